@@ -0,0 +1,105 @@
+"""Benchmark of building quote bands from rate curves.
+
+For C currencies (default 50) with B bands each (default 20), every curve given
+as a mid rate plus a spread in basis points per notional breakpoint, compares:
+
+- naive: per band, rate = mid * (1 + spread / 10_000) in floats, quantized with
+  decimal.Decimal(str(rate)).quantize(), then Band(max_amount=Decimal(...), rate=Decimal(...));
+- builder: RateCurve.from_spreads + build_quotes, with NumPy if installed;
+- builder (pure Python): the same with the NumPy path disabled.
+
+Usage:
+    uv run python sdk/benchmarks/bench_band_builder.py [--currencies 50] [--bands 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import decimal
+import random
+import time
+from typing import Callable
+
+import t0_provider_sdk.quote.bands as bands_module
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import PAYMENT_METHOD_TYPE_SEPA
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest
+from t0_provider_sdk.quote.bands import RateCurve, build_quotes
+from t0_provider_sdk.quote.publisher import Direction, QuoteKey
+
+RATE_QUANTUM = decimal.Decimal("1E-8")
+
+Desk = dict[QuoteKey, tuple[float, list[int], list[float]]]
+
+
+def _desk(currencies: int, bands: int) -> Desk:
+    rng = random.Random(0)
+    breakpoints = [1_000 * 2**i for i in range(bands)]
+    return {
+        QuoteKey(f"C{i:02d}", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT): (
+            rng.uniform(0.5, 150.0),
+            breakpoints,
+            sorted((rng.uniform(-40.0, -1.0) for _ in range(bands)), reverse=True),
+        )
+        for i in range(currencies)
+    }
+
+
+def naive(desk: Desk) -> dict[QuoteKey, list[UpdateQuoteRequest.Quote.Band]]:
+    result = {}
+    for key, (mid, breakpoints, spreads) in desk.items():
+        bands = []
+        for max_amount, spread in zip(breakpoints, spreads, strict=True):
+            rate = decimal.Decimal(str(mid * (1.0 + spread / 10_000))).quantize(RATE_QUANTUM)
+            bands.append(
+                UpdateQuoteRequest.Quote.Band(
+                    max_amount=Decimal(unscaled=max_amount, exponent=0),
+                    rate=Decimal(unscaled=int(rate.scaleb(8)), exponent=-8),
+                )
+            )
+        result[key] = bands
+    return result
+
+
+def builder(desk: Desk) -> dict[QuoteKey, list[UpdateQuoteRequest.Quote.Band]]:
+    curves = {
+        key: RateCurve.from_spreads(mid, breakpoints, spreads) for key, (mid, breakpoints, spreads) in desk.items()
+    }
+    return build_quotes(curves)
+
+
+def _time(fn: Callable[[Desk], object], desk: Desk, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(desk)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--currencies", type=int, default=50)
+    parser.add_argument("--bands", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    desk = _desk(args.currencies, args.bands)
+    numpy = bands_module.np
+    print(f"{args.currencies} currencies x {args.bands} bands, best of {args.repeat}")
+    print(f"{'variant':<28}{'per book':>12}{'per band':>12}{'speed-up':>10}")
+
+    naive_time = _time(naive, desk, args.repeat)
+    total = args.currencies * args.bands
+    print(f"{'naive':<28}{naive_time * 1000:>10.2f}ms{naive_time / total * 1e6:>10.2f}us{1.0:>9.1f}x")
+    variants = [("builder (NumPy)", numpy)] if numpy is not None else []
+    variants.append(("builder (pure Python)", None))
+    for name, module in variants:
+        bands_module.np = module
+        elapsed = _time(builder, desk, args.repeat)
+        print(f"{name:<28}{elapsed * 1000:>10.2f}ms{elapsed / total * 1e6:>10.2f}us{naive_time / elapsed:>9.1f}x")
+    bands_module.np = numpy
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Benchmark of Decimal message conversion and arithmetic for quote bands.
+
+For N bands (default 100k) with a USD max_amount and a rate, compares:
+
+- naive: decimal.Decimal(unscaled) * Decimal(10) ** exponent per field, arithmetic in
+  the decimal module, and back to a Decimal message via as_tuple();
+- scalar: t0_provider_sdk.common.decimal per band (to_decimal/from_decimal, multiply);
+- batch: to_scaled/multiply_scaled/from_scaled over arrays (vectorized with NumPy
+  when installed).
+
+Workloads: a rate round trip through decimal.Decimal, and max_amount / rate and
+max_amount * rate rounded to cents for every band.
+
+Usage:
+    uv run python sdk/benchmarks/bench_decimal.py [--bands 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import decimal
+import random
+import time
+from typing import Callable
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest
+from t0_provider_sdk.common.decimal import (
+    HAS_NUMPY,
+    divide,
+    from_decimal,
+    from_scaled,
+    multiply_scaled,
+    to_decimal,
+    to_scaled,
+)
+
+CENT = decimal.Decimal("0.01")
+
+
+def _bands(count: int) -> list[UpdateQuoteRequest.Quote.Band]:
+    rng = random.Random(0)
+    return [
+        UpdateQuoteRequest.Quote.Band(
+            max_amount=Decimal(unscaled=rng.choice((1_000, 5_000, 10_000, 25_000)), exponent=0),
+            rate=Decimal(unscaled=rng.randint(50_000_000, 150_000_000), exponent=-8),
+        )
+        for _ in range(count)
+    ]
+
+
+def _naive_to_decimal(value: Decimal) -> decimal.Decimal:
+    return decimal.Decimal(value.unscaled) * decimal.Decimal(10) ** value.exponent
+
+
+def _naive_from_decimal(value: decimal.Decimal) -> Decimal:
+    sign, digits, exponent = value.as_tuple()
+    unscaled = int("".join(str(d) for d in digits))
+    return Decimal(unscaled=-unscaled if sign else unscaled, exponent=exponent)
+
+
+def naive_round_trip(bands: list) -> list[Decimal]:
+    return [_naive_from_decimal(_naive_to_decimal(b.rate)) for b in bands]
+
+
+def scalar_round_trip(bands: list) -> list[Decimal]:
+    return [from_decimal(to_decimal(b.rate)) for b in bands]
+
+
+def naive_pay_out(bands: list) -> list[Decimal]:
+    return [
+        _naive_from_decimal((_naive_to_decimal(b.max_amount) / _naive_to_decimal(b.rate)).quantize(CENT)) for b in bands
+    ]
+
+
+def scalar_pay_out(bands: list) -> list[Decimal]:
+    return [divide(b.max_amount, b.rate, exponent=-2) for b in bands]
+
+
+def batch_rate_times_amount(bands: list) -> list[Decimal]:
+    """Settlement-side product max_amount * rate, rounded to cents, over arrays."""
+    amounts = to_scaled([b.max_amount for b in bands], 0)
+    rates = to_scaled([b.rate for b in bands], -8)
+    return from_scaled(multiply_scaled(amounts, 0, rates, -8, exponent=-2), -2)
+
+
+def naive_rate_times_amount(bands: list) -> list[Decimal]:
+    return [
+        _naive_from_decimal((_naive_to_decimal(b.max_amount) * _naive_to_decimal(b.rate)).quantize(CENT)) for b in bands
+    ]
+
+
+def _time(fn: Callable[[list], list], bands: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(bands)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bands", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bands = _bands(args.bands)
+    assert naive_pay_out(bands[:1000]) == scalar_pay_out(bands[:1000])
+    assert naive_rate_times_amount(bands[:1000]) == batch_rate_times_amount(bands[:1000])
+
+    print(f"{args.bands} bands, NumPy {'available' if HAS_NUMPY else 'not installed'}, best of {args.repeat}")
+    print(f"{'workload':<32}{'naive':>10}{'sdk':>10}{'speed-up':>10}")
+    for name, naive, fast in (
+        ("rate round trip (scalar)", naive_round_trip, scalar_round_trip),
+        ("amount / rate -> cents (scalar)", naive_pay_out, scalar_pay_out),
+        ("amount * rate -> cents (batch)", naive_rate_times_amount, batch_rate_times_amount),
+    ):
+        naive_time = _time(naive, bands, args.repeat)
+        fast_time = _time(fast, bands, args.repeat)
+        print(f"{name:<32}{naive_time * 1000:>8.0f}ms{fast_time * 1000:>8.0f}ms{naive_time / fast_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark of per-request SQLite commits vs GroupCommitWriter.
+
+Concurrent handler coroutines each persist one row and wait until it is
+durable, the way a handler would before acknowledging an RPC:
+
+- per-request: asyncio.to_thread running INSERT and COMMIT on a shared
+  connection behind a lock (one fsync per write, like Outbox);
+- group commit: await GroupCommitWriter.execute(), with the default
+  max_latency and with 0.
+
+Both use synchronous=FULL. Reports writes per second, p50/p99 time until a
+write was durable, and the mean batch size.
+
+Usage:
+    uv run python sdk/benchmarks/bench_group_commit.py [--writes 5000] [--concurrency 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from t0_provider_sdk.common.groupcommit import DEFAULT_MAX_LATENCY, GroupCommitWriter
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS payouts (payment_id INTEGER PRIMARY KEY, state TEXT NOT NULL);"
+INSERT = "INSERT INTO payouts VALUES (?, 'accepted')"
+
+
+async def _drive(write, writes: int, concurrency: int) -> tuple[float, list[float]]:
+    ids = iter(range(1, writes + 1))
+    latencies: list[float] = []
+
+    async def handler() -> None:
+        for payment_id in ids:
+            start = time.perf_counter()
+            await write(payment_id)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(handler() for _ in range(concurrency)))
+    return writes / (time.perf_counter() - start), latencies
+
+
+async def _per_request(path: str, writes: int, concurrency: int) -> tuple[float, list[float], float]:
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.executescript(SCHEMA)
+    lock = threading.Lock()
+
+    def insert(payment_id: int) -> None:
+        with lock:
+            conn.execute(INSERT, (payment_id,))
+
+    rate, latencies = await _drive(lambda payment_id: asyncio.to_thread(insert, payment_id), writes, concurrency)
+    conn.close()
+    return rate, latencies, 1.0
+
+
+async def _group(path: str, writes: int, concurrency: int, max_latency: float) -> tuple[float, list[float], float]:
+    with GroupCommitWriter(path, schema=SCHEMA, max_latency=max_latency) as writer:
+        rate, latencies = await _drive(lambda payment_id: writer.execute(INSERT, (payment_id,)), writes, concurrency)
+        batches = writer.registry.snapshot()["t0_group_commit_batch_size"][()]
+    return rate, latencies, batches.sum / batches.count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--writes", type=int, default=5_000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.writes} writes, {args.concurrency} concurrent handlers")
+    print(f"{'mode':<22} {'writes/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'batch':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        runs = [
+            ("per-request", lambda path: _per_request(path, args.writes, args.concurrency)),
+            (
+                f"group ({DEFAULT_MAX_LATENCY * 1000:g} ms)",
+                lambda path: _group(path, args.writes, args.concurrency, DEFAULT_MAX_LATENCY),
+            ),
+            ("group (0 ms)", lambda path: _group(path, args.writes, args.concurrency, 0.0)),
+        ]
+        for index, (name, run) in enumerate(runs):
+            rate, latencies, batch = asyncio.run(run(os.path.join(directory, f"{index}.db")))
+            quantiles = statistics.quantiles(latencies, n=100)
+            print(f"{name:<22} {rate:>10,.0f} {quantiles[49] * 1000:>8.2f} {quantiles[98] * 1000:>8.2f} {batch:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark of eager vs lazy decoding of a large AppendLedgerEntries body.
+
+Builds a request body close to DEFAULT_MAX_BODY_SIZE (4 MB) and processes it
+the way a handler would, iterating over every transaction:
+
+- eager: AppendLedgerEntriesRequest.FromString(body), as ConnectRPC does today;
+- lazy: LazyAppendLedgerEntriesRequest (with_lazy_ledger_entries()), decoding
+  one transaction per step.
+
+Each run happens in a fresh process, which reports time to the first
+transaction, total time, and peak RSS growth over the raw body (protobuf
+allocates outside the Python heap, so tracemalloc would not see it; the
+measurement reads /proc and needs Linux).
+
+Usage:
+    uv run python sdk/benchmarks/bench_lazy_ledger_entries.py [--body-size 4000000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.provider import LazyAppendLedgerEntriesRequest
+
+Transaction = AppendLedgerEntriesRequest.Transaction
+Entry = AppendLedgerEntriesRequest.LedgerEntry
+
+
+def _body(size: int) -> bytes:
+    request = AppendLedgerEntriesRequest()
+    transaction_id = 0
+    while request.ByteSize() < size:
+        for _ in range(1_000):
+            transaction_id += 1
+            amount = Decimal(unscaled=transaction_id * 1_234, exponent=-2)
+            request.transactions.append(
+                Transaction(
+                    transaction_id=transaction_id,
+                    payout=Transaction.Payout(payment_id=transaction_id),
+                    entries=[
+                        Entry(account_owner_id=7, account_type=3, debit=amount),
+                        Entry(account_owner_id=1, account_type=1, credit=amount),
+                    ],
+                )
+            )
+    return request.SerializeToString()
+
+
+def _peak_rss_kib() -> int:
+    """High-water RSS of this process (Linux; unlike ru_maxrss it is reset by exec)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1])
+    raise RuntimeError("VmHWM not found")
+
+
+def _run(mode: str, path: str, results: multiprocessing.Queue) -> None:
+    with open(path, "rb") as f:
+        body = f.read()
+    baseline = _peak_rss_kib()
+    start = time.perf_counter()
+    if mode == "eager":
+        request = AppendLedgerEntriesRequest.FromString(body)
+    else:
+        request = LazyAppendLedgerEntriesRequest()
+        request.ParseFromString(body)
+    first = None
+    count = 0
+    for transaction in request.transactions:
+        if first is None:
+            first = time.perf_counter() - start
+        count += transaction.transaction_id > 0
+    total = time.perf_counter() - start
+    peak = _peak_rss_kib() - baseline
+    results.put((mode, count, first, total, peak))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--body-size", type=int, default=4_000_000)
+    args = parser.parse_args()
+
+    body = _body(args.body_size)
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "body")
+        with open(path, "wb") as f:
+            f.write(body)
+        print(f"body {len(body) / 1e6:.2f} MB")
+        print(f"{'mode':<6} {'transactions':>12} {'first ms':>9} {'total ms':>9} {'peak RSS MB':>12}")
+        for mode in ("eager", "lazy"):
+            results: multiprocessing.Queue = context.Queue()
+            process = context.Process(target=_run, args=(mode, path, results))
+            process.start()
+            name, count, first, total, peak = results.get()
+            process.join()
+            print(f"{name:<6} {count:>12} {first * 1000:>9.2f} {total * 1000:>9.2f} {peak / 1024:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
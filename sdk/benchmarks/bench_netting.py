@@ -0,0 +1,100 @@
+"""Benchmark of SettlementNetting.
+
+Generates --transactions settlement and fee settlement transactions of two
+entries each between --counterparties participants and reports:
+
+- apply: incremental netting in batches of --batch transactions;
+- recompute (numpy / python): rebuilding every position from the whole history,
+  summed with np.add.at and with the dict fallback;
+- snapshot: polls of snapshot() per second.
+
+Usage:
+    uv run python sdk/benchmarks/bench_netting.py [--transactions 200000] [--counterparties 200] [--batch 500]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import t0_provider_sdk.ledger.netting as netting_module
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.ledger import SettlementNetting
+
+Transaction = AppendLedgerEntriesRequest.Transaction
+Entry = AppendLedgerEntriesRequest.LedgerEntry
+
+
+def _history(transactions: int, counterparties: int) -> list[Transaction]:
+    rng = random.Random(1)
+    history = []
+    for transaction_id in range(1, transactions + 1):
+        amount = Decimal(unscaled=rng.randrange(1, 10**9), exponent=-2)
+        debtor, creditor = rng.sample(range(1, counterparties + 1), 2)
+        details = (
+            {"provider_settlement": Transaction.ProviderSettlement(settlement_id=transaction_id)}
+            if transaction_id % 4
+            else {"fee_settlement": Transaction.FeeSettlement(fee_settlement_id=transaction_id)}
+        )
+        history.append(
+            Transaction(
+                transaction_id=transaction_id,
+                entries=[
+                    Entry(
+                        account_owner_id=debtor,
+                        account_type=AppendLedgerEntriesRequest.ACCOUNT_TYPE_SETTLEMENT_OUT,
+                        debit=amount,
+                    ),
+                    Entry(
+                        account_owner_id=creditor,
+                        account_type=AppendLedgerEntriesRequest.ACCOUNT_TYPE_SETTLEMENT_IN,
+                        credit=amount,
+                    ),
+                ],
+                **details,
+            )
+        )
+    return history
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=200_000)
+    parser.add_argument("--counterparties", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    history = _history(args.transactions, args.counterparties)
+    print(f"{args.transactions:,} settlement transactions, {args.counterparties} counterparties")
+
+    netting = SettlementNetting()
+    start = time.perf_counter()
+    for first in range(0, len(history), args.batch):
+        netting.apply(history[first : first + args.batch])
+    elapsed = time.perf_counter() - start
+    print(f"{'apply':<18} {elapsed:>7.2f} s {args.transactions / elapsed:>12,.0f} transactions/s")
+
+    numpy = netting_module.np
+    for name in ("numpy", "python"):
+        if name == "numpy" and numpy is None:
+            print("recompute (numpy)  NumPy is not installed")
+            continue
+        netting_module.np = numpy if name == "numpy" else None
+        start = time.perf_counter()
+        SettlementNetting().recompute(history)
+        elapsed = time.perf_counter() - start
+        print(f"{f'recompute ({name})':<18} {elapsed:>7.2f} s {args.transactions / elapsed:>12,.0f} transactions/s")
+    netting_module.np = numpy
+
+    polls = 1_000_000
+    start = time.perf_counter()
+    for _ in range(polls):
+        netting.snapshot()
+    elapsed = time.perf_counter() - start
+    print(f"{'snapshot':<18} {elapsed:>7.2f} s {polls / elapsed:>12,.0f} polls/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark of bulk reconciliation of payment records against the ledger.
+
+Builds both sides column-wise for --payments payouts (one ledger transaction
+each, plus a few percent of missing, unknown and mismatching ones) and reports
+the time to:
+
+- ingest: ReconciliationColumns.add_transactions over --transactions protobuf
+  transactions (the per-transaction cost of reading AppendLedgerEntries);
+- join (numpy / python): reconcile() with the vectorized join and with the
+  dict hash join fallback.
+
+Usage:
+    uv run python sdk/benchmarks/bench_reconciliation.py [--payments 2000000] [--transactions 100000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import t0_provider_sdk.ledger.reconciliation as reconciliation_module
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.ledger import LinkKind, ReconciliationColumns, reconcile
+
+Transaction = AppendLedgerEntriesRequest.Transaction
+Entry = AppendLedgerEntriesRequest.LedgerEntry
+
+
+def _sides(payments: int) -> tuple[ReconciliationColumns, ReconciliationColumns]:
+    rng = random.Random(1)
+    ids = rng.sample(range(1, 1 << 62), payments)
+    amounts = [rng.randrange(1, 10**12) for _ in range(payments)]
+    records, ledger = ReconciliationColumns(), ReconciliationColumns()
+    cut = payments // 100
+    records.extend(LinkKind.PAYMENT, ids[cut:], amounts[cut:])  # the first 1% is missing in the records
+    ledger.extend(LinkKind.PAYMENT, ids[: -2 * cut], amounts[: -2 * cut])  # the last 2% is missing in the ledger
+    ledger.extend(LinkKind.PAYMENT, ids[cut : 2 * cut], [1] * cut)  # 1% has an extra transaction
+    return records, ledger
+
+
+def _transactions(count: int) -> list[Transaction]:
+    return [
+        Transaction(
+            transaction_id=i,
+            payout=Transaction.Payout(payment_id=i),
+            entries=[
+                Entry(
+                    account_owner_id=1,
+                    account_type=AppendLedgerEntriesRequest.ACCOUNT_TYPE_PAY_OUT,
+                    debit=Decimal(unscaled=i, exponent=-2),
+                ),
+                Entry(
+                    account_owner_id=1,
+                    account_type=AppendLedgerEntriesRequest.ACCOUNT_TYPE_BALANCE,
+                    credit=Decimal(unscaled=i, exponent=-2),
+                ),
+            ],
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--payments", type=int, default=2_000_000)
+    parser.add_argument("--transactions", type=int, default=100_000)
+    args = parser.parse_args()
+
+    transactions = _transactions(args.transactions)
+    start = time.perf_counter()
+    ReconciliationColumns().add_transactions(transactions)
+    elapsed = time.perf_counter() - start
+    print(f"ingest {args.transactions:,} transactions: {elapsed:.2f} s ({args.transactions / elapsed:,.0f}/s)")
+
+    records, ledger = _sides(args.payments)
+    numpy = reconciliation_module.np
+    for name in ("numpy", "python"):
+        if name == "numpy" and numpy is None:
+            print("join (numpy): NumPy is not installed")
+            continue
+        reconciliation_module.np = numpy if name == "numpy" else None
+        start = time.perf_counter()
+        report = reconcile(records, ledger)
+        elapsed = time.perf_counter() - start
+        print(f"join ({name}) {args.payments:,} payments: {elapsed:.2f} s {report.summary()}")
+    reconciliation_module.np = numpy
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Contention benchmark for a sync network client shared between threads.
+
+Starts a minimal Connect-protocol server in a separate process and calls
+FinalizePayout from 1..64 threads through one shared client, comparing the
+default factory (new_service_client_sync, shared default transport) with the
+pooled factory (new_pooled_service_client_sync, pool sized to the thread count).
+
+Usage:
+    uv run python sdk/benchmarks/bench_sync_client_contention.py [--calls-per-thread 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClientSync
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import FinalizePayoutRequest, FinalizePayoutResponse
+from t0_provider_sdk.network.client import new_pooled_service_client_sync, new_service_client_sync
+
+PRIVATE_KEY = "0x6b30303de7b26bfb1222b317a52113357f8bb06de00160b4261a2fef9c8b9bd8"
+THREAD_COUNTS = (1, 2, 4, 8, 16, 32, 64)
+_RESPONSE = FinalizePayoutResponse().SerializeToString()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:  # noqa: N802
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/proto")
+        self.send_header("Content-Length", str(len(_RESPONSE)))
+        self.end_headers()
+        self.wfile.write(_RESPONSE)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+def _serve(port_queue: multiprocessing.Queue) -> None:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def _run(client: NetworkServiceClientSync, threads: int, calls_per_thread: int) -> tuple[float, list[float]]:
+    def worker(_: int) -> list[float]:
+        latencies = []
+        request = FinalizePayoutRequest(payment_id=1)
+        for _ in range(calls_per_thread):
+            start = time.perf_counter()
+            client.finalize_payout(request)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+    return elapsed, [latency for result in results for latency in result]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls-per-thread", type=int, default=200)
+    args = parser.parse_args()
+
+    port_queue: multiprocessing.Queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(port_queue,), daemon=True)
+    server.start()
+    base_url = f"http://127.0.0.1:{port_queue.get()}"
+
+    print(f"{'client':<8} {'threads':>7} {'req/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    try:
+        for threads in THREAD_COUNTS:
+            clients = {
+                "default": new_service_client_sync(PRIVATE_KEY, NetworkServiceClientSync, base_url=base_url),
+                "pooled": new_pooled_service_client_sync(
+                    PRIVATE_KEY, NetworkServiceClientSync, threads=threads, base_url=base_url
+                ),
+            }
+            for name, client in clients.items():
+                _run(client, threads, 5)  # open connections before measuring
+                elapsed, latencies = _run(client, threads, args.calls_per_thread)
+                quantiles = statistics.quantiles(latencies, n=100)
+                print(
+                    f"{name:<8} {threads:>7} {len(latencies) / elapsed:>10.0f}"
+                    f" {quantiles[49] * 1000:>8.2f} {quantiles[98] * 1000:>8.2f}"
+                )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,12 @@ This SDK provides:
 - Server-side ASGI middleware for signature verification
 - Client-side signing transport for outgoing requests
 - Generic, proto-agnostic handler/client registration
+- Quote publishing helpers (coalescing publisher)
+- Ledger bookkeeping (balances projected from AppendLedgerEntries, durable journal,
+  bulk reconciliation, settlement netting)
+- Counterparty limit tracking (versioned UpdateLimit snapshots, payout reservations)
+- Payment state tracking (legal transitions, in-memory or SQLite storage)
+- Group-commit SQLite writer for persisting handler state
 
 Usage (server):
     from t0_provider_sdk.provider import handler, new_asgi_app
@@ -0,0 +1,388 @@
+"""Conversions and exact arithmetic for tzero.v1.common.Decimal messages.
+
+A Decimal is unscaled * 10^exponent (123.45 = 12345 * 10^-2), with unscaled an
+int64 and exponent in [-8, 8]. The helpers here convert between Decimal messages
+and decimal.Decimal, int and fractions.Fraction, and multiply, divide and round
+Decimal messages directly on their scaled integers, without going through the
+decimal module or float. Nothing is rounded unless a rounding mode is given;
+conversions that would lose digits raise ValueError instead.
+
+Rounding modes are the decimal module's constants (decimal.ROUND_HALF_EVEN, ...).
+
+The batch functions work on arrays of unscaled integers sharing one exponent. With
+NumPy installed (pip install "t0-provider-sdk[numpy]") they return int64 ndarrays
+and run vectorized; otherwise they return array.array("q") built in plain Python.
+
+Example:
+    rate = from_decimal(decimal.Decimal("0.8612"))         # Decimal(unscaled=8612, exponent=-4)
+    amount = from_int(1_000)
+    pay_out = multiply(amount, rate, exponent=-2)          # 861.20
+    settlement = divide(pay_out, rate, exponent=-2)        # 1000.00
+
+No Go equivalent; the Go SDK leaves Decimal arithmetic to the integration.
+"""
+
+from __future__ import annotations
+
+import array
+import decimal
+import math
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+# Whether the batch functions are vectorized with NumPy
+HAS_NUMPY = np is not None
+
+# Exponent range accepted by the network (buf.validate rule on Decimal.exponent)
+MIN_EXPONENT = -8
+MAX_EXPONENT = 8
+
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+# numpy.ndarray of int64 when NumPy is installed, otherwise array.array("q")
+ScaledArray = Any
+
+# Context that never rounds (for scaleb on digits the value already has)
+_EXACT = decimal.Context(prec=decimal.MAX_PREC, Emax=decimal.MAX_EMAX, Emin=decimal.MIN_EMIN)
+
+_ROUNDINGS = frozenset(
+    {
+        decimal.ROUND_HALF_EVEN,
+        decimal.ROUND_HALF_UP,
+        decimal.ROUND_HALF_DOWN,
+        decimal.ROUND_UP,
+        decimal.ROUND_DOWN,
+        decimal.ROUND_CEILING,
+        decimal.ROUND_FLOOR,
+    }
+)
+
+
+def _check_rounding(rounding: str | None) -> None:
+    if rounding is not None and rounding not in _ROUNDINGS:
+        raise ValueError(f"unsupported rounding mode {rounding!r}")
+
+
+def _check_exponent(exponent: int) -> None:
+    if not MIN_EXPONENT <= exponent <= MAX_EXPONENT:
+        raise ValueError(f"exponent {exponent} outside [{MIN_EXPONENT}, {MAX_EXPONENT}]")
+
+
+def _div_round(n: int, d: int, rounding: str) -> int:
+    """n / d rounded to an integer; d must be positive."""
+    q, r = divmod(n, d)  # floor division, 0 <= r < d
+    if r == 0 or rounding == decimal.ROUND_FLOOR:
+        return q
+    if rounding == decimal.ROUND_CEILING:
+        return q + 1
+    if rounding == decimal.ROUND_DOWN:
+        return q + 1 if n < 0 else q
+    if rounding == decimal.ROUND_UP:
+        return q if n < 0 else q + 1
+    twice = 2 * r
+    if twice != d:
+        return q + 1 if twice > d else q
+    if rounding == decimal.ROUND_HALF_UP:
+        return q if n < 0 else q + 1
+    if rounding == decimal.ROUND_HALF_DOWN:
+        return q + 1 if n < 0 else q
+    return q + (q & 1)  # ROUND_HALF_EVEN
+
+
+def _rescale(unscaled: int, exponent: int, target: int, rounding: str | None) -> int:
+    """Unscaled value of unscaled * 10^exponent at the target exponent."""
+    if target <= exponent:
+        return unscaled * 10 ** (exponent - target)
+    divisor = 10 ** (target - exponent)
+    if rounding is None:
+        q, r = divmod(unscaled, divisor)
+        if r:
+            raise ValueError(f"{unscaled}e{exponent} is not exact at exponent {target}; pass a rounding mode")
+        return q
+    return _div_round(unscaled, divisor, rounding)
+
+
+def _make(unscaled: int, exponent: int, rounding: str | None = None) -> Decimal:
+    """Build a Decimal, moving the exponent into range and checking that unscaled fits int64."""
+    if exponent > MAX_EXPONENT:
+        unscaled *= 10 ** (exponent - MAX_EXPONENT)
+        exponent = MAX_EXPONENT
+    elif exponent < MIN_EXPONENT:
+        unscaled = _rescale(unscaled, exponent, MIN_EXPONENT, rounding)
+        exponent = MIN_EXPONENT
+    while not INT64_MIN <= unscaled <= INT64_MAX and exponent < MAX_EXPONENT and unscaled % 10 == 0:
+        unscaled //= 10
+        exponent += 1
+    if not INT64_MIN <= unscaled <= INT64_MAX:
+        raise ValueError(f"{unscaled}e{exponent} does not fit a Decimal (int64 unscaled)")
+    return Decimal(unscaled=unscaled, exponent=exponent)
+
+
+def _make_at(unscaled: int, exponent: int, target: int, rounding: str | None) -> Decimal:
+    """Build a Decimal with exactly the target exponent."""
+    _check_exponent(target)
+    result = _rescale(unscaled, exponent, target, rounding)
+    if not INT64_MIN <= result <= INT64_MAX:
+        raise ValueError(f"{result}e{target} does not fit a Decimal (int64 unscaled)")
+    return Decimal(unscaled=result, exponent=target)
+
+
+# --- Conversions -------------------------------------------------------------
+
+
+def to_fraction(value: Decimal) -> Fraction:
+    """Convert a Decimal message to an exact Fraction."""
+    if value.exponent >= 0:
+        return Fraction(value.unscaled * 10**value.exponent)
+    return Fraction(value.unscaled, 10**-value.exponent)
+
+
+def to_decimal(value: Decimal) -> decimal.Decimal:
+    """Convert a Decimal message to an exact decimal.Decimal (independent of the decimal context)."""
+    return decimal.Decimal(f"{value.unscaled}E{value.exponent}")
+
+
+def to_int(value: Decimal) -> int:
+    """Convert a Decimal message to int. Raises ValueError if it has a fractional part."""
+    return _rescale(value.unscaled, value.exponent, 0, None)
+
+
+def from_int(value: int, *, exponent: int | None = None) -> Decimal:
+    """Convert an int to a Decimal message, at the given exponent if any."""
+    if exponent is not None:
+        return _make_at(value, 0, exponent, None)
+    return _make(value, 0)
+
+
+def from_decimal(value: decimal.Decimal, *, exponent: int | None = None, rounding: str | None = None) -> Decimal:
+    """Convert a decimal.Decimal to a Decimal message.
+
+    Args:
+        value: A finite decimal.Decimal.
+        exponent: Exponent of the result; by default the value's own exponent, moved into range.
+        rounding: Rounding mode used if digits must be dropped; ValueError if None and the
+            conversion is not exact.
+    """
+    _check_rounding(rounding)
+    if not value.is_finite():
+        raise ValueError(f"{value} is not finite")
+    own_exponent = value.as_tuple().exponent
+    unscaled = int(value.scaleb(-own_exponent, _EXACT))
+    if exponent is not None:
+        return _make_at(unscaled, own_exponent, exponent, rounding)
+    return _make(unscaled, own_exponent, rounding)
+
+
+def from_fraction(value: Fraction, *, exponent: int | None = None, rounding: str | None = None) -> Decimal:
+    """Convert a Fraction to a Decimal message.
+
+    Without an exponent, uses the largest exponent <= 0 (fewest digits) that represents
+    the value exactly; values that need more than 8 decimal places are rounded to 8
+    places if a rounding mode is given.
+    """
+    _check_rounding(rounding)
+    n, d = value.numerator, value.denominator
+    if exponent is not None:
+        _check_exponent(exponent)
+        if rounding is None:
+            scaled = Fraction(n * 10**-exponent, d) if exponent <= 0 else Fraction(n, d * 10**exponent)
+            if scaled.denominator != 1:
+                raise ValueError(f"{value} is not exact at exponent {exponent}; pass a rounding mode")
+            return _make_at(scaled.numerator, exponent, exponent, None)
+        if exponent <= 0:
+            return _make_at(_div_round(n * 10**-exponent, d, rounding), exponent, exponent, None)
+        return _make_at(_div_round(n, d * 10**exponent, rounding), exponent, exponent, None)
+    for places in range(-MIN_EXPONENT + 1):
+        scaled = n * 10**places
+        if scaled % d == 0:
+            return _make(scaled // d, -places)
+    if rounding is None:
+        raise ValueError(f"{value} needs more than {-MIN_EXPONENT} decimal places; pass a rounding mode")
+    return _make(_div_round(n * 10**-MIN_EXPONENT, d, rounding), MIN_EXPONENT)
+
+
+def from_number(
+    value: decimal.Decimal | Fraction | int | str, *, exponent: int | None = None, rounding: str | None = None
+) -> Decimal:
+    """Convert a decimal.Decimal, Fraction, int or decimal string to a Decimal message."""
+    if isinstance(value, bool):
+        raise TypeError("bool is not a number here")
+    if isinstance(value, int):
+        return from_int(value, exponent=exponent)
+    if isinstance(value, Fraction):
+        return from_fraction(value, exponent=exponent, rounding=rounding)
+    if isinstance(value, str):
+        value = decimal.Decimal(value)
+    return from_decimal(value, exponent=exponent, rounding=rounding)
+
+
+def relative_change_bps(old: Decimal, new: Decimal) -> float:
+    """Absolute change from old to new in basis points of old (infinite if old is zero and new is not)."""
+    old_value = to_fraction(old)
+    new_value = to_fraction(new)
+    if old_value == new_value:
+        return 0.0
+    if old_value == 0:
+        return math.inf
+    return float(abs(new_value - old_value) * 10_000 / abs(old_value))
+
+
+# --- Arithmetic --------------------------------------------------------------
+
+
+def quantize(value: Decimal, exponent: int, *, rounding: str = decimal.ROUND_HALF_EVEN) -> Decimal:
+    """Round a Decimal message to the given exponent (e.g. -2 for cents)."""
+    _check_rounding(rounding)
+    return _make_at(value.unscaled, value.exponent, exponent, rounding)
+
+
+def multiply(
+    a: Decimal, b: Decimal, *, exponent: int | None = None, rounding: str = decimal.ROUND_HALF_EVEN
+) -> Decimal:
+    """Exact product a * b, rounded only to fit the given exponent (or the exponent range)."""
+    _check_rounding(rounding)
+    unscaled, product_exponent = a.unscaled * b.unscaled, a.exponent + b.exponent
+    if exponent is not None:
+        return _make_at(unscaled, product_exponent, exponent, rounding)
+    return _make(unscaled, product_exponent, rounding)
+
+
+def divide(a: Decimal, b: Decimal, *, exponent: int, rounding: str = decimal.ROUND_HALF_EVEN) -> Decimal:
+    """Quotient a / b at the given exponent, rounded once from the exact value."""
+    _check_rounding(rounding)
+    _check_exponent(exponent)
+    if b.unscaled == 0:
+        raise ZeroDivisionError("Decimal division by zero")
+    shift = a.exponent - b.exponent - exponent
+    n, d = a.unscaled, b.unscaled
+    if shift >= 0:
+        n *= 10**shift
+    else:
+        d *= 10**-shift
+    if d < 0:
+        n, d = -n, -d
+    return _make_at(_div_round(n, d, rounding), exponent, exponent, None)
+
+
+# --- Batch -------------------------------------------------------------------
+
+
+def _to_array(values: Iterable[int]) -> ScaledArray:
+    if np is not None:
+        return np.fromiter(values, dtype=np.int64)
+    return array.array("q", values)
+
+
+def _np_div_round(n: Any, d: int, rounding: str) -> Any:
+    q, r = np.divmod(n, d)
+    if rounding == decimal.ROUND_FLOOR:
+        return q
+    inexact = r != 0
+    if rounding == decimal.ROUND_CEILING:
+        return q + inexact
+    if rounding == decimal.ROUND_DOWN:
+        return q + (inexact & (n < 0))
+    if rounding == decimal.ROUND_UP:
+        return q + (inexact & (n >= 0))
+    twice = 2 * r
+    if rounding == decimal.ROUND_HALF_UP:
+        tie_up = n >= 0
+    elif rounding == decimal.ROUND_HALF_DOWN:
+        tie_up = n < 0
+    else:
+        tie_up = (q & 1) == 1
+    return q + ((twice > d) | ((twice == d) & tie_up))
+
+
+def _np_rescale(unscaled: Any, shift: int, rounding: str | None) -> Any:
+    """unscaled * 10^shift for an int64 array, checking overflow and exactness."""
+    if shift >= 0:
+        if shift == 0:
+            return unscaled
+        # not np.abs(): it leaves INT64_MIN negative
+        if shift > 18 or (unscaled.size and max(int(unscaled.max()), -int(unscaled.min())) > INT64_MAX // 10**shift):
+            raise ValueError("scaled values do not fit int64")
+        return unscaled * 10**shift
+    if -shift > 18:
+        return np.fromiter((_rescale(int(u), shift, 0, rounding) for u in unscaled.tolist()), dtype=np.int64)
+    divisor = 10**-shift
+    if rounding is None:
+        if np.any(unscaled % divisor):
+            raise ValueError(f"values are not exact at exponent shift {shift}; pass a rounding mode")
+        return unscaled // divisor
+    return _np_div_round(unscaled, divisor, rounding)
+
+
+def to_scaled(values: Iterable[Decimal], exponent: int, *, rounding: str | None = None) -> ScaledArray:
+    """Unscaled integers of Decimal messages, all at one exponent.
+
+    Args:
+        values: Decimal messages.
+        exponent: Common exponent of the result (e.g. -8 for rates, -2 for amounts).
+        rounding: Rounding mode for values with more decimal places; ValueError if None.
+
+    Returns:
+        An int64 ndarray with NumPy, otherwise array.array("q").
+    """
+    _check_rounding(rounding)
+    if np is None:
+        return array.array("q", (_rescale(v.unscaled, v.exponent, exponent, rounding) for v in values))
+    values = list(values)
+    unscaled = np.fromiter((v.unscaled for v in values), dtype=np.int64, count=len(values))
+    exponents = np.fromiter((v.exponent for v in values), dtype=np.int32, count=len(values))
+    result = np.empty_like(unscaled)
+    for own_exponent in np.unique(exponents).tolist():
+        mask = exponents == own_exponent
+        result[mask] = _np_rescale(unscaled[mask], own_exponent - exponent, rounding)
+    return result
+
+
+def from_scaled(unscaled: Sequence[int] | ScaledArray, exponent: int) -> list[Decimal]:
+    """Decimal messages for unscaled integers at one exponent."""
+    _check_exponent(exponent)
+    values = unscaled.tolist() if hasattr(unscaled, "tolist") else unscaled
+    return [Decimal(unscaled=u, exponent=exponent) for u in values]
+
+
+def multiply_scaled(
+    a: Sequence[int] | ScaledArray,
+    a_exponent: int,
+    b: Sequence[int] | ScaledArray,
+    b_exponent: int,
+    *,
+    exponent: int,
+    rounding: str = decimal.ROUND_HALF_EVEN,
+) -> ScaledArray:
+    """Element-wise a * b for scaled integer arrays, rounded to the given exponent.
+
+    Uses int64 arithmetic when NumPy is installed and the products cannot overflow;
+    otherwise falls back to Python integers, so results are always exact before rounding.
+    """
+    _check_rounding(rounding)
+    if len(a) != len(b):
+        raise ValueError("arrays must have the same length")
+    shift = a_exponent + b_exponent - exponent
+    if np is not None:
+        a_array = np.asarray(a, dtype=np.int64)
+        b_array = np.asarray(b, dtype=np.int64)
+        if not len(a_array):
+            return a_array.copy()
+        bound = max(int(a_array.max()), -int(a_array.min())) * max(int(b_array.max()), -int(b_array.min()))
+        if bound <= INT64_MAX and (shift < 0 or bound * 10**shift <= INT64_MAX):
+            return _np_rescale(a_array * b_array, shift, rounding)
+    a_values = a.tolist() if hasattr(a, "tolist") else a
+    b_values = b.tolist() if hasattr(b, "tolist") else b
+    return _to_array(
+        _rescale(x * y, a_exponent + b_exponent, exponent, rounding) for x, y in zip(a_values, b_values, strict=True)
+    )
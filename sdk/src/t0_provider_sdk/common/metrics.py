@@ -0,0 +1,244 @@
+"""In-process metrics registry: counters and histograms.
+
+A small, dependency-free registry shared by the SDK's components (network client,
+quote publisher, ledger, payments, periodic tasks, ...). Each component records
+into a MetricsRegistry passed to it or a private one.
+
+Observations are lock-free: every thread accumulates into its own shard and only
+readers (snapshots, export) sum over the shards. The registry can be rendered in
+the Prometheus text exposition format with to_prometheus().
+
+No Go equivalent; the Go SDK leaves instrumentation to OpenTelemetry middleware.
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable
+
+# Latency buckets in seconds, from sub-millisecond signing up to the default request timeout.
+DEFAULT_LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0,
+)  # fmt: skip
+
+
+class _Shards:
+    """Per-thread arrays of accumulators.
+
+    Each thread writes only to its own shard, so updates need no lock. The lock is
+    taken once per thread, when its shard is created; readers sum over all shards.
+    """
+
+    __slots__ = ("_size", "_local", "_shards", "_lock")
+
+    def __init__(self, size: int) -> None:
+        self._size = size
+        self._local = threading.local()
+        self._shards: list[list[float]] = []
+        self._lock = threading.Lock()
+
+    def local(self) -> list[float]:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0] * self._size
+            with self._lock:
+                self._shards.append(shard)
+            self._local.shard = shard
+            return shard
+
+    def totals(self) -> list[float]:
+        totals = [0] * self._size
+        for shard in list(self._shards):
+            for i, value in enumerate(shard):
+                totals[i] += value
+        return totals
+
+
+class Counter:
+    """Monotonically increasing counter."""
+
+    def __init__(self) -> None:
+        self._shards = _Shards(1)
+
+    def inc(self, amount: float = 1) -> None:
+        """Increment the counter by amount (must be non-negative)."""
+        self._shards.local()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._shards.totals()[0]
+
+
+@dataclass(frozen=True)
+class HistogramSnapshot:
+    """Point-in-time view of a Histogram.
+
+    Attributes:
+        buckets: Upper bounds of the finite buckets, ascending.
+        counts: Cumulative observation counts per bucket, plus a final +Inf bucket.
+        sum: Sum of all observed values.
+    """
+
+    buckets: tuple[float, ...]
+    counts: tuple[int, ...]
+    sum: float
+
+    @property
+    def count(self) -> int:
+        return self.counts[-1]
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1) by linear interpolation within buckets.
+
+        Returns NaN when the histogram is empty. Values in the +Inf bucket are reported
+        as the largest finite bucket bound.
+        """
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        index = bisect.bisect_left(self.counts, rank)
+        if index >= len(self.buckets):
+            return self.buckets[-1]
+        lower = self.buckets[index - 1] if index else 0.0
+        below = self.counts[index - 1] if index else 0
+        in_bucket = self.counts[index] - below
+        if not in_bucket:
+            return self.buckets[index]
+        return lower + (self.buckets[index] - lower) * (rank - below) / in_bucket
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus (upper-bound inclusive) semantics."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS) -> None:
+        if not buckets or list(buckets) != sorted(set(buckets)):
+            raise ValueError("buckets must be a non-empty, strictly increasing sequence")
+        self.buckets = tuple(float(b) for b in buckets)
+        # Layout: one count per finite bucket, one for +Inf, then the running sum.
+        self._shards = _Shards(len(self.buckets) + 2)
+
+    def observe(self, value: float) -> None:
+        shard = self._shards.local()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        totals = self._shards.totals()
+        cumulative = []
+        running = 0
+        for count in totals[:-1]:
+            running += int(count)
+            cumulative.append(running)
+        return HistogramSnapshot(self.buckets, tuple(cumulative), totals[-1])
+
+
+@dataclass
+class _Family:
+    name: str
+    help_text: str
+    kind: str
+    factory: Callable[[], Any]
+    children: dict[tuple[tuple[str, str], ...], Any]
+
+
+class MetricsRegistry:
+    """Named families of labelled counters and histograms.
+
+    Looking up an existing metric is two dict reads; creating a new label set takes a
+    lock. Metrics are created on first use and live for the lifetime of the registry.
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[str, _Family] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help_text: str, **labels: str) -> Counter:
+        """Return the counter for name and labels, creating it on first use."""
+        return self._child(name, help_text, "counter", Counter, labels)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        **labels: str,
+    ) -> Histogram:
+        """Return the histogram for name and labels, creating it on first use.
+
+        The buckets of the first call for a name apply to every label set of that name.
+        """
+        return self._child(name, help_text, "histogram", lambda: Histogram(buckets), labels)
+
+    def _child(self, name: str, help_text: str, kind: str, factory: Callable[[], Any], labels: dict[str, str]) -> Any:
+        key = tuple(sorted(labels.items()))
+        family = self._families.get(name)
+        if family is not None and family.kind == kind:
+            child = family.children.get(key)
+            if child is not None:
+                return child
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = _Family(name, help_text, kind, factory, {})
+                self._families[name] = family
+            elif family.kind != kind:
+                raise ValueError(f"metric {name!r} is already registered as a {family.kind}")
+            child = family.children.get(key)
+            if child is None:
+                child = family.factory()
+                # Copy-on-write so lock-free readers never see a dict being resized.
+                family.children = {**family.children, key: child}
+            return child
+
+    def snapshot(self) -> dict[str, dict[tuple[tuple[str, str], ...], float | HistogramSnapshot]]:
+        """Return {name: {labels: value}} with counter values and histogram snapshots."""
+        result: dict[str, dict[tuple[tuple[str, str], ...], float | HistogramSnapshot]] = {}
+        for family in list(self._families.values()):
+            values: dict[tuple[tuple[str, str], ...], float | HistogramSnapshot] = {}
+            for key, child in family.children.items():
+                values[key] = child.value if family.kind == "counter" else child.snapshot()
+            result[family.name] = values
+        return result
+
+    def to_prometheus(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (version 0.0.4)."""
+        lines: list[str] = []
+        for family in sorted(self._families.values(), key=lambda f: f.name):
+            lines.append(f"# HELP {family.name} {_escape_help(family.help_text)}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for key, child in sorted(family.children.items()):
+                if family.kind == "counter":
+                    lines.append(f"{family.name}{_labels(key)} {_number(child.value)}")
+                    continue
+                snap = child.snapshot()
+                bounds = [*(_number(b) for b in snap.buckets), "+Inf"]
+                for bound, count in zip(bounds, snap.counts, strict=True):
+                    lines.append(f"{family.name}_bucket{_labels((*key, ('le', bound)))} {count}")
+                lines.append(f"{family.name}_sum{_labels(key)} {_number(snap.sum)}")
+                lines.append(f"{family.name}_count{_labels(key)} {snap.count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _labels(key: tuple[tuple[str, str], ...]) -> str:
+    if not key:
+        return ""
+    pairs = ",".join(f'{name}="{_escape_label(value)}"' for name, value in key)
+    return "{" + pairs + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
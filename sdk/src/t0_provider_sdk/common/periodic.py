@@ -0,0 +1,200 @@
+"""Fixed-rate periodic task runner.
+
+A loop that sleeps for `interval` after each run drifts by the time every run
+takes, and a loop that lets an exception escape stops for good. PeriodicTask
+runs an async callable on a fixed-rate schedule instead:
+
+- tick n is due at start + n * interval, no matter how long earlier ticks took;
+- each tick may be delayed by a random jitter of up to `jitter` seconds, so
+  replicas started together do not hit the same upstream at the same instant
+  (jitter is applied to every tick separately and never accumulates);
+- a tick that runs past `deadline` is cancelled and counted as a failure;
+- errors are logged and the task keeps running; after consecutive failures the
+  next attempt is backed off exponentially, up to `max_backoff`;
+- ticks missed because a run overran its interval follow a MissedTickPolicy.
+
+start() and stop() are meant as ASGI lifespan hooks of new_asgi_app(), so the
+task runs exactly as long as the server:
+
+    refresh = PeriodicTask(refresh_rates, interval=5.0, jitter=0.5, name="rate refresh")
+    app = new_asgi_app(key, handler(...), on_startup=[refresh.start], on_shutdown=[refresh.stop])
+
+Alternatively, run(shutdown_event) as a background task.
+
+No Go equivalent; the Go starter uses a time.Ticker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import enum
+import logging
+import math
+import random
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from t0_provider_sdk.common.metrics import MetricsRegistry
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.common.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Upper bound (seconds) of the delay after consecutive failed ticks
+DEFAULT_MAX_BACKOFF = 60.0
+
+
+class MissedTickPolicy(enum.StrEnum):
+    """What to do with ticks whose due time passed while a previous tick was still running."""
+
+    SKIP = "skip"  # drop them and continue with the next tick on the original schedule
+    CATCH_UP = "catch_up"  # run each of them once, back to back, until the schedule is caught up
+    DELAY = "delay"  # restart the schedule one interval after the overrunning tick finished
+
+
+class PeriodicTask:
+    """Runs an async callable at a fixed rate until stopped.
+
+    Metrics (recorded in `registry`, labelled with task=name):
+        t0_periodic_ticks_total: ticks by result ("ok", "error" or "timeout").
+        t0_periodic_missed_ticks_total: ticks skipped by the missed-tick policy or by backoff.
+        t0_periodic_tick_seconds: duration of each tick.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[], Awaitable[Any]],
+        *,
+        interval: float,
+        jitter: float = 0.0,
+        deadline: float | None = None,
+        missed: MissedTickPolicy = MissedTickPolicy.SKIP,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        run_immediately: bool = True,
+        name: str | None = None,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        """Create a periodic task.
+
+        Args:
+            fn: Coroutine function called once per tick.
+            interval: Seconds between the due times of consecutive ticks.
+            jitter: Maximum random delay, in seconds, added to each tick's due time.
+            deadline: Seconds a tick may run before it is cancelled; defaults to interval.
+            missed: Policy for ticks that came due while a tick was still running.
+            max_backoff: Maximum delay after consecutive failures.
+            run_immediately: Run the first tick at start rather than one interval later.
+            name: Name used in logs and metric labels; defaults to fn's name.
+            registry: Metrics registry; a private one is created if omitted.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if not 0 <= jitter < interval:
+            raise ValueError("jitter must satisfy 0 <= jitter < interval")
+        if deadline is not None and deadline <= 0:
+            raise ValueError("deadline must be positive")
+        self._fn = fn
+        self._interval = interval
+        self._jitter = jitter
+        self._deadline = interval if deadline is None else deadline
+        self._missed_policy = MissedTickPolicy(missed)
+        self._max_backoff = max(max_backoff, interval)
+        self._run_immediately = run_immediately
+        self.name = name or getattr(fn, "__qualname__", None) or repr(fn)
+        self.registry = registry or MetricsRegistry()
+        self.consecutive_failures = 0
+
+        self._shutdown: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+        def ticks(result: str) -> Counter:
+            return self.registry.counter(
+                "t0_periodic_ticks_total", "Periodic task ticks by result.", task=self.name, result=result
+            )
+
+        self._ok, self._error, self._timeout = ticks("ok"), ticks("error"), ticks("timeout")
+        self._missed: Counter = self.registry.counter(
+            "t0_periodic_missed_ticks_total", "Periodic task ticks skipped after overruns or failures.", task=self.name
+        )
+        self._duration: Histogram = self.registry.histogram(
+            "t0_periodic_tick_seconds", "Duration of periodic task ticks.", task=self.name
+        )
+
+    async def start(self) -> None:
+        """Run the task in the background until stop()."""
+        if self._task is not None:
+            raise RuntimeError(f"{self.name} is already running")
+        self._shutdown = asyncio.Event()
+        self._task = asyncio.create_task(self.run(self._shutdown))
+
+    async def stop(self) -> None:
+        """Stop the background task started by start(), waiting for a running tick to finish."""
+        if self._task is None or self._shutdown is None:
+            return
+        self._shutdown.set()
+        await self._task
+        self._task = None
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """Tick on schedule until shutdown_event is set; a running tick is allowed to finish."""
+        loop = asyncio.get_running_loop()
+        anchor = loop.time()
+        tick = 0 if self._run_immediately else 1
+        while True:
+            due = anchor + tick * self._interval
+            if self._jitter:
+                due += random.uniform(0, self._jitter)
+            if await _wait(shutdown_event, due - loop.time()):
+                return
+
+            ok = await self._tick(loop)
+            now = loop.time()
+            if ok:
+                self.consecutive_failures = 0
+                earliest = now
+            else:
+                # back off from the failed tick's due time, so backed-off ticks stay on the schedule
+                self.consecutive_failures += 1
+                backoff = min(self._max_backoff, self._interval * 2 ** (self.consecutive_failures - 1))
+                earliest = max(now, anchor + tick * self._interval + backoff)
+            tick += 1
+
+            if anchor + tick * self._interval >= earliest:
+                continue
+            if ok and self._missed_policy is MissedTickPolicy.CATCH_UP:
+                continue
+            if ok and self._missed_policy is MissedTickPolicy.DELAY:
+                anchor, tick = now, 1
+                continue
+            # SKIP, and always after a failure: resume at the first due time not before `earliest`
+            next_tick = math.ceil((earliest - anchor) / self._interval - 1e-9)
+            self._missed.inc(next_tick - tick)
+            tick = next_tick
+
+    async def _tick(self, loop: asyncio.AbstractEventLoop) -> bool:
+        started = loop.time()
+        try:
+            await asyncio.wait_for(self._fn(), self._deadline)
+        except TimeoutError:
+            logger.warning("%s: tick did not finish within its %.3fs deadline", self.name, self._deadline)
+            self._timeout.inc()
+            return False
+        except Exception:
+            logger.exception("%s: tick failed (%d consecutive)", self.name, self.consecutive_failures + 1)
+            self._error.inc()
+            return False
+        finally:
+            self._duration.observe(loop.time() - started)
+        self._ok.inc()
+        return True
+
+
+async def _wait(shutdown_event: asyncio.Event, timeout: float) -> bool:
+    """Wait up to timeout seconds for shutdown_event; return whether it is set."""
+    if timeout <= 0 or shutdown_event.is_set():
+        return shutdown_event.is_set()
+    try:
+        await asyncio.wait_for(shutdown_event.wait(), timeout)
+    except TimeoutError:
+        return False
+    return True
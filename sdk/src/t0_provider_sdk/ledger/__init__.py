@@ -0,0 +1,46 @@
+"""Ledger bookkeeping for T-0 Network providers."""
+
+from t0_provider_sdk.ledger.errors import InvalidTransactionError, LedgerError
+from t0_provider_sdk.ledger.index import LedgerIndex
+from t0_provider_sdk.ledger.journal import DEFAULT_SEGMENT_SIZE, JournalPosition, LedgerJournal
+from t0_provider_sdk.ledger.netting import (
+    DEFAULT_SETTLEMENT_CURRENCY,
+    NetPosition,
+    NettingSnapshot,
+    PositionKey,
+    SettlementNetting,
+)
+from t0_provider_sdk.ledger.projection import DEFAULT_LEDGER_EXPONENT, AccountKey, Balance, LedgerProjection
+from t0_provider_sdk.ledger.reconciliation import (
+    AmountMismatch,
+    LinkKind,
+    ReconciliationColumns,
+    ReconciliationReport,
+    reconcile,
+)
+from t0_provider_sdk.ledger.store import DEFAULT_SNAPSHOT_EVERY, LedgerStore
+
+__all__ = [
+    "DEFAULT_LEDGER_EXPONENT",
+    "DEFAULT_SEGMENT_SIZE",
+    "DEFAULT_SETTLEMENT_CURRENCY",
+    "DEFAULT_SNAPSHOT_EVERY",
+    "AccountKey",
+    "AmountMismatch",
+    "Balance",
+    "InvalidTransactionError",
+    "JournalPosition",
+    "LedgerError",
+    "LedgerIndex",
+    "LedgerJournal",
+    "LedgerProjection",
+    "LedgerStore",
+    "LinkKind",
+    "NetPosition",
+    "NettingSnapshot",
+    "PositionKey",
+    "ReconciliationColumns",
+    "ReconciliationReport",
+    "SettlementNetting",
+    "reconcile",
+]
@@ -0,0 +1,17 @@
+"""Error types for ledger bookkeeping.
+
+No Go equivalent; the Go SDK does not process ledger entries.
+"""
+
+
+class LedgerError(ValueError):
+    """Base class for all ledger errors."""
+
+
+class InvalidTransactionError(LedgerError):
+    """A ledger transaction is malformed or its entries do not balance."""
+
+    def __init__(self, transaction_id: int, reason: str) -> None:
+        super().__init__(f"transaction {transaction_id}: {reason}")
+        self.transaction_id = transaction_id
+        self.reason = reason
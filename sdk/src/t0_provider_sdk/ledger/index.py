@@ -0,0 +1,158 @@
+"""Secondary indexes over journaled ledger transactions.
+
+Reconciliation asks for all ledger transactions of a payment, a provider
+settlement or a fee settlement, i.e. by the Payout, ProviderSettlement and
+FeeSettlement links. LedgerIndex answers those, and lookups by transaction_id,
+with dict lookups:
+
+- transaction_id maps to the journal position of its record, packed into one
+  int, so LedgerJournal.read() fetches it without a search;
+- payment_id, settlement_id and fee_settlement_id map to transaction_ids; a
+  link with one transaction (the usual case) stores a bare int, more use an
+  array("Q");
+- the index is saved inside the journal snapshot, and on startup only the
+  records after the snapshot are added to it.
+
+Example:
+    store = LedgerStore("/var/lib/provider/ledger")
+    store.payment_transactions(payment_id)
+
+No Go equivalent; the Go starter ignores ledger entries.
+"""
+
+from __future__ import annotations
+
+import struct
+from array import array
+from typing import TYPE_CHECKING
+
+from t0_provider_sdk.ledger.errors import LedgerError
+from t0_provider_sdk.ledger.journal import JournalPosition
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+
+    Transaction = AppendLedgerEntriesRequest.Transaction
+
+_OFFSET_BITS = 40  # packed position: segment << 40 | offset
+_COUNTS = struct.Struct("<4Q")
+
+
+class _Postings:
+    """Map from a link id to the transaction_ids carrying it."""
+
+    def __init__(self) -> None:
+        self._ids: dict[int, int | array[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, key: int, transaction_id: int) -> None:
+        current = self._ids.get(key)
+        if current is None:
+            self._ids[key] = transaction_id
+        elif isinstance(current, int):
+            self._ids[key] = array("Q", (current, transaction_id))
+        else:
+            current.append(transaction_id)
+
+    def get(self, key: int) -> tuple[int, ...]:
+        current = self._ids.get(key)
+        if current is None:
+            return ()
+        return (current,) if isinstance(current, int) else tuple(current)
+
+    def pairs(self) -> array[int]:
+        """Flattened (key, transaction_id) pairs, in insertion order per key."""
+        flat = array("Q")
+        for key, current in self._ids.items():
+            for transaction_id in (current,) if isinstance(current, int) else current:
+                flat.append(key)
+                flat.append(transaction_id)
+        return flat
+
+    def restore(self, flat: array[int]) -> None:
+        self._ids = {}
+        for i in range(0, len(flat), 2):
+            self.add(flat[i], flat[i + 1])
+
+
+class LedgerIndex:
+    """Lookups of journaled transactions by transaction_id and by their payout or settlement link.
+
+    Not thread-safe for writers; LedgerStore adds to it under its lock. Lookups
+    may run concurrently with add().
+    """
+
+    def __init__(self) -> None:
+        self._positions: dict[int, int] = {}
+        self._payments = _Postings()
+        self._settlements = _Postings()
+        self._fee_settlements = _Postings()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return transaction_id in self._positions
+
+    def add(self, position: JournalPosition, transaction: Transaction) -> None:
+        """Index a transaction recorded at `position`."""
+        if position.offset >> _OFFSET_BITS:
+            raise LedgerError(f"offset {position.offset} too large to index")
+        transaction_id = transaction.transaction_id
+        self._positions[transaction_id] = position.segment << _OFFSET_BITS | position.offset
+        details = transaction.WhichOneof("transaction_details")
+        if details == "payout":
+            self._payments.add(transaction.payout.payment_id, transaction_id)
+        elif details == "provider_settlement":
+            self._settlements.add(transaction.provider_settlement.settlement_id, transaction_id)
+        elif details == "fee_settlement":
+            self._fee_settlements.add(transaction.fee_settlement.fee_settlement_id, transaction_id)
+
+    def position(self, transaction_id: int) -> JournalPosition | None:
+        """Journal position of a transaction's record; None if it is not indexed."""
+        packed = self._positions.get(transaction_id)
+        if packed is None:
+            return None
+        return JournalPosition(packed >> _OFFSET_BITS, packed & ((1 << _OFFSET_BITS) - 1))
+
+    def payment_transaction_ids(self, payment_id: int) -> tuple[int, ...]:
+        """transaction_ids of the payout transactions of a payment, in journal order."""
+        return self._payments.get(payment_id)
+
+    def settlement_transaction_ids(self, settlement_id: int) -> tuple[int, ...]:
+        """transaction_ids of the transactions of a provider settlement, in journal order."""
+        return self._settlements.get(settlement_id)
+
+    def fee_settlement_transaction_ids(self, fee_settlement_id: int) -> tuple[int, ...]:
+        """transaction_ids of the transactions of a fee settlement, in journal order."""
+        return self._fee_settlements.get(fee_settlement_id)
+
+    def to_bytes(self) -> bytes:
+        """Serialize the index, e.g. for a snapshot."""
+        positions = array("Q")
+        for transaction_id, packed in self._positions.items():
+            positions.append(transaction_id)
+            positions.append(packed)
+        links = [postings.pairs() for postings in (self._payments, self._settlements, self._fee_settlements)]
+        sections = [positions, *links]
+        return _COUNTS.pack(*(len(section) for section in sections)) + b"".join(s.tobytes() for s in sections)
+
+    def restore(self, data: bytes) -> None:
+        """Replace the whole index with one serialized by to_bytes()."""
+        if len(data) < _COUNTS.size:
+            raise LedgerError("truncated ledger index")
+        counts = _COUNTS.unpack_from(data)
+        if len(data) != _COUNTS.size + 8 * sum(counts):
+            raise LedgerError("truncated ledger index")
+        sections = []
+        offset = _COUNTS.size
+        for count in counts:
+            sections.append(array("Q", data[offset : offset + 8 * count]))
+            offset += 8 * count
+        positions = sections[0]
+        self._positions = {positions[i]: positions[i + 1] for i in range(0, len(positions), 2)}
+        self._payments.restore(sections[1])
+        self._settlements.restore(sections[2])
+        self._fee_settlements.restore(sections[3])
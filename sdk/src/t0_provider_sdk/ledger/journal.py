@@ -0,0 +1,515 @@
+"""Append-only, memory-mapped journal of ledger transactions.
+
+Every AppendLedgerEntries transaction has to be kept, and settlement bursts
+deliver them faster than row-by-row database inserts absorb. LedgerJournal
+appends them to segment files instead:
+
+- a record is a 16-byte header (payload length, CRC-32, transaction_id) followed
+  by the serialized Transaction; a batch is one write() and, by default, one
+  fsync, however many transactions it holds;
+- a segment is sealed once it reaches `segment_size`; sealing writes its index
+  file (the segment's transaction_ids and offsets, sorted by id), so get() is a
+  bisect within the segments whose id range covers the id;
+- reads go through mmap: replaying or looking up copies single records, never a
+  whole segment;
+- a torn write at the end of the last segment (a crash mid-append) fails its
+  length or CRC check and is truncated on open;
+- write_snapshot() stores a LedgerProjection's balances and transaction ids, and
+  optionally a LedgerIndex, with the journal position they cover, atomically;
+  recover() loads the snapshot and replays only the records after it.
+
+Files in `directory`:
+    00000000.seg, 00000001.seg, ...  segments
+    00000000.idx, ...                indexes of sealed segments
+    snapshot                         latest snapshot
+
+One process at a time; appends and reads are thread-safe.
+
+No Go equivalent; the Go starter ignores ledger entries.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple
+
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.ledger.errors import LedgerError
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.common.metrics import Counter, Histogram
+    from t0_provider_sdk.ledger.index import LedgerIndex
+    from t0_provider_sdk.ledger.projection import LedgerProjection
+
+logger = logging.getLogger(__name__)
+
+# Size in bytes after which a segment is sealed and a new one started
+DEFAULT_SEGMENT_SIZE = 64 * 1024 * 1024
+
+# Transactions replayed into the projection per apply() during recovery
+_REPLAY_CHUNK = 1_024
+
+_HEADER = struct.Struct("<IIQ")  # payload length, CRC-32 of transaction_id + payload, transaction_id
+_SNAPSHOT_MAGIC = b"T0LEDGER-SNAPSHOT-1\n"
+_SNAPSHOT_FILE = "snapshot"
+
+Transaction = AppendLedgerEntriesRequest.Transaction
+
+
+class JournalPosition(NamedTuple):
+    """A byte offset within a segment; records at or after it come later."""
+
+    segment: int
+    offset: int
+
+
+def _checksum(transaction_id: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(transaction_id.to_bytes(8, "little")))
+
+
+def _records(view: bytes | mmap.mmap, start: int, end: int) -> Iterator[tuple[int, int, int, int]]:
+    """Yield (offset, transaction_id, payload start, payload end) of intact records; stop at a torn one."""
+    offset = start
+    while offset + _HEADER.size <= end:
+        length, crc, transaction_id = _HEADER.unpack_from(view, offset)
+        payload_start = offset + _HEADER.size
+        payload_end = payload_start + length
+        if payload_end > end or _checksum(transaction_id, view[payload_start:payload_end]) != crc:
+            return
+        yield offset, transaction_id, payload_start, payload_end
+        offset = payload_end
+
+
+def _fsync_directory(directory: str) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:  # platforms that cannot open directories
+        return
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_atomically(path: str, data: bytes) -> None:
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+    _fsync_directory(os.path.dirname(path))
+
+
+class _Segment:
+    """One segment file with its transaction_id index.
+
+    The index of the active segment is a dict; a sealed segment's is a pair of
+    arrays sorted by id, loaded from its .idx file.
+    """
+
+    def __init__(self, directory: str, number: int) -> None:
+        self.number = number
+        self.path = os.path.join(directory, f"{number:08d}.seg")
+        self.index_path = os.path.join(directory, f"{number:08d}.idx")
+        self.size = 0
+        self.active: dict[int, int] | None = {}
+        self.ids = array("Q")
+        self.offsets = array("Q")
+        self._map: mmap.mmap | None = None
+
+    def view(self, end: int) -> bytes | mmap.mmap:
+        """A read-only mapping covering at least `end` bytes."""
+        if end == 0:
+            return b""
+        if self._map is None or len(self._map) < end:
+            # an outdated map is not closed here: a concurrent replay may still be reading it
+            with open(self.path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._map
+
+    def find(self, transaction_id: int) -> int | None:
+        if self.active is not None:
+            return self.active.get(transaction_id)
+        ids = self.ids
+        if not ids or not ids[0] <= transaction_id <= ids[-1]:
+            return None
+        i = bisect_left(ids, transaction_id)
+        return self.offsets[i] if i < len(ids) and ids[i] == transaction_id else None
+
+    def seal(self) -> None:
+        """Turn the dict index into sorted arrays and persist them."""
+        assert self.active is not None
+        order = sorted(self.active.items())
+        self.ids = array("Q", (transaction_id for transaction_id, _ in order))
+        self.offsets = array("Q", (offset for _, offset in order))
+        self.active = None
+        _write_atomically(
+            self.index_path, struct.pack("<Q", len(self.ids)) + self.ids.tobytes() + self.offsets.tobytes()
+        )
+
+    def load_index(self) -> bool:
+        """Load the .idx file of a sealed segment; False if it is missing or damaged."""
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return False
+        if len(data) < 8:
+            return False
+        (count,) = struct.unpack_from("<Q", data)
+        if len(data) != 8 + 16 * count:
+            return False
+        self.ids = array("Q", data[8 : 8 + 8 * count])
+        self.offsets = array("Q", data[8 + 8 * count :])
+        self.active = None
+        return True
+
+    def scan(self) -> int:
+        """Index every intact record into the dict index; return the end of the last one."""
+        assert self.active is not None
+        end = 0
+        for offset, transaction_id, _, payload_end in _records(self.view(self.size), 0, self.size):
+            self.active[transaction_id] = offset
+            end = payload_end
+        return end
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+
+class LedgerJournal:
+    """Append-only store of ledger transactions in memory-mapped segment files.
+
+    Metrics (recorded in `registry`):
+        t0_ledger_journal_records_total: transactions appended.
+        t0_ledger_journal_fsync_seconds: duration of each fsync.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        sync: bool = True,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        """Open a journal, creating the directory if needed and truncating a torn tail.
+
+        Args:
+            directory: Directory holding the segment, index and snapshot files.
+            segment_size: Bytes after which a segment is sealed; a batch never spans segments.
+            sync: fsync after every append(); if False, call sync() to make appends durable.
+            registry: Metrics registry; a private one is created if omitted.
+        """
+        if segment_size < 1:
+            raise ValueError("segment_size must be positive")
+        self.directory = os.fspath(directory)
+        self._segment_size = segment_size
+        self._sync = sync
+        self.registry = registry or MetricsRegistry()
+        self._lock = threading.Lock()
+        self._records: Counter = self.registry.counter(
+            "t0_ledger_journal_records_total", "Ledger transactions appended to the journal."
+        )
+        self._fsync_seconds: Histogram = self.registry.histogram(
+            "t0_ledger_journal_fsync_seconds", "Duration of ledger journal fsyncs."
+        )
+
+        os.makedirs(self.directory, exist_ok=True)
+        numbers = sorted(int(name[:-4]) for name in os.listdir(self.directory) if name.endswith(".seg"))
+        self._segments: list[_Segment] = []
+        for number in numbers[:-1]:
+            self._segments.append(self._open_sealed(number))
+        active = _Segment(self.directory, numbers[-1] if numbers else 0)
+        if numbers:
+            active.size = os.path.getsize(active.path)
+            end = active.scan()
+            if end < active.size:
+                logger.warning("%s: truncating %d bytes of torn records", active.path, active.size - end)
+                os.truncate(active.path, end)
+                active.size = end
+        self._segments.append(active)
+        self._file = open(active.path, "ab", buffering=0)  # noqa: SIM115 -- closed by close()
+
+    def _open_sealed(self, number: int) -> _Segment:
+        segment = _Segment(self.directory, number)
+        segment.size = os.path.getsize(segment.path)
+        if not segment.load_index():
+            end = segment.scan()
+            if end != segment.size:
+                raise LedgerError(f"{segment.path}: damaged record at offset {end}")
+            logger.info("%s: rebuilt missing segment index", segment.path)
+            segment.seal()
+        return segment
+
+    def __enter__(self) -> LedgerJournal:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return self._locate(transaction_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(s.active) if s.active is not None else len(s.ids) for s in self._segments)
+
+    @property
+    def position(self) -> JournalPosition:
+        """End of the journal: where the next record will be written."""
+        with self._lock:
+            active = self._segments[-1]
+            return JournalPosition(active.number, active.size)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+            for segment in self._segments:
+                segment.close()
+
+    def append(self, transactions: Iterable[Transaction]) -> int:
+        """Write transactions not yet in the journal as one batch.
+
+        Returns:
+            Number of transactions written; transaction_ids already in the journal are skipped.
+        """
+        return len(self.append_batch(transactions))
+
+    def append_batch(self, transactions: Iterable[Transaction]) -> list[tuple[JournalPosition, Transaction]]:
+        """Like append(), but return the position of every record written."""
+        with self._lock:
+            parts: list[bytes] = []
+            ids: list[int] = []
+            written: list[Transaction] = []
+            seen: set[int] = set()
+            size = 0
+            for transaction in transactions:
+                transaction_id = transaction.transaction_id
+                if transaction_id in seen or self._locate_locked(transaction_id) is not None:
+                    continue
+                seen.add(transaction_id)
+                payload = transaction.SerializeToString()
+                parts.append(_HEADER.pack(len(payload), _checksum(transaction_id, payload), transaction_id))
+                parts.append(payload)
+                ids.append(transaction_id)
+                written.append(transaction)
+                size += _HEADER.size + len(payload)
+            if not ids:
+                return []
+
+            active = self._segments[-1]
+            if active.size and active.size + size > self._segment_size:
+                active = self._roll()
+            self._write(b"".join(parts), active.size)
+
+            assert active.active is not None
+            records = []
+            offset = active.size
+            for transaction_id, header, transaction in zip(ids, parts[::2], written, strict=True):
+                active.active[transaction_id] = offset
+                records.append((JournalPosition(active.number, offset), transaction))
+                offset += _HEADER.size + _HEADER.unpack(header)[0]
+            active.size = offset
+        self._records.inc(len(ids))
+        return records
+
+    def _write(self, data: bytes, size_before: int) -> None:
+        fd = self._file.fileno()
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+            if self._sync:
+                self._fsync(fd)
+        except BaseException:
+            # never leave a partial batch in front of the next one
+            os.truncate(self._segments[-1].path, size_before)
+            raise
+
+    def _fsync(self, fd: int) -> None:
+        started = time.monotonic()
+        os.fsync(fd)
+        self._fsync_seconds.observe(time.monotonic() - started)
+
+    def _roll(self) -> _Segment:
+        old = self._segments[-1]
+        self._fsync(self._file.fileno())
+        self._file.close()
+        old.seal()
+        active = _Segment(self.directory, old.number + 1)
+        self._segments.append(active)
+        self._file = open(active.path, "ab", buffering=0)  # noqa: SIM115 -- closed by close()
+        _fsync_directory(self.directory)
+        return active
+
+    def sync(self) -> None:
+        """fsync the active segment; needed only with sync=False."""
+        with self._lock:
+            self._fsync(self._file.fileno())
+
+    def _locate_locked(self, transaction_id: int) -> tuple[_Segment, int] | None:
+        for segment in reversed(self._segments):  # recent ids are the likely ones
+            offset = segment.find(transaction_id)
+            if offset is not None:
+                return segment, offset
+        return None
+
+    def _locate(self, transaction_id: int) -> tuple[_Segment, int] | None:
+        with self._lock:
+            return self._locate_locked(transaction_id)
+
+    def get(self, transaction_id: int) -> Transaction | None:
+        """The transaction with this id, read through mmap; None if it is not in the journal."""
+        with self._lock:
+            found = self._locate_locked(transaction_id)
+            if found is None:
+                return None
+            segment, offset = found
+            view = segment.view(segment.size)
+        length = _HEADER.unpack_from(view, offset)[0]
+        start = offset + _HEADER.size
+        return Transaction.FromString(view[start : start + length])
+
+    def read(self, position: JournalPosition) -> Transaction:
+        """The transaction recorded at `position`, e.g. one kept by a LedgerIndex.
+
+        Raises:
+            LedgerError: No intact record starts at `position`.
+        """
+        with self._lock:
+            first = self._segments[0].number
+            if not first <= position.segment <= self._segments[-1].number:
+                raise LedgerError(f"no segment {position.segment}")
+            segment = self._segments[position.segment - first]
+            size = segment.size
+            view = segment.view(size)
+        for _, _, payload_start, payload_end in _records(view, position.offset, size):
+            return Transaction.FromString(view[payload_start:payload_end])
+        raise LedgerError(f"no record at {position}")
+
+    def replay(self, start: JournalPosition | None = None) -> Iterator[tuple[JournalPosition, Transaction]]:
+        """Yield (position, transaction) of every record at or after `start`, in append order.
+
+        Covers the records present when called; later appends are not included.
+        """
+        with self._lock:
+            segments = [(segment, segment.size) for segment in self._segments]
+        for segment, size in segments:
+            if start is not None and segment.number < start.segment:
+                continue
+            offset = start.offset if start is not None and segment.number == start.segment else 0
+            view = segment.view(size)
+            for record_offset, _, payload_start, payload_end in _records(view, offset, size):
+                yield (
+                    JournalPosition(segment.number, record_offset),
+                    Transaction.FromString(view[payload_start:payload_end]),
+                )
+
+    def write_snapshot(
+        self,
+        projection: LedgerProjection,
+        position: JournalPosition | None = None,
+        *,
+        index: LedgerIndex | None = None,
+    ) -> JournalPosition:
+        """Atomically store the projection's state as covering the journal up to `position`.
+
+        The caller must make sure the projection (and index) include every record
+        before `position` (LedgerStore does); records after it are replayed by recover().
+
+        Args:
+            projection: Projection whose balances and transaction ids are stored.
+            position: Journal position the state covers; the current end if omitted.
+            index: Index stored along with the projection, if any.
+
+        Returns:
+            The position stored.
+        """
+        position = position or self.position
+        balances = projection.balances()
+        ids = projection.transaction_ids()
+        index_data = index.to_bytes() if index is not None else b""
+        meta = json.dumps(
+            {
+                "segment": position.segment,
+                "offset": position.offset,
+                "exponent": projection.exponent,
+                "balances": [[key.owner_id, key.account_type, b.debit, b.credit] for key, b in balances.items()],
+                "index": index is not None,
+            }
+        ).encode()
+        body = _SNAPSHOT_MAGIC + struct.pack("<IQ", len(meta), len(ids)) + meta + ids.tobytes() + index_data
+        _write_atomically(os.path.join(self.directory, _SNAPSHOT_FILE), body + struct.pack("<I", zlib.crc32(body)))
+        logger.info("ledger snapshot written at %s (%d transactions)", position, len(ids))
+        return position
+
+    def load_snapshot(self, projection: LedgerProjection, index: LedgerIndex | None = None) -> JournalPosition | None:
+        """Restore the projection from the latest snapshot; None if there is no usable one.
+
+        `index` is restored too if the snapshot holds one, and left untouched otherwise.
+        """
+        path = os.path.join(self.directory, _SNAPSHOT_FILE)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        header_end = len(_SNAPSHOT_MAGIC) + 12
+        if (
+            len(data) < header_end + 4
+            or not data.startswith(_SNAPSHOT_MAGIC)
+            or zlib.crc32(data[:-4]) != struct.unpack("<I", data[-4:])[0]
+        ):
+            logger.warning("%s: damaged snapshot ignored; replaying the whole journal", path)
+            return None
+        meta_size, count = struct.unpack_from("<IQ", data, len(_SNAPSHOT_MAGIC))
+        meta = json.loads(data[header_end : header_end + meta_size])
+        ids_end = header_end + meta_size + 8 * count
+        ids = array("Q", data[header_end + meta_size : ids_end])
+        balances = {(owner, account_type): (debit, credit) for owner, account_type, debit, credit in meta["balances"]}
+        projection.restore(balances, ids, exponent=meta["exponent"])
+        if index is not None and meta.get("index"):
+            index.restore(data[ids_end:-4])
+        return JournalPosition(meta["segment"], meta["offset"])
+
+    def recover(self, projection: LedgerProjection, index: LedgerIndex | None = None) -> int:
+        """Rebuild the projection: load the latest snapshot, then replay the records after it.
+
+        Args:
+            projection: Empty projection to rebuild.
+            index: Empty index to rebuild as well; if the snapshot holds no index, it is
+                rebuilt from the whole journal.
+
+        Returns:
+            Number of transactions replayed into the projection.
+        """
+        start = self.load_snapshot(projection, index)
+        index_start = start if index is None or len(index) == len(projection) else None
+        replayed = 0
+        chunk: list[Transaction] = []
+        for position, transaction in self.replay(index_start):
+            if index is not None:
+                index.add(position, transaction)
+            if start is not None and position < start:
+                continue
+            chunk.append(transaction)
+            if len(chunk) == _REPLAY_CHUNK:
+                replayed += projection.apply(chunk)
+                chunk = []
+        replayed += projection.apply(chunk)
+        logger.info("ledger recovered from %s: %d transactions replayed", start or "the start", replayed)
+        return replayed
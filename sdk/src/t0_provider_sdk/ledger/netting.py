@@ -0,0 +1,356 @@
+"""Net settlement positions per counterparty from ledger transactions.
+
+Provider settlements and fee settlements arrive through AppendLedgerEntries as
+transactions linked to ProviderSettlement.settlement_id or
+FeeSettlement.fee_settlement_id. Treasury plans prefunding from the net of
+these per counterparty. SettlementNetting keeps that net as a running total:
+
+- each entry of a settlement transaction adds its debit minus credit to the
+  position of its account owner (1 is the network, others are participants),
+  in the settlement or the fee column; payout transactions are ignored;
+- transaction_ids already netted are skipped, so redelivered batches count once;
+- readers poll snapshot(), an immutable NettingSnapshot that apply() replaces as
+  a whole, so a poll never takes the lock and never sees half a batch;
+- recompute() rebuilds every position from the full history (e.g. a journal
+  replay) in one pass, aggregated with NumPy when it is installed. It is meant
+  for startup, before apply() is called.
+
+Ledger entries carry no currency: T-0 settles in USD. Positions are keyed by
+(counterpart_id, currency) with the currency the netting was created for.
+
+Example:
+    netting = SettlementNetting()
+    netting.recompute(transaction for _, transaction in store.journal.replay())
+
+    async def append_ledger_entries(self, request, ctx):
+        await asyncio.to_thread(store.append, request)
+        netting.apply(request)
+        return AppendLedgerEntriesResponse()
+
+    snapshot = netting.snapshot()  # from the treasury service, as often as needed
+    snapshot.position(counterpart_id).to_decimal()
+
+No Go equivalent; the Go starter ignores ledger entries.
+"""
+
+from __future__ import annotations
+
+import decimal
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, NamedTuple
+
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.ledger.errors import InvalidTransactionError
+from t0_provider_sdk.ledger.projection import DEFAULT_LEDGER_EXPONENT
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+    from t0_provider_sdk.common.metrics import Counter
+
+    Transaction = AppendLedgerEntriesRequest.Transaction
+
+# Currency positions are booked in; T-0 settles in USD
+DEFAULT_SETTLEMENT_CURRENCY = "USD"
+
+# transaction_details field -> column of NetPosition (0 settlement, 1 fees)
+_COLUMNS = {"provider_settlement": 0, "fee_settlement": 1}
+
+
+class PositionKey(NamedTuple):
+    """Identifies one net position."""
+
+    counterpart_id: int  # ledger account_owner_id; 1 is the network
+    currency: str
+
+
+class NetPosition(NamedTuple):
+    """Net of one counterparty's settlement entries, as unscaled integers at `exponent`.
+
+    Both columns are debits minus credits on the counterparty's accounts.
+    """
+
+    settlement: int  # from ProviderSettlement transactions
+    fees: int  # from FeeSettlement transactions
+    exponent: int
+
+    @property
+    def net(self) -> int:
+        """Settlement plus fees, unscaled."""
+        return self.settlement + self.fees
+
+    def to_decimal(self) -> decimal.Decimal:
+        """Settlement plus fees as an exact decimal.Decimal."""
+        return decimal.Decimal(self.net).scaleb(self.exponent, context=decimal.Context(prec=decimal.MAX_PREC))
+
+
+@dataclass(frozen=True)
+class NettingSnapshot:
+    """Every net position at one point in time; later batches do not change it.
+
+    Attributes:
+        version: Grows by one with every apply() or recompute() that changed a position.
+        exponent: Exponent of the unscaled amounts in positions.
+        positions: Net position per (counterpart_id, currency).
+        last_transaction_id: Highest settlement transaction_id netted so far.
+        updated_at: Clock time the snapshot was taken.
+    """
+
+    version: int
+    exponent: int
+    positions: Mapping[PositionKey, NetPosition]
+    last_transaction_id: int
+    updated_at: float
+
+    def position(self, counterpart_id: int, currency: str = DEFAULT_SETTLEMENT_CURRENCY) -> NetPosition:
+        """Net position of one counterparty; zero if it had no settlement entries."""
+        return self.positions.get(PositionKey(counterpart_id, currency), NetPosition(0, 0, self.exponent))
+
+
+@dataclass
+class _Entries:
+    """Raw amounts of the counted entries, one row per entry."""
+
+    transaction_ids: array[int] = field(default_factory=lambda: array("Q"))
+    owners: array[int] = field(default_factory=lambda: array("I"))
+    columns: array[int] = field(default_factory=lambda: array("B"))
+    debit_amounts: array[int] = field(default_factory=lambda: array("q"))
+    debit_exponents: array[int] = field(default_factory=lambda: array("i"))
+    credit_amounts: array[int] = field(default_factory=lambda: array("q"))
+    credit_exponents: array[int] = field(default_factory=lambda: array("i"))
+
+
+class SettlementNetting:
+    """Running net settlement positions per counterparty.
+
+    apply() may be called from any thread; snapshot() does not take its lock.
+    recompute() reads the history without the lock, so apply() must not run
+    while it does: a batch applied in the meantime is dropped when recompute()
+    replaces the positions.
+
+    Metrics (recorded in `registry`):
+        t0_netting_transactions_total: settlement transactions by result ("applied" or "duplicate").
+    """
+
+    def __init__(
+        self,
+        *,
+        currency: str = DEFAULT_SETTLEMENT_CURRENCY,
+        account_types: Iterable[int] | None = None,
+        exponent: int = DEFAULT_LEDGER_EXPONENT,
+        registry: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create netting without positions.
+
+        Args:
+            currency: Currency the ledger amounts are in.
+            account_types: Only net entries of these AccountTypes; all entries if None.
+            exponent: Exponent positions are kept at; amounts with more decimal places are rejected.
+            registry: Metrics registry; a private one is created if omitted.
+            clock: Time source for NettingSnapshot.updated_at.
+        """
+        self.currency = currency
+        self.account_types = frozenset(account_types) if account_types is not None else None
+        self.exponent = exponent
+        self.registry = registry or MetricsRegistry()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._applied: set[int] = set()
+        self._snapshot = NettingSnapshot(0, exponent, MappingProxyType({}), 0, clock())
+
+        self._applied_count: Counter = self.registry.counter(
+            "t0_netting_transactions_total", "Settlement transactions by result.", result="applied"
+        )
+        self._duplicates: Counter = self.registry.counter(
+            "t0_netting_transactions_total", "Settlement transactions by result.", result="duplicate"
+        )
+
+    def __len__(self) -> int:
+        return len(self._applied)
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return transaction_id in self._applied
+
+    def apply(self, batch: AppendLedgerEntriesRequest | Iterable[Transaction]) -> int:
+        """Net a request's settlement transactions, or those of any iterable, all or nothing.
+
+        Returns:
+            Number of settlement transactions netted; payouts and already netted
+            transaction_ids are skipped.
+
+        Raises:
+            InvalidTransactionError: An amount has more decimal places than `exponent`; nothing was netted.
+        """
+        transactions = batch.transactions if hasattr(batch, "transactions") else batch
+        with self._lock:
+            totals: dict[int, list[int]] = {}
+            new: set[int] = set()
+            skip = False
+            for transaction_id, column, owner_id, amount in self._entries(transactions):
+                if column < 0:
+                    skip = transaction_id in self._applied or transaction_id in new
+                    if skip:
+                        self._duplicates.inc()
+                    else:
+                        new.add(transaction_id)
+                elif not skip:
+                    total = totals.setdefault(owner_id, [0, 0])
+                    total[column] += amount
+            if new:
+                positions = dict(self._snapshot.positions)
+                for owner_id, (settlement, fees) in totals.items():
+                    key = PositionKey(owner_id, self.currency)
+                    old = positions.get(key, NetPosition(0, 0, self.exponent))
+                    positions[key] = NetPosition(old.settlement + settlement, old.fees + fees, self.exponent)
+                self._applied.update(new)
+                self._publish(positions, max(self._snapshot.last_transaction_id, *new))
+        self._applied_count.inc(len(new))
+        return len(new)
+
+    def recompute(self, transactions: Iterable[Transaction]) -> NettingSnapshot:
+        """Replace every position with the net of `transactions`, e.g. a replay of the whole journal.
+
+        One pass copies the entries' raw amounts into columns; scaling and the sums per
+        counterparty are then vectorized when NumPy is installed.
+
+        Call it before serving AppendLedgerEntries: batches passed to apply() while it
+        runs are lost unless they are also in `transactions`.
+
+        Raises:
+            InvalidTransactionError: An amount has more decimal places than `exponent`; nothing changed.
+        """
+        applied: set[int] = set()
+        account_types = self.account_types
+        entries = _Entries()
+        transaction_ids, owners, columns = entries.transaction_ids, entries.owners, entries.columns
+        debit_amounts, debit_exponents = entries.debit_amounts, entries.debit_exponents
+        credit_amounts, credit_exponents = entries.credit_amounts, entries.credit_exponents
+        for transaction in transactions:
+            column = _COLUMNS.get(transaction.WhichOneof("transaction_details"))
+            if column is None:
+                continue
+            transaction_id = transaction.transaction_id
+            if transaction_id in applied:
+                continue
+            applied.add(transaction_id)
+            for entry in transaction.entries:
+                if account_types is None or entry.account_type in account_types:
+                    debit, credit = entry.debit, entry.credit
+                    transaction_ids.append(transaction_id)
+                    owners.append(entry.account_owner_id)
+                    columns.append(column)
+                    debit_amounts.append(debit.unscaled)
+                    debit_exponents.append(debit.exponent)
+                    credit_amounts.append(credit.unscaled)
+                    credit_exponents.append(credit.exponent)
+        sums = _sum_numpy(entries, self.exponent) if np is not None else None
+        if sums is None:
+            sums = self._sum_python(entries)
+        positions = {
+            PositionKey(owner_id, self.currency): NetPosition(settlement, fees, self.exponent)
+            for owner_id, (settlement, fees) in sums.items()
+        }
+        with self._lock:
+            self._applied = applied
+            self._publish(positions, max(applied, default=0))
+            return self._snapshot
+
+    def snapshot(self) -> NettingSnapshot:
+        """Current positions; cheap enough to poll, as it only returns the latest snapshot."""
+        return self._snapshot
+
+    def _publish(self, positions: dict[PositionKey, NetPosition], last_transaction_id: int) -> None:
+        self._snapshot = NettingSnapshot(
+            self._snapshot.version + 1,
+            self.exponent,
+            MappingProxyType(positions),
+            last_transaction_id,
+            self._clock(),
+        )
+
+    def _entries(self, transactions: Iterable[Transaction]) -> Iterable[tuple[int, int, int, int]]:
+        """Yield (transaction_id, -1, 0, 0) per settlement transaction, then one
+        (transaction_id, column, owner_id, debit - credit) per counted entry."""
+        account_types = self.account_types
+        for transaction in transactions:
+            column = _COLUMNS.get(transaction.WhichOneof("transaction_details"))
+            if column is None:
+                continue
+            transaction_id = transaction.transaction_id
+            yield transaction_id, -1, 0, 0
+            for entry in transaction.entries:
+                if account_types is None or entry.account_type in account_types:
+                    debit = self._scaled(transaction_id, entry.debit.unscaled, entry.debit.exponent)
+                    credit = self._scaled(transaction_id, entry.credit.unscaled, entry.credit.exponent)
+                    yield transaction_id, column, entry.account_owner_id, debit - credit
+
+    def _sum_python(self, entries: _Entries) -> dict[int, list[int]]:
+        scaled = self._scaled
+        sums: dict[int, list[int]] = {}
+        for transaction_id, owner_id, column, debit, debit_exponent, credit, credit_exponent in zip(
+            entries.transaction_ids,
+            entries.owners,
+            entries.columns,
+            entries.debit_amounts,
+            entries.debit_exponents,
+            entries.credit_amounts,
+            entries.credit_exponents,
+            strict=True,
+        ):
+            total = sums.setdefault(owner_id, [0, 0])
+            total[column] += scaled(transaction_id, debit, debit_exponent) - scaled(
+                transaction_id, credit, credit_exponent
+            )
+        return sums
+
+    def _scaled(self, transaction_id: int, unscaled: int, exponent: int) -> int:
+        shift = exponent - self.exponent
+        if shift >= 0:
+            return unscaled * 10**shift
+        scaled, remainder = divmod(unscaled, 10**-shift)
+        if remainder:
+            raise InvalidTransactionError(transaction_id, f"amount has more decimal places than 10^{self.exponent}")
+        return scaled
+
+
+def _sum_numpy(entries: _Entries, exponent: int) -> dict[int, list[int]] | None:
+    """Scale and sum per owner and column with np.add.at.
+
+    Returns None, leaving the work to the exact Python path, if an amount has more
+    decimal places than `exponent` or the amounts or sums might not fit an int64.
+    """
+    if not entries.owners:
+        return {}
+    amounts = []
+    bound = 0
+    for unscaled, exponents in (
+        (entries.debit_amounts, entries.debit_exponents),
+        (entries.credit_amounts, entries.credit_exponents),
+    ):
+        values = np.frombuffer(unscaled, dtype=np.int64)
+        shifts = np.frombuffer(exponents, dtype=np.int32) - exponent
+        if int(shifts.min()) < 0 or int(shifts.max()) > 18:
+            return None
+        bound += max(int(values.max()), -int(values.min())) * 10 ** int(shifts.max())
+        amounts.append(values * np.power(10, shifts, dtype=np.int64))
+    if bound * len(entries.owners) >= 1 << 63:
+        return None
+    keys = np.frombuffer(entries.owners, dtype=np.uint32).astype(np.uint64) * 2 + np.frombuffer(
+        entries.columns, dtype=np.uint8
+    )
+    unique, inverse = np.unique(keys, return_inverse=True)
+    totals = np.zeros(unique.size, dtype=np.int64)
+    np.add.at(totals, inverse, amounts[0] - amounts[1])
+    sums: dict[int, list[int]] = {}
+    for key, total in zip(unique.tolist(), totals.tolist(), strict=True):
+        sums.setdefault(key >> 1, [0, 0])[key & 1] = total
+    return sums
@@ -0,0 +1,250 @@
+"""Incremental ledger projection for AppendLedgerEntries.
+
+AppendLedgerEntries delivers the ledger transactions booked on the provider's
+accounts. LedgerProjection applies each batch to running balances per
+(account owner, account type), so the balance of any account is one dict lookup
+rather than a replay of history:
+
+- amounts are converted to unscaled integers at one exponent (-8, the smallest a
+  Decimal can have, by default), so sums are exact and never touch float;
+- every transaction of a batch is checked before any is applied: it needs a
+  transaction_id, a payout or settlement link, at least one entry, non-negative
+  amounts, no entry that is both debit and credit, and debits equal to credits.
+  One bad transaction rejects the whole batch;
+- transaction_ids already applied are skipped, so a redelivered batch (the RPC
+  is idempotent and may be retried) is counted once.
+
+Example:
+    ledger = LedgerProjection()
+
+    async def append_ledger_entries(self, request, ctx):
+        ledger.apply(request)  # raises InvalidTransactionError for unbalanced transactions
+        return AppendLedgerEntriesResponse()
+
+    ledger.balance(owner_id, ACCOUNT_TYPE_SETTLEMENT_OUT).to_decimal()
+
+No Go equivalent; the Go starter ignores ledger entries.
+"""
+
+from __future__ import annotations
+
+import decimal
+import threading
+from array import array
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping, NamedTuple
+
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.ledger.errors import InvalidTransactionError, LedgerError
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+    from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+    from t0_provider_sdk.common.metrics import Counter
+
+    Transaction = AppendLedgerEntriesRequest.Transaction
+
+# Exponent of the unscaled integers balances are kept in (-8 holds any Decimal exactly)
+DEFAULT_LEDGER_EXPONENT = -8
+
+
+class AccountKey(NamedTuple):
+    """Identifies one ledger account."""
+
+    owner_id: int  # 1 is the network, others are participant ids
+    account_type: int  # AppendLedgerEntriesRequest.AccountType
+
+
+class Balance(NamedTuple):
+    """Running totals of one account, as unscaled integers at `exponent`."""
+
+    debit: int
+    credit: int
+    exponent: int
+
+    @property
+    def net(self) -> int:
+        """Debits minus credits, unscaled."""
+        return self.debit - self.credit
+
+    def to_decimal(self) -> decimal.Decimal:
+        """Debits minus credits as an exact decimal.Decimal."""
+        return decimal.Decimal(self.net).scaleb(self.exponent, context=decimal.Context(prec=decimal.MAX_PREC))
+
+
+class LedgerProjection:
+    """Per-account balances maintained incrementally from ledger transactions.
+
+    apply() is serialized by a lock and may be called from any thread. Balance
+    reads do not take the lock: each account's totals are replaced atomically, but
+    a read concurrent with apply() may see part of a batch.
+
+    Metrics (recorded in `registry`):
+        t0_ledger_transactions_total: transactions by result ("applied" or "duplicate").
+        t0_ledger_rejected_batches_total: batches rejected by validation.
+    """
+
+    def __init__(self, *, exponent: int = DEFAULT_LEDGER_EXPONENT, registry: MetricsRegistry | None = None) -> None:
+        """Create an empty projection.
+
+        Args:
+            exponent: Exponent balances are kept at; amounts with more decimal places are rejected.
+            registry: Metrics registry; a private one is created if omitted.
+        """
+        self.exponent = exponent
+        self.registry = registry or MetricsRegistry()
+        self._lock = threading.Lock()
+        self._balances: dict[AccountKey, tuple[int, int]] = {}
+        self._applied: set[int] = set()
+        self._last_transaction_id = 0
+
+        self._applied_count: Counter = self.registry.counter(
+            "t0_ledger_transactions_total", "Ledger transactions by result.", result="applied"
+        )
+        self._duplicates: Counter = self.registry.counter(
+            "t0_ledger_transactions_total", "Ledger transactions by result.", result="duplicate"
+        )
+        self._rejected: Counter = self.registry.counter(
+            "t0_ledger_rejected_batches_total", "Ledger batches rejected by validation."
+        )
+
+    def __len__(self) -> int:
+        return len(self._applied)
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return transaction_id in self._applied
+
+    @property
+    def last_transaction_id(self) -> int:
+        """Highest transaction_id applied so far (ids may arrive out of order)."""
+        return self._last_transaction_id
+
+    def apply(
+        self,
+        batch: AppendLedgerEntriesRequest | Iterable[Transaction],
+        *,
+        before_commit: Callable[[list[Transaction]], object] | None = None,
+    ) -> int:
+        """Apply a request's transactions, or any iterable of transactions, all or nothing.
+
+        Args:
+            batch: AppendLedgerEntriesRequest or transactions.
+            before_commit: Called under the lock with the new, validated transactions before
+                they are applied (e.g. to persist them); if it raises, nothing is applied.
+
+        Returns:
+            Number of transactions applied; already applied transaction_ids are skipped.
+
+        Raises:
+            InvalidTransactionError: A transaction is malformed or unbalanced; nothing was applied.
+        """
+        transactions = batch.transactions if hasattr(batch, "transactions") else batch
+        with self._lock:
+            deltas = []
+            new = []
+            seen: set[int] = set()
+            for transaction in transactions:
+                transaction_id = transaction.transaction_id
+                if transaction_id in self._applied or transaction_id in seen:
+                    self._duplicates.inc()
+                    continue
+                try:
+                    deltas.append((transaction_id, self._deltas(transaction)))
+                except InvalidTransactionError:
+                    self._rejected.inc()
+                    raise
+                seen.add(transaction_id)
+                new.append(transaction)
+            if before_commit is not None and new:
+                before_commit(new)
+            for transaction_id, changes in deltas:
+                self._commit(transaction_id, changes)
+        self._applied_count.inc(len(deltas))
+        return len(deltas)
+
+    def balance(self, owner_id: int, account_type: int) -> Balance:
+        """Totals of one account; zero for accounts without entries."""
+        debit, credit = self._balances.get(AccountKey(owner_id, account_type), (0, 0))
+        return Balance(debit, credit, self.exponent)
+
+    def balances(self, owner_id: int | None = None) -> dict[AccountKey, Balance]:
+        """Totals of every account, or of one owner's accounts, taken under the lock."""
+        with self._lock:
+            items = list(self._balances.items())
+        return {
+            key: Balance(debit, credit, self.exponent)
+            for key, (debit, credit) in items
+            if owner_id is None or key.owner_id == owner_id
+        }
+
+    def transaction_ids(self) -> array[int]:
+        """Ids of every applied transaction, sorted."""
+        with self._lock:
+            return array("Q", sorted(self._applied))
+
+    def restore(
+        self, balances: Mapping[AccountKey, tuple[int, int]], transaction_ids: Iterable[int], *, exponent: int
+    ) -> None:
+        """Replace the whole state, e.g. from a snapshot.
+
+        Args:
+            balances: Unscaled (debit, credit) totals, or Balances, per account.
+            transaction_ids: Ids of the transactions those totals include.
+            exponent: Exponent the totals are at; must match this projection's.
+        """
+        if exponent != self.exponent:
+            raise LedgerError(f"state is at exponent {exponent}, projection at {self.exponent}")
+        with self._lock:
+            self._balances = {AccountKey(*key): (totals[0], totals[1]) for key, totals in balances.items()}
+            self._applied = set(transaction_ids)
+            self._last_transaction_id = max(self._applied, default=0)
+
+    def _scaled(self, transaction_id: int, value: Decimal) -> int:
+        shift = value.exponent - self.exponent
+        if shift >= 0:
+            return value.unscaled * 10**shift
+        scaled, remainder = divmod(value.unscaled, 10**-shift)
+        if remainder:
+            raise InvalidTransactionError(transaction_id, f"amount has more decimal places than 10^{self.exponent}")
+        return scaled
+
+    def _deltas(self, transaction: Transaction) -> dict[AccountKey, tuple[int, int]]:
+        """Validate one transaction and return its (debit, credit) per account."""
+        transaction_id = transaction.transaction_id
+        if transaction_id <= 0:
+            raise InvalidTransactionError(transaction_id, "transaction_id must be positive")
+        if transaction.WhichOneof("transaction_details") is None:
+            raise InvalidTransactionError(transaction_id, "no payout or settlement details")
+        if not transaction.entries:
+            raise InvalidTransactionError(transaction_id, "no entries")
+        deltas: dict[AccountKey, tuple[int, int]] = {}
+        total_debit = total_credit = 0
+        for entry in transaction.entries:
+            if entry.account_type == 0:
+                raise InvalidTransactionError(transaction_id, f"entry for owner {entry.account_owner_id} has no type")
+            debit = self._scaled(transaction_id, entry.debit)
+            credit = self._scaled(transaction_id, entry.credit)
+            if debit < 0 or credit < 0:
+                raise InvalidTransactionError(transaction_id, "negative amount")
+            if debit and credit:
+                raise InvalidTransactionError(transaction_id, "entry is both debit and credit")
+            key = AccountKey(entry.account_owner_id, entry.account_type)
+            old_debit, old_credit = deltas.get(key, (0, 0))
+            deltas[key] = (old_debit + debit, old_credit + credit)
+            total_debit += debit
+            total_credit += credit
+        if total_debit != total_credit:
+            raise InvalidTransactionError(
+                transaction_id,
+                f"debits {decimal.Decimal(total_debit).scaleb(self.exponent)}"
+                f" != credits {decimal.Decimal(total_credit).scaleb(self.exponent)}",
+            )
+        return deltas
+
+    def _commit(self, transaction_id: int, deltas: dict[AccountKey, tuple[int, int]]) -> None:
+        balances = self._balances
+        for key, (debit, credit) in deltas.items():
+            old_debit, old_credit = balances.get(key, (0, 0))
+            balances[key] = (old_debit + debit, old_credit + credit)
+        self._applied.add(transaction_id)
+        if transaction_id > self._last_transaction_id:
+            self._last_transaction_id = transaction_id
@@ -0,0 +1,326 @@
+"""Bulk reconciliation of payment records against ledger transactions.
+
+Every ledger transaction is linked to one payment (Payout.payment_id), provider
+settlement (settlement_id) or fee settlement (fee_settlement_id). Reconciliation
+checks the provider's own records (amounts it expects per link id, built from
+CreatePayment responses, UpdatePayment and FinalizePayout outcomes, settlement
+instructions) against the transactions AppendLedgerEntries delivered:
+
+- missing in ledger: a record with no ledger transaction;
+- missing in records: a ledger transaction the records do not know;
+- failed in ledger: a ledger transaction for a payment the records hold as failed;
+- amount mismatch: both sides know the link id but the amounts differ.
+
+Both sides are kept column-wise, one array of link ids and one of amounts
+(unscaled integers at a common exponent) per link kind, and every link kind is
+joined in one pass over its columns instead of one lookup per record. With
+NumPy installed the columns are aggregated and joined vectorized (sorted, then
+matched with searchsorted, since NumPy has no hash table); without it, the join
+is a hash join on dicts built from the columns. Both give the same report.
+
+Example:
+    records = ReconciliationColumns()
+    records.add(LinkKind.PAYMENT, payment_id, response.accepted.settlement_amount)
+    records.add_failed(LinkKind.PAYMENT, failed_payment_id)
+
+    ledger = ReconciliationColumns()
+    ledger.add_transactions(transaction for _, transaction in store.journal.replay())
+
+    report = reconcile(records, ledger)
+    if not report.ok:
+        ...
+
+No Go equivalent; the Go starter ignores ledger entries.
+"""
+
+from __future__ import annotations
+
+import array
+import enum
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple
+
+from t0_provider_sdk.common.decimal import to_fraction
+from t0_provider_sdk.ledger.projection import DEFAULT_LEDGER_EXPONENT
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional
+    np = None
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+    from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+
+    Transaction = AppendLedgerEntriesRequest.Transaction
+
+
+class LinkKind(enum.IntEnum):
+    """What a ledger transaction is linked to."""
+
+    PAYMENT = 1  # Transaction.Payout.payment_id
+    SETTLEMENT = 2  # Transaction.ProviderSettlement.settlement_id
+    FEE_SETTLEMENT = 3  # Transaction.FeeSettlement.fee_settlement_id
+
+
+# transaction_details field -> (link kind, id field of the details message)
+_DETAILS = {
+    "payout": (LinkKind.PAYMENT, "payment_id"),
+    "provider_settlement": (LinkKind.SETTLEMENT, "settlement_id"),
+    "fee_settlement": (LinkKind.FEE_SETTLEMENT, "fee_settlement_id"),
+}
+
+
+class AmountMismatch(NamedTuple):
+    """A link id whose amounts differ; amounts are unscaled at the report's exponent."""
+
+    kind: LinkKind
+    link_id: int
+    expected: int
+    actual: int
+
+
+@dataclass
+class _Column:
+    ids: array.array[int] = field(default_factory=lambda: array.array("Q"))
+    amounts: array.array[int] = field(default_factory=lambda: array.array("q"))
+    failed: array.array[int] = field(default_factory=lambda: array.array("Q"))
+
+
+class ReconciliationColumns:
+    """Amounts per link id for one side of a reconciliation, stored column-wise.
+
+    A link id may be added more than once (e.g. several ledger transactions of
+    one payment); its amounts are summed. Sums must fit an int64 at `exponent`.
+    """
+
+    def __init__(self, *, exponent: int = DEFAULT_LEDGER_EXPONENT) -> None:
+        """Create empty columns.
+
+        Args:
+            exponent: Exponent amounts are kept at; amounts with more decimal places raise ValueError.
+        """
+        self.exponent = exponent
+        self._columns: dict[LinkKind, _Column] = {kind: _Column() for kind in LinkKind}
+
+    def __len__(self) -> int:
+        return sum(len(column.ids) for column in self._columns.values())
+
+    def add(self, kind: LinkKind, link_id: int, amount: Decimal | Fraction | int) -> None:
+        """Add one amount for a link id."""
+        amount = self._scaled(amount)
+        column = self._columns[kind]
+        column.ids.append(link_id)
+        column.amounts.append(amount)
+
+    def extend(self, kind: LinkKind, link_ids: Iterable[int], unscaled: Iterable[int]) -> None:
+        """Add amounts already unscaled at `exponent`, one per link id, in bulk."""
+        column = self._columns[kind]
+        before = len(column.ids)
+        column.ids.extend(link_ids)
+        column.amounts.extend(unscaled)
+        if len(column.ids) != len(column.amounts):
+            del column.ids[before:], column.amounts[before:]
+            raise ValueError("link_ids and unscaled differ in length")
+
+    def add_failed(self, kind: LinkKind, link_id: int) -> None:
+        """Record a link id that must not appear in the ledger (e.g. a failed payment)."""
+        self._columns[kind].failed.append(link_id)
+
+    def add_transactions(
+        self, transactions: AppendLedgerEntriesRequest | Iterable[Transaction], *, account_type: int | None = None
+    ) -> None:
+        """Add ledger transactions, each under its payout or settlement link id.
+
+        Args:
+            transactions: An AppendLedgerEntriesRequest or any iterable of Transactions.
+            account_type: If set, a transaction's amount is debits minus credits on
+                entries of this account type; otherwise its total debits.
+        """
+        if hasattr(transactions, "transactions"):
+            transactions = transactions.transactions
+        scaled = self._scaled
+        for transaction in transactions:
+            details = transaction.WhichOneof("transaction_details")
+            if details is None:
+                continue
+            kind, id_field = _DETAILS[details]
+            if account_type is None:
+                amount = sum(scaled(entry.debit) for entry in transaction.entries)
+            else:
+                amount = sum(
+                    scaled(entry.debit) - scaled(entry.credit)
+                    for entry in transaction.entries
+                    if entry.account_type == account_type
+                )
+            column = self._columns[kind]
+            column.ids.append(getattr(getattr(transaction, details), id_field))
+            column.amounts.append(amount)
+
+    def _scaled(self, amount: Decimal | Fraction | int) -> int:
+        if isinstance(amount, int):
+            value = Fraction(amount)
+        elif isinstance(amount, Fraction):
+            value = amount
+        else:
+            shift = amount.exponent - self.exponent
+            if shift >= 0:
+                return amount.unscaled * 10**shift
+            value = to_fraction(amount)
+        scaled = value * Fraction(10) ** -self.exponent
+        if scaled.denominator != 1:
+            raise ValueError(f"amount {value} has more decimal places than 10^{self.exponent}")
+        return scaled.numerator
+
+
+@dataclass(frozen=True)
+class ReconciliationReport:
+    """Differences between records and ledger; link ids are sorted ascending.
+
+    Attributes:
+        exponent: Exponent of the unscaled amounts in amount_mismatches.
+        matched: Link ids present on both sides with equal amounts.
+        missing_in_ledger: Record link ids without ledger transactions, by kind.
+        missing_in_records: Ledger link ids the records do not know, by kind.
+        failed_in_ledger: Link ids recorded as failed that have ledger transactions, by kind.
+        amount_mismatches: Link ids on both sides with different amounts.
+    """
+
+    exponent: int
+    matched: int
+    missing_in_ledger: dict[LinkKind, list[int]]
+    missing_in_records: dict[LinkKind, list[int]]
+    failed_in_ledger: dict[LinkKind, list[int]]
+    amount_mismatches: list[AmountMismatch]
+
+    @property
+    def ok(self) -> bool:
+        """Whether records and ledger agree completely."""
+        return not (
+            any(self.missing_in_ledger.values())
+            or any(self.missing_in_records.values())
+            or any(self.failed_in_ledger.values())
+            or self.amount_mismatches
+        )
+
+    def summary(self) -> dict[str, int]:
+        """Counts of each finding, e.g. for logging or metrics."""
+        return {
+            "matched": self.matched,
+            "missing_in_ledger": sum(map(len, self.missing_in_ledger.values())),
+            "missing_in_records": sum(map(len, self.missing_in_records.values())),
+            "failed_in_ledger": sum(map(len, self.failed_in_ledger.values())),
+            "amount_mismatches": len(self.amount_mismatches),
+        }
+
+
+def reconcile(records: ReconciliationColumns, ledger: ReconciliationColumns) -> ReconciliationReport:
+    """Join records and ledger by link kind and id and report every difference.
+
+    Link ids recorded as failed are expected to be absent from the ledger; failed
+    ids added to `ledger` are ignored.
+
+    Raises:
+        ValueError: The two sides use different exponents.
+    """
+    if records.exponent != ledger.exponent:
+        raise ValueError(f"records are at exponent {records.exponent}, ledger at {ledger.exponent}")
+    join = _join_numpy if np is not None else _join_python
+    matched = 0
+    missing_in_ledger: dict[LinkKind, list[int]] = {}
+    missing_in_records: dict[LinkKind, list[int]] = {}
+    failed_in_ledger: dict[LinkKind, list[int]] = {}
+    mismatches: list[AmountMismatch] = []
+    for kind in LinkKind:
+        expected, actual = records._columns[kind], ledger._columns[kind]
+        equal, missing, unknown, failed, differing = join(expected, actual)
+        matched += equal
+        missing_in_ledger[kind] = missing
+        missing_in_records[kind] = unknown
+        failed_in_ledger[kind] = failed
+        mismatches.extend(AmountMismatch(kind, *row) for row in differing)
+    return ReconciliationReport(
+        exponent=records.exponent,
+        matched=matched,
+        missing_in_ledger=missing_in_ledger,
+        missing_in_records=missing_in_records,
+        failed_in_ledger=failed_in_ledger,
+        amount_mismatches=mismatches,
+    )
+
+
+_JoinResult = tuple[int, list[int], list[int], list[int], list[tuple[int, int, int]]]
+
+
+def _join_python(expected: _Column, actual: _Column) -> _JoinResult:
+    """Hash join of one link kind: dicts of summed amounts, joined with set operations."""
+    records = _sums(expected.ids, expected.amounts)
+    ledger = _sums(actual.ids, actual.amounts)
+    failed = set(expected.failed)
+    both = records.keys() & ledger.keys()
+    differing = sorted(
+        (link_id, records[link_id], ledger[link_id]) for link_id in both if records[link_id] != ledger[link_id]
+    )
+    return (
+        len(both) - len(differing),
+        sorted(records.keys() - ledger.keys()),
+        sorted(ledger.keys() - records.keys() - failed),
+        sorted(ledger.keys() & failed - records.keys()),
+        differing,
+    )
+
+
+def _sums(ids: array.array[int], amounts: array.array[int]) -> dict[int, int]:
+    sums = dict(zip(ids, amounts, strict=True))
+    if len(sums) == len(ids):  # no link id repeats
+        return sums
+    sums = {}
+    for link_id, amount in zip(ids, amounts, strict=True):
+        sums[link_id] = sums.get(link_id, 0) + amount
+    return sums
+
+
+def _join_numpy(expected: _Column, actual: _Column) -> _JoinResult:
+    """Vectorized join of one link kind: summed per unique id, matched with searchsorted."""
+    record_ids, record_amounts = _np_sums(expected.ids, expected.amounts)
+    ledger_ids, ledger_amounts = _np_sums(actual.ids, actual.amounts)
+    failed = np.unique(np.frombuffer(expected.failed, dtype=np.uint64))
+
+    in_records, record_index = _np_find(record_ids, ledger_ids)
+    found = np.zeros(record_ids.size, dtype=bool)
+    found[record_index[in_records]] = True
+    in_failed, _ = _np_find(failed, ledger_ids)
+
+    ledger_matched = ledger_amounts[in_records]
+    records_matched = record_amounts[record_index[in_records]]
+    differs = records_matched != ledger_matched
+    differing = (ledger_ids[in_records][differs], records_matched[differs], ledger_matched[differs])
+    return (
+        int(np.count_nonzero(~differs)),
+        record_ids[~found].tolist(),
+        ledger_ids[~in_records & ~in_failed].tolist(),
+        ledger_ids[~in_records & in_failed].tolist(),
+        list(zip(*(column.tolist() for column in differing), strict=True)),
+    )
+
+
+def _np_sums(ids: array.array[int], amounts: array.array[int]) -> tuple[Any, Any]:
+    """Sorted unique ids and the summed amounts of each."""
+    ids_np = np.frombuffer(ids, dtype=np.uint64)
+    amounts_np = np.frombuffer(amounts, dtype=np.int64)
+    unique, inverse = np.unique(ids_np, return_inverse=True)
+    sums = np.zeros(unique.size, dtype=np.int64)
+    if unique.size == ids_np.size:
+        sums[inverse] = amounts_np
+    else:
+        np.add.at(sums, inverse, amounts_np)
+    return unique, sums
+
+
+def _np_find(sorted_ids: Any, ids: Any) -> tuple[Any, Any]:
+    """Mask of `ids` present in `sorted_ids`, and their positions there."""
+    if not sorted_ids.size:
+        return np.zeros(ids.size, dtype=bool), np.zeros(ids.size, dtype=np.intp)
+    index = np.minimum(np.searchsorted(sorted_ids, ids), sorted_ids.size - 1)
+    return sorted_ids[index] == ids, index
@@ -0,0 +1,153 @@
+"""Durable ledger: a LedgerJournal feeding a LedgerProjection.
+
+LedgerStore keeps what is applied and what is persisted identical:
+
+- append() validates a batch, writes its new transactions to the journal (one
+  write and one fsync per batch) and only then applies them to the balances, all
+  under one lock; a rejected batch is neither written nor applied;
+- a LedgerIndex finds transactions by transaction_id, payment_id, settlement_id
+  and fee_settlement_id with dict lookups;
+- every `snapshot_every` transactions the balances and the index are
+  snapshotted, so a restart costs loading the snapshot plus replaying the
+  journal tail after it;
+- opening the store runs that recovery.
+
+Example:
+    store = LedgerStore("/var/lib/provider/ledger")
+
+    async def append_ledger_entries(self, request, ctx):
+        await asyncio.to_thread(store.append, request)
+        return AppendLedgerEntriesResponse()
+
+    store.payment_transactions(payment_id)  # every ledger transaction of a payout
+
+No Go equivalent; the Go starter ignores ledger entries.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Iterable
+
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.ledger.index import LedgerIndex
+from t0_provider_sdk.ledger.journal import DEFAULT_SEGMENT_SIZE, JournalPosition, LedgerJournal
+from t0_provider_sdk.ledger.projection import DEFAULT_LEDGER_EXPONENT, Balance, LedgerProjection
+
+if TYPE_CHECKING:
+    import os
+
+    from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+
+    Transaction = AppendLedgerEntriesRequest.Transaction
+
+# Transactions appended between automatic snapshots (0 disables them)
+DEFAULT_SNAPSHOT_EVERY = 100_000
+
+
+class LedgerStore:
+    """Ledger balances and indexes persisted in a journal, recovered on open."""
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str],
+        *,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        sync: bool = True,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+        exponent: int = DEFAULT_LEDGER_EXPONENT,
+        registry: MetricsRegistry | None = None,
+    ) -> None:
+        """Open the journal in `directory` and recover the balances from it.
+
+        Args:
+            directory: Directory of the journal and its snapshots.
+            segment_size: Bytes after which a journal segment is sealed.
+            sync: fsync every appended batch; if False, call sync() to make appends durable.
+            snapshot_every: Transactions appended between automatic snapshots; 0 disables them.
+            exponent: Exponent balances are kept at; must match existing snapshots.
+            registry: Metrics registry shared by the journal and the projection.
+        """
+        self.registry = registry or MetricsRegistry()
+        self.journal = LedgerJournal(directory, segment_size=segment_size, sync=sync, registry=self.registry)
+        self.projection = LedgerProjection(exponent=exponent, registry=self.registry)
+        self.index = LedgerIndex()
+        self.snapshot_every = snapshot_every
+        self._lock = threading.Lock()
+        self._since_snapshot = self.journal.recover(self.projection, self.index)
+
+    def __enter__(self) -> LedgerStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.projection)
+
+    def __contains__(self, transaction_id: int) -> bool:
+        return transaction_id in self.projection
+
+    def append(self, batch: AppendLedgerEntriesRequest | Iterable[Transaction]) -> int:
+        """Validate, persist and apply a batch, all or nothing.
+
+        Returns:
+            Number of transactions applied; already applied transaction_ids are skipped.
+
+        Raises:
+            InvalidTransactionError: A transaction is malformed or unbalanced; nothing was written.
+            OSError: The journal write failed; nothing was applied.
+        """
+        with self._lock:
+            applied = self.projection.apply(batch, before_commit=self._persist)
+            self._since_snapshot += applied
+            if self.snapshot_every and self._since_snapshot >= self.snapshot_every:
+                self._snapshot()
+        return applied
+
+    def _persist(self, transactions: list[Transaction]) -> None:
+        for position, transaction in self.journal.append_batch(transactions):
+            self.index.add(position, transaction)
+
+    def balance(self, owner_id: int, account_type: int) -> Balance:
+        """Totals of one account; zero for accounts without entries."""
+        return self.projection.balance(owner_id, account_type)
+
+    def get(self, transaction_id: int) -> Transaction | None:
+        """The journaled transaction with this id, or None."""
+        position = self.index.position(transaction_id)
+        return self.journal.read(position) if position is not None else None
+
+    def payment_transactions(self, payment_id: int) -> list[Transaction]:
+        """Payout transactions of a payment, in journal order."""
+        return self._read(self.index.payment_transaction_ids(payment_id))
+
+    def settlement_transactions(self, settlement_id: int) -> list[Transaction]:
+        """Transactions of a provider settlement, in journal order."""
+        return self._read(self.index.settlement_transaction_ids(settlement_id))
+
+    def fee_settlement_transactions(self, fee_settlement_id: int) -> list[Transaction]:
+        """Transactions of a fee settlement, in journal order."""
+        return self._read(self.index.fee_settlement_transaction_ids(fee_settlement_id))
+
+    def _read(self, transaction_ids: tuple[int, ...]) -> list[Transaction]:
+        positions = [self.index.position(transaction_id) for transaction_id in transaction_ids]
+        return [self.journal.read(position) for position in positions if position is not None]
+
+    def snapshot(self) -> JournalPosition:
+        """Snapshot the balances and the index now; returns the journal position the snapshot covers."""
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> JournalPosition:
+        self.journal.sync()  # a snapshot must never cover records that are not on disk
+        position = self.journal.write_snapshot(self.projection, index=self.index)
+        self._since_snapshot = 0
+        return position
+
+    def sync(self) -> None:
+        """Make every appended batch durable; needed only with sync=False."""
+        self.journal.sync()
+
+    def close(self) -> None:
+        self.journal.close()
@@ -0,0 +1,16 @@
+"""Counterparty credit limits for T-0 Network providers."""
+
+from t0_provider_sdk.limits.errors import LimitError, LimitExceededError
+from t0_provider_sdk.limits.exposure import DEFAULT_LOCK_SHARDS, DEFAULT_RESERVATION_TTL, ExposureBook, Reservation
+from t0_provider_sdk.limits.tracker import CounterpartLimit, LimitTracker
+
+__all__ = [
+    "DEFAULT_LOCK_SHARDS",
+    "DEFAULT_RESERVATION_TTL",
+    "CounterpartLimit",
+    "ExposureBook",
+    "LimitError",
+    "LimitExceededError",
+    "LimitTracker",
+    "Reservation",
+]
@@ -0,0 +1,25 @@
+"""Error types for counterparty limits.
+
+No Go equivalent; the Go starter ignores limit updates.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from fractions import Fraction
+
+
+class LimitError(ValueError):
+    """Base class for all limit errors."""
+
+
+class LimitExceededError(LimitError):
+    """A reservation does not fit in the counterparty's remaining headroom."""
+
+    def __init__(self, counterpart_id: int, amount: Fraction, available: Fraction) -> None:
+        super().__init__(f"counterparty {counterpart_id}: {float(amount)} exceeds available {float(available)}")
+        self.counterpart_id = counterpart_id
+        self.amount = amount
+        self.available = available
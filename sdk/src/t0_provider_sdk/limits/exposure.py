@@ -0,0 +1,311 @@
+"""Atomic exposure reservations against counterparty payout limits.
+
+A PayoutRequest from a counterparty (its pay_in_provider_id) spends part of the
+credit that counterparty extends. Once a payout is accepted, it takes time
+before the network's next UpdateLimit reflects it. Until then, concurrent
+payouts checked only against LimitTracker would all see the same headroom and
+could overdraw it together. ExposureBook reserves the amount before the payout
+is accepted:
+
+- reserve() fails with LimitExceededError unless the amount fits in the headroom
+  minus everything already reserved or committed for that counterparty;
+- commit() (FinalizePayout success) keeps the amount counted until a newer
+  UpdateLimit version arrives, which then includes it in credit_usage;
+- release() (FinalizePayout failure) returns it at once;
+- a reservation neither committed nor released expires after `ttl`.
+
+Counterparties are spread over `shards` locks, so payouts for different
+counterparties never wait for each other, and the reservations of one
+counterparty are checked and added atomically.
+
+Amounts are in USD, like the limits; convert the payout amount before
+reserving it.
+
+Example:
+    exposure = ExposureBook(limits)
+
+    async def pay_out(self, request, ctx):
+        exposure.reserve(request.pay_in_provider_id, request.payment_id, usd_amount)
+        ...
+
+    # when the payout is finalized
+    exposure.commit(payment_id)  # or exposure.release(payment_id)
+
+No Go equivalent; the Go starter ignores limit updates.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field, replace
+from fractions import Fraction
+from typing import TYPE_CHECKING, Callable
+
+from t0_provider_sdk.common.decimal import to_fraction
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.limits.errors import LimitExceededError
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+    from t0_provider_sdk.common.metrics import Counter
+    from t0_provider_sdk.limits.tracker import LimitTracker
+
+logger = logging.getLogger(__name__)
+
+# Seconds a reservation is held without being committed or released
+DEFAULT_RESERVATION_TTL = 300.0
+
+# Number of locks counterparties are spread over
+DEFAULT_LOCK_SHARDS = 64
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """USD amount held against a counterparty's limit for one payment.
+
+    Attributes:
+        counterpart_id: Counterparty whose limit the amount is held against.
+        payment_id: Payment the amount is held for.
+        amount: USD amount held.
+        version: Limit version the reservation was made (or committed) under.
+        expires_at: Clock time after which a pending reservation is dropped.
+        committed: Whether the payout was finalized successfully.
+    """
+
+    counterpart_id: int
+    payment_id: int
+    amount: Fraction
+    version: int
+    expires_at: float
+    committed: bool = False
+
+
+@dataclass
+class _Exposure:
+    """Reservations of one counterparty; guarded by its shard lock."""
+
+    version: int = 0
+    pending: dict[int, Reservation] = field(default_factory=dict)  # by payment_id, in expiry order
+    committed: dict[int, Reservation] = field(default_factory=dict)
+    pending_total: Fraction = Fraction(0)
+    committed_total: Fraction = Fraction(0)
+
+
+def _as_fraction(value: Decimal | Fraction | int) -> Fraction:
+    if isinstance(value, Fraction | int):
+        return Fraction(value)
+    return to_fraction(value)
+
+
+class ExposureBook:
+    """Reservations against the limits held by a LimitTracker.
+
+    All methods are thread-safe and hold only the lock of the counterparty's
+    shard, for a few dict operations; they do not block on I/O and may be
+    called directly from async handlers.
+
+    Metrics (recorded in `registry`):
+        t0_exposure_reservations_total: Reservations by result ("reserved",
+            "rejected", "committed", "released" or "expired").
+    """
+
+    def __init__(
+        self,
+        limits: LimitTracker,
+        *,
+        ttl: float = DEFAULT_RESERVATION_TTL,
+        shards: int = DEFAULT_LOCK_SHARDS,
+        registry: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create an empty book.
+
+        Args:
+            limits: Tracker of the counterparties' latest limits.
+            ttl: Seconds a reservation is held without being committed or released.
+            shards: Number of locks counterparties are spread over.
+            registry: Metrics registry; a private one is created if omitted.
+            clock: Monotonic clock used for expiry.
+        """
+        if ttl <= 0:
+            raise ValueError("ttl must be positive")
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.limits = limits
+        self.registry = registry or MetricsRegistry()
+        self._ttl = ttl
+        self._clock = clock
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._shards: list[dict[int, _Exposure]] = [{} for _ in range(shards)]
+        # payment_id -> counterpart_id; single dict operations are atomic, and an
+        # entry is only changed under the lock of its counterparty's shard.
+        self._owners: dict[int, int] = {}
+        help_text = "Exposure reservations by result."
+        self._results: dict[str, Counter] = {
+            result: self.registry.counter("t0_exposure_reservations_total", help_text, result=result)
+            for result in ("reserved", "rejected", "committed", "released", "expired")
+        }
+
+    def reserve(self, counterpart_id: int, payment_id: int, amount: Decimal | Fraction | int) -> Reservation:
+        """Hold a USD amount for a payment against the counterparty's limit.
+
+        Reserving a payment that is already reserved or committed returns the
+        existing reservation, so a redelivered PayoutRequest is not counted twice.
+
+        Returns:
+            The reservation.
+
+        Raises:
+            LimitExceededError: The amount exceeds what is available.
+            ValueError: The amount is negative.
+        """
+        amount = _as_fraction(amount)
+        if amount < 0:
+            raise ValueError("amount must not be negative")
+        index = counterpart_id % len(self._locks)
+        now = self._clock()
+        with self._locks[index]:
+            exposure = self._exposure(index, counterpart_id, now)
+            existing = exposure.pending.get(payment_id) or exposure.committed.get(payment_id)
+            if existing is not None:
+                return existing
+            available = self.limits.headroom(counterpart_id) - exposure.pending_total - exposure.committed_total
+            if amount > available:
+                self._results["rejected"].inc()
+                raise LimitExceededError(counterpart_id, amount, available)
+            reservation = Reservation(counterpart_id, payment_id, amount, exposure.version, now + self._ttl)
+            exposure.pending[payment_id] = reservation
+            exposure.pending_total += amount
+            self._owners[payment_id] = counterpart_id
+        self._results["reserved"].inc()
+        return reservation
+
+    def commit(self, payment_id: int) -> Reservation | None:
+        """Keep a payment's amount counted until the next limit version (payout succeeded).
+
+        Returns:
+            The committed reservation; None if the payment holds no pending
+            reservation (never reserved, released, expired or already committed).
+        """
+        counterpart_id = self._owners.get(payment_id)
+        if counterpart_id is None:
+            return None
+        index = counterpart_id % len(self._locks)
+        with self._locks[index]:
+            exposure = self._exposure(index, counterpart_id, self._clock())
+            reservation = exposure.pending.pop(payment_id, None)
+            if reservation is None:
+                return None
+            exposure.pending_total -= reservation.amount
+            reservation = replace(reservation, version=exposure.version, committed=True)
+            exposure.committed[payment_id] = reservation
+            exposure.committed_total += reservation.amount
+        self._results["committed"].inc()
+        return reservation
+
+    def release(self, payment_id: int) -> Reservation | None:
+        """Return a payment's pending amount to the headroom (payout failed).
+
+        Returns:
+            The released reservation; None if the payment holds no pending reservation.
+        """
+        counterpart_id = self._owners.get(payment_id)
+        if counterpart_id is None:
+            return None
+        index = counterpart_id % len(self._locks)
+        with self._locks[index]:
+            exposure = self._exposure(index, counterpart_id, self._clock())
+            reservation = exposure.pending.pop(payment_id, None)
+            if reservation is None:
+                return None
+            exposure.pending_total -= reservation.amount
+            self._owners.pop(payment_id, None)
+        self._results["released"].inc()
+        return reservation
+
+    def available(self, counterpart_id: int) -> Fraction:
+        """USD that may still be reserved against a counterparty; negative when exceeded."""
+        index = counterpart_id % len(self._locks)
+        with self._locks[index]:
+            exposure = self._exposure(index, counterpart_id, self._clock())
+            held = exposure.pending_total + exposure.committed_total
+        return self.limits.headroom(counterpart_id) - held
+
+    def exposure(self, counterpart_id: int) -> Fraction:
+        """USD reserved or committed against a counterparty and not yet in its limit."""
+        index = counterpart_id % len(self._locks)
+        with self._locks[index]:
+            exposure = self._exposure(index, counterpart_id, self._clock())
+            return exposure.pending_total + exposure.committed_total
+
+    def get(self, payment_id: int) -> Reservation | None:
+        """Current reservation of a payment; None if it holds none."""
+        counterpart_id = self._owners.get(payment_id)
+        if counterpart_id is None:
+            return None
+        index = counterpart_id % len(self._locks)
+        with self._locks[index]:
+            exposure = self._exposure(index, counterpart_id, self._clock())
+            return exposure.pending.get(payment_id) or exposure.committed.get(payment_id)
+
+    def expire(self) -> int:
+        """Drop expired reservations, and counterparties left without any.
+
+        Expiry also happens whenever a counterparty is accessed; call this
+        periodically so that idle counterparties do not hold their reservations.
+
+        Returns:
+            The number of reservations that expired.
+        """
+        expired = 0
+        now = self._clock()
+        for index, lock in enumerate(self._locks):
+            with lock:
+                shard = self._shards[index]
+                for counterpart_id, exposure in list(shard.items()):
+                    expired += self._expire(exposure, now)
+                    if not exposure.pending and not exposure.committed:
+                        del shard[counterpart_id]
+        return expired
+
+    def _exposure(self, index: int, counterpart_id: int, now: float) -> _Exposure:
+        """Reconciled state of a counterparty; call with its shard lock held."""
+        shard = self._shards[index]
+        exposure = shard.get(counterpart_id)
+        if exposure is None:
+            exposure = shard[counterpart_id] = _Exposure()
+        limit = self.limits.get(counterpart_id)
+        if limit is not None and limit.version > exposure.version:
+            self._reconcile(exposure, limit.version)
+        self._expire(exposure, now)
+        return exposure
+
+    def _reconcile(self, exposure: _Exposure, version: int) -> None:
+        """Drop committed amounts that a newer limit version already includes."""
+        exposure.version = version
+        for payment_id, reservation in list(exposure.committed.items()):
+            if reservation.version < version:
+                del exposure.committed[payment_id]
+                exposure.committed_total -= reservation.amount
+                self._owners.pop(payment_id, None)
+
+    def _expire(self, exposure: _Exposure, now: float) -> int:
+        """Drop pending reservations past their expiry and return how many; the oldest come first."""
+        expired = 0
+        while exposure.pending:
+            payment_id, reservation = next(iter(exposure.pending.items()))
+            if reservation.expires_at > now:
+                break
+            del exposure.pending[payment_id]
+            exposure.pending_total -= reservation.amount
+            self._owners.pop(payment_id, None)
+            expired += 1
+            logger.warning(
+                "reservation of payment %d against counterparty %d expired",
+                payment_id,
+                reservation.counterpart_id,
+            )
+        self._results["expired"].inc(expired)
+        return expired
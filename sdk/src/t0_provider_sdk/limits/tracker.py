@@ -0,0 +1,160 @@
+"""Versioned credit limits per counterparty from UpdateLimit notifications.
+
+UpdateLimitRequest.limits carries, per counterpart_id, the credit line the
+counterparty extends (credit_limit), how much of it is used (credit_usage), how
+much is reserved for pending payments (reserve) and the resulting headroom
+(payout_limit = credit_limit - credit_usage - reserve; negative when exceeded).
+Every Limit has a version that only grows, as in the ledger.
+
+LimitTracker keeps the latest limit of every counterparty:
+
+- a limit is applied only if its version is newer than the one held, so a
+  notification delivered late or twice never rolls a counterparty back;
+- reads never block: they look up an immutable snapshot that update() replaces
+  as a whole, so pay_out and quote approval check headroom with one dict lookup.
+
+Example:
+    limits = LimitTracker()
+
+    async def update_limit(self, request, ctx):
+        limits.update(request)
+        return UpdateLimitResponse()
+
+    if not limits.can_pay_out(counterpart_id, request.settlement_amount):
+        ...
+
+No Go equivalent; the Go starter ignores limit updates.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from fractions import Fraction
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Iterable, Mapping
+
+from t0_provider_sdk.common.decimal import to_fraction
+from t0_provider_sdk.common.metrics import MetricsRegistry
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+    from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import UpdateLimitRequest
+    from t0_provider_sdk.common.metrics import Counter
+
+    Limit = UpdateLimitRequest.Limit
+
+
+@dataclass(frozen=True)
+class CounterpartLimit:
+    """Latest known limit of one counterparty, in USD.
+
+    Attributes:
+        counterpart_id: Provider extending the credit line.
+        version: Version of the UpdateLimit entry this came from.
+        payout_limit: Headroom left: credit_limit - credit_usage - reserve; negative when exceeded.
+        credit_limit: Credit line the counterparty extends.
+        credit_usage: Payouts made minus settlements received; may be negative.
+        reserve: Amount reserved for payments not yet finalized.
+        updated_at: Clock time the limit was applied.
+    """
+
+    counterpart_id: int
+    version: int
+    payout_limit: Fraction
+    credit_limit: Fraction
+    credit_usage: Fraction
+    reserve: Fraction
+    updated_at: float
+
+
+def _as_fraction(value: Decimal | Fraction | int) -> Fraction:
+    if isinstance(value, Fraction | int):
+        return Fraction(value)
+    return to_fraction(value)
+
+
+class LimitTracker:
+    """Latest limit per counterparty, applied by version.
+
+    update() is serialized by a lock; reads may run concurrently from any thread
+    or task and never block. Each update() copies the snapshot once, which is
+    cheap for the handful of counterparties a provider has.
+
+    Metrics (recorded in `registry`):
+        t0_limit_updates_total: Limit entries by result ("applied" or "stale").
+    """
+
+    def __init__(self, *, registry: MetricsRegistry | None = None, clock: Callable[[], float] = time.time) -> None:
+        """Create an empty tracker.
+
+        Args:
+            registry: Metrics registry; a private one is created if omitted.
+            clock: Wall clock recorded as updated_at.
+        """
+        self.registry = registry or MetricsRegistry()
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._limits: Mapping[int, CounterpartLimit] = MappingProxyType({})
+        self._applied: Counter = self.registry.counter(
+            "t0_limit_updates_total", "Limit entries by result.", result="applied"
+        )
+        self._stale: Counter = self.registry.counter(
+            "t0_limit_updates_total", "Limit entries by result.", result="stale"
+        )
+
+    def __len__(self) -> int:
+        return len(self._limits)
+
+    def __contains__(self, counterpart_id: int) -> bool:
+        return counterpart_id in self._limits
+
+    def update(self, request: UpdateLimitRequest | Iterable[Limit]) -> list[CounterpartLimit]:
+        """Apply the entries of an UpdateLimitRequest, or any iterable of Limits, that are newer.
+
+        Returns:
+            The limits that were applied; entries not newer than the held version are skipped.
+        """
+        limits = request.limits if hasattr(request, "limits") else request
+        now = self._clock()
+        with self._lock:
+            current = self._limits
+            changed: dict[int, CounterpartLimit] = {}
+            stale = 0
+            for limit in limits:
+                held = changed.get(limit.counterpart_id) or current.get(limit.counterpart_id)
+                if held is not None and limit.version <= held.version:
+                    stale += 1
+                    continue
+                changed[limit.counterpart_id] = CounterpartLimit(
+                    counterpart_id=limit.counterpart_id,
+                    version=limit.version,
+                    payout_limit=to_fraction(limit.payout_limit),
+                    credit_limit=to_fraction(limit.credit_limit),
+                    credit_usage=to_fraction(limit.credit_usage),
+                    reserve=to_fraction(limit.reserve),
+                    updated_at=now,
+                )
+            if changed:
+                self._limits = MappingProxyType({**current, **changed})
+        self._applied.inc(len(changed))
+        self._stale.inc(stale)
+        return list(changed.values())
+
+    def get(self, counterpart_id: int) -> CounterpartLimit | None:
+        """Latest limit of a counterparty; None if no update was received for it."""
+        return self._limits.get(counterpart_id)
+
+    def headroom(self, counterpart_id: int) -> Fraction:
+        """USD that may still be paid out against a counterparty; 0 if its limit is unknown."""
+        limit = self._limits.get(counterpart_id)
+        return limit.payout_limit if limit is not None else Fraction(0)
+
+    def can_pay_out(self, counterpart_id: int, amount: Decimal | Fraction | int) -> bool:
+        """Whether a USD amount fits in the counterparty's headroom."""
+        return _as_fraction(amount) <= self.headroom(counterpart_id)
+
+    def snapshot(self) -> Mapping[int, CounterpartLimit]:
+        """All current limits, by counterpart_id; an immutable view that later updates do not change."""
+        return self._limits
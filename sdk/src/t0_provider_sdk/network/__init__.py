@@ -1,14 +1,41 @@
 """Client-side SDK for connecting to T-0 Network."""
 
-from t0_provider_sdk.network.client import new_service_client, new_service_client_sync
+from t0_provider_sdk.network.cache import QuoteCache
+from t0_provider_sdk.network.client import (
+    ClientEndpoint,
+    client_endpoint,
+    new_pooled_service_client_sync,
+    new_service_client,
+    new_service_client_sync,
+)
+from t0_provider_sdk.network.errors import RateLimitExceededError
+from t0_provider_sdk.network.metrics import ClientMetrics, MetricsRegistry
 from t0_provider_sdk.network.options import DEFAULT_BASE_URL, DEFAULT_TIMEOUT
+from t0_provider_sdk.network.outbox import Outbox, OutboxWorker
+from t0_provider_sdk.network.ratelimit import RateLimit, RateLimiter
 from t0_provider_sdk.network.signing import SigningClient, SigningSyncClient
+from t0_provider_sdk.network.warmup import KeepAlive, KeepAliveSync, warm_up, warm_up_sync
 
 __all__ = [
+    "ClientEndpoint",
+    "ClientMetrics",
     "DEFAULT_BASE_URL",
     "DEFAULT_TIMEOUT",
+    "KeepAlive",
+    "KeepAliveSync",
+    "MetricsRegistry",
+    "Outbox",
+    "OutboxWorker",
+    "QuoteCache",
+    "RateLimit",
+    "RateLimitExceededError",
+    "RateLimiter",
     "SigningClient",
     "SigningSyncClient",
+    "client_endpoint",
+    "new_pooled_service_client_sync",
     "new_service_client",
     "new_service_client_sync",
+    "warm_up",
+    "warm_up_sync",
 ]
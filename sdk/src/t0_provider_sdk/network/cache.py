@@ -0,0 +1,186 @@
+"""Caching wrapper for GetQuote that honors quote expiration.
+
+UI and routing code often ask GetQuote the same question many times a second,
+and every call is a signed round trip to the network. QuoteCache wraps an async
+NetworkService client and answers repeated GetQuoteRequests from memory:
+
+- the key is the deterministic serialization of the request, so two requests
+  hit the same entry exactly when all their fields are equal;
+- a success is cached until its quote's expiration minus `expiry_margin`, so a
+  cached quote is never handed out just before the network stops honoring it;
+- failures (no quote found) are cached for `failure_ttl` seconds, which defaults
+  to 0 (not cached); errors are never cached;
+- concurrent misses for the same key collapse into a single request whose
+  result every caller shares (single flight);
+- at most `max_entries` responses are kept, evicting the least recently used.
+
+Every other attribute is delegated to the wrapped client, so the cache is a
+drop-in replacement for it.
+
+Example:
+    client = QuoteCache(new_service_client(private_key, NetworkServiceClient))
+    response = await client.get_quote(request)  # hits the network
+    response = await client.get_quote(request)  # served from memory until expiration
+
+No Go equivalent; the Go SDK does not cache quotes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+
+from t0_provider_sdk.network.metrics import MetricsRegistry
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import GetQuoteRequest, GetQuoteResponse
+    from t0_provider_sdk.network.metrics import Counter
+
+# Maximum number of cached GetQuote responses
+DEFAULT_CACHE_ENTRIES = 4_096
+
+# Seconds before a quote's expiration at which its cached response stops being served
+DEFAULT_EXPIRY_MARGIN = 1.0
+
+
+class _Entry(NamedTuple):
+    response: GetQuoteResponse
+    expires_at: float  # clock() time after which the entry is stale
+
+
+class QuoteCache:
+    """Async NetworkService client wrapper that caches GetQuote responses.
+
+    Meant for one event loop; not thread-safe.
+
+    Metrics (recorded in `registry`):
+        t0_quote_cache_requests_total: get_quote calls by result ("hit", "miss", or
+            "collapsed" for misses that joined a request already in flight).
+        t0_quote_cache_evictions_total: live entries evicted to stay within max_entries.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        expiry_margin: float = DEFAULT_EXPIRY_MARGIN,
+        failure_ttl: float = 0.0,
+        registry: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Wrap a client.
+
+        Args:
+            client: Async NetworkService client (e.g. from new_service_client()).
+            max_entries: Maximum cached responses.
+            expiry_margin: Seconds before a quote's expiration at which it is no longer served.
+            failure_ttl: Seconds a failure response (no quote found) is cached; 0 disables.
+            registry: Metrics registry; a private one is created if omitted.
+            clock: Wall clock compared with quote expirations.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        if expiry_margin < 0 or failure_ttl < 0:
+            raise ValueError("expiry_margin and failure_ttl must not be negative")
+        self._client = client
+        self._max_entries = max_entries
+        self._expiry_margin = expiry_margin
+        self._failure_ttl = failure_ttl
+        self._clock = clock
+        self.registry = registry or MetricsRegistry()
+
+        self._entries: OrderedDict[bytes, _Entry] = OrderedDict()
+        self._inflight: dict[bytes, asyncio.Task[GetQuoteResponse]] = {}
+
+        self._hits: Counter = self.registry.counter(
+            "t0_quote_cache_requests_total", "GetQuote calls through the cache by result.", result="hit"
+        )
+        self._misses: Counter = self.registry.counter(
+            "t0_quote_cache_requests_total", "GetQuote calls through the cache by result.", result="miss"
+        )
+        self._collapsed: Counter = self.registry.counter(
+            "t0_quote_cache_requests_total", "GetQuote calls through the cache by result.", result="collapsed"
+        )
+        self._evictions: Counter = self.registry.counter(
+            "t0_quote_cache_evictions_total", "Live GetQuote responses evicted to stay within max_entries."
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        if name == "_client":  # not set yet; avoid recursing
+            raise AttributeError(name)
+        return getattr(self._client, name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get_quote(self, request: GetQuoteRequest, **kwargs: Any) -> GetQuoteResponse:
+        """GetQuote, answered from the cache while the cached quote is valid.
+
+        Keyword arguments (e.g. timeout_ms) are passed to the wrapped client on a miss
+        and are not part of the cache key. Returns a copy the caller may modify.
+        """
+        key = request.SerializeToString(deterministic=True)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._clock() < entry.expires_at:
+                self._entries.move_to_end(key)
+                self._hits.inc()
+                return _copy(entry.response)
+            del self._entries[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            self._misses.inc()
+            task = asyncio.ensure_future(self._fetch(key, request, kwargs))
+            task.add_done_callback(_retrieve)  # the error is raised to callers; do not log it if all gave up
+            self._inflight[key] = task
+        else:
+            self._collapsed.inc()
+        # shield: a caller that gives up must not cancel the request the others are waiting for
+        return _copy(await asyncio.shield(task))
+
+    def invalidate(self, request: GetQuoteRequest | None = None) -> None:
+        """Drop the cached response of one request, or all of them."""
+        if request is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(request.SerializeToString(deterministic=True), None)
+
+    async def _fetch(self, key: bytes, request: GetQuoteRequest, kwargs: dict[str, Any]) -> GetQuoteResponse:
+        try:
+            response = await self._client.get_quote(request, **kwargs)
+        finally:
+            del self._inflight[key]
+        expires_at = self._expires_at(response)
+        if expires_at > self._clock():
+            self._entries[key] = _Entry(response, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                if self._clock() < evicted.expires_at:
+                    self._evictions.inc()
+        return response
+
+    def _expires_at(self, response: GetQuoteResponse) -> float:
+        result = response.WhichOneof("result")
+        if result == "success":
+            if not response.success.HasField("expiration"):
+                return 0.0
+            return response.success.expiration.ToNanoseconds() / 1_000_000_000 - self._expiry_margin
+        if result == "failure" and self._failure_ttl > 0:
+            return self._clock() + self._failure_ttl
+        return 0.0
+
+
+def _retrieve(task: asyncio.Task[Any]) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+def _copy(response: GetQuoteResponse) -> GetQuoteResponse:
+    copy = type(response)()
+    copy.CopyFrom(response)
+    return copy
@@ -7,21 +7,60 @@ Proto-agnostic: works with ANY generated ConnectRPC client class.
 
 from __future__ import annotations
 
-from typing import TypeVar
+import weakref
+from typing import TYPE_CHECKING, Any, NamedTuple, TypeVar
+
+import pyqwest
 
 from t0_provider_sdk.crypto.signer import new_signer_from_hex
-from t0_provider_sdk.network.options import DEFAULT_BASE_URL, DEFAULT_TIMEOUT
+from t0_provider_sdk.network.metrics import MetricsInterceptor, MetricsInterceptorSync
+from t0_provider_sdk.network.options import DEFAULT_BASE_URL, DEFAULT_POOL_IDLE_TIMEOUT, DEFAULT_TIMEOUT
 from t0_provider_sdk.network.signing import SigningClient, SigningSyncClient
 
+if TYPE_CHECKING:
+    from t0_provider_sdk.network.metrics import ClientMetrics
+    from t0_provider_sdk.network.ratelimit import RateLimiter
+
 T = TypeVar("T")
 
 
+class ClientEndpoint(NamedTuple):
+    """Base URL and signing HTTP client that a client created by the factories sends requests through."""
+
+    base_url: str
+    http_client: SigningClient | SigningSyncClient
+
+
+# Endpoint of every client created by the factories; an entry goes away with its client
+_endpoints: weakref.WeakKeyDictionary[Any, ClientEndpoint] = weakref.WeakKeyDictionary()
+
+
+def client_endpoint(client: Any) -> ClientEndpoint:
+    """Return the base URL and signing HTTP client a factory-created client was built with.
+
+    Raises:
+        TypeError: The client was not created by new_service_client(), new_service_client_sync()
+            or new_pooled_service_client_sync().
+    """
+    endpoint = _endpoints.get(client)
+    if endpoint is None:
+        raise TypeError("client was not created by the network client factories")
+    return endpoint
+
+
+def _register(client: T, base_url: str, http_client: SigningClient | SigningSyncClient) -> T:
+    _endpoints[client] = ClientEndpoint(base_url, http_client)
+    return client
+
+
 def new_service_client(
     private_key: str,
     client_class: type[T],
     *,
     base_url: str = DEFAULT_BASE_URL,
     timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+    metrics: ClientMetrics | None = None,
 ) -> T:
     """Create an async ConnectRPC client with signing transport.
 
@@ -30,13 +69,19 @@ def new_service_client(
         client_class: Generated ConnectRPC async client class (e.g. NetworkServiceClient).
         base_url: Base URL of the T-0 Network API.
         timeout: Request timeout in seconds.
+        rate_limiter: Optional outbound rate limiter. May be shared between clients.
+        metrics: Optional per-method latency/size/result metrics. May be shared between clients.
 
     Returns:
         An instance of client_class configured with signing transport.
     """
     sign_fn = new_signer_from_hex(private_key)
-    signing_client = SigningClient(sign_fn)
-    return client_class(base_url, http_client=signing_client, timeout_ms=int(timeout * 1000))  # type: ignore[call-arg]
+    signing_client = SigningClient(sign_fn, rate_limiter=rate_limiter, metrics=metrics)
+    interceptors = [MetricsInterceptor(metrics)] if metrics else []
+    client = client_class(  # type: ignore[call-arg]
+        base_url, http_client=signing_client, timeout_ms=int(timeout * 1000), interceptors=interceptors
+    )
+    return _register(client, base_url, signing_client)
 
 
 def new_service_client_sync(
@@ -45,6 +90,8 @@ def new_service_client_sync(
     *,
     base_url: str = DEFAULT_BASE_URL,
     timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+    metrics: ClientMetrics | None = None,
 ) -> T:
     """Create a sync ConnectRPC client with signing transport.
 
@@ -53,10 +100,68 @@ def new_service_client_sync(
         client_class: Generated ConnectRPC sync client class (e.g. NetworkServiceClientSync).
         base_url: Base URL of the T-0 Network API.
         timeout: Request timeout in seconds.
+        rate_limiter: Optional outbound rate limiter. May be shared between clients.
+        metrics: Optional per-method latency/size/result metrics. May be shared between clients.
 
     Returns:
         An instance of client_class configured with signing transport.
     """
     sign_fn = new_signer_from_hex(private_key)
-    signing_client = SigningSyncClient(sign_fn)
-    return client_class(base_url, http_client=signing_client, timeout_ms=int(timeout * 1000))  # type: ignore[call-arg]
+    signing_client = SigningSyncClient(sign_fn, rate_limiter=rate_limiter, metrics=metrics)
+    interceptors = [MetricsInterceptorSync(metrics)] if metrics else []
+    client = client_class(  # type: ignore[call-arg]
+        base_url, http_client=signing_client, timeout_ms=int(timeout * 1000), interceptors=interceptors
+    )
+    return _register(client, base_url, signing_client)
+
+
+def new_pooled_service_client_sync(
+    private_key: str,
+    client_class: type[T],
+    *,
+    threads: int,
+    base_url: str = DEFAULT_BASE_URL,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate_limiter: RateLimiter | None = None,
+    metrics: ClientMetrics | None = None,
+) -> T:
+    """Create a sync ConnectRPC client meant to be shared by a fixed number of threads.
+
+    Intended for multi-threaded WSGI servers (e.g. gunicorn with --worker-class gthread
+    --threads N): create one client per worker process and share it between all of the
+    worker's threads.
+
+    Thread safety: the returned client holds no per-request state. Headers are built per
+    call, signing uses an immutable key, the optional rate limiter is lock-protected, and
+    the underlying pyqwest transport is a thread-safe connection pool. Concurrent calls
+    from any number of threads are safe; the pool is sized so that `threads` concurrent
+    calls never wait for a connection and idle connections are kept for reuse.
+
+    Args:
+        private_key: Hex-encoded secp256k1 private key (with or without 0x prefix).
+        client_class: Generated ConnectRPC sync client class (e.g. NetworkServiceClientSync).
+        threads: Number of threads sharing the client (e.g. gunicorn --threads).
+        base_url: Base URL of the T-0 Network API.
+        timeout: Request timeout in seconds.
+        rate_limiter: Optional outbound rate limiter. May be shared between clients.
+        metrics: Optional per-method latency/size/result metrics. May be shared between clients.
+
+    Returns:
+        An instance of client_class configured with signing transport over a dedicated connection pool.
+    """
+    if threads < 1:
+        raise ValueError("threads must be at least 1")
+    transport = pyqwest.SyncHTTPTransport(
+        tls_include_system_certs=True,
+        timeout=timeout,
+        pool_idle_timeout=DEFAULT_POOL_IDLE_TIMEOUT,
+        pool_max_idle_per_host=threads,
+        max_connections_per_address=threads,
+    )
+    sign_fn = new_signer_from_hex(private_key)
+    signing_client = SigningSyncClient(sign_fn, transport=transport, rate_limiter=rate_limiter, metrics=metrics)
+    interceptors = [MetricsInterceptorSync(metrics)] if metrics else []
+    client = client_class(  # type: ignore[call-arg]
+        base_url, http_client=signing_client, timeout_ms=int(timeout * 1000), interceptors=interceptors
+    )
+    return _register(client, base_url, signing_client)
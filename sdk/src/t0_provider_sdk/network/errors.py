@@ -0,0 +1,19 @@
+"""Error types for the client-side signing transport."""
+
+from __future__ import annotations
+
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+
+
+class RateLimitExceededError(ConnectError):
+    """An outbound request was rejected by the local rate limiter.
+
+    Subclasses ConnectError so that ConnectRPC propagates it unchanged to the caller
+    with code RESOURCE_EXHAUSTED, the same code the network uses for server-side throttling.
+    """
+
+    def __init__(self, method: str, retry_after: float) -> None:
+        super().__init__(Code.RESOURCE_EXHAUSTED, f"rate limit exceeded for {method}, retry after {retry_after:.3f}s")
+        self.method = method
+        self.retry_after = retry_after
@@ -0,0 +1,215 @@
+"""In-process metrics for outbound RPCs to the T-0 Network.
+
+The hooks that feed a t0_provider_sdk.common.metrics.MetricsRegistry from the
+network client:
+
+- MetricsInterceptor / MetricsInterceptorSync: ConnectRPC client interceptors that
+  record total call latency and the result code per RPC method.
+- MetricsTransport / MetricsSyncTransport: pyqwest transport wrappers that record
+  time-to-first-byte (request sent until response headers received).
+- SigningClient / SigningSyncClient record signing time and request/response sizes
+  when given a ClientMetrics instance.
+
+MetricsRegistry, Counter and Histogram are re-exported from this module for existing
+imports.
+
+No Go equivalent; the Go SDK leaves instrumentation to OpenTelemetry middleware.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from connectrpc.errors import ConnectError
+
+from t0_provider_sdk.common.metrics import (
+    DEFAULT_LATENCY_BUCKETS,
+    Counter,
+    Histogram,
+    HistogramSnapshot,
+    MetricsRegistry,
+)
+from t0_provider_sdk.network.ratelimit import rpc_method_from_url
+
+if TYPE_CHECKING:
+    import pyqwest
+    from connectrpc.request import RequestContext
+
+# Size buckets in bytes, up to the 4 MiB default body limit.
+DEFAULT_SIZE_BUCKETS: tuple[float, ...] = (
+    64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304,
+)  # fmt: skip
+
+RESULT_OK = "ok"
+RESULT_UNKNOWN = "unknown"
+
+__all__ = [
+    "DEFAULT_LATENCY_BUCKETS",
+    "DEFAULT_SIZE_BUCKETS",
+    "ClientMetrics",
+    "Counter",
+    "Histogram",
+    "HistogramSnapshot",
+    "MetricsInterceptor",
+    "MetricsInterceptorSync",
+    "MetricsRegistry",
+    "MetricsSyncTransport",
+    "MetricsTransport",
+]
+
+
+class ClientMetrics:
+    """Per-method metrics for outbound RPCs, backed by a MetricsRegistry.
+
+    Pass an instance to new_service_client() / new_service_client_sync() via metrics=
+    to instrument a client; one instance may be shared between clients.
+
+    Metrics (all labelled by RPC method name, e.g. method="UpdateQuote"):
+        t0_client_signing_seconds: time spent hashing and signing the request body.
+        t0_client_ttfb_seconds: time from sending the request to receiving response headers.
+        t0_client_request_duration_seconds: total call latency as seen by the caller.
+        t0_client_request_size_bytes: request body size on the wire.
+        t0_client_response_size_bytes: response body size on the wire.
+        t0_client_requests_total: completed calls, additionally labelled by Connect code ("ok" on success).
+    """
+
+    def __init__(
+        self,
+        registry: MetricsRegistry | None = None,
+        *,
+        latency_buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+        size_buckets: tuple[float, ...] = DEFAULT_SIZE_BUCKETS,
+    ) -> None:
+        self.registry = registry or MetricsRegistry()
+        self._latency_buckets = latency_buckets
+        self._size_buckets = size_buckets
+
+    def observe_signing(self, method: str, seconds: float) -> None:
+        self.registry.histogram(
+            "t0_client_signing_seconds", "Time spent signing outbound requests.", self._latency_buckets, method=method
+        ).observe(seconds)
+
+    def observe_ttfb(self, method: str, seconds: float) -> None:
+        self.registry.histogram(
+            "t0_client_ttfb_seconds",
+            "Time from sending an outbound request to receiving response headers.",
+            self._latency_buckets,
+            method=method,
+        ).observe(seconds)
+
+    def observe_request_size(self, method: str, size: int) -> None:
+        self.registry.histogram(
+            "t0_client_request_size_bytes", "Outbound request body size.", self._size_buckets, method=method
+        ).observe(size)
+
+    def observe_response_size(self, method: str, size: int) -> None:
+        self.registry.histogram(
+            "t0_client_response_size_bytes",
+            "Response body size of outbound requests.",
+            self._size_buckets,
+            method=method,
+        ).observe(size)
+
+    def observe_call(self, method: str, seconds: float, code: str) -> None:
+        """Record a completed call: its total latency and its result code."""
+        self.registry.histogram(
+            "t0_client_request_duration_seconds",
+            "Total latency of outbound RPCs.",
+            self._latency_buckets,
+            method=method,
+        ).observe(seconds)
+        self.registry.counter(
+            "t0_client_requests_total", "Completed outbound RPCs by result code.", method=method, code=code
+        ).inc()
+
+    def to_prometheus(self) -> str:
+        return self.registry.to_prometheus()
+
+
+def _result_code(exc: BaseException) -> str:
+    if isinstance(exc, ConnectError):
+        return exc.code.value
+    return RESULT_UNKNOWN
+
+
+class MetricsInterceptor:
+    """Async ConnectRPC client interceptor recording call latency and result codes.
+
+    Implements the UnaryInterceptor protocol (connectrpc._interceptor_async.UnaryInterceptor).
+    """
+
+    def __init__(self, metrics: ClientMetrics) -> None:
+        self._metrics = metrics
+
+    async def intercept_unary(
+        self,
+        call_next: Callable[[Any, RequestContext], Awaitable[Any]],
+        request: Any,
+        ctx: RequestContext,
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            response = await call_next(request, ctx)
+        except BaseException as exc:
+            self._metrics.observe_call(ctx.method().name, time.perf_counter() - start, _result_code(exc))
+            raise
+        self._metrics.observe_call(ctx.method().name, time.perf_counter() - start, RESULT_OK)
+        return response
+
+
+class MetricsInterceptorSync:
+    """Sync ConnectRPC client interceptor recording call latency and result codes.
+
+    Implements the UnaryInterceptorSync protocol (connectrpc._interceptor_sync.UnaryInterceptorSync).
+    """
+
+    def __init__(self, metrics: ClientMetrics) -> None:
+        self._metrics = metrics
+
+    def intercept_unary_sync(
+        self,
+        call_next: Callable[[Any, RequestContext], Any],
+        request: Any,
+        ctx: RequestContext,
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            response = call_next(request, ctx)
+        except BaseException as exc:
+            self._metrics.observe_call(ctx.method().name, time.perf_counter() - start, _result_code(exc))
+            raise
+        self._metrics.observe_call(ctx.method().name, time.perf_counter() - start, RESULT_OK)
+        return response
+
+
+class MetricsTransport:
+    """pyqwest Transport wrapper recording time-to-first-byte per RPC method.
+
+    execute() returns as soon as response headers arrive, so its duration is the
+    network round trip excluding the response body.
+    """
+
+    def __init__(self, inner: pyqwest.Transport, metrics: ClientMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    async def execute(self, request: pyqwest.Request) -> pyqwest.Response:
+        start = time.perf_counter()
+        response = await self._inner.execute(request)
+        self._metrics.observe_ttfb(rpc_method_from_url(request.url), time.perf_counter() - start)
+        return response
+
+
+class MetricsSyncTransport:
+    """pyqwest SyncTransport wrapper recording time-to-first-byte per RPC method."""
+
+    def __init__(self, inner: pyqwest.SyncTransport, metrics: ClientMetrics) -> None:
+        self._inner = inner
+        self._metrics = metrics
+
+    def execute_sync(self, request: pyqwest.SyncRequest) -> pyqwest.SyncResponse:
+        start = time.perf_counter()
+        response = self._inner.execute_sync(request)
+        self._metrics.observe_ttfb(rpc_method_from_url(request.url), time.perf_counter() - start)
+        return response
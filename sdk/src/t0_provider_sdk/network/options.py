@@ -2,3 +2,12 @@
 
 DEFAULT_BASE_URL = "https://api.t-0.network"
 DEFAULT_TIMEOUT = 15.0
+
+# Idle pooled connections are closed after this many seconds (pyqwest default)
+DEFAULT_POOL_IDLE_TIMEOUT = 90.0
+
+# Connections opened by warm_up() and kept alive by KeepAlive
+DEFAULT_WARM_CONNECTIONS = 4
+
+# Seconds between keep-alive rounds; must stay below DEFAULT_POOL_IDLE_TIMEOUT
+DEFAULT_KEEPALIVE_INTERVAL = 30.0
@@ -0,0 +1,361 @@
+"""Durable outbox for outbound network requests.
+
+Calling FinalizePayout (or any other NetworkService RPC) inline from an inbound
+handler loses the call if the request fails or the process dies before it is
+retried. The outbox persists the request first and delivers it in the background:
+
+    ProviderService handler ──enqueue──▶ Outbox (SQLite, WAL) ──claim──▶ OutboxWorker
+                                                                            │
+                                                  NetworkServiceClient ◀────┘
+                                                  (bounded concurrency, retries)
+
+Requests are stored as serialized protobuf bytes together with the name of the
+client method to call (e.g. "finalize_payout"). Entries are deduplicated by
+(method, dedupe_key); the key defaults to the request's payment_id field, so a
+redelivered PayOut cannot enqueue a second FinalizePayout for the same payment.
+
+All NetworkService RPCs are idempotent, which makes at-least-once delivery safe.
+
+Example:
+    outbox = Outbox("outbox.db")
+    worker = OutboxWorker(outbox, network_client, concurrency=8)
+    asyncio.create_task(worker.run(shutdown_event))
+
+    # in pay_out():
+    await outbox.enqueue("finalize_payout", FinalizePayoutRequest(payment_id=..., success=...))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable
+
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+from google.protobuf import descriptor_pool, message_factory
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from google.protobuf.message import Message
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_ATTEMPTS = 20
+DEFAULT_BASE_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 60.0
+DEFAULT_POLL_INTERVAL = 1.0
+
+STATUS_PENDING = "pending"
+STATUS_INFLIGHT = "inflight"
+STATUS_DONE = "done"
+STATUS_DEAD = "dead"
+
+# Errors that will not succeed on retry; the entry is moved to the dead state.
+_PERMANENT_CODES = frozenset(
+    {
+        Code.INVALID_ARGUMENT,
+        Code.NOT_FOUND,
+        Code.PERMISSION_DENIED,
+        Code.UNIMPLEMENTED,
+        Code.FAILED_PRECONDITION,
+        Code.OUT_OF_RANGE,
+    }
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    method TEXT NOT NULL,
+    dedupe_key TEXT,
+    type_name TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    UNIQUE (method, dedupe_key)
+);
+CREATE INDEX IF NOT EXISTS outbox_ready ON outbox (status, next_attempt_at);
+"""
+
+
+@dataclass(frozen=True)
+class OutboxEntry:
+    """A persisted outbound request."""
+
+    id: int
+    method: str
+    dedupe_key: str | None
+    type_name: str
+    payload: bytes
+    attempts: int
+
+    def decode(self) -> Message:
+        """Rebuild the request message from its serialized payload."""
+        descriptor = descriptor_pool.Default().FindMessageTypeByName(self.type_name)
+        message = message_factory.GetMessageClass(descriptor)()
+        message.ParseFromString(self.payload)
+        return message
+
+
+def default_dedupe_key(request: Message) -> str | None:
+    """Return the request's payment_id as dedupe key, or None if it has no such field or it is unset."""
+    if "payment_id" in request.DESCRIPTOR.fields_by_name and request.payment_id:  # type: ignore[attr-defined]
+        return str(request.payment_id)  # type: ignore[attr-defined]
+    return None
+
+
+class Outbox:
+    """SQLite-backed persistent queue of outbound requests.
+
+    The database runs in WAL mode with synchronous=FULL, so an enqueue that returned
+    survives a process crash. A single connection is shared between threads behind a
+    lock; the async methods run the blocking SQLite calls in a worker thread.
+
+    Entries left in flight by a previous process are requeued when the outbox is
+    opened, so only one Outbox may be open per database file at a time.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[], None]] = []
+        requeued = self.requeue_inflight()
+        if requeued:
+            logger.info("Requeued %d outbox entries left in flight", requeued)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def subscribe(self, listener: Callable[[], None]) -> Callable[[], None]:
+        """Register a callback invoked after every successful enqueue; its exceptions are logged.
+
+        Returns:
+            A function that removes the listener.
+        """
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def enqueue_sync(self, method: str, request: Message, *, dedupe_key: str | None = None) -> bool:
+        """Persist a request for delivery.
+
+        Args:
+            method: Name of the client method to call, e.g. "finalize_payout".
+            request: The request message.
+            dedupe_key: Deduplication key; defaults to the request's payment_id.
+
+        Returns:
+            True if the request was enqueued, False if an entry with the same
+            (method, dedupe_key) already exists.
+        """
+        if dedupe_key is None:
+            dedupe_key = default_dedupe_key(request)
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO outbox"
+                " (method, dedupe_key, type_name, payload, status, next_attempt_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    method,
+                    dedupe_key,
+                    request.DESCRIPTOR.full_name,
+                    request.SerializeToString(),
+                    STATUS_PENDING,
+                    now,
+                    now,
+                ),
+            )
+            inserted = cursor.rowcount == 1
+        if inserted:
+            for listener in list(self._listeners):
+                try:
+                    listener()
+                except Exception:
+                    # the entry is already stored; a failing listener must not fail the enqueue
+                    logger.exception("Outbox enqueue listener failed")
+        return inserted
+
+    async def enqueue(self, method: str, request: Message, *, dedupe_key: str | None = None) -> bool:
+        """Async variant of enqueue_sync(); the fsync happens off the event loop."""
+        return await asyncio.to_thread(self.enqueue_sync, method, request, dedupe_key=dedupe_key)
+
+    def claim(self, limit: int) -> list[OutboxEntry]:
+        """Mark up to limit due entries as in flight and return them, oldest first."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, method, dedupe_key, type_name, payload, attempts FROM outbox"
+                    " WHERE status = ? AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT ?",
+                    (STATUS_PENDING, time.time(), limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE outbox SET status = ? WHERE id = ?", [(STATUS_INFLIGHT, row[0]) for row in rows]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [OutboxEntry(*row) for row in rows]
+
+    def complete(self, entry_id: int) -> None:
+        """Mark an entry as delivered. Delivered entries are kept for deduplication."""
+        self._update(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = NULL WHERE id = ?",
+            (STATUS_DONE, entry_id),
+        )
+
+    def retry(self, entry_id: int, delay: float, error: str) -> None:
+        """Return an entry to the queue, due again after delay seconds."""
+        self._update(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1, next_attempt_at = ?, last_error = ? WHERE id = ?",
+            (STATUS_PENDING, time.time() + delay, error, entry_id),
+        )
+
+    def fail(self, entry_id: int, error: str) -> None:
+        """Move an entry to the dead state; it will not be retried."""
+        self._update(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ? WHERE id = ?",
+            (STATUS_DEAD, error, entry_id),
+        )
+
+    def requeue_inflight(self) -> int:
+        """Return entries left in flight by a previous process to the queue; done on open.
+
+        Returns:
+            The number of requeued entries.
+        """
+        return self._update("UPDATE outbox SET status = ? WHERE status = ?", (STATUS_PENDING, STATUS_INFLIGHT))
+
+    def purge_completed(self, older_than: float) -> int:
+        """Delete delivered entries created more than older_than seconds ago.
+
+        Purged entries no longer take part in deduplication.
+        """
+        return self._update(
+            "DELETE FROM outbox WHERE status = ? AND created_at < ?", (STATUS_DONE, time.time() - older_than)
+        )
+
+    def counts(self) -> dict[str, int]:
+        """Number of entries per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall()
+        return dict(rows)
+
+    def dead_entries(self) -> list[tuple[OutboxEntry, str | None]]:
+        """Entries that exhausted their retries, with the last error."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, method, dedupe_key, type_name, payload, attempts, last_error FROM outbox"
+                " WHERE status = ? ORDER BY id",
+                (STATUS_DEAD,),
+            ).fetchall()
+        return [(OutboxEntry(*row[:6]), row[6]) for row in rows]
+
+    def _update(self, sql: str, params: tuple[Any, ...]) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+
+class OutboxWorker:
+    """Drains an Outbox through a ConnectRPC client with bounded concurrency.
+
+    Each entry is delivered by calling getattr(client, entry.method)(request).
+    Transient failures are retried with exponential backoff and jitter; permanent
+    ConnectError codes (e.g. INVALID_ARGUMENT) and exhausted retries move the entry
+    to the dead state, logged and available via Outbox.dead_entries().
+    """
+
+    def __init__(
+        self,
+        outbox: Outbox,
+        client: Any,
+        *,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self._outbox = outbox
+        self._client = client
+        self._concurrency = concurrency
+        self._max_attempts = max_attempts
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._poll_interval = poll_interval
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """Deliver entries until shutdown_event is set, then wait for in-flight sends."""
+        loop = asyncio.get_running_loop()
+        wakeup = asyncio.Event()
+        unsubscribe = self._outbox.subscribe(lambda: loop.call_soon_threadsafe(wakeup.set))
+        inflight: set[asyncio.Task[None]] = set()
+
+        def on_done(task: asyncio.Task[None]) -> None:
+            inflight.discard(task)
+            wakeup.set()
+
+        try:
+            while not shutdown_event.is_set():
+                wakeup.clear()
+                free = self._concurrency - len(inflight)
+                if free > 0:
+                    for entry in await asyncio.to_thread(self._outbox.claim, free):
+                        task = asyncio.create_task(self._deliver(entry))
+                        inflight.add(task)
+                        task.add_done_callback(on_done)
+                await _wait_any(wakeup, shutdown_event, timeout=self._poll_interval)
+        finally:
+            unsubscribe()
+            if inflight:
+                await asyncio.gather(*inflight, return_exceptions=True)
+
+    async def _deliver(self, entry: OutboxEntry) -> None:
+        try:
+            await getattr(self._client, entry.method)(entry.decode())
+        except Exception as e:
+            code = e.code if isinstance(e, ConnectError) else Code.UNAVAILABLE
+            attempts = entry.attempts + 1
+            if code in _PERMANENT_CODES or attempts >= self._max_attempts:
+                logger.error(
+                    "Outbox entry %d (%s) failed permanently after %d attempts: %s", entry.id, entry.method, attempts, e
+                )
+                await asyncio.to_thread(self._outbox.fail, entry.id, str(e))
+            else:
+                delay = self._backoff(attempts)
+                logger.warning("Outbox entry %d (%s) failed, retrying in %.1fs: %s", entry.id, entry.method, delay, e)
+                await asyncio.to_thread(self._outbox.retry, entry.id, delay, str(e))
+            return
+        await asyncio.to_thread(self._outbox.complete, entry.id)
+
+    def _backoff(self, attempts: int) -> float:
+        """Exponential backoff with equal jitter: between half the exponential delay and all of it."""
+        ceiling = min(self._max_backoff, self._base_backoff * 2 ** (attempts - 1))
+        return random.uniform(ceiling / 2, ceiling)
+
+
+async def _wait_any(*events: asyncio.Event, timeout: float) -> None:
+    """Wait until any of the events is set or the timeout elapses."""
+    waiters = [asyncio.ensure_future(event.wait()) for event in events]
+    try:
+        await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
@@ -0,0 +1,171 @@
+"""Token-bucket rate limiting for outgoing requests.
+
+The T-0 Network throttles providers that publish quotes more than once per second
+or burst other RPCs (e.g. FinalizePayout during a payout spike). A RateLimiter
+smooths such bursts on the client side: every request takes one token from the
+global bucket and one from the bucket of its RPC method.
+
+Buckets are guarded by a threading.Lock and only ever compute how long a caller
+must wait; the waiting itself happens outside the lock (asyncio.sleep for the
+async client, time.sleep for the sync client). A single RateLimiter can therefore
+be shared between SigningClient and SigningSyncClient, across threads and event loops.
+
+Example:
+    limiter = RateLimiter(
+        global_limit=RateLimit(rate=20, burst=40),
+        method_limits={"UpdateQuote": RateLimit(rate=1)},
+        max_wait=2.0,
+    )
+    client = new_service_client(private_key, NetworkServiceClient, rate_limiter=limiter)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable
+
+from t0_provider_sdk.network.errors import RateLimitExceededError
+
+# Default upper bound (seconds) a request may be queued before it is rejected
+DEFAULT_MAX_WAIT = 5.0
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Sustained rate (requests per second) and burst size of a token bucket."""
+
+    rate: float
+    burst: int = 1
+
+    def __post_init__(self) -> None:
+        if self.rate <= 0:
+            raise ValueError("rate must be positive")
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+
+
+class TokenBucket:
+    """Thread-safe token bucket.
+
+    The bucket starts full. Reservations may drive the token count negative, which
+    queues callers in FIFO order: each new reservation waits for the tokens owed by
+    the reservations before it.
+    """
+
+    def __init__(self, limit: RateLimit, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._rate = limit.rate
+        self._burst = float(limit.burst)
+        self._clock = clock
+        self._tokens = self._burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, max_wait: float) -> float | None:
+        """Reserve one token.
+
+        Args:
+            max_wait: Longest acceptable delay in seconds.
+
+        Returns:
+            The delay in seconds the caller must wait before proceeding, or None if
+            the delay would exceed max_wait (nothing is reserved in that case).
+        """
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+
+            wait = max(0.0, (1.0 - self._tokens) / self._rate)
+            if wait > max_wait:
+                return None
+            self._tokens -= 1.0
+            return wait
+
+    def release(self) -> None:
+        """Return a token taken by reserve(), e.g. when another bucket refused the request."""
+        with self._lock:
+            self._tokens = min(self._burst, self._tokens + 1.0)
+
+    def retry_after(self) -> float:
+        """Seconds until one token becomes available."""
+        with self._lock:
+            now = self._clock()
+            tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            return max(0.0, (1.0 - tokens) / self._rate)
+
+
+@dataclass
+class RateLimiter:
+    """Global and per-method token-bucket limiter for outgoing RPCs.
+
+    Attributes:
+        global_limit: Limit applied to all requests, or None for no global limit.
+        method_limits: Limits keyed by RPC method name (e.g. "UpdateQuote", "FinalizePayout").
+        max_wait: Longest time in seconds a request is queued. Requests that would wait
+            longer fail with RateLimitExceededError. Use 0 to reject instead of queueing.
+    """
+
+    global_limit: RateLimit | None = None
+    method_limits: dict[str, RateLimit] = field(default_factory=dict)
+    max_wait: float = DEFAULT_MAX_WAIT
+    clock: Callable[[], float] = time.monotonic
+    _global_bucket: TokenBucket | None = field(init=False, repr=False)
+    _method_buckets: dict[str, TokenBucket] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._global_bucket = TokenBucket(self.global_limit, clock=self.clock) if self.global_limit else None
+        self._method_buckets = {
+            method: TokenBucket(limit, clock=self.clock) for method, limit in self.method_limits.items()
+        }
+
+    def reserve(self, method: str, *, max_wait: float | None = None) -> float:
+        """Reserve capacity for one request to method.
+
+        Args:
+            method: RPC method name.
+            max_wait: Overrides the limiter's max_wait for this reservation.
+
+        Returns:
+            Delay in seconds the caller must wait before sending.
+
+        Raises:
+            RateLimitExceededError: If the request would wait longer than max_wait.
+        """
+        if max_wait is None:
+            max_wait = self.max_wait
+        taken: list[TokenBucket] = []
+        delay = 0.0
+        for bucket in (self._method_buckets.get(method), self._global_bucket):
+            if bucket is None:
+                continue
+            wait = bucket.reserve(max_wait)
+            if wait is None:
+                for reserved in taken:
+                    reserved.release()
+                raise RateLimitExceededError(method, bucket.retry_after())
+            taken.append(bucket)
+            delay = max(delay, wait)
+        return delay
+
+    async def acquire(self, method: str) -> None:
+        """Wait (asynchronously) until a request to method may be sent."""
+        delay = self.reserve(method)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def acquire_sync(self, method: str) -> None:
+        """Block the calling thread until a request to method may be sent."""
+        delay = self.reserve(method)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def rpc_method_from_url(url: str) -> str:
+    """Extract the RPC method name from a ConnectRPC URL.
+
+    "https://api.t-0.network/tzero.v1.payment.NetworkService/UpdateQuote?..." -> "UpdateQuote"
+    """
+    return url.split("?", 1)[0].rsplit("/", 1)[-1]
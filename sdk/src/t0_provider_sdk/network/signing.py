@@ -2,7 +2,13 @@
 
 These wrappers intercept outgoing requests to add T-0 Network signature headers
 before delegating to the underlying pyqwest client. ConnectRPC uses exactly
-three methods on the client: get(), post(), and stream().
+three methods on the client: get(), post(), and stream(). head() is used by
+connection warm-up (see warmup.py).
+
+An optional RateLimiter is consulted before signing, so that a request queued by
+the limiter is signed with a fresh timestamp once it is allowed through. An
+optional ClientMetrics records signing time, request/response sizes and (via a
+transport wrapper) time-to-first-byte per RPC method.
 
 Go equivalent: network/signing_transport.go → SigningTransport.RoundTrip(req)
 """
@@ -21,9 +27,13 @@ from t0_provider_sdk.common.headers import (
     SIGNATURE_TIMESTAMP_HEADER,
 )
 from t0_provider_sdk.crypto.hash import legacy_keccak256
+from t0_provider_sdk.network.metrics import MetricsSyncTransport, MetricsTransport
+from t0_provider_sdk.network.ratelimit import rpc_method_from_url
 
 if TYPE_CHECKING:
     from t0_provider_sdk.crypto.signer import SignFn
+    from t0_provider_sdk.network.metrics import ClientMetrics
+    from t0_provider_sdk.network.ratelimit import RateLimiter
 
 
 def _sign_request(
@@ -53,6 +63,30 @@ def _sign_request(
     return headers
 
 
+def _sign_observed(
+    sign_fn: SignFn,
+    metrics: ClientMetrics | None,
+    url: str,
+    body: bytes,
+    headers: pyqwest.Headers | None,
+) -> pyqwest.Headers:
+    """Sign the request, recording signing time and request size when metrics are enabled."""
+    if metrics is None:
+        return _sign_request(sign_fn, body, headers)
+    method = rpc_method_from_url(url)
+    start = time.perf_counter()
+    headers = _sign_request(sign_fn, body, headers)
+    metrics.observe_signing(method, time.perf_counter() - start)
+    metrics.observe_request_size(method, len(body))
+    return headers
+
+
+def _observe_response(metrics: ClientMetrics | None, url: str, response: Any) -> Any:
+    if metrics is not None:
+        metrics.observe_response_size(rpc_method_from_url(url), len(response.content))
+    return response
+
+
 class SigningClient:
     """Async signing wrapper for pyqwest.Client.
 
@@ -60,26 +94,49 @@ class SigningClient:
     Intercepts get(), post(), stream() to add signature headers.
     """
 
-    def __init__(self, sign_fn: SignFn, *, transport: Any | None = None) -> None:
+    def __init__(
+        self,
+        sign_fn: SignFn,
+        *,
+        transport: Any | None = None,
+        rate_limiter: RateLimiter | None = None,
+        metrics: ClientMetrics | None = None,
+    ) -> None:
+        if metrics is not None:
+            transport = MetricsTransport(transport or pyqwest.get_default_transport(), metrics)
         self._inner = pyqwest.Client(transport=transport) if transport else pyqwest.Client()
         self._sign_fn = sign_fn
+        self._rate_limiter = rate_limiter
+        self._metrics = metrics
 
     async def get(self, url: str, headers: pyqwest.Headers | None = None) -> Any:
-        headers = _sign_request(self._sign_fn, b"", headers)
-        return await self._inner.get(url, headers=headers)
+        if self._rate_limiter:
+            await self._rate_limiter.acquire(rpc_method_from_url(url))
+        headers = _sign_observed(self._sign_fn, self._metrics, url, b"", headers)
+        return _observe_response(self._metrics, url, await self._inner.get(url, headers=headers))
 
     async def post(
         self, url: str, headers: pyqwest.Headers | None = None, content: bytes | None = None
     ) -> Any:
+        if self._rate_limiter:
+            await self._rate_limiter.acquire(rpc_method_from_url(url))
         body = content or b""
-        headers = _sign_request(self._sign_fn, body, headers)
-        return await self._inner.post(url, headers=headers, content=content)
+        headers = _sign_observed(self._sign_fn, self._metrics, url, body, headers)
+        return _observe_response(self._metrics, url, await self._inner.post(url, headers=headers, content=content))
+
+    async def head(self, url: str, headers: pyqwest.Headers | None = None) -> Any:
+        """Send a signed HEAD request. Not an RPC: bypasses rate limiting and metrics."""
+        headers = _sign_request(self._sign_fn, b"", headers)
+        return await self._inner.head(url, headers=headers)
 
     def stream(
         self, method: str, url: str, headers: pyqwest.Headers | None = None, content: bytes | None = None
     ) -> Any:
+        # stream() returns a context manager synchronously, so it can only reject, not wait.
+        if self._rate_limiter:
+            self._rate_limiter.reserve(rpc_method_from_url(url), max_wait=0.0)
         body = content or b""
-        headers = _sign_request(self._sign_fn, body, headers)
+        headers = _sign_observed(self._sign_fn, self._metrics, url, body, headers)
         return self._inner.stream(method, url, headers=headers, content=content)
 
 
@@ -88,15 +145,31 @@ class SigningSyncClient:
 
     Passed to ConnectRPC sync client via http_client= parameter.
     Intercepts get(), post(), stream() to add signature headers.
+
+    Thread-safe: holds no per-request state, so one instance may be shared by all
+    threads of a WSGI worker (see new_pooled_service_client_sync()).
     """
 
-    def __init__(self, sign_fn: SignFn, *, transport: Any | None = None) -> None:
+    def __init__(
+        self,
+        sign_fn: SignFn,
+        *,
+        transport: Any | None = None,
+        rate_limiter: RateLimiter | None = None,
+        metrics: ClientMetrics | None = None,
+    ) -> None:
+        if metrics is not None:
+            transport = MetricsSyncTransport(transport or pyqwest.get_default_sync_transport(), metrics)
         self._inner = pyqwest.SyncClient(transport=transport) if transport else pyqwest.SyncClient()
         self._sign_fn = sign_fn
+        self._rate_limiter = rate_limiter
+        self._metrics = metrics
 
     def get(self, url: str, headers: pyqwest.Headers | None = None, timeout: float | None = None) -> Any:
-        headers = _sign_request(self._sign_fn, b"", headers)
-        return self._inner.get(url, headers=headers, timeout=timeout)
+        if self._rate_limiter:
+            self._rate_limiter.acquire_sync(rpc_method_from_url(url))
+        headers = _sign_observed(self._sign_fn, self._metrics, url, b"", headers)
+        return _observe_response(self._metrics, url, self._inner.get(url, headers=headers, timeout=timeout))
 
     def post(
         self,
@@ -105,9 +178,17 @@ class SigningSyncClient:
         content: bytes | None = None,
         timeout: float | None = None,
     ) -> Any:
+        if self._rate_limiter:
+            self._rate_limiter.acquire_sync(rpc_method_from_url(url))
         body = content or b""
-        headers = _sign_request(self._sign_fn, body, headers)
-        return self._inner.post(url, headers=headers, content=content, timeout=timeout)
+        headers = _sign_observed(self._sign_fn, self._metrics, url, body, headers)
+        response = self._inner.post(url, headers=headers, content=content, timeout=timeout)
+        return _observe_response(self._metrics, url, response)
+
+    def head(self, url: str, headers: pyqwest.Headers | None = None, timeout: float | None = None) -> Any:
+        """Send a signed HEAD request. Not an RPC: bypasses rate limiting and metrics."""
+        headers = _sign_request(self._sign_fn, b"", headers)
+        return self._inner.head(url, headers=headers, timeout=timeout)
 
     def stream(
         self,
@@ -117,6 +198,8 @@ class SigningSyncClient:
         content: bytes | None = None,
         timeout: float | None = None,
     ) -> Any:
+        if self._rate_limiter:
+            self._rate_limiter.acquire_sync(rpc_method_from_url(url))
         body = content or b""
-        headers = _sign_request(self._sign_fn, body, headers)
+        headers = _sign_observed(self._sign_fn, self._metrics, url, body, headers)
         return self._inner.stream(method, url, headers=headers, content=content, timeout=timeout)
@@ -0,0 +1,233 @@
+"""Connection pre-warming and keep-alive for network clients.
+
+The first RPC after a deploy or an idle period otherwise pays DNS, TCP and TLS
+setup against the network endpoint. warm_up() opens pooled connections ahead of
+time by sending concurrent signed HEAD requests to the client's base URL; any
+HTTP response, even an error status, leaves an established connection in the
+pool. KeepAlive repeats this periodically so pooled connections are reused
+before the pool idle timeout closes them, and reopens any the server dropped.
+
+Works with clients created by new_service_client(), new_service_client_sync()
+and new_pooled_service_client_sync(). Over HTTP/2 all requests share a single
+multiplexed connection, so warming more than one connection has no extra effect.
+
+No Go equivalent; Go's http.Transport is typically warmed by the first request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from t0_provider_sdk.network.client import client_endpoint
+from t0_provider_sdk.network.options import DEFAULT_KEEPALIVE_INTERVAL, DEFAULT_WARM_CONNECTIONS
+from t0_provider_sdk.network.signing import SigningClient, SigningSyncClient
+
+logger = logging.getLogger(__name__)
+
+# Per-request timeout for warm-up requests, in seconds
+DEFAULT_WARM_UP_TIMEOUT = 5.0
+
+
+def _endpoint(client: Any, signing_class: type) -> tuple[Any, str]:
+    """Return the signing HTTP client and base URL of a client created by the factories."""
+    base_url, http_client = client_endpoint(client)
+    if not isinstance(http_client, signing_class):
+        raise TypeError(f"client must use a {signing_class.__name__} (create it with the network client factories)")
+    return http_client, base_url
+
+
+def _check_connections(connections: int) -> None:
+    if connections < 1:
+        raise ValueError("connections must be at least 1")
+
+
+async def warm_up(
+    client: Any,
+    *,
+    connections: int = DEFAULT_WARM_CONNECTIONS,
+    timeout: float = DEFAULT_WARM_UP_TIMEOUT,
+) -> int:
+    """Pre-open pooled connections for an async network client.
+
+    Sends `connections` concurrent HEAD requests to the client's base URL. Failures
+    are logged rather than raised, so a network outage never blocks server startup.
+
+    Args:
+        client: Async client created by new_service_client().
+        connections: Number of connections to open.
+        timeout: Per-request timeout in seconds.
+
+    Returns:
+        Number of requests that received a response (i.e. connections established).
+    """
+    _check_connections(connections)
+    http_client, url = _endpoint(client, SigningClient)
+
+    async def probe() -> bool:
+        try:
+            await asyncio.wait_for(http_client.head(url), timeout)
+        except Exception as e:
+            logger.warning("Connection warm-up to %s failed: %s", url, e)
+            return False
+        return True
+
+    results = await asyncio.gather(*(probe() for _ in range(connections)))
+    return sum(results)
+
+
+def warm_up_sync(
+    client: Any,
+    *,
+    connections: int = DEFAULT_WARM_CONNECTIONS,
+    timeout: float = DEFAULT_WARM_UP_TIMEOUT,
+) -> int:
+    """Pre-open pooled connections for a sync network client.
+
+    Sync equivalent of warm_up(); the HEAD requests are sent from `connections` threads.
+
+    Args:
+        client: Sync client created by new_service_client_sync() or new_pooled_service_client_sync().
+        connections: Number of connections to open. Should not exceed the pool size.
+        timeout: Per-request timeout in seconds.
+
+    Returns:
+        Number of requests that received a response (i.e. connections established).
+    """
+    _check_connections(connections)
+    http_client, url = _endpoint(client, SigningSyncClient)
+
+    def probe(_: int) -> bool:
+        try:
+            http_client.head(url, timeout=timeout)
+        except Exception as e:
+            logger.warning("Connection warm-up to %s failed: %s", url, e)
+            return False
+        return True
+
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="t0-warm-up") as pool:
+        return sum(pool.map(probe, range(connections)))
+
+
+class KeepAlive:
+    """Keeps a pool of connections to the network endpoint warm for an async client.
+
+    Use start() and stop() as ASGI lifespan hooks, so the pool is hot before the
+    server accepts traffic:
+
+        keep_alive = KeepAlive(network_client)
+        app = new_asgi_app(key, handler(...), on_startup=[keep_alive.start], on_shutdown=[keep_alive.stop])
+
+    Alternatively, run(shutdown_event) as a background task.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        connections: int = DEFAULT_WARM_CONNECTIONS,
+        interval: float = DEFAULT_KEEPALIVE_INTERVAL,
+        timeout: float = DEFAULT_WARM_UP_TIMEOUT,
+    ) -> None:
+        _check_connections(connections)
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        _endpoint(client, SigningClient)
+        self._client = client
+        self._connections = connections
+        self._interval = interval
+        self._timeout = timeout
+        self._shutdown: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    async def warm_up(self) -> int:
+        return await warm_up(self._client, connections=self._connections, timeout=self._timeout)
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """Warm up immediately, then every interval until shutdown_event is set."""
+        await self.warm_up()
+        await self._keep_warm(shutdown_event)
+
+    async def start(self) -> None:
+        """Warm up the pool, then keep it warm in a background task until stop()."""
+        established = await self.warm_up()
+        logger.info("Warmed up %d/%d network connections", established, self._connections)
+        self._shutdown = asyncio.Event()
+        self._task = asyncio.create_task(self._keep_warm(self._shutdown))
+
+    async def stop(self) -> None:
+        """Stop the background task started by start()."""
+        if self._task is None or self._shutdown is None:
+            return
+        self._shutdown.set()
+        await self._task
+        self._task = None
+
+    async def _keep_warm(self, shutdown_event: asyncio.Event) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(shutdown_event.wait(), self._interval)
+                return
+            except TimeoutError:
+                pass
+            await self.warm_up()
+
+
+class KeepAliveSync:
+    """Keeps a pool of connections to the network endpoint warm for a sync client.
+
+    start() warms the pool and starts a daemon thread; stop() ends it. With gunicorn,
+    call start() after the worker has forked (e.g. in the post_worker_init hook or when
+    the WSGI module is imported by the worker).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        connections: int = DEFAULT_WARM_CONNECTIONS,
+        interval: float = DEFAULT_KEEPALIVE_INTERVAL,
+        timeout: float = DEFAULT_WARM_UP_TIMEOUT,
+    ) -> None:
+        _check_connections(connections)
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        _endpoint(client, SigningSyncClient)
+        self._client = client
+        self._connections = connections
+        self._interval = interval
+        self._timeout = timeout
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def warm_up(self) -> int:
+        return warm_up_sync(self._client, connections=self._connections, timeout=self._timeout)
+
+    def run(self, stop_event: threading.Event) -> None:
+        """Warm up immediately, then every interval until stop_event is set."""
+        self.warm_up()
+        while not stop_event.wait(self._interval):
+            self.warm_up()
+
+    def start(self) -> None:
+        """Warm up the pool, then keep it warm in a daemon thread until stop()."""
+        established = self.warm_up()
+        logger.info("Warmed up %d/%d network connections", established, self._connections)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._keep_warm, name="t0-keep-alive", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread started by start()."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _keep_warm(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.warm_up()
@@ -0,0 +1,29 @@
+"""Payment state tracking for T-0 Network providers."""
+
+from t0_provider_sdk.payments.errors import IllegalTransitionError, PaymentError, PaymentNotFoundError
+from t0_provider_sdk.payments.sqlite import SQLitePaymentBackend
+from t0_provider_sdk.payments.store import (
+    DEFAULT_LOCK_SHARDS,
+    TRANSITIONS,
+    MemoryPaymentBackend,
+    PaymentBackend,
+    PaymentRecord,
+    PaymentRole,
+    PaymentState,
+    PaymentStore,
+)
+
+__all__ = [
+    "DEFAULT_LOCK_SHARDS",
+    "TRANSITIONS",
+    "IllegalTransitionError",
+    "MemoryPaymentBackend",
+    "PaymentBackend",
+    "PaymentError",
+    "PaymentNotFoundError",
+    "PaymentRecord",
+    "PaymentRole",
+    "PaymentState",
+    "PaymentStore",
+    "SQLitePaymentBackend",
+]
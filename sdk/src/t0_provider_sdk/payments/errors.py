@@ -0,0 +1,34 @@
+"""Error types for payment state tracking.
+
+No Go equivalent; the Go starter leaves payment state to the integrator.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.payments.store import PaymentRecord, PaymentState
+
+
+class PaymentError(ValueError):
+    """Base class for all payment store errors."""
+
+
+class PaymentNotFoundError(PaymentError):
+    """No payment is stored under the given id."""
+
+    def __init__(self, payment_id: int = 0, payment_client_id: str = "") -> None:
+        key = f"payment_client_id {payment_client_id!r}" if payment_client_id else f"payment_id {payment_id}"
+        super().__init__(f"unknown payment: {key}")
+        self.payment_id = payment_id
+        self.payment_client_id = payment_client_id
+
+
+class IllegalTransitionError(PaymentError):
+    """A payment cannot move from its current state to the requested one."""
+
+    def __init__(self, record: PaymentRecord, state: PaymentState) -> None:
+        super().__init__(f"payment {record.payment_id or record.payment_client_id!r}: {record.state} -> {state}")
+        self.record = record
+        self.state = state
@@ -0,0 +1,147 @@
+"""SQLite storage for PaymentStore.
+
+Records live in one WAL-mode table keyed by (role, key) with an index on
+(role, payment_id). Each thread gets its own connection, so reads of unrelated
+payments run in parallel; SQLite still serializes commits, one per put().
+Given a GroupCommitWriter, puts from concurrent threads are committed together
+instead, and each put() still returns only once its own write is durable.
+
+No Go equivalent; the Go starter leaves payment state to the integrator.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+from typing import TYPE_CHECKING
+
+from t0_provider_sdk.payments.store import PaymentRecord, PaymentRole, PaymentState
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from t0_provider_sdk.common.groupcommit import GroupCommitWriter
+
+# Seconds a connection waits for another connection's write lock
+DEFAULT_BUSY_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payments (
+    role TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payment_id INTEGER NOT NULL,
+    payment_client_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (role, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS payments_payment_id ON payments (role, payment_id);
+"""
+
+_COLUMNS = "role, payment_id, payment_client_id, state, version, updated_at"
+
+
+def _to_sql(payment_id: int) -> int:
+    """uint64 payment_id as the signed 64-bit integer SQLite stores."""
+    return payment_id - (1 << 64) if payment_id >= 1 << 63 else payment_id
+
+
+def _record(row: tuple) -> PaymentRecord:
+    role, payment_id, payment_client_id, state, version, updated_at = row
+    return PaymentRecord(
+        PaymentRole(role), payment_id % (1 << 64), payment_client_id, PaymentState(state), version, updated_at
+    )
+
+
+class SQLitePaymentBackend:
+    """Payment records in a SQLite database in WAL mode.
+
+    With synchronous=FULL (the default) a put() that returned survives a
+    process crash; NORMAL trades that for fewer fsyncs.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        synchronous: str = "FULL",
+        busy_timeout: float = DEFAULT_BUSY_TIMEOUT,
+        writer: GroupCommitWriter | None = None,
+    ) -> None:
+        """Open or create the database.
+
+        Args:
+            path: Database file.
+            synchronous: SQLite synchronous pragma ("FULL" or "NORMAL") of direct puts.
+            busy_timeout: Seconds a connection waits for another one's write lock.
+            writer: Group commit writer of the same database file; puts go through
+                it. The caller owns it and closes it after the backend.
+        """
+        if synchronous.upper() not in ("FULL", "NORMAL"):
+            raise ValueError("synchronous must be FULL or NORMAL")
+        self._path = str(path)
+        self._synchronous = synchronous.upper()
+        self._busy_timeout = busy_timeout
+        self._writer = writer
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                self._path, timeout=self._busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            conn.execute(f"PRAGMA synchronous={self._synchronous}")
+            with self._lock:
+                self._connections.append(conn)
+            self._local.conn = conn
+        return conn
+
+    def get(self, role: PaymentRole, key: str) -> PaymentRecord | None:
+        row = (
+            self._conn()
+            .execute(f"SELECT {_COLUMNS} FROM payments WHERE role = ? AND key = ?", (role.value, key))
+            .fetchone()
+        )
+        return None if row is None else _record(row)
+
+    def find(self, role: PaymentRole, payment_id: int) -> PaymentRecord | None:
+        if not payment_id:
+            return None
+        row = (
+            self._conn()
+            .execute(
+                f"SELECT {_COLUMNS} FROM payments WHERE role = ? AND payment_id = ?", (role.value, _to_sql(payment_id))
+            )
+            .fetchone()
+        )
+        return None if row is None else _record(row)
+
+    def put(self, record: PaymentRecord) -> None:
+        sql = f"INSERT OR REPLACE INTO payments (key, {_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)"
+        parameters = (
+            record.key,
+            record.role.value,
+            _to_sql(record.payment_id),
+            record.payment_client_id,
+            record.state.value,
+            record.version,
+            record.updated_at,
+        )
+        if self._writer is not None:
+            self._writer.execute_sync(sql, parameters)
+        else:
+            self._conn().execute(sql, parameters)
+
+    def close(self) -> None:
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
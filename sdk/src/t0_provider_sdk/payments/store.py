@@ -0,0 +1,363 @@
+"""Payment state machine with pluggable storage.
+
+A provider takes part in a payment on one of two sides:
+
+- pay-in: it creates the payment (CreatePayment, keyed by its own
+  payment_client_id) and the network reports progress with UpdatePayment;
+- pay-out: the network asks it to pay out (PayoutRequest, keyed by payment_id)
+  and it answers with PayoutResponse and later FinalizePayout.
+
+PaymentStore tracks both with one state machine:
+
+    PENDING ──▶ MANUAL_AML_CHECK ──▶ ACCEPTED ──▶ CONFIRMED
+       │               │                │
+       └───────────────┴────────────────┴──────▶ FAILED
+
+Any other move raises IllegalTransitionError; repeating the current state (a
+redelivered notification) is a no-op. Pay-in payments are found by
+payment_client_id and by payment_id once the network assigned it; payouts by
+payment_id.
+
+Each payment is read, checked and written under the lock of its shard, so
+updates of one payment are serialized while unrelated payments do not wait
+for each other. Records are kept by a PaymentBackend: MemoryPaymentBackend
+(the default) or SQLitePaymentBackend.
+
+Example:
+    payments = PaymentStore(SQLitePaymentBackend("payments.db"))
+
+    async def update_payment(self, request, ctx):
+        await asyncio.to_thread(payments.update, request)
+        return UpdatePaymentResponse()
+
+No Go equivalent; the Go starter leaves payment state to the integrator.
+"""
+
+from __future__ import annotations
+
+import enum
+import threading
+import time
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING, Callable, Protocol
+
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.payments.errors import IllegalTransitionError, PaymentError, PaymentNotFoundError
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import CreatePaymentResponse, FinalizePayoutRequest
+    from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import (
+        PayoutRequest,
+        PayoutResponse,
+        UpdatePaymentRequest,
+    )
+    from t0_provider_sdk.common.metrics import Counter
+
+# Number of locks payments are spread over
+DEFAULT_LOCK_SHARDS = 64
+
+
+class PaymentRole(enum.StrEnum):
+    """Side of a payment the provider is on."""
+
+    PAY_IN = "pay_in"
+    PAY_OUT = "pay_out"
+
+
+class PaymentState(enum.StrEnum):
+    """State of a payment."""
+
+    PENDING = "pending"
+    MANUAL_AML_CHECK = "manual_aml_check"
+    ACCEPTED = "accepted"
+    CONFIRMED = "confirmed"
+    FAILED = "failed"
+
+
+# Legal moves from each state; CONFIRMED and FAILED are final.
+TRANSITIONS: dict[PaymentState, frozenset[PaymentState]] = {
+    PaymentState.PENDING: frozenset({PaymentState.MANUAL_AML_CHECK, PaymentState.ACCEPTED, PaymentState.FAILED}),
+    PaymentState.MANUAL_AML_CHECK: frozenset({PaymentState.ACCEPTED, PaymentState.FAILED}),
+    PaymentState.ACCEPTED: frozenset({PaymentState.CONFIRMED, PaymentState.FAILED}),
+    PaymentState.CONFIRMED: frozenset(),
+    PaymentState.FAILED: frozenset(),
+}
+
+# UpdatePaymentRequest.result and PayoutResponse.result fields, by the state they report
+_RESULT_STATES = {
+    "accepted": PaymentState.ACCEPTED,
+    "manual_aml_check": PaymentState.MANUAL_AML_CHECK,
+    "confirmed": PaymentState.CONFIRMED,
+    "failed": PaymentState.FAILED,
+}
+
+# FinalizePayoutRequest.result fields, by the state they report
+_FINALIZE_STATES = {
+    "success": PaymentState.CONFIRMED,
+    "failure": PaymentState.FAILED,
+}
+
+
+@dataclass(frozen=True)
+class PaymentRecord:
+    """Stored state of one payment.
+
+    Attributes:
+        role: Side of the payment the provider is on.
+        payment_id: Id assigned by the network; 0 for a pay-in not yet accepted.
+        payment_client_id: Id the provider assigned (pay-in only).
+        state: Current state.
+        version: Number of state changes so far.
+        updated_at: Clock time of the last change.
+    """
+
+    role: PaymentRole
+    payment_id: int
+    payment_client_id: str
+    state: PaymentState
+    version: int
+    updated_at: float
+
+    @property
+    def key(self) -> str:
+        """Primary key within the role: payment_client_id for pay-ins, payment_id for payouts."""
+        return self.payment_client_id if self.role is PaymentRole.PAY_IN else str(self.payment_id)
+
+
+class PaymentBackend(Protocol):
+    """Storage of payment records.
+
+    PaymentStore serializes calls per payment; a backend must allow calls for
+    different payments from several threads at once.
+    """
+
+    def get(self, role: PaymentRole, key: str) -> PaymentRecord | None:
+        """Record by primary key (PaymentRecord.key)."""
+        ...
+
+    def find(self, role: PaymentRole, payment_id: int) -> PaymentRecord | None:
+        """Record by network payment_id."""
+        ...
+
+    def put(self, record: PaymentRecord) -> None:
+        """Insert or replace a record; durable when it returns."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class MemoryPaymentBackend:
+    """Records in dicts; lost when the process exits."""
+
+    def __init__(self) -> None:
+        self._records: dict[tuple[PaymentRole, str], PaymentRecord] = {}
+        self._payment_ids: dict[tuple[PaymentRole, int], str] = {}
+
+    def get(self, role: PaymentRole, key: str) -> PaymentRecord | None:
+        return self._records.get((role, key))
+
+    def find(self, role: PaymentRole, payment_id: int) -> PaymentRecord | None:
+        key = self._payment_ids.get((role, payment_id))
+        return None if key is None else self._records.get((role, key))
+
+    def put(self, record: PaymentRecord) -> None:
+        self._records[record.role, record.key] = record
+        if record.payment_id:
+            self._payment_ids[record.role, record.payment_id] = record.key
+
+    def close(self) -> None:
+        pass
+
+
+class PaymentStore:
+    """Payments by role and id, moved only along TRANSITIONS.
+
+    All methods are thread-safe. They call the backend synchronously; with
+    SQLitePaymentBackend, call them from async handlers via asyncio.to_thread.
+
+    Metrics (recorded in `registry`):
+        t0_payment_transitions_total: State changes by new state (creations count as "pending").
+        t0_payment_illegal_transitions_total: Rejected state changes.
+    """
+
+    def __init__(
+        self,
+        backend: PaymentBackend | None = None,
+        *,
+        shards: int = DEFAULT_LOCK_SHARDS,
+        registry: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create a store.
+
+        Args:
+            backend: Where records are kept; a MemoryPaymentBackend if omitted.
+            shards: Number of locks payments are spread over.
+            registry: Metrics registry; a private one is created if omitted.
+            clock: Wall clock recorded as updated_at.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.backend = backend if backend is not None else MemoryPaymentBackend()
+        self.registry = registry or MetricsRegistry()
+        self._clock = clock
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._transitions: dict[PaymentState, Counter] = {
+            state: self.registry.counter("t0_payment_transitions_total", "Payment state changes.", state=state)
+            for state in PaymentState
+        }
+        self._illegal: Counter = self.registry.counter(
+            "t0_payment_illegal_transitions_total", "Rejected payment state changes."
+        )
+
+    def close(self) -> None:
+        self.backend.close()
+
+    def __enter__(self) -> PaymentStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    # --- Pay-in ---
+
+    def create(self, payment_client_id: str) -> PaymentRecord:
+        """Start tracking a payment before sending CreatePayment.
+
+        Returns:
+            The new PENDING record, or the existing one if the id is already tracked.
+        """
+        if not payment_client_id:
+            raise PaymentError("payment_client_id must not be empty")
+        return self._create(PaymentRole.PAY_IN, 0, payment_client_id)
+
+    def apply_create_response(self, response: CreatePaymentResponse) -> PaymentRecord:
+        """Record the payment_id the network assigned, or the failure it reported.
+
+        Raises:
+            PaymentNotFoundError: The payment_client_id is not tracked.
+        """
+        result = response.WhichOneof("result")
+        if result == "accepted":
+            return self._transition(
+                PaymentRole.PAY_IN, response.payment_client_id, None, payment_id=response.accepted.payment_id
+            )
+        state = PaymentState.FAILED if result == "failure" else None
+        return self._transition(PaymentRole.PAY_IN, response.payment_client_id, state)
+
+    def update(self, request: UpdatePaymentRequest) -> PaymentRecord:
+        """Apply an UpdatePayment notification.
+
+        The payment is found by payment_client_id, or by payment_id if the
+        request has no client id.
+
+        Raises:
+            PaymentNotFoundError: The payment is not tracked.
+            IllegalTransitionError: The payment cannot move to the reported state.
+        """
+        state = self._result_state(request.WhichOneof("result"))
+        key = request.payment_client_id
+        if not key:
+            record = self.backend.find(PaymentRole.PAY_IN, request.payment_id)
+            if record is None:
+                raise PaymentNotFoundError(request.payment_id)
+            key = record.key
+        return self._transition(PaymentRole.PAY_IN, key, state, payment_id=request.payment_id)
+
+    # --- Pay-out ---
+
+    def start_payout(self, request: PayoutRequest) -> PaymentRecord:
+        """Start tracking a payout on PayoutRequest.
+
+        Returns:
+            The new PENDING record, or the existing one for a redelivered request.
+        """
+        if not request.payment_id:
+            raise PaymentError("payment_id must not be 0")
+        return self._create(PaymentRole.PAY_OUT, request.payment_id, "")
+
+    def apply_payout_response(self, payment_id: int, response: PayoutResponse) -> PaymentRecord:
+        """Record the PayoutResponse returned for a payout."""
+        return self._transition(PaymentRole.PAY_OUT, str(payment_id), self._result_state(response.WhichOneof("result")))
+
+    def finalize_payout(self, request: FinalizePayoutRequest) -> PaymentRecord:
+        """Record the outcome sent with FinalizePayout: CONFIRMED on success, FAILED on failure.
+
+        Raises:
+            PaymentError: The request carries neither result.
+        """
+        result = request.WhichOneof("result")
+        if result not in _FINALIZE_STATES:
+            raise PaymentError(f"unsupported payout result {result!r}")
+        state = _FINALIZE_STATES[result]
+        return self._transition(PaymentRole.PAY_OUT, str(request.payment_id), state)
+
+    # --- Generic ---
+
+    def transition(self, role: PaymentRole, key: int | str, state: PaymentState) -> PaymentRecord:
+        """Move a payment to `state`, e.g. after CompleteManualAmlCheck.
+
+        Args:
+            role: Side of the payment.
+            key: payment_client_id of a pay-in, or payment_id of a payout.
+            state: New state.
+
+        Raises:
+            PaymentNotFoundError: The payment is not tracked.
+            IllegalTransitionError: The payment cannot move to `state`.
+        """
+        return self._transition(role, str(key), state)
+
+    def get(self, payment_id: int, *, role: PaymentRole = PaymentRole.PAY_OUT) -> PaymentRecord | None:
+        """Record by network payment_id; None if not tracked."""
+        if role is PaymentRole.PAY_OUT:
+            return self.backend.get(role, str(payment_id))
+        return self.backend.find(role, payment_id)
+
+    def get_by_client_id(self, payment_client_id: str) -> PaymentRecord | None:
+        """Pay-in record by payment_client_id; None if not tracked."""
+        return self.backend.get(PaymentRole.PAY_IN, payment_client_id)
+
+    def _lock(self, role: PaymentRole, key: str) -> threading.Lock:
+        return self._locks[hash((role, key)) % len(self._locks)]
+
+    @staticmethod
+    def _result_state(result: str | None) -> PaymentState:
+        if result not in _RESULT_STATES:
+            raise PaymentError(f"unsupported payment result {result!r}")
+        return _RESULT_STATES[result]
+
+    def _create(self, role: PaymentRole, payment_id: int, payment_client_id: str) -> PaymentRecord:
+        record = PaymentRecord(role, payment_id, payment_client_id, PaymentState.PENDING, 0, self._clock())
+        with self._lock(role, record.key):
+            existing = self.backend.get(role, record.key)
+            if existing is not None:
+                return existing
+            self.backend.put(record)
+        self._transitions[PaymentState.PENDING].inc()
+        return record
+
+    def _transition(
+        self, role: PaymentRole, key: str, state: PaymentState | None, *, payment_id: int = 0
+    ) -> PaymentRecord:
+        """Move a payment to `state` (None keeps it) and bind `payment_id` if it has none."""
+        with self._lock(role, key):
+            record = self.backend.get(role, key)
+            if record is None:
+                if role is PaymentRole.PAY_IN:
+                    raise PaymentNotFoundError(payment_id, key)
+                raise PaymentNotFoundError(int(key))
+            changed = record
+            if payment_id and not record.payment_id:
+                changed = replace(changed, payment_id=payment_id, updated_at=self._clock())
+            if state is not None and state != record.state:
+                if state not in TRANSITIONS[record.state]:
+                    self._illegal.inc()
+                    raise IllegalTransitionError(record, state)
+                changed = replace(changed, state=state, version=record.version + 1, updated_at=self._clock())
+            if changed is record:
+                return record
+            self.backend.put(changed)
+        if changed.state != record.state:
+            self._transitions[changed.state].inc()
+        return changed
@@ -12,17 +12,22 @@ from t0_provider_sdk.provider.handler import (
     BuildHandler,
     BuildHandlerSync,
     HandlerOption,
+    LifespanHook,
     handler,
     handler_sync,
     new_asgi_app,
     new_wsgi_app,
+    with_lazy_ledger_entries,
 )
+from t0_provider_sdk.provider.lazy import LazyAppendLedgerEntriesRequest
 
 __all__ = [
     "BuildHandler",
     "BuildHandlerSync",
     "HandlerOption",
     "InvalidHeaderEncodingError",
+    "LazyAppendLedgerEntriesRequest",
+    "LifespanHook",
     "MissingRequiredHeaderError",
     "SignatureFailedError",
     "SignatureVerificationError",
@@ -32,4 +37,5 @@ __all__ = [
     "handler_sync",
     "new_asgi_app",
     "new_wsgi_app",
+    "with_lazy_ledger_entries",
 ]
@@ -9,9 +9,10 @@ any generated ConnectRPC service application class.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Any, Callable, Iterable, TypeVar
+from typing import Any, Awaitable, Callable, Iterable, Sequence, TypeVar
 
 from t0_provider_sdk.provider.interceptor import SignatureErrorInterceptor, SignatureErrorInterceptorSync
+from t0_provider_sdk.provider.lazy import lazy_ledger_entries_asgi, lazy_ledger_entries_wsgi
 from t0_provider_sdk.provider.middleware import (
     DEFAULT_MAX_BODY_SIZE,
     ASGIApp,
@@ -34,6 +35,9 @@ BuildHandlerSync = Callable[["_HandlerOptions"], tuple[str, WSGIApp]]
 # Type for handler option modifiers
 HandlerOption = Callable[["_HandlerOptions"], None]
 
+# Type for ASGI lifespan startup/shutdown hooks
+LifespanHook = Callable[[], Awaitable[None]]
+
 
 @dataclass
 class _HandlerOptions:
@@ -44,6 +48,21 @@ class _HandlerOptions:
 
     interceptors: list[Any] = field(default_factory=list)
     max_body_size: int = DEFAULT_MAX_BODY_SIZE
+    lazy_ledger_entries: bool = False
+
+
+def with_lazy_ledger_entries() -> HandlerOption:
+    """Hand AppendLedgerEntries a LazyAppendLedgerEntriesRequest that decodes transactions on iteration.
+
+    Binary requests are not parsed up front: the handler gets the verified raw
+    bytes and decodes one transaction per step of `request.transactions`. Use it
+    for ProviderService handlers that process transactions one by one.
+    """
+
+    def apply(opts: _HandlerOptions) -> None:
+        opts.lazy_ledger_entries = True
+
+    return apply
 
 
 def handler(
@@ -74,6 +93,8 @@ def handler(
             opt(opts)
 
         app = asgi_app_factory(service_impl, interceptors=opts.interceptors)
+        if opts.lazy_ledger_entries:
+            return app.path, lazy_ledger_entries_asgi(app, service_impl, opts.interceptors)
         return app.path, app
 
     return build
@@ -82,6 +103,8 @@ def handler(
 def new_asgi_app(
     network_public_key: str,
     *build_handlers: BuildHandler,
+    on_startup: Sequence[LifespanHook] = (),
+    on_shutdown: Sequence[LifespanHook] = (),
 ) -> ASGIApp:
     """Create a composite ASGI app with signature verification.
 
@@ -91,6 +114,9 @@ def new_asgi_app(
         network_public_key: Hex-encoded T-0 Network public key for signature verification.
             Pass empty string to disable signature verification.
         *build_handlers: Handler builders created via handler().
+        on_startup: Coroutine functions awaited, in order, on ASGI lifespan startup, before
+            the server accepts requests (e.g. KeepAlive.start to pre-warm network connections).
+        on_shutdown: Coroutine functions awaited, in order, on ASGI lifespan shutdown.
 
     Returns:
         An ASGI application with signature verification middleware.
@@ -106,7 +132,7 @@ def new_asgi_app(
         routes[path] = app
 
     # Create router ASGI app
-    router = _create_router(routes)
+    router = _create_router(routes, on_startup, on_shutdown)
 
     # Wrap with signature verification middleware if key provided
     if network_public_key:
@@ -144,6 +170,8 @@ def handler_sync(
             opt(opts)
 
         app = wsgi_app_factory(service_impl, interceptors=opts.interceptors)
+        if opts.lazy_ledger_entries:
+            return app.path, lazy_ledger_entries_wsgi(app, service_impl, opts.interceptors)
         return app.path, app
 
     return build
@@ -186,7 +214,11 @@ def new_wsgi_app(
     return router
 
 
-def _create_router(routes: dict[str, ASGIApp]) -> ASGIApp:
+def _create_router(
+    routes: dict[str, ASGIApp],
+    on_startup: Sequence[LifespanHook] = (),
+    on_shutdown: Sequence[LifespanHook] = (),
+) -> ASGIApp:
     """Create a simple path-prefix ASGI router.
 
     ConnectRPC requests have paths like:
@@ -194,9 +226,16 @@ def _create_router(routes: dict[str, ASGIApp]) -> ASGIApp:
 
     The routes dict maps service path prefixes to their ASGI apps:
     {"/tzero.v1.payment.ProviderService": <app>}
+
+    If lifespan hooks are given, the router answers the lifespan protocol itself
+    instead of forwarding it to the first handler.
     """
 
     async def router(scope: dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] == "lifespan" and (on_startup or on_shutdown):
+            await _run_lifespan(receive, send, on_startup, on_shutdown)
+            return
+
         if scope["type"] != "http":
             # Non-HTTP scopes (e.g. lifespan) - try first handler
             if routes:
@@ -217,6 +256,34 @@ def _create_router(routes: dict[str, ASGIApp]) -> ASGIApp:
     return router
 
 
+async def _run_lifespan(
+    receive: Any,
+    send: Any,
+    on_startup: Sequence[LifespanHook],
+    on_shutdown: Sequence[LifespanHook],
+) -> None:
+    """Serve the ASGI lifespan protocol, awaiting the hooks on startup and shutdown."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                for hook in on_startup:
+                    await hook()
+            except Exception as e:
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            try:
+                for hook in on_shutdown:
+                    await hook()
+            except Exception as e:
+                await send({"type": "lifespan.shutdown.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
 def _create_wsgi_router(routes: dict[str, WSGIApp]) -> WSGIApp:
     """Create a simple path-prefix WSGI router.
 
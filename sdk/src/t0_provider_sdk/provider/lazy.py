@@ -0,0 +1,212 @@
+"""Lazy decoding of AppendLedgerEntries requests.
+
+End-of-day settlement can send AppendLedgerEntries bodies close to
+DEFAULT_MAX_BODY_SIZE. Normally ConnectRPC parses the whole body into one
+message before the handler runs, so the handler waits for every transaction to
+be decoded and all of them are held in memory at once. With
+with_lazy_ledger_entries() the handler receives a LazyAppendLedgerEntriesRequest
+instead: it keeps the verified raw bytes, and iterating `transactions` decodes
+one Transaction at a time.
+
+Only binary (application/proto) requests are decoded lazily; JSON requests
+still get a parsed AppendLedgerEntriesRequest, which iterates the same way.
+
+Example:
+    class Provider(ProviderService):
+        async def append_ledger_entries(self, request, ctx):
+            for transaction in request.transactions:  # decoded one at a time
+                ledger.apply([transaction])
+            return AppendLedgerEntriesResponse()
+
+    handler(ProviderServiceASGIApplication, Provider(), with_lazy_ledger_entries())
+
+No Go equivalent; connect-go always decodes whole messages.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+
+from connectrpc.method import IdempotencyLevel, MethodInfo
+from connectrpc.server import ConnectASGIApplication, ConnectWSGIApplication, Endpoint, EndpointSync
+from google.protobuf.message import DecodeError
+
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import (
+    AppendLedgerEntriesRequest,
+    AppendLedgerEntriesResponse,
+)
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.provider.middleware import ASGIApp, ASGIReceive, ASGISend, Scope
+    from t0_provider_sdk.provider.middleware_wsgi import WSGIApp
+
+SERVICE_NAME = "tzero.v1.payment.ProviderService"
+APPEND_LEDGER_ENTRIES_PATH = f"/{SERVICE_NAME}/AppendLedgerEntries"
+
+_TRANSACTIONS_TAG = AppendLedgerEntriesRequest.TRANSACTIONS_FIELD_NUMBER << 3 | 2  # length-delimited
+_TRANSACTIONS_TAG_BYTES = bytes((_TRANSACTIONS_TAG & 0x7F | 0x80, _TRANSACTIONS_TAG >> 7))  # field 20 needs two bytes
+_PROTO_CONTENT_TYPE = "application/proto"
+
+Transaction = AppendLedgerEntriesRequest.Transaction
+
+
+def _varint(data: bytes, offset: int) -> tuple[int, int]:
+    """Decode a varint at `offset`; return (value, offset after it)."""
+    value = shift = 0
+    while True:
+        if offset >= len(data) or shift > 63:
+            raise DecodeError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _skip(data: bytes, offset: int, wire_type: int) -> int:
+    """Offset after a field value of `wire_type` starting at `offset`."""
+    if wire_type == 0:
+        return _varint(data, offset)[1]
+    if wire_type == 1:
+        end = offset + 8
+    elif wire_type == 2:
+        length, offset = _varint(data, offset)
+        end = offset + length
+    elif wire_type == 5:
+        end = offset + 4
+    else:
+        raise DecodeError(f"unsupported wire type {wire_type}")
+    if end > len(data):
+        raise DecodeError("truncated field")
+    return end
+
+
+class LazyAppendLedgerEntriesRequest:
+    """AppendLedgerEntriesRequest whose transactions are decoded on iteration.
+
+    Implements the part of the message API ConnectRPC and handlers use:
+    ParseFromString() keeps the bytes, `transactions` yields decoded
+    Transactions. A malformed transaction raises DecodeError when iteration
+    reaches it, after the preceding ones have been yielded.
+    """
+
+    def __init__(self, data: bytes = b"") -> None:
+        self._data = data
+
+    def ParseFromString(self, data: bytes) -> int:  # noqa: N802 -- protobuf message API
+        self._data = bytes(data)
+        return len(self._data)
+
+    def ByteSize(self) -> int:  # noqa: N802 -- protobuf message API
+        return len(self._data)
+
+    def SerializeToString(self) -> bytes:  # noqa: N802 -- protobuf message API
+        return self._data
+
+    @property
+    def transactions(self) -> Iterator[Transaction]:
+        """A fresh iterator decoding one Transaction per step."""
+        return self._iter_transactions()
+
+    def _iter_transactions(self) -> Iterator[Transaction]:
+        data = self._data
+        view = memoryview(data)  # slices of it are not copied
+        size = len(data)
+        tag_size = len(_TRANSACTIONS_TAG_BYTES)
+        offset = 0
+        while offset < size:
+            if not data.startswith(_TRANSACTIONS_TAG_BYTES, offset):
+                tag, offset = _varint(data, offset)
+                if tag != _TRANSACTIONS_TAG:  # unknown field
+                    offset = _skip(data, offset, tag & 7)
+                    continue
+            else:
+                offset += tag_size
+            if offset < size and data[offset] < 0x80:  # lengths under 128 take one byte
+                length = data[offset]
+                offset += 1
+            else:
+                length, offset = _varint(data, offset)
+            end = offset + length
+            if end > size:
+                raise DecodeError("truncated transaction")
+            yield Transaction.FromString(view[offset:end])
+            offset = end
+
+    def to_message(self) -> AppendLedgerEntriesRequest:
+        """Parse the whole request, as ConnectRPC would have."""
+        return AppendLedgerEntriesRequest.FromString(self._data)
+
+
+_METHOD = MethodInfo(
+    name="AppendLedgerEntries",
+    service_name=SERVICE_NAME,
+    input=LazyAppendLedgerEntriesRequest,
+    output=AppendLedgerEntriesResponse,
+    idempotency_level=IdempotencyLevel.IDEMPOTENT,
+)
+
+
+class _LazyLedgerEntriesASGIApplication(ConnectASGIApplication[Any]):
+    """Connect application serving only AppendLedgerEntries, with a lazy request."""
+
+    def __init__(self, service: Any, *, interceptors: Iterable[Any]) -> None:
+        super().__init__(
+            service=service,
+            endpoints=lambda svc: {
+                APPEND_LEDGER_ENTRIES_PATH: Endpoint.unary(method=_METHOD, function=svc.append_ledger_entries)
+            },
+            interceptors=interceptors,
+        )
+
+    @property
+    def path(self) -> str:
+        return f"/{SERVICE_NAME}"
+
+
+class _LazyLedgerEntriesWSGIApplication(ConnectWSGIApplication):
+    """Sync counterpart of _LazyLedgerEntriesASGIApplication."""
+
+    def __init__(self, service: Any, *, interceptors: Iterable[Any]) -> None:
+        super().__init__(
+            endpoints={
+                APPEND_LEDGER_ENTRIES_PATH: EndpointSync.unary(method=_METHOD, function=service.append_ledger_entries)
+            },
+            interceptors=interceptors,
+        )
+
+    @property
+    def path(self) -> str:
+        return f"/{SERVICE_NAME}"
+
+
+def _is_proto(content_type: str) -> bool:
+    return content_type.split(";", 1)[0].strip().lower() == _PROTO_CONTENT_TYPE
+
+
+def lazy_ledger_entries_asgi(app: ASGIApp, service_impl: Any, interceptors: Iterable[Any]) -> ASGIApp:
+    """Route binary AppendLedgerEntries requests for `app` to a lazily decoding application."""
+    lazy = _LazyLedgerEntriesASGIApplication(service_impl, interceptors=interceptors)
+
+    async def route(scope: Scope, receive: ASGIReceive, send: ASGISend) -> None:
+        if scope["type"] == "http" and scope.get("path") == APPEND_LEDGER_ENTRIES_PATH:
+            content_type = next((v for k, v in scope.get("headers", ()) if k.lower() == b"content-type"), b"")
+            if _is_proto(content_type.decode("latin-1")):
+                await lazy(scope, receive, send)
+                return
+        await app(scope, receive, send)
+
+    return route
+
+
+def lazy_ledger_entries_wsgi(app: WSGIApp, service_impl: Any, interceptors: Iterable[Any]) -> WSGIApp:
+    """Route binary AppendLedgerEntries requests for `app` to a lazily decoding application."""
+    lazy = _LazyLedgerEntriesWSGIApplication(service_impl, interceptors=interceptors)
+
+    def route(environ: dict[str, Any], start_response: Any) -> Iterable[bytes]:
+        if environ.get("PATH_INFO") == APPEND_LEDGER_ENTRIES_PATH and _is_proto(environ.get("CONTENT_TYPE", "")):
+            return lazy(environ, start_response)
+        return app(environ, start_response)
+
+    return route
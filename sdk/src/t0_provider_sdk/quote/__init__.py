@@ -0,0 +1,104 @@
+"""Quote publishing and bookkeeping for T-0 Network providers."""
+
+from t0_provider_sdk.quote.bands import (
+    DEFAULT_AMOUNT_EXPONENT,
+    DEFAULT_RATE_EXPONENT,
+    RateCurve,
+    build_bands,
+    build_quotes,
+)
+from t0_provider_sdk.quote.book import DEFAULT_HISTORY_SIZE, BookBand, LastLook, QuoteBook
+from t0_provider_sdk.quote.diff import (
+    DEFAULT_REFRESH_BEFORE,
+    DEFAULT_THRESHOLD_BPS,
+    PublishedQuote,
+    QuoteDiffer,
+    QuotePlan,
+)
+from t0_provider_sdk.quote.feed import (
+    DEFAULT_FEED_POLL_INTERVAL,
+    DEFAULT_FEED_QUEUE_SIZE,
+    DEFAULT_FEED_TIMEOUT,
+    DEFAULT_MAX_CLOCK_SKEW,
+    DEFAULT_SOURCE_BASE_BACKOFF,
+    DEFAULT_SOURCE_MAX_BACKOFF,
+    DEFAULT_STALE_AFTER,
+    FeedPipeline,
+    FeedSource,
+    FileTailSource,
+    HttpPollingSource,
+    LocalFeed,
+    QuoteSink,
+    RateUpdate,
+    RateValidator,
+    SocketSource,
+    SourceStatus,
+    parse_json_rates,
+)
+from t0_provider_sdk.quote.matrix import (
+    DEFAULT_FANOUT_CONCURRENCY,
+    DEFAULT_FANOUT_TIMEOUT,
+    QuoteFailure,
+    QuoteStatus,
+    RateMatrix,
+    fetch_rate_matrix,
+)
+from t0_provider_sdk.quote.publisher import (
+    DEFAULT_MAX_INTERVAL,
+    DEFAULT_MIN_INTERVAL,
+    DEFAULT_QUOTE_TTL,
+    Direction,
+    QuoteKey,
+    QuotePublisher,
+)
+from t0_provider_sdk.quote.scheduler import DEFAULT_WHEEL_RESOLUTION, DEFAULT_WHEEL_SLOTS, TimerWheel
+
+__all__ = [
+    "DEFAULT_AMOUNT_EXPONENT",
+    "DEFAULT_FANOUT_CONCURRENCY",
+    "DEFAULT_FANOUT_TIMEOUT",
+    "DEFAULT_FEED_POLL_INTERVAL",
+    "DEFAULT_FEED_QUEUE_SIZE",
+    "DEFAULT_FEED_TIMEOUT",
+    "DEFAULT_HISTORY_SIZE",
+    "DEFAULT_MAX_CLOCK_SKEW",
+    "DEFAULT_MAX_INTERVAL",
+    "DEFAULT_MIN_INTERVAL",
+    "DEFAULT_QUOTE_TTL",
+    "DEFAULT_RATE_EXPONENT",
+    "DEFAULT_REFRESH_BEFORE",
+    "DEFAULT_SOURCE_BASE_BACKOFF",
+    "DEFAULT_SOURCE_MAX_BACKOFF",
+    "DEFAULT_STALE_AFTER",
+    "DEFAULT_THRESHOLD_BPS",
+    "DEFAULT_WHEEL_RESOLUTION",
+    "DEFAULT_WHEEL_SLOTS",
+    "BookBand",
+    "Direction",
+    "FeedPipeline",
+    "FeedSource",
+    "FileTailSource",
+    "HttpPollingSource",
+    "LastLook",
+    "LocalFeed",
+    "PublishedQuote",
+    "QuoteBook",
+    "QuoteDiffer",
+    "QuoteFailure",
+    "QuoteKey",
+    "QuotePlan",
+    "QuotePublisher",
+    "QuoteSink",
+    "QuoteStatus",
+    "RateCurve",
+    "RateMatrix",
+    "RateUpdate",
+    "RateValidator",
+    "SocketSource",
+    "SourceStatus",
+    "TimerWheel",
+    "build_bands",
+    "build_quotes",
+    "fetch_rate_matrix",
+    "parse_json_rates",
+]
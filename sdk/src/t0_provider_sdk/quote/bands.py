@@ -0,0 +1,294 @@
+"""Vectorized band construction from rate curves.
+
+Pricing desks describe a quote as a rate curve: the rate (or a spread over a mid
+rate) as a step function of the USD notional. build_bands() turns one curve into
+UpdateQuoteRequest.Quote.Band messages; build_quotes() does the same for a whole
+book of curves, quantizing every rate and max_amount in one pass:
+
+- with NumPy installed, float curves are scaled, rounded and range-checked as one
+  float64 array and written into the messages from a single int64 result;
+- without NumPy, the same float arithmetic runs element by element and gives
+  identical results.
+
+Float values are quantized in binary floating point (value * 10^-exponent, then
+rounded), the same as numpy.round. decimal.Decimal, Fraction, int, decimal strings
+and Decimal messages are quantized exactly in decimal.
+
+Example:
+    curves = {
+        QuoteKey("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT): RateCurve.from_spreads(
+            0.8612, max_amounts=[1_000, 10_000, 100_000], spreads_bps=[-15, -10, -5]
+        ),
+    }
+    for key, bands in build_quotes(curves).items():
+        publisher.update(*key, bands)
+
+No Go equivalent; the Go starter publishes a fixed quote.
+"""
+
+from __future__ import annotations
+
+import decimal
+import itertools
+import math
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Any, Callable, Hashable, Mapping, Sequence, TypeVar
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest
+from t0_provider_sdk.common.decimal import (
+    INT64_MAX,
+    INT64_MIN,
+    MAX_EXPONENT,
+    MIN_EXPONENT,
+    from_fraction,
+    to_fraction,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised by forcing np = None in tests
+    np = None
+
+# Exponent of built rates (8 decimal places, the finest a Decimal message carries)
+DEFAULT_RATE_EXPONENT = -8
+
+# Exponent of built max_amounts (whole USD)
+DEFAULT_AMOUNT_EXPONENT = 0
+
+Band = UpdateQuoteRequest.Quote.Band
+ArrayLike = Any
+K = TypeVar("K", bound=Hashable)
+
+_FLOAT_ROUNDINGS: dict[str, Callable[[float], float]] = {
+    decimal.ROUND_HALF_EVEN: round,
+    decimal.ROUND_HALF_UP: lambda x: math.copysign(math.floor(abs(x) + 0.5), x),
+    decimal.ROUND_HALF_DOWN: lambda x: math.copysign(math.ceil(abs(x) - 0.5), x),
+    decimal.ROUND_UP: lambda x: math.copysign(math.ceil(abs(x)), x),
+    decimal.ROUND_DOWN: math.trunc,
+    decimal.ROUND_CEILING: math.ceil,
+    decimal.ROUND_FLOOR: math.floor,
+}
+
+
+@dataclass(frozen=True)
+class RateCurve:
+    """Rate as a step function of the USD notional, one step per band.
+
+    Attributes:
+        max_amounts: Upper bound of each band in USD, strictly ascending.
+        rates: Rate of each band; floats, or exact values (decimal.Decimal, Fraction,
+            int, decimal strings, Decimal messages). Any array-like, including NumPy arrays.
+    """
+
+    max_amounts: ArrayLike
+    rates: ArrayLike
+
+    def __post_init__(self) -> None:
+        if len(self.max_amounts) != len(self.rates):
+            raise ValueError("max_amounts and rates must have the same length")
+        if not len(self.rates):
+            raise ValueError("a rate curve needs at least one band")
+
+    @classmethod
+    def from_spreads(cls, mid_rate: Any, max_amounts: ArrayLike, spreads_bps: ArrayLike) -> RateCurve:
+        """Curve of mid_rate * (1 + spread / 10_000) for each band.
+
+        Spreads are signed: pass negative spreads to quote below mid. A float mid_rate
+        is combined with the spreads in floating point (vectorized with NumPy); any other
+        mid_rate is combined exactly.
+        """
+        if isinstance(mid_rate, float):
+            if np is not None:
+                rates = mid_rate * (1.0 + np.asarray(spreads_bps, dtype=np.float64) / 10_000)
+            else:
+                rates = [mid_rate * (1.0 + float(spread) / 10_000) for spread in spreads_bps]
+        else:
+            mid = _exact(mid_rate)
+            rates = [mid * (1 + Fraction(spread) / 10_000) for spread in _tolist(spreads_bps)]
+        return cls(max_amounts, rates)
+
+
+def build_bands(
+    max_amounts: ArrayLike,
+    rates: ArrayLike,
+    *,
+    client_quote_ids: Sequence[str] | None = None,
+    rate_exponent: int = DEFAULT_RATE_EXPONENT,
+    amount_exponent: int = DEFAULT_AMOUNT_EXPONENT,
+    rounding: str = decimal.ROUND_HALF_EVEN,
+) -> list[Band]:
+    """Build the bands of one quote from a rate curve.
+
+    Args:
+        max_amounts: Upper bound of each band in USD, strictly ascending.
+        rates: Rate of each band.
+        client_quote_ids: Id of each band; left empty if omitted (QuotePublisher.update assigns them).
+        rate_exponent: Exponent of the built rates.
+        amount_exponent: Exponent of the built max_amounts.
+        rounding: decimal rounding mode used to quantize both.
+
+    Returns:
+        One Band per breakpoint, in the given order.
+    """
+    curve = RateCurve(max_amounts, rates)
+    ids = {None: client_quote_ids} if client_quote_ids is not None else None
+    return build_quotes(
+        {None: curve},
+        client_quote_ids=ids,
+        rate_exponent=rate_exponent,
+        amount_exponent=amount_exponent,
+        rounding=rounding,
+    )[None]
+
+
+def build_quotes(
+    curves: Mapping[K, RateCurve],
+    *,
+    client_quote_ids: Mapping[K, Sequence[str]] | None = None,
+    rate_exponent: int = DEFAULT_RATE_EXPONENT,
+    amount_exponent: int = DEFAULT_AMOUNT_EXPONENT,
+    rounding: str = decimal.ROUND_HALF_EVEN,
+) -> dict[K, list[Band]]:
+    """Build the bands of many quotes, quantizing all curves together.
+
+    Args:
+        curves: Rate curve per quote, keyed by anything hashable (typically QuoteKey).
+        client_quote_ids: Band ids per quote; bands of quotes without an entry are left
+            without an id.
+        rate_exponent: Exponent of the built rates.
+        amount_exponent: Exponent of the built max_amounts.
+        rounding: decimal rounding mode used to quantize rates and max_amounts.
+
+    Returns:
+        Bands per quote, in the order of the curves.
+
+    Raises:
+        ValueError: A curve is not strictly ascending in max_amount, has a non-positive
+            amount or rate, a value does not fit the exponent range, or ids do not match.
+    """
+    if rounding not in _FLOAT_ROUNDINGS:
+        raise ValueError(f"unsupported rounding mode {rounding!r}")
+    for exponent in (rate_exponent, amount_exponent):
+        if not MIN_EXPONENT <= exponent <= MAX_EXPONENT:
+            raise ValueError(f"exponent {exponent} outside the Decimal range {MIN_EXPONENT}..{MAX_EXPONENT}")
+    client_quote_ids = client_quote_ids or {}
+
+    keys = list(curves)
+    amounts = _quantize([curves[key].max_amounts for key in keys], amount_exponent, rounding)
+    rates = _quantize([curves[key].rates for key in keys], rate_exponent, rounding)
+
+    result: dict[K, list[Band]] = {}
+    start = 0
+    for key in keys:
+        end = start + len(curves[key].rates)
+        key_amounts, key_rates = amounts[start:end], rates[start:end]
+        ids = client_quote_ids.get(key)
+        if ids is not None and len(ids) != end - start:
+            raise ValueError(f"{key}: expected {end - start} client_quote_ids, got {len(ids)}")
+        _validate(key, key_amounts, key_rates)
+        result[key] = _emit(key_amounts, amount_exponent, key_rates, rate_exponent, ids)
+        start = end
+    return result
+
+
+def _emit(
+    amounts: list[int], amount_exponent: int, rates: list[int], rate_exponent: int, ids: Sequence[str] | None
+) -> list[Band]:
+    """Write scaled integers into Band messages (setting fields in place beats nested constructors)."""
+    bands = []
+    for index, (amount, rate) in enumerate(zip(amounts, rates, strict=True)):
+        band = Band()
+        if ids is not None:
+            band.client_quote_id = ids[index]
+        field = band.max_amount
+        field.unscaled = amount
+        field.exponent = amount_exponent
+        field = band.rate
+        field.unscaled = rate
+        field.exponent = rate_exponent
+        bands.append(band)
+    return bands
+
+
+def _validate(key: Any, amounts: list[int], rates: list[int]) -> None:
+    if amounts[0] <= 0:
+        raise ValueError(f"{key}: max_amounts must be positive")
+    if any(b <= a for a, b in itertools.pairwise(amounts)):
+        raise ValueError(f"{key}: max_amounts must be strictly ascending")
+    if min(rates) <= 0:
+        raise ValueError(f"{key}: rates must be positive")
+
+
+def _quantize(columns: list[ArrayLike], exponent: int, rounding: str) -> list[int]:
+    """Unscaled integers at the exponent for the concatenation of several columns."""
+    if np is not None:
+        arrays = [np.asarray(column) for column in columns]
+        if any(a.ndim != 1 for a in arrays):
+            raise ValueError("curve values must be one-dimensional")
+        kinds = {a.dtype.kind for a in arrays}
+        if kinds == {"f"}:
+            return _np_quantize_floats(np.concatenate(arrays).astype(np.float64), exponent, rounding).tolist()
+        if kinds and kinds <= {"i", "u"} and exponent <= 0:
+            return _np_scale_ints(np.concatenate(arrays), exponent).tolist()
+        columns = [a.tolist() for a in arrays]
+    return [_quantize_one(value, exponent, rounding) for column in columns for value in column]
+
+
+def _np_scale_ints(values: Any, exponent: int) -> Any:
+    limit = INT64_MAX // 10**-exponent
+    if values.size and (int(values.max()) > limit or int(values.min()) < -limit):
+        raise ValueError("scaled values do not fit int64")
+    return values.astype(np.int64) * 10**-exponent
+
+
+def _np_quantize_floats(values: Any, exponent: int, rounding: str) -> Any:
+    scaled = values * 10.0**-exponent if exponent <= 0 else values / 10.0**exponent
+    if not np.all(np.isfinite(scaled)):
+        raise ValueError("curve values must be finite")
+    magnitude = np.abs(scaled)
+    if rounding == decimal.ROUND_HALF_EVEN:
+        rounded = np.rint(scaled)
+    elif rounding == decimal.ROUND_HALF_UP:
+        rounded = np.copysign(np.floor(magnitude + 0.5), scaled)
+    elif rounding == decimal.ROUND_HALF_DOWN:
+        rounded = np.copysign(np.ceil(magnitude - 0.5), scaled)
+    elif rounding == decimal.ROUND_UP:
+        rounded = np.copysign(np.ceil(magnitude), scaled)
+    elif rounding == decimal.ROUND_DOWN:
+        rounded = np.trunc(scaled)
+    elif rounding == decimal.ROUND_CEILING:
+        rounded = np.ceil(scaled)
+    else:
+        rounded = np.floor(scaled)
+    if rounded.size and (rounded.max() >= 2.0**63 or rounded.min() < -(2.0**63)):
+        raise ValueError("scaled values do not fit int64")
+    return rounded.astype(np.int64)
+
+
+def _quantize_one(value: Any, exponent: int, rounding: str) -> int:
+    if isinstance(value, float):
+        scaled = value * 10.0**-exponent if exponent <= 0 else value / 10.0**exponent
+        if not math.isfinite(scaled):
+            raise ValueError("curve values must be finite")
+        unscaled = int(_FLOAT_ROUNDINGS[rounding](scaled))
+    elif isinstance(value, int) and not isinstance(value, bool) and exponent <= 0:
+        unscaled = value * 10**-exponent
+    else:
+        return from_fraction(_exact(value), exponent=exponent, rounding=rounding).unscaled
+    if not INT64_MIN <= unscaled <= INT64_MAX:
+        raise ValueError("scaled values do not fit int64")
+    return unscaled
+
+
+def _exact(value: Any) -> Fraction:
+    if isinstance(value, bool):
+        raise TypeError("bool is not a number")
+    if isinstance(value, Decimal):
+        return to_fraction(value)
+    return Fraction(value)
+
+
+def _tolist(values: ArrayLike) -> list[Any]:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
@@ -0,0 +1,243 @@
+"""In-memory index of published quote bands for last-look checks.
+
+When the network comes back with a payment priced from one of the provider's
+quotes, the provider has to find the exact band it published: by client_quote_id
+(PayoutRequest.client_quote_id, CompleteManualAmlCheck) or by currency, payment
+method and settlement amount (ApprovePaymentQuotes, which carries only the rate
+and amounts). QuoteBook records every published UpdateQuoteRequest and answers
+both lookups without going back to the pricing service:
+
+- by client_quote_id: one dict lookup;
+- by (currency, payment method, direction) and amount: bisect over the quote's
+  bands, which the network orders by max_amount.
+
+UpdateQuote replaces all previously published quotes, so each record() moves the
+bands that were not published again into a bounded history of superseded bands.
+A payment priced just before a republish can still be told apart from one that
+uses an id the provider never issued.
+
+Example:
+    book = QuoteBook()
+    publisher = QuotePublisher(network_client, book=book)
+
+    # in a handler:
+    verdict = book.check(request.client_quote_id, rate=rate, amount=settlement_amount, tolerance_bps=5)
+    if verdict is not LastLook.ACCEPTED:
+        ...
+
+No Go equivalent; the Go starter accepts every quote.
+"""
+
+from __future__ import annotations
+
+import bisect
+import enum
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import TYPE_CHECKING, Callable, NamedTuple
+
+from t0_provider_sdk.common.decimal import to_fraction
+from t0_provider_sdk.quote.publisher import Direction, QuoteKey
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+    from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest
+
+# Number of superseded bands kept for lookups after a republish
+DEFAULT_HISTORY_SIZE = 10_000
+
+
+class LastLook(enum.StrEnum):
+    """Outcome of a last-look check against the quote book."""
+
+    ACCEPTED = "accepted"
+    UNKNOWN_QUOTE = "unknown_quote"  # never published, or no live band covers the amount
+    EXPIRED = "expired"  # past its expiration
+    SUPERSEDED = "superseded"  # replaced by a later UpdateQuote before it expired
+    RATE_MISMATCH = "rate_mismatch"  # rate differs from the published one by more than the tolerance
+    AMOUNT_EXCEEDED = "amount_exceeded"  # amount above the band's max_amount
+
+
+@dataclass(frozen=True)
+class BookBand:
+    """One published band with the context of its quote.
+
+    Attributes:
+        client_quote_id: The band's client_quote_id.
+        key: The quote the band belongs to.
+        max_amount: Maximum USD amount the band applies to.
+        rate: Published rate (USD/currency).
+        expiration: Quote expiration, seconds since the epoch.
+        timestamp: Quote timestamp, seconds since the epoch.
+    """
+
+    client_quote_id: str
+    key: QuoteKey
+    max_amount: Fraction
+    rate: Fraction
+    expiration: float
+    timestamp: float
+
+
+class _Quote(NamedTuple):
+    max_amounts: list[Fraction]  # ascending, for bisect
+    bands: list[BookBand]
+
+
+@dataclass(frozen=True)
+class _Snapshot:
+    by_id: dict[str, BookBand]
+    by_key: dict[QuoteKey, _Quote]
+
+
+def _as_fraction(value: Decimal | Fraction | int) -> Fraction:
+    if isinstance(value, Fraction | int):
+        return Fraction(value)
+    return to_fraction(value)
+
+
+class QuoteBook:
+    """Index of the currently published bands plus a short history of superseded ones.
+
+    record() is called by the publisher (one writer at a time); lookups may run
+    concurrently from any thread or task and never block: they read an immutable
+    snapshot that record() replaces as a whole.
+    """
+
+    def __init__(self, *, history: int = DEFAULT_HISTORY_SIZE, clock: Callable[[], float] = time.time) -> None:
+        """Create an empty book.
+
+        Args:
+            history: Number of superseded bands to keep.
+            clock: Wall clock used to decide expiry.
+        """
+        if history < 0:
+            raise ValueError("history must not be negative")
+        self._history_size = history
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshot = _Snapshot({}, {})
+        self._history: OrderedDict[str, BookBand] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._snapshot.by_id)
+
+    def record(self, request: UpdateQuoteRequest) -> None:
+        """Record a successfully published request as the live book."""
+        by_id: dict[str, BookBand] = {}
+        by_key: dict[QuoteKey, _Quote] = {}
+        for direction in Direction:
+            for quote in getattr(request, direction.value):
+                key = QuoteKey(quote.currency, quote.payment_method, direction)
+                expiration = quote.expiration.ToNanoseconds() / 1_000_000_000
+                timestamp = quote.timestamp.ToNanoseconds() / 1_000_000_000
+                bands = [
+                    BookBand(
+                        band.client_quote_id,
+                        key,
+                        to_fraction(band.max_amount),
+                        to_fraction(band.rate),
+                        expiration,
+                        timestamp,
+                    )
+                    for band in quote.bands
+                ]
+                bands.sort(key=lambda b: b.max_amount)
+                by_key[key] = _Quote([b.max_amount for b in bands], bands)
+                by_id.update((b.client_quote_id, b) for b in bands)
+
+        with self._lock:
+            for client_quote_id, band in self._snapshot.by_id.items():
+                if client_quote_id not in by_id:
+                    self._history[client_quote_id] = band
+                    self._history.move_to_end(client_quote_id)
+            for client_quote_id in by_id:
+                self._history.pop(client_quote_id, None)
+            while len(self._history) > self._history_size:
+                self._history.popitem(last=False)
+            self._snapshot = _Snapshot(by_id, by_key)
+
+    def get(self, client_quote_id: str) -> BookBand | None:
+        """Find a live or superseded band by client_quote_id."""
+        band = self._snapshot.by_id.get(client_quote_id)
+        if band is not None:
+            return band
+        with self._lock:
+            return self._history.get(client_quote_id)
+
+    def is_live(self, client_quote_id: str) -> bool:
+        """Whether the band is part of the last published book (it may still be past its expiration)."""
+        return client_quote_id in self._snapshot.by_id
+
+    def bands(self, currency: str, payment_method: int, direction: Direction) -> list[BookBand]:
+        """Live bands of one quote, ordered by max_amount."""
+        quote = self._snapshot.by_key.get(QuoteKey(currency, payment_method, Direction(direction)))
+        return list(quote.bands) if quote is not None else []
+
+    def find(
+        self, currency: str, payment_method: int, direction: Direction, amount: Decimal | Fraction | int
+    ) -> BookBand | None:
+        """Find the live band that applies to a USD amount: the one with the smallest max_amount >= amount."""
+        quote = self._snapshot.by_key.get(QuoteKey(currency, payment_method, Direction(direction)))
+        if quote is None:
+            return None
+        index = bisect.bisect_left(quote.max_amounts, _as_fraction(amount))
+        return quote.bands[index] if index < len(quote.bands) else None
+
+    def check(
+        self,
+        client_quote_id: str,
+        *,
+        rate: Decimal | Fraction | int,
+        amount: Decimal | Fraction | int,
+        tolerance_bps: float = 0.0,
+    ) -> LastLook:
+        """Last-look check of a payment priced from the band with this client_quote_id.
+
+        Args:
+            client_quote_id: Band id from the payment (e.g. PayoutRequest.client_quote_id).
+            rate: Rate the payment was priced at.
+            amount: USD (settlement) amount of the payment.
+            tolerance_bps: Accepted difference between rate and the published rate, in basis points.
+        """
+        band = self._snapshot.by_id.get(client_quote_id)
+        if band is None:
+            return LastLook.SUPERSEDED if self.get(client_quote_id) is not None else LastLook.UNKNOWN_QUOTE
+        return self._verdict(band, _as_fraction(rate), _as_fraction(amount), tolerance_bps)
+
+    def check_rate(
+        self,
+        currency: str,
+        payment_method: int,
+        direction: Direction,
+        *,
+        rate: Decimal | Fraction | int,
+        amount: Decimal | Fraction | int,
+        tolerance_bps: float = 0.0,
+    ) -> LastLook:
+        """Last-look check of a rate against the live band that covers a USD amount.
+
+        For requests that carry no client_quote_id, such as ApprovePaymentQuoteRequest
+        (use settlement_amount as the amount).
+        """
+        amount_value = _as_fraction(amount)
+        band = self.find(currency, payment_method, direction, amount_value)
+        if band is None:
+            if self._snapshot.by_key.get(QuoteKey(currency, payment_method, Direction(direction))) is None:
+                return LastLook.UNKNOWN_QUOTE
+            return LastLook.AMOUNT_EXCEEDED
+        return self._verdict(band, _as_fraction(rate), amount_value, tolerance_bps)
+
+    def _verdict(self, band: BookBand, rate: Fraction, amount: Fraction, tolerance_bps: float) -> LastLook:
+        if self._clock() >= band.expiration:
+            return LastLook.EXPIRED
+        if amount > band.max_amount:
+            return LastLook.AMOUNT_EXCEEDED
+        if band.rate == 0:
+            return LastLook.ACCEPTED if rate == 0 else LastLook.RATE_MISMATCH
+        if abs(rate - band.rate) * 10_000 > abs(band.rate) * Fraction(tolerance_bps):
+            return LastLook.RATE_MISMATCH
+        return LastLook.ACCEPTED
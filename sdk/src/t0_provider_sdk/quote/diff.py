@@ -0,0 +1,231 @@
+"""Change detection and incremental encoding for quote publishing.
+
+Most publish ticks carry a book that has barely moved since the last one. QuoteDiffer
+compares each quote against what was last published and decides, per quote:
+
+- rebuild: the band count or a max_amount changed, a rate moved by at least the
+  currency's threshold (in basis points), or the published quote is about to
+  expire. The quote is encoded again with a new expiration.
+- reuse: anything else. The previously published Quote, with its client_quote_ids,
+  rates and expiration, is sent again from its cached serialized bytes.
+
+The request is assembled by concatenating the per-quote field encodings, so an
+unchanged quote costs one bytes join rather than a message build and serialization.
+A plan only becomes the published state once commit() is called after a successful
+publish, so a failed publish is compared against what the network actually has.
+Refresh deadlines (expiration - refresh_before) are kept in a TimerWheel, so finding
+the next quote to refresh does not scan the book.
+
+No Go equivalent; the Go starter publishes a fixed quote in a loop.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping
+
+from google.protobuf.timestamp_pb2 import Timestamp
+
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import QUOTE_TYPE_REALTIME, UpdateQuoteRequest
+from t0_provider_sdk.common.decimal import relative_change_bps, to_fraction
+from t0_provider_sdk.quote.scheduler import TimerWheel
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.quote.publisher import Band, QuoteEntry, QuoteKey
+
+# Republish a quote when any band rate moves by at least this many basis points (0: on any change)
+DEFAULT_THRESHOLD_BPS = 0.0
+
+# Republish a quote when its published expiration is at most this many seconds away
+DEFAULT_REFRESH_BEFORE = 5.0
+
+
+def to_timestamp(seconds: float) -> Timestamp:
+    """Convert seconds since the epoch to a protobuf Timestamp."""
+    ts = Timestamp()
+    ts.FromNanoseconds(int(seconds * 1_000_000_000))
+    return ts
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _field_tag(name: str) -> bytes:
+    """Tag of a length-delimited UpdateQuoteRequest field."""
+    return _varint(UpdateQuoteRequest.DESCRIPTOR.fields_by_name[name].number << 3 | 2)
+
+
+_FIELD_TAGS = {name: _field_tag(name) for name in ("pay_out", "pay_in")}
+
+
+@dataclass(frozen=True)
+class PublishedQuote:
+    """One quote as last published.
+
+    Attributes:
+        source: The feed entry the quote was last compared with.
+        bands: Bands as published.
+        expiration: Published expiration, seconds since the epoch.
+        timestamp: Published timestamp (time of the feed update), seconds since the epoch.
+        encoded: The quote's UpdateQuoteRequest field encoding (tag, length, Quote bytes).
+    """
+
+    source: QuoteEntry
+    bands: list[Band]
+    expiration: float
+    timestamp: float
+    encoded: bytes
+
+
+@dataclass(frozen=True)
+class QuotePlan:
+    """What to publish for a book, as computed by QuoteDiffer.plan().
+
+    Attributes:
+        quotes: The quote to publish per key.
+        payload: Serialized UpdateQuoteRequest for the whole book.
+        changed: True if the network would see a different book than the last published one.
+        rebuilt: Number of quotes encoded again.
+        reused: Number of quotes sent from cached bytes.
+    """
+
+    quotes: dict[QuoteKey, PublishedQuote]
+    payload: bytes
+    changed: bool
+    rebuilt: int
+    reused: int
+
+    def request(self) -> UpdateQuoteRequest:
+        """Parse the payload into an UpdateQuoteRequest."""
+        return UpdateQuoteRequest.FromString(self.payload)
+
+
+class QuoteDiffer:
+    """Compares books against the last published one and encodes them incrementally.
+
+    plan() may be called from any thread; commit() swaps in the new published state
+    as a whole, so readers never see a partial update. commit(), due_refreshes() and
+    next_refresh() must be called from a single thread (the publisher's event loop).
+    """
+
+    def __init__(
+        self,
+        *,
+        thresholds_bps: Mapping[str, float] | None = None,
+        default_threshold_bps: float = DEFAULT_THRESHOLD_BPS,
+        refresh_before: float = DEFAULT_REFRESH_BEFORE,
+        wheel: TimerWheel[QuoteKey] | None = None,
+    ) -> None:
+        """Create a differ.
+
+        Args:
+            thresholds_bps: Rate-change threshold in basis points per currency code.
+            default_threshold_bps: Threshold for currencies not in thresholds_bps.
+            refresh_before: Seconds before expiration at which a quote is republished.
+            wheel: Timer wheel for refresh deadlines (wall-clock seconds); one with defaults if omitted.
+        """
+        thresholds = dict(thresholds_bps or {})
+        if default_threshold_bps < 0 or any(t < 0 for t in thresholds.values()):
+            raise ValueError("thresholds must not be negative")
+        if refresh_before < 0:
+            raise ValueError("refresh_before must not be negative")
+        self._thresholds = thresholds
+        self._default_threshold = default_threshold_bps
+        self._refresh_before = refresh_before
+        self._published: dict[QuoteKey, PublishedQuote] = {}
+        self._wheel: TimerWheel[QuoteKey] = wheel if wheel is not None else TimerWheel()
+
+    @property
+    def published(self) -> dict[QuoteKey, PublishedQuote]:
+        """The last committed state (do not modify)."""
+        return self._published
+
+    def threshold_bps(self, currency: str) -> float:
+        return self._thresholds.get(currency, self._default_threshold)
+
+    def is_meaningful(self, currency: str, published: list[Band], bands: list[Band]) -> bool:
+        """Whether bands differ from the published ones enough to republish."""
+        if len(published) != len(bands):
+            return True
+        threshold = self.threshold_bps(currency)
+        for old, new in zip(published, bands, strict=True):
+            if to_fraction(old.max_amount) != to_fraction(new.max_amount):
+                return True
+            change = relative_change_bps(old.rate, new.rate)
+            if change > 0 and change >= threshold:
+                return True
+        return False
+
+    def next_refresh(self) -> float:
+        """Wall-clock time at which the first published quote needs refreshing (inf if none)."""
+        return self._wheel.next_deadline()
+
+    def due_refreshes(self, now: float) -> list[QuoteKey]:
+        """Pop the keys whose refresh deadline has passed; the next plan rebuilds them."""
+        return self._wheel.advance(now)
+
+    def plan(self, entries: Mapping[QuoteKey, QuoteEntry], now: float) -> QuotePlan:
+        """Decide, per quote, whether to reuse the published encoding or build a new one.
+
+        Args:
+            entries: The current book.
+            now: Wall-clock time, seconds since the epoch.
+        """
+        published = self._published
+        quotes: dict[QuoteKey, PublishedQuote] = {}
+        rebuilt = 0
+        for key in sorted(entries):
+            entry = entries[key]
+            previous = published.get(key)
+            if previous is None or now >= previous.expiration - self._refresh_before:
+                quote = self._encode(key, entry, now)
+                rebuilt += 1
+            elif previous.source is entry:
+                quote = previous
+            elif self.is_meaningful(key.currency, previous.bands, entry.bands):
+                quote = self._encode(key, entry, now)
+                rebuilt += 1
+            else:
+                # Sub-threshold move: keep publishing the old quote, and skip comparing this entry again
+                quote = PublishedQuote(entry, previous.bands, previous.expiration, previous.timestamp, previous.encoded)
+            quotes[key] = quote
+        payload = b"".join(quote.encoded for quote in quotes.values())
+        changed = rebuilt > 0 or quotes.keys() != published.keys()
+        return QuotePlan(quotes, payload, changed, rebuilt, len(quotes) - rebuilt)
+
+    def commit(self, plan: QuotePlan) -> None:
+        """Record a plan as published and reschedule the refreshes of rebuilt quotes."""
+        previous = self._published
+        self._published = plan.quotes
+        for key in previous.keys() - plan.quotes.keys():
+            self._wheel.cancel(key)
+        for key, quote in plan.quotes.items():
+            old = previous.get(key)
+            if old is None or old.expiration != quote.expiration or key not in self._wheel:
+                self._wheel.schedule(key, quote.expiration - self._refresh_before)
+
+    def reset(self) -> None:
+        """Forget the published state, so the next plan rebuilds every quote."""
+        for key in self._published:
+            self._wheel.cancel(key)
+        self._published = {}
+
+    def _encode(self, key: QuoteKey, entry: QuoteEntry, now: float) -> PublishedQuote:
+        expiration = now + entry.ttl
+        quote = UpdateQuoteRequest.Quote(
+            currency=key.currency,
+            quote_type=QUOTE_TYPE_REALTIME,
+            payment_method=key.payment_method,
+            bands=entry.bands,
+            expiration=to_timestamp(expiration),
+            timestamp=to_timestamp(entry.updated_at),
+        )
+        body = quote.SerializeToString()
+        encoded = _FIELD_TAGS[key.direction.value] + _varint(len(body)) + body
+        return PublishedQuote(entry, entry.bands, expiration, entry.updated_at, encoded)
@@ -0,0 +1,756 @@
+"""Rate feed ingestion pipeline.
+
+Quotes come from the provider's own systems: liquidity-provider HTTP APIs, files
+written by pricing jobs, sockets fed by internal services. FeedPipeline pulls any
+number of such sources concurrently on one event loop and passes every record
+through three stages, separated by bounded queues:
+
+    sources --raw--> normalize --updates--> validate --> sink (e.g. QuotePublisher)
+
+- a source adapter yields raw records without blocking the loop: HttpPollingSource
+  polls a URL at a fixed rate, FileTailSource follows a newline-delimited file
+  across truncation and rotation, SocketSource reads newline-delimited records
+  from a local TCP or Unix socket, and LocalFeed is an in-process stand-in fed by
+  push() for tests and development;
+- normalize turns a raw record into RateUpdates (parse_json_rates by default);
+- RateValidator rejects malformed or implausible updates before they reach the sink;
+- the queues give backpressure: when a later stage falls behind, earlier stages
+  wait instead of buffering without limit, which slows polling and lets socket
+  reads push back on the sender;
+- a source that raises is restarted with exponential backoff and jitter; a source
+  without a valid update for `stale_after` seconds is reported stale and the quotes
+  it last provided are withdrawn from the sink until it recovers.
+
+Example:
+    publisher = QuotePublisher(network_client)
+    pipeline = FeedPipeline(
+        [HttpPollingSource("lp-a", "https://lp-a.example/rates"), FileTailSource("pricing", "rates.jsonl")],
+        publisher,
+    )
+    app = new_asgi_app(..., on_startup=[publisher.start, pipeline.start], on_shutdown=[pipeline.stop, publisher.stop])
+
+No Go equivalent; the Go starter publishes a fixed quote.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import dataclasses
+import decimal
+import json
+import logging
+import os
+import random
+import re
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterable, Mapping, Protocol, Sequence
+
+import pyqwest
+
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import PaymentMethodType
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest
+from t0_provider_sdk.common.decimal import from_number, relative_change_bps, to_fraction
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.common.periodic import PeriodicTask
+from t0_provider_sdk.quote.publisher import DEFAULT_QUOTE_TTL, Direction, QuoteKey
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.common.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+# Capacity of each queue between pipeline stages; a full queue makes the previous stage wait
+DEFAULT_FEED_QUEUE_SIZE = 1_024
+
+# Seconds without a valid update after which a source is stale and its quotes are withdrawn
+DEFAULT_STALE_AFTER = 10.0
+
+# Seconds between HTTP polls, and between reads of a file that has no new data
+DEFAULT_FEED_POLL_INTERVAL = 1.0
+
+# Per-request timeout for HTTP polling, in seconds
+DEFAULT_FEED_TIMEOUT = 5.0
+
+# First delay (seconds) before restarting a failed source; doubles per consecutive failure
+DEFAULT_SOURCE_BASE_BACKOFF = 0.5
+
+# Upper bound (seconds) of the delay before restarting a failed source
+DEFAULT_SOURCE_MAX_BACKOFF = 30.0
+
+# Seconds a rate timestamp may lie in the future before the update is rejected
+DEFAULT_MAX_CLOCK_SKEW = 5.0
+
+# Maximum bytes read from a tailed file per read
+_TAIL_CHUNK = 1 << 20
+
+_CURRENCY = re.compile(r"[A-Z]{3}")
+
+Band = UpdateQuoteRequest.Quote.Band
+
+
+@dataclass(frozen=True)
+class RateUpdate:
+    """One normalized quote from a feed.
+
+    Attributes:
+        source: Name of the source that produced it.
+        currency: ISO 4217 currency code.
+        payment_method: tzero.v1.common.PaymentMethodType value.
+        direction: Direction.PAY_OUT or Direction.PAY_IN.
+        bands: Bands ordered by max_amount.
+        ttl: Seconds the quote stays valid once published.
+        timestamp: Wall-clock time the source observed the rate; None if unknown.
+    """
+
+    source: str
+    currency: str
+    payment_method: int
+    direction: Direction
+    bands: tuple[Band, ...]
+    ttl: float = DEFAULT_QUOTE_TTL
+    timestamp: float | None = None
+
+    @property
+    def key(self) -> QuoteKey:
+        return QuoteKey(self.currency, self.payment_method, self.direction)
+
+
+@dataclass
+class SourceStatus:
+    """Health of one source, as returned by FeedPipeline.status().
+
+    Attributes:
+        last_update: Wall-clock time of the last accepted update; None if there was none.
+        updates: Accepted updates.
+        rejected: Updates rejected by validation.
+        errors: Source failures and records that could not be normalized.
+        stale: Whether the source is currently stale.
+    """
+
+    last_update: float | None = None
+    updates: int = 0
+    rejected: int = 0
+    errors: int = 0
+    stale: bool = False
+
+
+class FeedSource(Protocol):
+    """A rate source: a named async stream of raw records.
+
+    stream() is called again after it raises, so it should (re)connect on every
+    call. A stream that ends without raising marks the source as finished.
+    """
+
+    name: str
+
+    def stream(self) -> AsyncIterator[Any]: ...
+
+
+class QuoteSink(Protocol):
+    """Where accepted updates go; QuotePublisher implements it."""
+
+    def update(
+        self, currency: str, payment_method: int, direction: Direction, bands: Iterable[Band], *, ttl: float = ...
+    ) -> None: ...
+
+    def remove(self, currency: str, payment_method: int, direction: Direction) -> bool: ...
+
+
+# --- Normalization ---
+
+
+def _payment_method(value: Any) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    name = str(value).upper()
+    if not name.startswith("PAYMENT_METHOD_TYPE_"):
+        name = "PAYMENT_METHOD_TYPE_" + name
+    return PaymentMethodType.Value(name)
+
+
+def _number(value: Any) -> Any:
+    if isinstance(value, float):  # only from callers that parsed JSON themselves; use the shortest repr
+        return decimal.Decimal(repr(value))
+    return value
+
+
+def _rate_update(source: str, quote: Mapping[str, Any]) -> RateUpdate:
+    bands = []
+    for band in quote["bands"]:
+        bands.append(
+            Band(
+                client_quote_id=band.get("client_quote_id", ""),
+                max_amount=from_number(_number(band["max_amount"])),
+                rate=from_number(_number(band["rate"])),
+            )
+        )
+    timestamp = quote.get("timestamp")
+    return RateUpdate(
+        source=source,
+        currency=quote["currency"],
+        payment_method=_payment_method(quote["payment_method"]),
+        direction=Direction(quote["direction"]),
+        bands=tuple(bands),
+        ttl=float(quote.get("ttl", DEFAULT_QUOTE_TTL)),
+        timestamp=None if timestamp is None else float(timestamp),
+    )
+
+
+def parse_json_rates(source: str, record: Any) -> list[RateUpdate]:
+    """Default normalizer: one JSON quote, a list of them, or {"quotes": [...]}.
+
+    Each quote looks like:
+
+        {"currency": "EUR", "payment_method": "SEPA", "direction": "pay_out", "ttl": 30,
+         "timestamp": 1718000000.25, "bands": [{"max_amount": "1000", "rate": "0.86"}]}
+
+    payment_method is a PaymentMethodType value or name (with or without the
+    PAYMENT_METHOD_TYPE_ prefix); ttl and timestamp are optional. Numbers may be
+    JSON numbers or decimal strings and are converted exactly. record may be bytes,
+    str, or an already parsed object.
+
+    Raises:
+        ValueError: The record is not valid JSON or a quote is malformed.
+    """
+    if isinstance(record, (bytes, bytearray, str)):
+        record = json.loads(record, parse_float=decimal.Decimal)
+    if isinstance(record, Mapping) and "quotes" in record:
+        record = record["quotes"]
+    quotes = record if isinstance(record, list) else [record]
+    try:
+        return [_rate_update(source, quote) for quote in quotes]
+    except (KeyError, TypeError, decimal.InvalidOperation) as exc:
+        raise ValueError(f"malformed quote: {exc!r}") from exc
+
+
+# --- Validation ---
+
+
+class RateValidator:
+    """Checks RateUpdates before they reach the sink.
+
+    Always checked: a three-letter upper-case currency, a known payment method, at
+    least one band, positive rates, positive and strictly ascending max_amounts, a
+    positive ttl, and a timestamp no more than `max_clock_skew` in the future.
+    Optionally: a maximum age of the rate, and a maximum move of the first band's
+    rate against the last accepted rate for the same quote from any source (a feed
+    glitch guard; call reset() to accept a genuine jump that large).
+
+    Subclass and extend validate() for provider-specific rules.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_age: float | None = None,
+        max_clock_skew: float = DEFAULT_MAX_CLOCK_SKEW,
+        max_move_bps: float | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create a validator.
+
+        Args:
+            max_age: Seconds after its timestamp at which a rate is too old; None disables.
+            max_clock_skew: Seconds a timestamp may lie in the future.
+            max_move_bps: Largest accepted move, in basis points, of the first band's rate; None disables.
+            clock: Wall clock compared with rate timestamps.
+        """
+        self._max_age = max_age
+        self._max_clock_skew = max_clock_skew
+        self._max_move_bps = max_move_bps
+        self._clock = clock
+        self._last_rates: dict[QuoteKey, Any] = {}
+
+    def validate(self, update: RateUpdate) -> None:
+        """Raise ValueError naming the first problem with update; remember its rate if it passes."""
+        if not _CURRENCY.fullmatch(update.currency):
+            raise ValueError(f"invalid currency {update.currency!r}")
+        if update.payment_method not in PaymentMethodType.values() or update.payment_method == 0:
+            raise ValueError(f"invalid payment method {update.payment_method}")
+        if not update.bands:
+            raise ValueError("a quote needs at least one band")
+        if not update.ttl > 0:
+            raise ValueError("ttl must be positive")
+        previous = None
+        for band in update.bands:
+            max_amount = to_fraction(band.max_amount)
+            if max_amount <= 0 or to_fraction(band.rate) <= 0:
+                raise ValueError("band max_amount and rate must be positive")
+            if previous is not None and max_amount <= previous:
+                raise ValueError("band max_amounts must be strictly ascending")
+            previous = max_amount
+        if update.timestamp is not None:
+            age = self._clock() - update.timestamp
+            if age < -self._max_clock_skew:
+                raise ValueError(f"timestamp is {-age:.1f}s in the future")
+            if self._max_age is not None and age > self._max_age:
+                raise ValueError(f"rate is {age:.1f}s old")
+        rate = update.bands[0].rate
+        if self._max_move_bps is not None:
+            last = self._last_rates.get(update.key)
+            if last is not None and relative_change_bps(last, rate) > self._max_move_bps:
+                raise ValueError(f"rate moved {relative_change_bps(last, rate):.0f} bps, over {self._max_move_bps:g}")
+        self._last_rates[update.key] = rate
+
+    def reset(self, key: QuoteKey | None = None) -> None:
+        """Forget the last accepted rate of one quote, or of all of them."""
+        if key is None:
+            self._last_rates.clear()
+        else:
+            self._last_rates.pop(key, None)
+
+
+# --- Sources ---
+
+
+class HttpPollingSource:
+    """Polls a URL at a fixed rate and yields each 2xx response body.
+
+    A non-2xx status, a timeout or a connection error raises, so the pipeline
+    restarts the source with backoff.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        url: str,
+        *,
+        interval: float = DEFAULT_FEED_POLL_INTERVAL,
+        timeout: float = DEFAULT_FEED_TIMEOUT,
+        headers: Mapping[str, str] | None = None,
+        client: pyqwest.Client | None = None,
+    ) -> None:
+        """Create an HTTP polling source.
+
+        Args:
+            name: Source name used in logs, metrics and status().
+            url: URL to GET.
+            interval: Seconds between the starts of consecutive polls.
+            timeout: Seconds a poll may take.
+            headers: Request headers (e.g. an API key).
+            client: pyqwest client to share between sources; a new one is created if omitted.
+        """
+        if interval <= 0 or timeout <= 0:
+            raise ValueError("interval and timeout must be positive")
+        self.name = name
+        self.url = url
+        self._interval = interval
+        self._timeout = timeout
+        self._headers = dict(headers or {})
+        self._client = client
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        if self._client is None:
+            self._client = pyqwest.Client()
+        loop = asyncio.get_running_loop()
+        due = loop.time()
+        while True:
+            response = await asyncio.wait_for(
+                self._client.get(self.url, headers=pyqwest.Headers(self._headers)), self._timeout
+            )
+            if not 200 <= response.status < 300:
+                raise ConnectionError(f"HTTP {response.status} from {self.url}")
+            yield response.content
+            # fixed rate; after an overrun, continue from now rather than firing back to back
+            due = max(due + self._interval, loop.time())
+            await asyncio.sleep(due - loop.time())
+
+
+class _Tail:
+    """Blocking file follower; read() runs in a worker thread."""
+
+    def __init__(self, path: str, from_start: bool) -> None:
+        self._path = path
+        self._from_start = from_start
+        self._file: Any = None
+        self._inode: int | None = None
+
+    def read(self) -> bytes:
+        try:
+            inode = os.stat(self._path).st_ino
+        except FileNotFoundError:
+            return b""
+        data = b""
+        if self._file is not None and inode != self._inode:  # rotated: finish the old file first
+            data = self._file.read()
+            self.close()
+        if self._file is None:
+            first = self._inode is None
+            self._file = open(self._path, "rb")  # noqa: SIM115 -- kept open across reads, closed by close()
+            self._inode = os.fstat(self._file.fileno()).st_ino
+            if first and not self._from_start:
+                self._file.seek(0, os.SEEK_END)
+        elif os.fstat(self._file.fileno()).st_size < self._file.tell():  # truncated
+            self._file.seek(0)
+        return data + self._file.read(_TAIL_CHUNK)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class FileTailSource:
+    """Follows a file like `tail -F` and yields each complete, non-blank line.
+
+    Reads run in a worker thread. A truncated file is read again from the start; a
+    replaced (rotated) file is drained and then followed from the start of the new
+    one. A missing file yields nothing until it appears.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str | os.PathLike[str],
+        *,
+        poll_interval: float = DEFAULT_FEED_POLL_INTERVAL,
+        from_start: bool = False,
+    ) -> None:
+        """Create a file tail source.
+
+        Args:
+            name: Source name used in logs, metrics and status().
+            path: File to follow.
+            poll_interval: Seconds to wait after a read that found no new data.
+            from_start: Read lines already in the file when first opened, rather than only new ones.
+        """
+        if poll_interval <= 0:
+            raise ValueError("poll_interval must be positive")
+        self.name = name
+        self.path = os.fspath(path)
+        self._poll_interval = poll_interval
+        self._from_start = from_start
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        tail = _Tail(self.path, self._from_start)
+        pending = b""
+        try:
+            while True:
+                data = await asyncio.to_thread(tail.read)
+                if not data:
+                    await asyncio.sleep(self._poll_interval)
+                    continue
+                *lines, pending = (pending + data).split(b"\n")
+                for line in lines:
+                    if line.strip():
+                        yield line
+        finally:
+            tail.close()
+
+
+class SocketSource:
+    """Reads newline-delimited records from a local Unix or TCP socket.
+
+    The connection closing raises, so the pipeline reconnects with backoff.
+    """
+
+    def __init__(self, name: str, *, path: str | None = None, host: str = "127.0.0.1", port: int | None = None) -> None:
+        """Create a socket source; pass either path (Unix socket) or port (TCP).
+
+        Args:
+            name: Source name used in logs, metrics and status().
+            path: Unix socket path.
+            host: TCP host.
+            port: TCP port.
+        """
+        if (path is None) == (port is None):
+            raise ValueError("pass exactly one of path and port")
+        self.name = name
+        self._path = path
+        self._host = host
+        self._port = port
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        if self._path is not None:
+            reader, writer = await asyncio.open_unix_connection(self._path)
+        else:
+            reader, writer = await asyncio.open_connection(self._host, self._port)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    raise ConnectionError("connection closed by peer")
+                if line.strip():
+                    yield line.rstrip(b"\r\n")
+        finally:
+            writer.close()
+            with contextlib.suppress(OSError):
+                await writer.wait_closed()
+
+
+_CLOSED = object()
+
+
+class LocalFeed:
+    """In-process stand-in feed for tests and development.
+
+    push() records (anything the pipeline's normalizer accepts), fail() to make the
+    stream raise, close() to end it.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+
+    def push(self, record: Any) -> None:
+        self._queue.put_nowait(record)
+
+    def push_quote(
+        self,
+        currency: str,
+        payment_method: int | str,
+        direction: Direction,
+        bands: Iterable[tuple[Any, Any]],
+        *,
+        ttl: float | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Push one quote in the parse_json_rates format; bands are (max_amount, rate) pairs."""
+        quote: dict[str, Any] = {
+            "currency": currency,
+            "payment_method": payment_method,
+            "direction": str(direction),
+            "bands": [{"max_amount": str(amount), "rate": str(rate)} for amount, rate in bands],
+        }
+        if ttl is not None:
+            quote["ttl"] = ttl
+        if timestamp is not None:
+            quote["timestamp"] = timestamp
+        self.push(quote)
+
+    def fail(self, error: Exception) -> None:
+        self._queue.put_nowait(error)
+
+    def close(self) -> None:
+        self._queue.put_nowait(_CLOSED)
+
+    async def stream(self) -> AsyncIterator[Any]:
+        while True:
+            record = await self._queue.get()
+            if record is _CLOSED:
+                return
+            if isinstance(record, Exception):
+                raise record
+            yield record
+
+
+# --- Pipeline ---
+
+
+class FeedPipeline:
+    """Pulls rate sources through normalize and validate stages into a quote sink.
+
+    Runs on one event loop; sink.update() and sink.remove() are called from it.
+
+    Metrics (recorded in `registry`, per-source ones labelled with source=name):
+        t0_feed_records_total: raw records received.
+        t0_feed_updates_total: normalized updates by result ("accepted" or "rejected").
+        t0_feed_errors_total: failures by stage ("source", "normalize" or "apply").
+        t0_feed_stale_total: times the source became stale.
+        t0_feed_backpressure_total: puts that found the next stage's queue full, by stage.
+        t0_feed_latency_seconds: age of accepted updates that carry a timestamp.
+    """
+
+    def __init__(
+        self,
+        sources: Sequence[FeedSource],
+        sink: QuoteSink,
+        *,
+        normalize: Callable[[str, Any], Iterable[RateUpdate]] = parse_json_rates,
+        validator: RateValidator | None = None,
+        queue_size: int = DEFAULT_FEED_QUEUE_SIZE,
+        stale_after: float | None = DEFAULT_STALE_AFTER,
+        withdraw_stale: bool = True,
+        base_backoff: float = DEFAULT_SOURCE_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_SOURCE_MAX_BACKOFF,
+        registry: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create a pipeline.
+
+        Args:
+            sources: Rate sources; names must be unique.
+            sink: Receives accepted updates (e.g. a QuotePublisher).
+            normalize: Turns (source name, raw record) into RateUpdates; raises ValueError on bad input.
+            validator: Checks updates; a RateValidator with defaults if omitted.
+            queue_size: Capacity of each queue between stages.
+            stale_after: Seconds without a valid update after which a source is stale; None disables.
+            withdraw_stale: Remove the quotes last provided by a source from the sink while it is stale.
+            base_backoff: First delay before restarting a failed source.
+            max_backoff: Maximum delay before restarting a failed source.
+            registry: Metrics registry; a private one is created if omitted.
+            clock: Wall clock used for staleness and update ages.
+        """
+        names = [source.name for source in sources]
+        if len(set(names)) != len(names):
+            raise ValueError("source names must be unique")
+        if queue_size < 1:
+            raise ValueError("queue_size must be at least 1")
+        if stale_after is not None and stale_after <= 0:
+            raise ValueError("stale_after must be positive")
+        self._sources = list(sources)
+        self._sink = sink
+        self._normalize = normalize
+        self._validator = validator or RateValidator(clock=clock)
+        self._queue_size = queue_size
+        self._stale_after = stale_after
+        self._withdraw_stale = withdraw_stale
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._clock = clock
+        self.registry = registry or MetricsRegistry()
+
+        self._status = {name: SourceStatus() for name in names}
+        self._owners: dict[QuoteKey, str] = {}  # source of the latest accepted update per quote
+        self._started_at = clock()
+        self._shutdown: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+        self._backpressure = {
+            stage: self.registry.counter(
+                "t0_feed_backpressure_total", "Feed records that waited for a full queue, by stage.", stage=stage
+            )
+            for stage in ("normalize", "validate")
+        }
+        self._latency: Histogram = self.registry.histogram(
+            "t0_feed_latency_seconds", "Age of accepted feed updates that carry a timestamp."
+        )
+
+    def _counter(self, name: str, help_text: str, source: str, **labels: str) -> Counter:
+        return self.registry.counter(name, help_text, source=source, **labels)
+
+    def status(self) -> dict[str, SourceStatus]:
+        """A copy of every source's status, by name."""
+        return {name: dataclasses.replace(status) for name, status in self._status.items()}
+
+    async def start(self) -> None:
+        """Run the pipeline in the background until stop(); meant as an ASGI lifespan hook."""
+        if self._task is not None:
+            raise RuntimeError("pipeline is already running")
+        self._shutdown = asyncio.Event()
+        self._task = asyncio.create_task(self.run(self._shutdown))
+
+    async def stop(self) -> None:
+        """Stop the background task started by start()."""
+        if self._task is None or self._shutdown is None:
+            return
+        self._shutdown.set()
+        await self._task
+        self._task = None
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """Ingest from every source until shutdown_event is set, then cancel all stages."""
+        raw: asyncio.Queue[tuple[str, Any]] = asyncio.Queue(self._queue_size)
+        updates: asyncio.Queue[RateUpdate] = asyncio.Queue(self._queue_size)
+        self._started_at = self._clock()
+        tasks = [asyncio.create_task(self._ingest(source, raw)) for source in self._sources]
+        tasks.append(asyncio.create_task(self._normalize_stage(raw, updates)))
+        tasks.append(asyncio.create_task(self._validate_stage(updates)))
+        if self._stale_after is not None:
+            checker = PeriodicTask(
+                self._check_staleness, interval=self._stale_after / 10, name="feed staleness", registry=self.registry
+            )
+            tasks.append(asyncio.create_task(checker.run(shutdown_event)))
+        try:
+            await shutdown_event.wait()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _put(self, queue: asyncio.Queue[Any], item: Any, stage: str) -> None:
+        if queue.full():
+            self._backpressure[stage].inc()
+        await queue.put(item)
+
+    async def _ingest(self, source: FeedSource, raw: asyncio.Queue[tuple[str, Any]]) -> None:
+        name = source.name
+        records = self._counter("t0_feed_records_total", "Raw records received from feed sources.", name)
+        errors = self._counter("t0_feed_errors_total", "Feed failures by stage.", name, stage="source")
+        failures = 0
+        while True:
+            try:
+                async with contextlib.aclosing(source.stream()) as stream:
+                    async for record in stream:
+                        failures = 0
+                        records.inc()
+                        await self._put(raw, (name, record), "normalize")
+            except Exception:
+                failures += 1
+                errors.inc()
+                self._status[name].errors += 1
+                delay = random.uniform(0, min(self._max_backoff, self._base_backoff * 2 ** (failures - 1)))
+                logger.exception("%s: feed source failed (%d consecutive); restarting in %.2fs", name, failures, delay)
+                await asyncio.sleep(delay)
+            else:
+                logger.info("%s: feed source finished", name)
+                return
+
+    async def _normalize_stage(self, raw: asyncio.Queue[tuple[str, Any]], updates: asyncio.Queue[RateUpdate]) -> None:
+        while True:
+            name, record = await raw.get()
+            try:
+                normalized = list(self._normalize(name, record))
+            except Exception as exc:
+                self._counter("t0_feed_errors_total", "Feed failures by stage.", name, stage="normalize").inc()
+                self._status[name].errors += 1
+                logger.warning("%s: dropping record that could not be normalized: %s", name, exc)
+                continue
+            for update in normalized:
+                await self._put(updates, update, "validate")
+
+    async def _validate_stage(self, updates: asyncio.Queue[RateUpdate]) -> None:
+        while True:
+            update = await updates.get()
+            status = self._status[update.source]
+            result = "accepted"
+            try:
+                try:
+                    self._validator.validate(update)
+                except ValueError as exc:
+                    result = "rejected"
+                    status.rejected += 1
+                    logger.warning("%s: rejected %s quote: %s", update.source, "/".join(map(str, update.key)), exc)
+                else:
+                    self._apply(update, status)
+            except Exception:
+                self._counter("t0_feed_errors_total", "Feed failures by stage.", update.source, stage="apply").inc()
+                status.errors += 1
+                logger.exception(
+                    "%s: dropping %s quote that could not be applied", update.source, "/".join(map(str, update.key))
+                )
+                continue
+            self._counter(
+                "t0_feed_updates_total", "Normalized feed updates by result.", update.source, result=result
+            ).inc()
+
+    def _apply(self, update: RateUpdate, status: SourceStatus) -> None:
+        self._sink.update(update.currency, update.payment_method, update.direction, update.bands, ttl=update.ttl)
+        self._owners[update.key] = update.source
+        now = self._clock()
+        if update.timestamp is not None:
+            self._latency.observe(max(0.0, now - update.timestamp))
+        status.last_update = now
+        status.updates += 1
+        if status.stale:
+            status.stale = False
+            logger.info("%s: feed source recovered", update.source)
+
+    async def _check_staleness(self) -> None:
+        now = self._clock()
+        for name, status in self._status.items():
+            since = self._started_at if status.last_update is None else status.last_update
+            if status.stale or now - since < (self._stale_after or float("inf")):
+                continue
+            status.stale = True
+            self._counter("t0_feed_stale_total", "Times a feed source became stale.", name).inc()
+            withdrawn = 0
+            if self._withdraw_stale:
+                for key in [key for key, owner in self._owners.items() if owner == name]:
+                    del self._owners[key]
+                    withdrawn += self._sink.remove(*key)
+            logger.warning(
+                "%s: no valid update for %.1fs; source is stale (%d quotes withdrawn)", name, now - since, withdrawn
+            )
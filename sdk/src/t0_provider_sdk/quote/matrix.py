@@ -0,0 +1,311 @@
+"""Concurrent GetQuote fan-out into a columnar rate matrix.
+
+GetQuote answers one (amount, currency, payout method) at a time. For routing a
+provider needs the network's view across every currency, payout method and
+amount tier, which is one request per cell. fetch_rate_matrix() sends them
+concurrently:
+
+- at most `concurrency` requests in flight, served by a fixed pool of worker
+  tasks, so a large grid never creates thousands of tasks at once;
+- every request has its own timeout, so one slow cell cannot hold up the rest;
+- a failed or timed-out request marks its cell and is reported, never raised.
+
+Results land in a RateMatrix: one flat column per field (status, rate, amounts,
+quote id, expiration) in array.array form, indexed by (currency, method, tier) in
+row-major order. Decimal fields keep their exact unscaled value and exponent. The
+columns are buffers, so numpy.asarray(matrix.rate_unscaled) wraps them without copying.
+
+Example:
+    matrix = await fetch_rate_matrix(
+        network_client,
+        currencies=["EUR", "GBP"],
+        methods=[PAYMENT_METHOD_TYPE_SEPA, PAYMENT_METHOD_TYPE_SWIFT],
+        amounts=[100, 1_000, 10_000],  # settlement amounts in USD
+    )
+    rate = matrix.rate("EUR", PAYMENT_METHOD_TYPE_SEPA, 1)
+    for failure in matrix.errors:
+        ...
+
+No Go equivalent; the Go starter requests a single quote.
+"""
+
+from __future__ import annotations
+
+import array
+import asyncio
+import enum
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+from connectrpc.errors import ConnectError
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import (
+    QUOTE_TYPE_REALTIME,
+    GetQuoteRequest,
+    GetQuoteResponse,
+)
+from t0_provider_sdk.common.decimal import from_number
+
+if TYPE_CHECKING:
+    import decimal
+    from fractions import Fraction
+
+    from connectrpc.code import Code
+
+logger = logging.getLogger(__name__)
+
+# Maximum GetQuote requests in flight during a fan-out
+DEFAULT_FANOUT_CONCURRENCY = 16
+
+# Seconds each GetQuote request may take before its cell is marked as timed out
+DEFAULT_FANOUT_TIMEOUT = 5.0
+
+# RateMatrix columns written by _fill()
+_VALUE_COLUMNS = (
+    "rate_unscaled",
+    "rate_exponent",
+    "pay_out_unscaled",
+    "pay_out_exponent",
+    "settlement_unscaled",
+    "settlement_exponent",
+    "quote_id",
+    "provider_id",
+    "expiration",
+)
+
+
+class QuoteStatus(enum.IntEnum):
+    """Outcome of one cell of a rate matrix."""
+
+    OK = 0  # GetQuoteResponse.success
+    NOT_FOUND = 1  # GetQuoteResponse.failure: no quote or limits exceeded
+    TIMEOUT = 2  # no response within the per-request timeout
+    ERROR = 3  # the request failed (ConnectError or transport error), or the response was empty or unusable
+
+
+@dataclass(frozen=True)
+class QuoteFailure:
+    """A cell without a quote.
+
+    Attributes:
+        currency: Pay-out currency of the request.
+        method: Pay-out method of the request.
+        tier: Index into RateMatrix.amounts.
+        status: NOT_FOUND, TIMEOUT or ERROR.
+        code: ConnectError code for errors from the network, otherwise None.
+        message: Failure reason or error message.
+    """
+
+    currency: str
+    method: int
+    tier: int
+    status: QuoteStatus
+    code: Code | None = None
+    message: str = ""
+
+
+@dataclass
+class RateMatrix:
+    """Columnar GetQuote results for every (currency, method, amount tier).
+
+    Cell (c, m, t) is at index (c * len(methods) + m) * len(amounts) + t of every
+    column. Columns of cells without a quote hold zeros.
+    """
+
+    currencies: tuple[str, ...]
+    methods: tuple[int, ...]
+    amounts: tuple[Decimal, ...]
+    status: array.array = field(repr=False)  # QuoteStatus values
+    rate_unscaled: array.array = field(repr=False)
+    rate_exponent: array.array = field(repr=False)
+    pay_out_unscaled: array.array = field(repr=False)
+    pay_out_exponent: array.array = field(repr=False)
+    settlement_unscaled: array.array = field(repr=False)
+    settlement_exponent: array.array = field(repr=False)
+    quote_id: array.array = field(repr=False)
+    provider_id: array.array = field(repr=False)
+    expiration: array.array = field(repr=False)  # seconds since the epoch
+    failures: list[QuoteFailure] = field(default_factory=list)
+
+    @classmethod
+    def empty(cls, currencies: Sequence[str], methods: Sequence[int], amounts: Sequence[Decimal]) -> RateMatrix:
+        """A matrix of the given shape with every cell marked ERROR until filled."""
+        size = len(currencies) * len(methods) * len(amounts)
+
+        def column(typecode: str) -> array.array:
+            return array.array(typecode, bytes(array.array(typecode).itemsize * size))
+
+        status = array.array("b", [QuoteStatus.ERROR] * size)
+        return cls(
+            tuple(currencies),
+            tuple(methods),
+            tuple(amounts),
+            status,
+            column("q"),
+            column("b"),
+            column("q"),
+            column("b"),
+            column("q"),
+            column("b"),
+            column("q"),
+            column("i"),
+            column("d"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return len(self.currencies), len(self.methods), len(self.amounts)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every request got an answer from the network (NOT_FOUND counts as an answer)."""
+        return not self.errors
+
+    @property
+    def errors(self) -> list[QuoteFailure]:
+        """Failures caused by timeouts or errors rather than by the network finding no quote."""
+        return [f for f in self.failures if f.status in (QuoteStatus.TIMEOUT, QuoteStatus.ERROR)]
+
+    def index(self, currency: str, method: int, tier: int) -> int:
+        """Column index of a cell; raises ValueError for unknown currencies or methods."""
+        if not 0 <= tier < len(self.amounts):
+            raise IndexError(f"amount tier {tier} out of range")
+        row = self.currencies.index(currency) * len(self.methods) + self.methods.index(method)
+        return row * len(self.amounts) + tier
+
+    def cell_status(self, currency: str, method: int, tier: int) -> QuoteStatus:
+        return QuoteStatus(self.status[self.index(currency, method, tier)])
+
+    def rate(self, currency: str, method: int, tier: int) -> Decimal | None:
+        """Quoted rate (USD/currency) of a cell, or None if it has no quote."""
+        i = self.index(currency, method, tier)
+        if self.status[i] != QuoteStatus.OK:
+            return None
+        return Decimal(unscaled=self.rate_unscaled[i], exponent=self.rate_exponent[i])
+
+    def success(self, currency: str, method: int, tier: int) -> GetQuoteResponse.Success | None:
+        """Rebuild the GetQuoteResponse.Success of a cell, or None if it has no quote."""
+        i = self.index(currency, method, tier)
+        if self.status[i] != QuoteStatus.OK:
+            return None
+        result = GetQuoteResponse.Success(
+            rate=Decimal(unscaled=self.rate_unscaled[i], exponent=self.rate_exponent[i]),
+            pay_out_amount=Decimal(unscaled=self.pay_out_unscaled[i], exponent=self.pay_out_exponent[i]),
+            settlement_amount=Decimal(unscaled=self.settlement_unscaled[i], exponent=self.settlement_exponent[i]),
+        )
+        result.quote_id.quote_id = self.quote_id[i]
+        result.quote_id.provider_id = self.provider_id[i]
+        result.expiration.FromNanoseconds(round(self.expiration[i] * 1_000_000_000))
+        return result
+
+    def _fill(self, i: int, response: GetQuoteResponse) -> None:
+        success = response.success
+        self.rate_unscaled[i] = success.rate.unscaled
+        self.rate_exponent[i] = success.rate.exponent
+        self.pay_out_unscaled[i] = success.pay_out_amount.unscaled
+        self.pay_out_exponent[i] = success.pay_out_amount.exponent
+        self.settlement_unscaled[i] = success.settlement_amount.unscaled
+        self.settlement_exponent[i] = success.settlement_amount.exponent
+        self.quote_id[i] = success.quote_id.quote_id
+        self.provider_id[i] = success.quote_id.provider_id
+        self.expiration[i] = success.expiration.ToNanoseconds() / 1_000_000_000
+        self.status[i] = QuoteStatus.OK
+
+    def _fail(self, i: int, status: QuoteStatus, code: Code | None, message: str) -> None:
+        self.status[i] = status
+        for column in _VALUE_COLUMNS:  # undo a partial _fill()
+            getattr(self, column)[i] = 0
+        per_currency = len(self.methods) * len(self.amounts)
+        self.failures.append(
+            QuoteFailure(
+                self.currencies[i // per_currency],
+                self.methods[i % per_currency // len(self.amounts)],
+                i % len(self.amounts),
+                status,
+                code,
+                message,
+            )
+        )
+
+
+async def fetch_rate_matrix(
+    client: Any,
+    *,
+    currencies: Sequence[str],
+    methods: Sequence[int],
+    amounts: Sequence[Decimal | decimal.Decimal | Fraction | int | str],
+    quote_type: int = QUOTE_TYPE_REALTIME,
+    concurrency: int = DEFAULT_FANOUT_CONCURRENCY,
+    timeout: float = DEFAULT_FANOUT_TIMEOUT,
+) -> RateMatrix:
+    """Request a quote for every (currency, method, amount) and collect the results.
+
+    Never raises for individual requests: each failure is recorded in the matrix and
+    summarized in one log line.
+
+    Args:
+        client: Async NetworkService client (e.g. from new_service_client()).
+        currencies: Pay-out currencies (ISO 4217).
+        methods: tzero.v1.common.PaymentMethodType values.
+        amounts: Settlement amounts in USD, one per tier.
+        quote_type: QuoteType of every request.
+        concurrency: Maximum requests in flight.
+        timeout: Seconds each request may take.
+
+    Returns:
+        The filled matrix, with a QuoteFailure for every cell without a quote.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+    tiers = [a if isinstance(a, Decimal) else from_number(a) for a in amounts]
+    matrix = RateMatrix.empty(currencies, methods, tiers)
+    cells = _requests(matrix, quote_type)
+
+    async def worker() -> None:
+        for i, request in cells:  # the shared iterator hands each cell to exactly one worker
+            try:
+                response = await asyncio.wait_for(client.get_quote(request), timeout)
+                result = response.WhichOneof("result")
+                if result == "success":
+                    matrix._fill(i, response)  # raises for values the columns cannot hold
+                elif result == "failure":
+                    reason = GetQuoteResponse.Failure.Reason.Name(response.failure.reason)
+                    matrix._fail(i, QuoteStatus.NOT_FOUND, None, reason)
+                else:
+                    matrix._fail(i, QuoteStatus.ERROR, None, "response has neither success nor failure")
+            except TimeoutError:
+                matrix._fail(i, QuoteStatus.TIMEOUT, None, f"no response within {timeout}s")
+            except ConnectError as e:
+                matrix._fail(i, QuoteStatus.ERROR, e.code, e.message)
+            except Exception as e:
+                matrix._fail(i, QuoteStatus.ERROR, None, str(e) or type(e).__name__)
+
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(matrix)))))
+    matrix.failures.sort(key=lambda f: matrix.index(f.currency, f.method, f.tier))
+    if matrix.failures:
+        errors = len(matrix.errors)
+        logger.warning(
+            "Rate matrix: %d of %d quotes missing (%d not found, %d errors or timeouts)",
+            len(matrix.failures),
+            len(matrix),
+            len(matrix.failures) - errors,
+            errors,
+        )
+    return matrix
+
+
+def _requests(matrix: RateMatrix, quote_type: int) -> Iterator[tuple[int, GetQuoteRequest]]:
+    """GetQuoteRequest of every cell with its column index, in column order."""
+    cells = itertools.product(matrix.currencies, matrix.methods, matrix.amounts)
+    for i, (currency, method, tier) in enumerate(cells):
+        request = GetQuoteRequest(pay_out_currency=currency, pay_out_method=method, quote_type=quote_type)
+        request.amount.settlement_amount.CopyFrom(tier)
+        yield i, request
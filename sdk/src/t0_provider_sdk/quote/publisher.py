@@ -0,0 +1,360 @@
+"""Coalescing quote publisher.
+
+UpdateQuote replaces all previously published quotes, so every publish must carry
+the provider's full book. QuotePublisher keeps the latest bands per
+(currency, payment method, direction), accepts concurrent updates from any number
+of rate feeds (asyncio tasks or threads), and coalesces them into one full
+UpdateQuoteRequest published at a bounded cadence:
+
+- at most once per min_interval, and only if the book changed meaningfully since the
+  last publish or a published quote is about to expire (see QuoteDiffer);
+- at least once per max_interval while the book is not empty, as a heartbeat.
+
+run() does not poll: it sleeps until the earliest of the next quote refresh (kept
+in the differ's timer wheel), the next heartbeat, or an update() from a feed, and
+never ticks more often than min_interval.
+
+Publishing runs in its own task. A tick that comes up while the previous publish
+is still in flight is skipped rather than queued, so a slow network never builds
+a backlog of outdated books.
+
+Example:
+    publisher = QuotePublisher(network_client)
+    asyncio.create_task(publisher.run(shutdown_event))
+
+    # from any feed, at any rate:
+    publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, bands)
+
+No Go equivalent; the Go starter publishes a fixed quote in a loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import enum
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, NamedTuple
+
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest
+from t0_provider_sdk.common.metrics import MetricsRegistry
+from t0_provider_sdk.quote.diff import QuoteDiffer
+
+if TYPE_CHECKING:
+    from t0_provider_sdk.common.metrics import Counter, Histogram
+    from t0_provider_sdk.quote.book import QuoteBook
+
+logger = logging.getLogger(__name__)
+
+# Publish at most once per this many seconds (the network asks for no more than once per second)
+DEFAULT_MIN_INTERVAL = 1.0
+
+# Publish at least once per this many seconds while quotes exist
+DEFAULT_MAX_INTERVAL = 5.0
+
+# Seconds a published quote stays valid (its expiration is publish time + ttl)
+DEFAULT_QUOTE_TTL = 30.0
+
+Band = UpdateQuoteRequest.Quote.Band
+
+
+class Direction(enum.StrEnum):
+    """Side of a quote; values are the UpdateQuoteRequest field names."""
+
+    PAY_OUT = "pay_out"
+    PAY_IN = "pay_in"
+
+
+class QuoteKey(NamedTuple):
+    """Identifies one quote within the book."""
+
+    currency: str
+    payment_method: int  # tzero.v1.common.PaymentMethodType
+    direction: Direction
+
+
+@dataclass
+class QuoteEntry:
+    """Latest bands reported by a feed for one QuoteKey.
+
+    Attributes:
+        bands: Bands with client_quote_id set, ordered by max_amount as given by the feed.
+        ttl: Seconds the quote stays valid once published.
+        updated_at: Wall-clock time (seconds since the epoch) of the feed update.
+    """
+
+    bands: list[Band]
+    ttl: float
+    updated_at: float
+
+
+def _copy_bands(bands: Iterable[Band]) -> list[Band]:
+    """Copy bands so later changes by the caller cannot leak in, assigning missing client_quote_ids."""
+    copies = []
+    for band in bands:
+        copy = Band()
+        copy.CopyFrom(band)
+        if not copy.client_quote_id:
+            copy.client_quote_id = str(uuid.uuid4())
+        copies.append(copy)
+    return copies
+
+
+class QuotePublisher:
+    """Coalesces concurrent quote updates into full UpdateQuoteRequests.
+
+    update() and remove() are thread-safe and never block on the network. run()
+    drives publishing on the event loop.
+
+    Metrics (recorded in `registry`):
+        t0_quote_publish_seconds: UpdateQuote call latency.
+        t0_quote_publishes_total: publish attempts by result ("ok" or "error").
+        t0_quote_skipped_ticks_total: ticks skipped because a publish was still in flight.
+        t0_quote_staleness_seconds: age of each quote's feed data at the time it is published.
+        t0_quote_suppressed_publishes_total: due publishes skipped because nothing changed meaningfully.
+        t0_quote_encodings_total: quotes per publish by action ("rebuilt" or "reused" from cached bytes).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float | None = DEFAULT_MAX_INTERVAL,
+        differ: QuoteDiffer | None = None,
+        book: QuoteBook | None = None,
+        registry: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """Create a publisher.
+
+        Args:
+            client: Async NetworkService client (e.g. from new_service_client()).
+            min_interval: Minimum seconds between publishes; also the tick period.
+            max_interval: Maximum seconds between publishes while the book is not empty;
+                None disables the heartbeat, so only changes and expirations trigger publishes.
+            differ: Change detection and thresholds; a QuoteDiffer with defaults if omitted.
+            book: Quote book that records every successfully published request.
+            registry: Metrics registry; a private one is created if omitted.
+            clock: Wall clock used for quote timestamps and expirations.
+        """
+        if min_interval <= 0 or (max_interval is not None and max_interval < min_interval):
+            raise ValueError("intervals must satisfy 0 < min_interval <= max_interval")
+        self._client = client
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._clock = clock
+        self.differ = differ or QuoteDiffer()
+        self.book = book
+        self.registry = registry or MetricsRegistry()
+
+        self._lock = threading.Lock()
+        self._entries: dict[QuoteKey, QuoteEntry] = {}
+        self._dirty = False
+        self._last_publish = -float("inf")  # time.monotonic() of the last publish start
+        self._inflight: asyncio.Task[None] | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._shutdown: asyncio.Event | None = None
+        self._task: asyncio.Task[None] | None = None
+
+        self._publish_latency: Histogram = self.registry.histogram(
+            "t0_quote_publish_seconds", "Latency of UpdateQuote calls."
+        )
+        self._published: Counter = self.registry.counter(
+            "t0_quote_publishes_total", "UpdateQuote publish attempts by result.", result="ok"
+        )
+        self._failed: Counter = self.registry.counter(
+            "t0_quote_publishes_total", "UpdateQuote publish attempts by result.", result="error"
+        )
+        self._skipped: Counter = self.registry.counter(
+            "t0_quote_skipped_ticks_total", "Publish ticks skipped because a publish was in flight."
+        )
+        self._staleness: Histogram = self.registry.histogram(
+            "t0_quote_staleness_seconds", "Age of feed data in published quotes."
+        )
+        self._suppressed: Counter = self.registry.counter(
+            "t0_quote_suppressed_publishes_total", "Due publishes skipped because no quote changed meaningfully."
+        )
+        self._rebuilt: Counter = self.registry.counter(
+            "t0_quote_encodings_total", "Quotes per publish by encoding action.", action="rebuilt"
+        )
+        self._reused: Counter = self.registry.counter(
+            "t0_quote_encodings_total", "Quotes per publish by encoding action.", action="reused"
+        )
+
+    def update(
+        self,
+        currency: str,
+        payment_method: int,
+        direction: Direction,
+        bands: Iterable[Band],
+        *,
+        ttl: float = DEFAULT_QUOTE_TTL,
+    ) -> None:
+        """Replace the bands for one (currency, payment method, direction).
+
+        Bands without a client_quote_id get a fresh one. The change is published on the
+        next tick if it moves the quote by at least the differ's threshold.
+
+        Args:
+            currency: ISO 4217 currency code (e.g. "EUR").
+            payment_method: tzero.v1.common.PaymentMethodType value.
+            direction: Direction.PAY_OUT or Direction.PAY_IN.
+            bands: One or more bands.
+            ttl: Seconds the quote stays valid once published.
+        """
+        entry = QuoteEntry(_copy_bands(bands), ttl, self._clock())
+        if not entry.bands:
+            raise ValueError("a quote needs at least one band")
+        key = QuoteKey(currency, payment_method, Direction(direction))
+        with self._lock:
+            self._entries[key] = entry
+            was_dirty, self._dirty = self._dirty, True
+        if not was_dirty:
+            self._wake()
+
+    def remove(self, currency: str, payment_method: int, direction: Direction) -> bool:
+        """Withdraw a quote. Returns False if there was none."""
+        with self._lock:
+            if self._entries.pop(QuoteKey(currency, payment_method, Direction(direction)), None) is None:
+                return False
+            was_dirty, self._dirty = self._dirty, True
+        if not was_dirty:
+            self._wake()
+        return True
+
+    def _wake(self) -> None:
+        """Wake run() early; safe to call from any thread."""
+        loop, wakeup = self._loop, self._wakeup
+        if loop is None or wakeup is None:
+            return
+        with contextlib.suppress(RuntimeError):  # loop already closed
+            loop.call_soon_threadsafe(wakeup.set)
+
+    def staleness(self) -> dict[QuoteKey, float]:
+        """Seconds since each quote was last updated by its feed."""
+        now = self._clock()
+        with self._lock:
+            return {key: now - entry.updated_at for key, entry in self._entries.items()}
+
+    def build_request(self) -> UpdateQuoteRequest:
+        """Build the UpdateQuoteRequest the next publish would send for the current book."""
+        with self._lock:
+            entries = dict(self._entries)
+        return self.differ.plan(entries, self._clock()).request()
+
+    async def publish(self, *, force: bool = True) -> None:
+        """Publish the current book. Errors are logged and the book is retried on the next tick.
+
+        Args:
+            force: Send the book even if no quote changed meaningfully since the last publish.
+        """
+        with self._lock:
+            entries = dict(self._entries)
+            self._dirty = False
+        now = self._clock()
+        plan = self.differ.plan(entries, now)
+        if not (force or plan.changed or self._heartbeat_due()):
+            self._suppressed.inc()
+            return
+        self._last_publish = time.monotonic()
+        request = plan.request()
+        start = time.perf_counter()
+        try:
+            await self._client.update_quote(request)
+        except Exception:
+            logger.exception("Error publishing %d quotes", len(entries))
+            self._failed.inc()
+            with self._lock:
+                self._dirty = True
+            self._wake()
+            return
+        self._publish_latency.observe(time.perf_counter() - start)
+        self._published.inc()
+        self._rebuilt.inc(plan.rebuilt)
+        self._reused.inc(plan.reused)
+        for quote in plan.quotes.values():
+            self._staleness.observe(now - quote.timestamp)
+        self.differ.commit(plan)
+        if self.book is not None:
+            self.book.record(request)
+
+    def _heartbeat_due(self) -> bool:
+        if self._max_interval is None:
+            return False
+        with self._lock:
+            if not self._entries:
+                return False
+        return time.monotonic() - self._last_publish >= self._max_interval
+
+    def _due(self) -> bool:
+        with self._lock:
+            dirty = self._dirty
+        return dirty or self._heartbeat_due() or bool(self.differ.due_refreshes(self._clock()))
+
+    def _next_due_in(self) -> float:
+        """Seconds until a publish may become due without an update()."""
+        with self._lock:
+            if self._dirty:
+                return 0.0
+            has_entries = bool(self._entries)
+        delay = self.differ.next_refresh() - self._clock()
+        if self._max_interval is not None and has_entries:
+            delay = min(delay, self._last_publish + self._max_interval - time.monotonic())
+        return delay
+
+    def tick(self) -> None:
+        """Start a publish if one is due and none is in flight."""
+        if self._inflight is not None and not self._inflight.done():
+            self._skipped.inc()
+            return
+        if self._due():
+            self._inflight = asyncio.create_task(self.publish(force=False))
+
+    async def start(self) -> None:
+        """Run the publisher in the background until stop(); meant as an ASGI lifespan hook."""
+        if self._task is not None:
+            raise RuntimeError("publisher is already running")
+        self._shutdown = asyncio.Event()
+        self._task = asyncio.create_task(self.run(self._shutdown))
+
+    async def stop(self) -> None:
+        """Stop the background task started by start(), waiting for an in-flight publish."""
+        if self._task is None or self._shutdown is None:
+            return
+        self._shutdown.set()
+        await self._task
+        self._task = None
+
+    async def run(self, shutdown_event: asyncio.Event) -> None:
+        """Tick whenever a publish may be due until shutdown_event is set, then wait for an in-flight publish.
+
+        Ticks are at least min_interval apart. Between ticks, run() sleeps until the next
+        quote refresh or heartbeat, or until update() or remove() changes the book.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        shutdown = asyncio.ensure_future(shutdown_event.wait())
+        try:
+            while not shutdown.done():
+                self.tick()
+                await asyncio.wait([shutdown], timeout=self._min_interval)
+                if shutdown.done():
+                    break
+                # Clear before checking, so an update() racing with the check still wakes us
+                self._wakeup.clear()
+                delay = self._next_due_in()
+                if delay > 0:
+                    wakeup = asyncio.ensure_future(self._wakeup.wait())
+                    await asyncio.wait([shutdown, wakeup], timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                    wakeup.cancel()
+        finally:
+            shutdown.cancel()
+            self._loop = self._wakeup = None
+        if self._inflight is not None:
+            await self._inflight
@@ -0,0 +1,114 @@
+"""Hashed timer wheel for quote expirations.
+
+Every published quote carries its own expiration and must be republished shortly
+before it. A book can hold thousands of quotes (currency x method x direction);
+instead of one asyncio timer or a full scan per tick, deadlines are hashed into a
+fixed ring of slots by time:
+
+- schedule() and cancel() are O(1);
+- advance(now) only visits the slots between the previous and the current time;
+- next_deadline() scans forward from the current slot and stops at the first
+  occupied one, so the publisher can sleep exactly until the earliest refresh.
+
+A deadline more than one revolution (slots x resolution) away stays in its slot and
+is skipped until its turn comes.
+
+No Go equivalent; the Go starter republishes its quote at a fixed interval.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Generic, Hashable, TypeVar
+
+# Number of slots in the wheel
+DEFAULT_WHEEL_SLOTS = 512
+
+# Seconds covered by one slot; timers fire no later than this after their deadline when polled at this rate
+DEFAULT_WHEEL_RESOLUTION = 0.1
+
+K = TypeVar("K", bound=Hashable)
+
+
+class TimerWheel(Generic[K]):
+    """A hashed timing wheel keyed by arbitrary hashable keys.
+
+    Each key has at most one timer; scheduling it again moves it. Deadlines are
+    absolute times on whatever clock the caller uses consistently. Not thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        slots: int = DEFAULT_WHEEL_SLOTS,
+        resolution: float = DEFAULT_WHEEL_RESOLUTION,
+        start: float = 0.0,
+    ) -> None:
+        """Create an empty wheel.
+
+        Args:
+            slots: Number of slots in the ring.
+            resolution: Seconds covered by one slot.
+            start: Current time; advance() must not be called with an earlier one.
+        """
+        if slots < 1 or resolution <= 0:
+            raise ValueError("slots must be at least 1 and resolution positive")
+        self._slots: list[dict[K, tuple[float, int]]] = [{} for _ in range(slots)]
+        self._resolution = resolution
+        self._tick = self._tick_of(start)
+        self._where: dict[K, int] = {}  # key -> slot index
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._where
+
+    def _tick_of(self, when: float) -> int:
+        return math.floor(when / self._resolution)
+
+    def schedule(self, key: K, deadline: float) -> None:
+        """Set the timer for key, replacing any existing one."""
+        self.cancel(key)
+        tick = max(self._tick_of(deadline), self._tick)  # overdue timers go in the current slot
+        index = tick % len(self._slots)
+        self._slots[index][key] = (deadline, tick)
+        self._where[key] = index
+
+    def cancel(self, key: K) -> bool:
+        """Remove the timer for key. Returns False if there was none."""
+        index = self._where.pop(key, None)
+        if index is None:
+            return False
+        del self._slots[index][key]
+        return True
+
+    def advance(self, now: float) -> list[K]:
+        """Move the wheel to `now` and remove and return every key whose deadline is <= now."""
+        target = self._tick_of(now)
+        count = len(self._slots)
+        fired: list[K] = []
+        if self._where:
+            for tick in range(self._tick, min(target, self._tick + count - 1) + 1):
+                slot = self._slots[tick % count]
+                due = [key for key, (deadline, key_tick) in slot.items() if key_tick <= target and deadline <= now]
+                for key in due:
+                    del slot[key]
+                    del self._where[key]
+                fired.extend(due)
+        self._tick = max(self._tick, target)
+        return fired
+
+    def next_deadline(self) -> float:
+        """Earliest scheduled deadline, or inf if the wheel is empty."""
+        if not self._where:
+            return math.inf
+        count = len(self._slots)
+        for offset in range(count):
+            tick = self._tick + offset
+            slot = self._slots[tick % count]
+            deadlines = [deadline for deadline, key_tick in slot.values() if key_tick == tick]
+            if deadlines:
+                return min(deadlines)
+        # Only timers more than one revolution away remain
+        return min(deadline for slot in self._slots for deadline, _ in slot.values())
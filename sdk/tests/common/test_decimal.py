@@ -0,0 +1,193 @@
+"""Tests for Decimal message conversions and exact scaled arithmetic."""
+
+import array
+import decimal
+import random
+from fractions import Fraction
+from functools import partial
+
+import pytest
+
+import t0_provider_sdk.common.decimal as dec
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.common.decimal import (
+    divide,
+    from_decimal,
+    from_fraction,
+    from_int,
+    from_number,
+    from_scaled,
+    multiply,
+    multiply_scaled,
+    quantize,
+    to_decimal,
+    to_fraction,
+    to_int,
+    to_scaled,
+)
+
+# Modules the shared `backend` fixture runs with and without NumPy
+NUMPY_MODULES = [dec]
+
+ROUNDINGS = [
+    decimal.ROUND_HALF_EVEN,
+    decimal.ROUND_HALF_UP,
+    decimal.ROUND_HALF_DOWN,
+    decimal.ROUND_UP,
+    decimal.ROUND_DOWN,
+    decimal.ROUND_CEILING,
+    decimal.ROUND_FLOOR,
+]
+
+
+def D(unscaled: int, exponent: int = 0) -> Decimal:  # noqa: N802
+    return Decimal(unscaled=unscaled, exponent=exponent)
+
+
+class TestConversions:
+    def test_round_trip_decimal(self):
+        for text in ("0.86", "-123.45", "0", "1000", "0.00000001", "9223372036854775807"):
+            value = decimal.Decimal(text)
+            assert to_decimal(from_decimal(value)) == value
+
+    def test_from_decimal_keeps_scale_and_moves_exponent_into_range(self):
+        assert from_decimal(decimal.Decimal("0.860")) == D(860, -3)
+        assert from_decimal(decimal.Decimal("1E+10")) == D(100, 8)
+        assert from_decimal(decimal.Decimal("1E+20")) == D(10**12, 8)
+        assert from_decimal(decimal.Decimal("1.500000000")) == D(150000000, -8)
+
+    def test_from_decimal_refuses_to_lose_digits_unless_rounding(self):
+        with pytest.raises(ValueError):
+            from_decimal(decimal.Decimal("0.123456789"))
+        assert from_decimal(decimal.Decimal("0.123456785"), rounding=decimal.ROUND_HALF_EVEN) == D(12345678, -8)
+        assert from_decimal(decimal.Decimal("1.005"), exponent=-2, rounding=decimal.ROUND_HALF_UP) == D(101, -2)
+        with pytest.raises(ValueError):
+            from_decimal(decimal.Decimal("NaN"))
+        with pytest.raises(ValueError):
+            from_decimal(decimal.Decimal("1E+30"))  # unscaled would not fit int64
+
+    def test_to_decimal_ignores_context_precision(self):
+        with decimal.localcontext(decimal.Context(prec=3)):
+            assert str(to_decimal(D(123456789, -4))) == "12345.6789"
+
+    def test_int(self):
+        assert from_int(42) == D(42)
+        assert from_int(42, exponent=-2) == D(4200, -2)
+        assert to_int(D(4200, -2)) == 42
+        assert to_int(D(5, 3)) == 5000
+        with pytest.raises(ValueError):
+            to_int(D(4201, -2))
+
+    def test_fraction(self):
+        assert from_fraction(Fraction(3, 8)) == D(375, -3)
+        assert from_fraction(Fraction(5)) == D(5)
+        assert to_fraction(D(375, -3)) == Fraction(3, 8)
+        with pytest.raises(ValueError):
+            from_fraction(Fraction(1, 3))
+        assert from_fraction(Fraction(1, 3), rounding=decimal.ROUND_HALF_EVEN) == D(33333333, -8)
+        assert from_fraction(Fraction(2, 3), exponent=-2, rounding=decimal.ROUND_DOWN) == D(66, -2)
+        assert from_fraction(Fraction(1, 4), exponent=-4) == D(2500, -4)
+
+    def test_from_number(self):
+        assert from_number("0.86") == D(86, -2)
+        assert from_number(7) == D(7)
+        assert from_number(Fraction(1, 2)) == D(5, -1)
+        with pytest.raises(TypeError):
+            from_number(True)
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            from_int(1, exponent=9)
+        with pytest.raises(ValueError):
+            quantize(D(1), -2, rounding="ROUND_05UP")
+
+
+class TestArithmetic:
+    def test_multiply_is_exact(self):
+        assert multiply(D(1000), D(8612, -4)) == D(8612000, -4)
+        assert multiply(D(12345, -6), D(12345, -6), rounding=decimal.ROUND_HALF_EVEN) == D(15240, -8)
+        assert multiply(D(1999, -3), D(3), exponent=-2) == D(600, -2)
+
+    def test_divide(self):
+        assert divide(D(86120, -2), D(8612, -4), exponent=-2) == D(100000, -2)
+        assert divide(D(1), D(3), exponent=-8) == D(33333333, -8)
+        assert divide(D(-2), D(3), exponent=-2, rounding=decimal.ROUND_HALF_UP) == D(-67, -2)
+        assert divide(D(1), D(-8), exponent=-2, rounding=decimal.ROUND_HALF_EVEN) == D(-12, -2)
+        with pytest.raises(ZeroDivisionError):
+            divide(D(1), D(0), exponent=0)
+
+    @pytest.mark.parametrize("rounding", ROUNDINGS)
+    def test_rounding_matches_decimal_module(self, rounding):
+        rng = random.Random(1)
+        context = decimal.Context(prec=100, rounding=rounding)
+        for _ in range(500):
+            a = D(rng.randint(-(10**12), 10**12), rng.randint(-8, 2))
+            b = D(rng.randint(-(10**6), 10**6) or 1, rng.randint(-8, 0))
+            exponent = rng.randint(-8, 2)
+            quantum = decimal.Decimal(1).scaleb(exponent)
+
+            cases = [
+                (
+                    partial(multiply, a, b, exponent=exponent, rounding=rounding),
+                    context.multiply(*map(to_decimal, (a, b))),
+                ),
+                (partial(divide, a, b, exponent=exponent, rounding=rounding), context.divide(*map(to_decimal, (a, b)))),
+                (partial(quantize, a, exponent, rounding=rounding), to_decimal(a)),
+            ]
+            for compute, exact in cases:
+                expected = exact.quantize(quantum, context=context)
+                if abs(expected.scaleb(-exponent)) > 2**63 - 1:
+                    with pytest.raises(ValueError):
+                        compute()
+                else:
+                    assert to_decimal(compute()) == expected
+
+
+class TestBatch:
+    def test_to_scaled_aligns_exponents(self, backend):
+        values = [D(86, -2), D(8612, -4), D(1, 0), D(-5, 1)]
+        assert list(to_scaled(values, -4)) == [8600, 8612, 10000, -500000]
+        result = to_scaled(values, -4)
+        if backend == "python":
+            assert isinstance(result, array.array)
+        else:
+            assert str(result.dtype) == "int64"
+
+    def test_to_scaled_rounding(self, backend):
+        values = [D(12345, -4), D(-12355, -4), D(10, 0)]
+        with pytest.raises(ValueError):
+            to_scaled(values, -2)
+        assert list(to_scaled(values, -2, rounding=decimal.ROUND_HALF_EVEN)) == [123, -124, 1000]
+        assert list(to_scaled(values, -2, rounding=decimal.ROUND_DOWN)) == [123, -123, 1000]
+
+    def test_from_scaled(self, backend):
+        assert from_scaled(to_scaled([D(1), D(2, -1)], -2), -2) == [D(100, -2), D(20, -2)]
+
+    @pytest.mark.parametrize("rounding", ROUNDINGS)
+    def test_multiply_scaled_matches_scalar(self, backend, rounding):
+        rng = random.Random(2)
+        amounts = [rng.randint(-(10**10), 10**10) for _ in range(1_000)]
+        rates = [rng.randint(1, 10**8) for _ in range(1_000)]
+        result = multiply_scaled(amounts, -2, rates, -8, exponent=-2, rounding=rounding)
+        expected = [
+            multiply(D(a, -2), D(r, -8), exponent=-2, rounding=rounding).unscaled
+            for a, r in zip(amounts, rates, strict=True)
+        ]
+        assert list(result) == expected
+
+    def test_multiply_scaled_falls_back_when_int64_would_overflow(self, backend):
+        big = [2**62, -(2**62)]
+        result = multiply_scaled(big, -8, [3, 3], -8, exponent=-2, rounding=decimal.ROUND_HALF_EVEN)
+        expected = round(Fraction(3 * 2**62, 10**14))  # round() on a Fraction is half-even
+        assert list(result) == [expected, -expected]
+
+    def test_int64_min_is_not_mistaken_for_a_small_value(self, backend):
+        result = multiply_scaled([-(2**63), 2], -2, [5, 5], -1, exponent=-2)  # -2^63 * 5 overflows int64
+        assert list(result) == [-(2**62), 1]
+        assert list(to_scaled([D(-(2**63))], 0)) == [-(2**63)]
+        with pytest.raises((ValueError, OverflowError)):  # OverflowError from array.array without NumPy
+            to_scaled([D(-(2**63))], -1)
+
+    def test_multiply_scaled_validation(self, backend):
+        with pytest.raises(ValueError):
+            multiply_scaled([1, 2], 0, [1], 0, exponent=0)
@@ -0,0 +1,126 @@
+"""Tests for the group-commit SQLite writer."""
+
+import asyncio
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from t0_provider_sdk.common.groupcommit import GroupCommitWriter
+
+SCHEMA = "CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, value TEXT NOT NULL);"
+
+
+def _rows(path) -> list[tuple]:
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT id, value FROM items ORDER BY id").fetchall()
+
+
+def _batches(writer: GroupCommitWriter) -> int:
+    return writer.registry.snapshot()["t0_group_commit_batch_size"][()].count
+
+
+def _held(writer: GroupCommitWriter) -> threading.Event:
+    """Occupy the writer thread until the returned event is set, so later writes queue up as one batch."""
+    started, release = threading.Event(), threading.Event()
+    writer.submit(lambda conn: (started.set(), release.wait()))
+    assert started.wait(5)
+    return release
+
+
+async def test_concurrent_writes_share_commits(tmp_path):
+    path = tmp_path / "state.db"
+    with GroupCommitWriter(path, schema=SCHEMA, max_latency=0.01) as writer:
+        await asyncio.gather(*(writer.execute("INSERT INTO items VALUES (?, ?)", (i, f"v{i}")) for i in range(200)))
+        assert len(_rows(path)) == 200  # durable and visible to other connections once awaited
+        assert _batches(writer) < 200
+        assert writer.registry.snapshot()["t0_group_commit_writes_total"][(("result", "ok"),)] == 200
+
+
+async def test_failing_write_does_not_affect_its_batch(tmp_path):
+    path = tmp_path / "state.db"
+    with GroupCommitWriter(path, schema=SCHEMA, max_latency=0.05) as writer:
+        await writer.execute("INSERT INTO items VALUES (1, 'a')")
+
+        def insert_two(conn):
+            conn.execute("INSERT INTO items VALUES (3, 'c')")
+            conn.execute("INSERT INTO items VALUES (1, 'duplicate')")
+
+        results = await asyncio.gather(
+            writer.execute("INSERT INTO items VALUES (2, 'b')"),
+            writer.transact(insert_two),
+            writer.transact(lambda conn: conn.execute("SELECT count(*) FROM items").fetchone()[0]),
+            return_exceptions=True,
+        )
+
+    assert isinstance(results[1], sqlite3.IntegrityError)
+    assert results[2] == 2  # sees the earlier writes of its own batch
+    assert _rows(path) == [(1, "a"), (2, "b")]  # the failed write's first insert was rolled back too
+
+
+def test_threads_wait_only_for_their_own_batch(tmp_path):
+    path = tmp_path / "state.db"
+    with GroupCommitWriter(path, schema=SCHEMA, max_latency=0.02, max_batch=4) as writer:
+        latencies = []
+
+        def write(i: int) -> None:
+            start = time.monotonic()
+            writer.execute_sync("INSERT INTO items VALUES (?, ?)", (i, "x"))
+            latencies.append(time.monotonic() - start)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert _batches(writer) >= 4  # max_batch splits them
+        assert len(_rows(path)) == 16
+
+        release = _held(writer)
+        pair = [
+            writer.submit(lambda conn, i=i: conn.execute("INSERT INTO items VALUES (?, 'x')", (i,))) for i in (98, 99)
+        ]
+        release.set()
+        for future in pair:
+            future.result(timeout=5)
+
+        start = time.monotonic()  # the last batch held two writes, so this one waits for company
+        writer.execute_sync("INSERT INTO items VALUES (100, 'alone')")
+        assert 0.015 <= time.monotonic() - start < 1.0  # waited for company, but only max_latency
+
+
+def test_batch_failure_resolves_every_write(tmp_path):
+    path = tmp_path / "state.db"
+    with GroupCommitWriter(path, schema=SCHEMA, max_latency=0.0) as writer:
+        release = _held(writer)
+        futures = [
+            writer.submit(lambda conn: conn.execute("INSERT INTO items VALUES (1, 'a')")),
+            writer.submit(lambda conn: conn.execute("COMMIT")),  # ends the transaction: RELEASE fails
+            writer.submit(lambda conn: conn.execute("INSERT INTO items VALUES (2, 'b')")),
+            writer.submit(lambda conn: conn.execute("INSERT INTO items VALUES (3, 'c')")),
+        ]
+        release.set()
+
+        for future in futures:
+            with pytest.raises(sqlite3.OperationalError):
+                future.result(timeout=5)
+        writer.execute_sync("INSERT INTO items VALUES (4, 'd')")  # the writer keeps going
+
+    assert _rows(path) == [(1, "a"), (4, "d")]  # the COMMIT inside the batch made the first insert durable
+
+
+def test_close_commits_queued_writes(tmp_path):
+    path = tmp_path / "state.db"
+    writer = GroupCommitWriter(path, schema=SCHEMA, max_latency=0.5)
+    futures = [
+        writer.submit(lambda conn, i=i: conn.execute("INSERT INTO items VALUES (?, 'x')", (i,))) for i in range(5)
+    ]
+    writer.close()
+
+    assert all(future.done() and future.exception() is None for future in futures)
+    assert len(_rows(path)) == 5
+    with pytest.raises(RuntimeError, match="closed"):
+        writer.submit(lambda conn: None)
+    writer.close()  # idempotent
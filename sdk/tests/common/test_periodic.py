@@ -0,0 +1,143 @@
+"""Tests for the fixed-rate periodic task runner."""
+
+import asyncio
+
+import pytest
+
+from t0_provider_sdk.common.periodic import MissedTickPolicy, PeriodicTask
+
+
+class Recorder:
+    """Coroutine function recording the loop time of each call relative to the first."""
+
+    def __init__(self, durations=(), errors=()) -> None:
+        self.durations = list(durations)
+        self.errors = list(errors)
+        self.starts: list[float] = []
+
+    async def __call__(self) -> None:
+        now = asyncio.get_running_loop().time()
+        self.starts.append(now)
+        index = len(self.starts) - 1
+        if index < len(self.durations):
+            await asyncio.sleep(self.durations[index])
+        if index < len(self.errors) and self.errors[index]:
+            raise RuntimeError(f"tick {index} failed")
+
+    def offsets(self) -> list[float]:
+        return [round(t - self.starts[0], 3) for t in self.starts]
+
+
+async def _run_for(task: PeriodicTask, seconds: float) -> None:
+    shutdown = asyncio.Event()
+    runner = asyncio.create_task(task.run(shutdown))
+    await asyncio.sleep(seconds)
+    shutdown.set()
+    await runner
+
+
+def _metric(task: PeriodicTask, name: str, **labels: str) -> float:
+    key = tuple(sorted({"task": task.name, **labels}.items()))
+    return task.registry.snapshot()[name].get(key, 0)
+
+
+def _assert_close(actual: list[float], expected: list[float], tolerance: float = 0.02) -> None:
+    assert len(actual) >= len(expected), actual
+    for a, e in zip(actual, expected, strict=False):
+        assert abs(a - e) <= tolerance, (actual, expected)
+
+
+async def test_fixed_rate_does_not_drift_with_tick_duration():
+    fn = Recorder(durations=[0.03] * 10)
+    await _run_for(PeriodicTask(fn, interval=0.05), 0.33)
+    _assert_close(fn.offsets(), [0.0, 0.05, 0.10, 0.15, 0.20, 0.25, 0.30])
+
+
+async def test_errors_keep_running_with_exponential_backoff(caplog):
+    fn = Recorder(errors=[True] * 5 + [False] * 5)
+    task = PeriodicTask(fn, interval=0.02, max_backoff=0.08, name="flaky")
+    await _run_for(task, 0.33)
+
+    # failures back off 0.02, 0.04, 0.08, 0.08, 0.08; the sixth tick succeeds and the rate returns to 0.02
+    _assert_close(fn.offsets(), [0.0, 0.02, 0.06, 0.14, 0.22, 0.30, 0.32], tolerance=0.015)
+    assert task.consecutive_failures == 0
+    assert _metric(task, "t0_periodic_ticks_total", result="error") == 5
+    assert _metric(task, "t0_periodic_missed_ticks_total") >= 8
+    assert "flaky: tick failed (5 consecutive)" in caplog.text
+
+
+async def test_deadline_cancels_a_hung_tick():
+    fn = Recorder(durations=[10.0])
+    task = PeriodicTask(fn, interval=0.05, deadline=0.02)
+    await _run_for(task, 0.18)
+    assert len(fn.starts) >= 3
+    assert _metric(task, "t0_periodic_ticks_total", result="timeout") == 1
+    assert _metric(task, "t0_periodic_ticks_total", result="ok") >= 2
+
+
+@pytest.mark.parametrize(
+    ("policy", "expected"),
+    [
+        (MissedTickPolicy.SKIP, [0.0, 0.15, 0.20]),
+        (MissedTickPolicy.CATCH_UP, [0.0, 0.12, 0.12, 0.15, 0.20]),
+        (MissedTickPolicy.DELAY, [0.0, 0.17, 0.22]),
+    ],
+)
+async def test_missed_tick_policies(policy, expected):
+    fn = Recorder(durations=[0.12])
+    task = PeriodicTask(fn, interval=0.05, deadline=1.0, missed=policy)
+    await _run_for(task, expected[-1] + 0.025)
+    _assert_close(fn.offsets(), expected)
+    assert len(fn.starts) == len(expected)
+    assert _metric(task, "t0_periodic_missed_ticks_total") == (2 if policy is MissedTickPolicy.SKIP else 0)
+
+
+async def test_jitter_delays_each_tick_within_bounds():
+    fn = Recorder()
+    await _run_for(PeriodicTask(fn, interval=0.04, jitter=0.02, run_immediately=False), 0.3)
+    assert len(fn.starts) >= 5
+    # each tick lands in [due, due + jitter] of its own slot, so gaps vary by at most the jitter
+    for gap in (b - a for a, b in zip(fn.starts, fn.starts[1:], strict=False)):
+        assert 0.04 - 0.02 - 0.01 <= gap <= 0.04 + 0.02 + 0.01
+
+
+async def test_start_and_stop_as_lifespan_hooks():
+    fn = Recorder()
+    task = PeriodicTask(fn, interval=0.02)
+    await task.start()
+    with pytest.raises(RuntimeError):
+        await task.start()
+    await asyncio.sleep(0.05)
+    await task.stop()
+    count = len(fn.starts)
+    assert count >= 2
+    await asyncio.sleep(0.05)
+    assert len(fn.starts) == count
+    await task.stop()  # idempotent
+
+
+async def test_stop_waits_for_running_tick():
+    done = []
+
+    async def slow() -> None:
+        await asyncio.sleep(0.05)
+        done.append(True)
+
+    task = PeriodicTask(slow, interval=1.0)
+    await task.start()
+    await asyncio.sleep(0.01)
+    await task.stop()
+    assert done == [True]
+
+
+def test_validation():
+    async def fn() -> None:
+        pass
+
+    with pytest.raises(ValueError):
+        PeriodicTask(fn, interval=0)
+    with pytest.raises(ValueError):
+        PeriodicTask(fn, interval=1, jitter=1)
+    with pytest.raises(ValueError):
+        PeriodicTask(fn, interval=1, deadline=0)
+    assert PeriodicTask(fn, interval=1).name.endswith("fn")
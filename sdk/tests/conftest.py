@@ -0,0 +1,21 @@
+"""Shared fixtures for SDK tests."""
+
+import pytest
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run a test with NumPy and again with the pure-Python fallback.
+
+    The test module lists the SDK modules with an optional NumPy import in
+    `NUMPY_MODULES`; the "python" run sets their `np` to None. The "numpy" run is
+    skipped when NumPy is not installed.
+    """
+    modules = request.module.NUMPY_MODULES
+    if request.param == "numpy":
+        if any(module.np is None for module in modules):
+            pytest.skip("NumPy is not installed")
+    else:
+        for module in modules:
+            monkeypatch.setattr(module, "np", None)
+    return request.param
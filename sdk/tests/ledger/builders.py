@@ -0,0 +1,75 @@
+"""Ledger transactions for the ledger tests."""
+
+import decimal
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+
+Transaction = AppendLedgerEntriesRequest.Transaction
+Entry = AppendLedgerEntriesRequest.LedgerEntry
+BALANCE = AppendLedgerEntriesRequest.ACCOUNT_TYPE_BALANCE
+PAY_OUT = AppendLedgerEntriesRequest.ACCOUNT_TYPE_PAY_OUT
+SETTLEMENT_OUT = AppendLedgerEntriesRequest.ACCOUNT_TYPE_SETTLEMENT_OUT
+FEE_EXPENSE = AppendLedgerEntriesRequest.ACCOUNT_TYPE_FEE_EXPENSE
+NETWORK = 1  # account_owner_id of the network
+
+
+def amount(value: str) -> Decimal:
+    """The exact Decimal message of a decimal string."""
+    d = decimal.Decimal(value).as_tuple()
+    return Decimal(unscaled=int("".join(map(str, d.digits))) * (-1 if d.sign else 1), exponent=d.exponent)
+
+
+def cents(value: int) -> Decimal:
+    return Decimal(unscaled=value, exponent=-2)
+
+
+def transfer(
+    transaction_id: int,
+    value: str | Decimal = "1.00",
+    *,
+    debit: tuple[int, int] = (7, PAY_OUT),
+    credit: tuple[int, int] = (NETWORK, BALANCE),
+    **details,
+) -> Transaction:
+    """A transaction moving `value` from (owner, account type) `debit` to `credit`.
+
+    `details` sets the link (payout=..., provider_settlement=..., fee_settlement=...);
+    without it the transaction is a payout of payment `transaction_id`.
+    """
+    value = amount(value) if isinstance(value, str) else value
+    transaction = Transaction(
+        transaction_id=transaction_id,
+        entries=[
+            Entry(account_owner_id=debit[0], account_type=debit[1], debit=value),
+            Entry(account_owner_id=credit[0], account_type=credit[1], credit=value),
+        ],
+    )
+    if not details:
+        details = {"payout": Transaction.Payout(payment_id=transaction_id)}
+    for name, link in details.items():
+        getattr(transaction, name).CopyFrom(link)
+    return transaction
+
+
+def payout(
+    transaction_id: int, payment_id: int | None = None, value: str | Decimal = "1.00", **accounts
+) -> Transaction:
+    payment_id = transaction_id if payment_id is None else payment_id
+    return transfer(transaction_id, value, payout=Transaction.Payout(payment_id=payment_id), **accounts)
+
+
+def settlement(
+    transaction_id: int, settlement_id: int | None = None, value: str | Decimal = "1.00", **accounts
+) -> Transaction:
+    settlement_id = transaction_id if settlement_id is None else settlement_id
+    link = Transaction.ProviderSettlement(settlement_id=settlement_id)
+    return transfer(transaction_id, value, provider_settlement=link, **accounts)
+
+
+def fee_settlement(
+    transaction_id: int, fee_settlement_id: int | None = None, value: str | Decimal = "1.00", **accounts
+) -> Transaction:
+    fee_settlement_id = transaction_id if fee_settlement_id is None else fee_settlement_id
+    link = Transaction.FeeSettlement(fee_settlement_id=fee_settlement_id)
+    return transfer(transaction_id, value, fee_settlement=link, **accounts)
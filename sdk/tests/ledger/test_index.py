@@ -0,0 +1,88 @@
+"""Tests for the secondary ledger indexes."""
+
+import os
+
+import pytest
+
+from t0_provider_sdk.ledger import (
+    JournalPosition,
+    LedgerError,
+    LedgerIndex,
+    LedgerJournal,
+    LedgerProjection,
+    LedgerStore,
+)
+from tests.ledger.builders import fee_settlement, payout, settlement
+
+
+def test_lookups_by_link_and_position():
+    index = LedgerIndex()
+    index.add(JournalPosition(0, 0), payout(1, payment_id=10))
+    index.add(JournalPosition(0, 90), payout(2, payment_id=10))
+    index.add(JournalPosition(3, 2**39), settlement(3, settlement_id=20))
+    index.add(JournalPosition(3, 2**39 + 90), fee_settlement(4, fee_settlement_id=30))
+    index.add(JournalPosition(3, 2**39 + 180), payout(5, payment_id=10))
+
+    assert index.payment_transaction_ids(10) == (1, 2, 5)
+    assert index.payment_transaction_ids(11) == ()
+    assert index.settlement_transaction_ids(20) == (3,)
+    assert index.fee_settlement_transaction_ids(30) == (4,)
+    assert index.position(3) == JournalPosition(3, 2**39)
+    assert index.position(6) is None
+    assert len(index) == 5 and 4 in index
+
+    copy = LedgerIndex()
+    copy.restore(index.to_bytes())
+    assert copy.payment_transaction_ids(10) == (1, 2, 5)
+    assert copy.position(5) == JournalPosition(3, 2**39 + 180)
+    assert copy.to_bytes() == index.to_bytes()
+
+    with pytest.raises(LedgerError, match="truncated"):
+        copy.restore(index.to_bytes()[:-1])
+    with pytest.raises(LedgerError, match="too large"):
+        index.add(JournalPosition(0, 2**40), payout(6, payment_id=1))
+
+
+def test_store_serves_lookups_across_segments(tmp_path):
+    with LedgerStore(tmp_path, segment_size=150, snapshot_every=0) as store:
+        store.append([payout(1, 10), settlement(2, 20)])
+        store.append([payout(3, 10), fee_settlement(4, 30)])
+        store.append([payout(3, 10)])  # redelivered
+        assert [t.transaction_id for t in store.payment_transactions(10)] == [1, 3]
+        assert store.settlement_transactions(20) == [settlement(2, 20)]
+        assert store.fee_settlement_transactions(30) == [fee_settlement(4, 30)]
+        assert store.payment_transactions(99) == []
+        assert store.get(4) == fee_settlement(4, 30) and store.get(5) is None
+        assert len([name for name in os.listdir(tmp_path) if name.endswith(".seg")]) > 1
+
+
+def test_index_rebuilt_from_snapshot_and_tail(tmp_path, monkeypatch):
+    with LedgerStore(tmp_path, snapshot_every=0) as store:
+        store.append([payout(1, 10), settlement(2, 20)])
+        store.snapshot()
+        store.append([payout(3, 10)])
+
+    replayed = []
+    with LedgerJournal(tmp_path) as journal:
+        original = journal.replay
+        monkeypatch.setattr(journal, "replay", lambda start=None: replayed.append(start) or original(start))
+        index = LedgerIndex()
+        assert journal.recover(LedgerProjection(), index) == 1
+    assert replayed[0] is not None  # started after the snapshot, not from the beginning
+    assert index.payment_transaction_ids(10) == (1, 3)
+
+    with LedgerStore(tmp_path) as store:
+        assert store.get(3) == payout(3, 10) and store.get(2) == settlement(2, 20)
+
+
+def test_index_rebuilt_from_whole_journal_when_snapshot_has_none(tmp_path):
+    with LedgerJournal(tmp_path) as journal:
+        projection = LedgerProjection()
+        projection.apply([payout(1, 10), payout(2, 10)], before_commit=journal.append)
+        journal.write_snapshot(projection)  # without an index
+        projection.apply([settlement(3, 20)], before_commit=journal.append)
+
+    with LedgerStore(tmp_path) as store:
+        assert len(store) == 3
+        assert [t.transaction_id for t in store.payment_transactions(10)] == [1, 2]
+        assert store.settlement_transactions(20) == [settlement(3, 20)]
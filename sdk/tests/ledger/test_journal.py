@@ -0,0 +1,147 @@
+"""Tests for the ledger journal and the durable ledger store."""
+
+import decimal
+import os
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.ledger import (
+    InvalidTransactionError,
+    JournalPosition,
+    LedgerError,
+    LedgerJournal,
+    LedgerProjection,
+    LedgerStore,
+)
+from tests.ledger.builders import BALANCE, PAY_OUT, cents, transfer
+
+
+def _segments(directory) -> list[str]:
+    return sorted(name for name in os.listdir(directory) if name.endswith(".seg"))
+
+
+def test_append_get_and_replay(tmp_path):
+    with LedgerJournal(tmp_path) as journal:
+        assert journal.append([transfer(1), transfer(2)]) == 2
+        assert journal.append([transfer(2), transfer(3), transfer(3)]) == 1  # duplicates skipped
+        assert len(journal) == 3 and 2 in journal and 4 not in journal
+        assert journal.get(3) == transfer(3)
+        assert journal.get(4) is None
+        positions = [position for position, _ in journal.replay()]
+        assert [t.transaction_id for _, t in journal.replay()] == [1, 2, 3]
+        assert [t.transaction_id for _, t in journal.replay(positions[1])] == [2, 3]
+        assert journal.position == JournalPosition(0, os.path.getsize(tmp_path / "00000000.seg"))
+
+
+def test_segments_roll_and_are_indexed(tmp_path):
+    with LedgerJournal(tmp_path, segment_size=500) as journal:
+        for start in range(1, 60, 3):
+            journal.append([transfer(start), transfer(start + 1), transfer(start + 2)])
+        assert len(_segments(tmp_path)) > 3
+        assert all(os.path.exists(tmp_path / name.replace(".seg", ".idx")) for name in _segments(tmp_path)[:-1])
+        assert all(os.path.getsize(tmp_path / name) <= 500 for name in _segments(tmp_path))
+        assert journal.get(5) == transfer(5) and journal.get(60) == transfer(60)
+
+    os.remove(tmp_path / "00000000.idx")  # rebuilt on open
+    with LedgerJournal(tmp_path, segment_size=500) as journal:
+        assert len(journal) == 60
+        assert journal.get(1) == transfer(1)
+        assert [t.transaction_id for _, t in journal.replay()] == list(range(1, 61))
+    assert os.path.exists(tmp_path / "00000000.idx")
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path, caplog):
+    with LedgerJournal(tmp_path) as journal:
+        journal.append([transfer(1), transfer(2)])
+        intact = journal.position.offset
+        journal.append([transfer(3)])
+    with open(tmp_path / "00000000.seg", "r+b") as f:
+        f.truncate(os.path.getsize(tmp_path / "00000000.seg") - 5)
+
+    with LedgerJournal(tmp_path) as journal:
+        assert "torn" in caplog.text
+        assert journal.position.offset == intact
+        assert [t.transaction_id for _, t in journal.replay()] == [1, 2]
+        assert journal.append([transfer(3)]) == 1
+    with LedgerJournal(tmp_path) as journal:
+        assert [t.transaction_id for _, t in journal.replay()] == [1, 2, 3]
+
+
+def test_damaged_sealed_segment_is_refused(tmp_path):
+    with LedgerJournal(tmp_path, segment_size=200) as journal:
+        for transaction_id in range(1, 6):
+            journal.append([transfer(transaction_id)])
+    os.remove(tmp_path / "00000000.idx")
+    with open(tmp_path / "00000000.seg", "r+b") as f:
+        f.seek(20)
+        f.write(b"\xff")
+    with pytest.raises(LedgerError, match="damaged record"):
+        LedgerJournal(tmp_path, segment_size=200)
+
+
+def test_recover_from_snapshot_and_tail(tmp_path):
+    with LedgerJournal(tmp_path) as journal:
+        projection = LedgerProjection()
+        for transaction_id in range(1, 11):
+            batch = [transfer(transaction_id, cents(transaction_id))]
+            projection.apply(batch, before_commit=journal.append)
+        journal.write_snapshot(projection)
+        projection.apply([transfer(11, cents(11)), transfer(12, cents(12))], before_commit=journal.append)
+
+    with LedgerJournal(tmp_path) as journal:
+        recovered = LedgerProjection()
+        assert journal.recover(recovered) == 2  # only the tail after the snapshot is replayed
+        assert recovered.balances() == projection.balances()
+        assert recovered.transaction_ids() == projection.transaction_ids()
+        assert recovered.balance(7, PAY_OUT).to_decimal() == decimal.Decimal("0.78")
+
+
+def test_damaged_snapshot_falls_back_to_full_replay(tmp_path, caplog):
+    with LedgerJournal(tmp_path) as journal:
+        projection = LedgerProjection()
+        projection.apply([transfer(1), transfer(2)], before_commit=journal.append)
+        journal.write_snapshot(projection)
+    with open(tmp_path / "snapshot", "r+b") as f:
+        f.seek(30)
+        f.write(b"\x00\x01")
+
+    with LedgerJournal(tmp_path) as journal:
+        recovered = LedgerProjection()
+        assert journal.recover(recovered) == 2
+        assert "damaged snapshot" in caplog.text
+        assert recovered.balances() == projection.balances()
+
+
+def test_snapshot_exponent_mismatch(tmp_path):
+    with LedgerJournal(tmp_path) as journal:
+        journal.write_snapshot(LedgerProjection(exponent=-2))
+        with pytest.raises(LedgerError, match="exponent"):
+            journal.load_snapshot(LedgerProjection())
+
+
+def test_store_persists_only_valid_batches(tmp_path):
+    with LedgerStore(tmp_path, snapshot_every=3) as store:
+        assert store.append(AppendLedgerEntriesRequest(transactions=[transfer(1), transfer(2)])) == 2
+        unbalanced = transfer(4)
+        unbalanced.entries[0].debit.unscaled = 1
+        with pytest.raises(InvalidTransactionError):
+            store.append([transfer(3), unbalanced])
+        assert len(store.journal) == 2
+        assert store.append([transfer(3), transfer(4)]) == 2  # crosses snapshot_every
+        assert os.path.exists(tmp_path / "snapshot")
+        store.append([transfer(5)])
+        assert store.get(5) == transfer(5)
+
+    with LedgerStore(tmp_path) as store:
+        assert len(store) == 5 and 5 in store
+        assert store.balance(1, BALANCE).to_decimal() == decimal.Decimal("-5")
+
+
+def test_store_without_sync_snapshot_flushes(tmp_path):
+    with LedgerStore(tmp_path, sync=False, snapshot_every=0) as store:
+        store.append([transfer(1)])
+        position = store.snapshot()
+        assert position == store.journal.position
+    with LedgerStore(tmp_path) as store:
+        assert store.balance(7, PAY_OUT).to_decimal() == decimal.Decimal("1")
@@ -0,0 +1,137 @@
+"""Tests for net settlement positions per counterparty."""
+
+import decimal
+import random
+import threading
+
+import pytest
+
+import t0_provider_sdk.ledger.netting as netting_module
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.ledger import InvalidTransactionError, NetPosition, PositionKey, SettlementNetting
+from tests.ledger.builders import (
+    BALANCE,
+    FEE_EXPENSE,
+    NETWORK,
+    SETTLEMENT_OUT,
+    cents,
+    fee_settlement,
+    payout,
+    settlement,
+)
+
+# Modules the shared `backend` fixture runs with and without NumPy
+NUMPY_MODULES = [netting_module]
+
+
+def test_batches_are_netted_incrementally_and_once():
+    netting = SettlementNetting(exponent=-2, clock=lambda: 42.0)
+    batch = AppendLedgerEntriesRequest(
+        transactions=[
+            settlement(1, value=cents(10_000), debit=(7, SETTLEMENT_OUT)),
+            settlement(2, value=cents(2_500), debit=(NETWORK, SETTLEMENT_OUT), credit=(7, BALANCE)),
+            fee_settlement(3, value=cents(150), debit=(7, FEE_EXPENSE)),
+            payout(4, value=cents(99_999), debit=(7, SETTLEMENT_OUT)),  # not a settlement
+            settlement(1, value=cents(10_000), debit=(7, SETTLEMENT_OUT)),  # repeated within the batch
+        ]
+    )
+
+    assert netting.apply(batch) == 3
+    assert netting.apply(batch) == 0  # redelivered
+
+    snapshot = netting.snapshot()
+    assert snapshot.version == 1 and snapshot.last_transaction_id == 3 and snapshot.updated_at == 42.0
+    assert snapshot.position(7) == NetPosition(7_500, 150, -2)
+    assert snapshot.position(7).to_decimal() == decimal.Decimal("76.50")
+    assert snapshot.position(NETWORK).net == -7_650  # balanced transactions net to zero overall
+    assert snapshot.position(8) == NetPosition(0, 0, -2)
+    assert set(snapshot.positions) == {PositionKey(7, "USD"), PositionKey(NETWORK, "USD")}
+    assert len(netting) == 3 and 4 not in netting
+    assert netting.registry.snapshot()["t0_netting_transactions_total"] == {
+        (("result", "applied"),): 3,
+        (("result", "duplicate"),): 5,
+    }
+
+    netting.apply([settlement(5, value=cents(1_000), debit=(8, SETTLEMENT_OUT), credit=(7, BALANCE))])
+    assert netting.snapshot().position(7).settlement == 6_500
+    assert snapshot.position(7).settlement == 7_500  # earlier snapshots do not change
+
+
+def test_account_types_and_rejected_batches():
+    netting = SettlementNetting(account_types=[FEE_EXPENSE], exponent=-2)
+    netting.apply(
+        [
+            settlement(1, value=cents(100), debit=(7, SETTLEMENT_OUT)),
+            fee_settlement(2, value=cents(30), debit=(7, FEE_EXPENSE)),
+        ]
+    )
+    assert netting.snapshot().position(7) == NetPosition(0, 30, -2)
+    assert netting.snapshot().position(NETWORK) == NetPosition(0, 0, -2)  # BALANCE entries not netted
+
+    inexact = fee_settlement(3, value=cents(1), debit=(7, FEE_EXPENSE))
+    inexact.entries[0].debit.exponent = -3
+    with pytest.raises(InvalidTransactionError, match="decimal places"):
+        netting.apply([fee_settlement(4, value=cents(5), debit=(7, FEE_EXPENSE)), inexact])
+    assert netting.snapshot().version == 1 and 4 not in netting
+
+
+def test_recompute_matches_incremental(backend):
+    rng = random.Random(3)
+    history = [
+        rng.choice([settlement, fee_settlement, payout])(
+            transaction_id,
+            value=cents(rng.randrange(1, 10**9)),
+            debit=(rng.randrange(1, 50), SETTLEMENT_OUT),
+            credit=(rng.randrange(1, 50), BALANCE),
+        )
+        for transaction_id in rng.sample(range(1, 10**6), 2_000)
+    ]
+    incremental = SettlementNetting()
+    for start in range(0, len(history), 100):
+        incremental.apply(history[start : start + 100])
+
+    rebuilt = SettlementNetting()
+    rebuilt.apply([settlement(10**7, value=cents(5), debit=(1, SETTLEMENT_OUT))])  # replaced by recompute
+    snapshot = rebuilt.recompute(history + history[:10])
+
+    assert dict(snapshot.positions) == dict(incremental.snapshot().positions)
+    assert sum(position.net for position in snapshot.positions.values()) == 0
+    assert snapshot.last_transaction_id == incremental.snapshot().last_transaction_id
+    assert len(rebuilt) == len(incremental) and 10**7 not in rebuilt
+
+    finer = fee_settlement(10**7 + 1, value=cents(0), debit=(3, SETTLEMENT_OUT), credit=(4, BALANCE))
+    finer.entries[0].debit.CopyFrom(Decimal(unscaled=12_300, exponent=-10))  # exact at 10^-8
+    finer.entries[1].credit.CopyFrom(Decimal(unscaled=123, exponent=-8))
+    assert rebuilt.recompute(history + [finer]).position(3).fees == incremental.snapshot().position(3).fees + 123
+
+    finer.entries[0].debit.unscaled += 1
+    with pytest.raises(InvalidTransactionError, match="decimal places"):
+        rebuilt.recompute([finer])
+    assert len(rebuilt) == len(incremental) + 1
+
+
+def test_polling_never_sees_half_a_batch():
+    netting = SettlementNetting(exponent=-2)
+    stop = threading.Event()
+    seen = []
+
+    def poll():
+        while not stop.is_set():
+            snapshot = netting.snapshot()
+            seen.append(sum(position.net for position in snapshot.positions.values()))
+
+    poller = threading.Thread(target=poll)
+    poller.start()
+    for transaction_id in range(1, 2_001, 2):
+        netting.apply(
+            [
+                settlement(transaction_id, value=cents(100), debit=(7, SETTLEMENT_OUT), credit=(8, BALANCE)),
+                fee_settlement(transaction_id + 1, value=cents(10), debit=(8, SETTLEMENT_OUT), credit=(9, BALANCE)),
+            ]
+        )
+    stop.set()
+    poller.join()
+
+    assert seen and set(seen) == {0}
+    assert netting.snapshot().version == 1_000
@@ -0,0 +1,107 @@
+"""Tests for the incremental ledger projection."""
+
+import decimal
+import threading
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.ledger import AccountKey, InvalidTransactionError, LedgerProjection
+from tests.ledger.builders import BALANCE, PAY_OUT, SETTLEMENT_OUT, Entry, Transaction, amount, transfer
+
+
+def test_balances_accumulate_exactly():
+    ledger = LedgerProjection()
+    request = AppendLedgerEntriesRequest(
+        transactions=[transfer(1, "0.1"), transfer(2, "0.2"), transfer(3, "12345678901.12345678")]
+    )
+    assert ledger.apply(request) == 3
+
+    pay_out = ledger.balance(7, PAY_OUT)
+    assert pay_out.debit == 12345678901_42345678 and pay_out.credit == 0
+    assert pay_out.to_decimal() == decimal.Decimal("12345678901.42345678")
+    assert ledger.balance(1, BALANCE).to_decimal() == decimal.Decimal("-12345678901.42345678")
+    assert ledger.balance(99, BALANCE).net == 0
+    assert len(ledger) == 3 and ledger.last_transaction_id == 3 and 2 in ledger
+
+
+def test_mixed_exponents_and_repeated_accounts():
+    ledger = LedgerProjection()
+    transaction = Transaction(
+        transaction_id=10,
+        entries=[
+            Entry(account_owner_id=7, account_type=SETTLEMENT_OUT, debit=Decimal(unscaled=5, exponent=2)),
+            Entry(account_owner_id=1, account_type=BALANCE, credit=Decimal(unscaled=25_000, exponent=-2)),
+            Entry(account_owner_id=1, account_type=BALANCE, credit=Decimal(unscaled=250, exponent=0)),
+        ],
+        provider_settlement=Transaction.ProviderSettlement(settlement_id=4),
+    )
+    ledger.apply([transaction])
+    assert ledger.balance(1, BALANCE).credit == 500 * 10**8
+    assert ledger.balances(owner_id=7) == {AccountKey(7, SETTLEMENT_OUT): ledger.balance(7, SETTLEMENT_OUT)}
+
+
+def test_redelivered_and_out_of_order_transactions_apply_once():
+    ledger = LedgerProjection()
+    ledger.apply([transfer(5, "1"), transfer(3, "1")])
+    assert ledger.apply([transfer(3, "1"), transfer(4, "2"), transfer(4, "2")]) == 1
+    assert ledger.balance(7, PAY_OUT).to_decimal() == 4
+    assert ledger.last_transaction_id == 5
+    results = ledger.registry.snapshot()["t0_ledger_transactions_total"]
+    assert results[(("result", "applied"),)] == 3 and results[(("result", "duplicate"),)] == 2
+
+
+@pytest.mark.parametrize(
+    ("transaction", "reason"),
+    [
+        (Transaction(transaction_id=1, payout={"payment_id": 1}), "no entries"),
+        (Transaction(transaction_id=1, entries=[Entry(account_type=BALANCE)]), "no payout or settlement"),
+        (transfer(0, "1"), "must be positive"),
+        (transfer(1, "1", debit=(7, 0)), "has no type"),
+        (transfer(1, "-1"), "negative"),
+        (transfer(1, "0.000000001"), "decimal places"),
+        (
+            Transaction(
+                transaction_id=1,
+                entries=[Entry(account_owner_id=1, account_type=BALANCE, debit=amount("1"), credit=amount("1"))],
+                fee_settlement={"fee_settlement_id": 1},
+            ),
+            "both debit and credit",
+        ),
+        (
+            Transaction(
+                transaction_id=1,
+                entries=[
+                    Entry(account_owner_id=7, account_type=PAY_OUT, debit=amount("10.00")),
+                    Entry(account_owner_id=1, account_type=BALANCE, credit=amount("9.99")),
+                ],
+                payout={"payment_id": 1},
+            ),
+            "debits 10.00000000 != credits 9.99000000",
+        ),
+    ],
+)
+def test_invalid_transactions_reject_the_whole_batch(transaction, reason):
+    ledger = LedgerProjection()
+    with pytest.raises(InvalidTransactionError, match=reason) as info:
+        ledger.apply([transfer(100, "5"), transaction])
+    assert info.value.transaction_id == transaction.transaction_id
+    assert len(ledger) == 0 and ledger.balance(7, PAY_OUT).net == 0
+    assert ledger.registry.snapshot()["t0_ledger_rejected_batches_total"][()] == 1
+
+
+def test_concurrent_batches_from_threads():
+    ledger = LedgerProjection()
+
+    def worker(start: int) -> None:
+        for i in range(start, start + 500):
+            ledger.apply([transfer(i, "0.01")])
+
+    threads = [threading.Thread(target=worker, args=(1 + n * 500,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(ledger) == 4_000
+    assert ledger.balance(7, PAY_OUT).to_decimal() == 40
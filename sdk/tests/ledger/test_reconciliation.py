@@ -0,0 +1,112 @@
+"""Tests for bulk reconciliation of payment records against ledger transactions."""
+
+import random
+from fractions import Fraction
+
+import pytest
+
+import t0_provider_sdk.ledger.reconciliation as reconciliation_module
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import AppendLedgerEntriesRequest
+from t0_provider_sdk.ledger import AmountMismatch, LinkKind, ReconciliationColumns, reconcile
+from tests.ledger.builders import BALANCE, cents, payout
+
+# Modules the shared `backend` fixture runs with and without NumPy
+NUMPY_MODULES = [reconciliation_module]
+
+pytestmark = pytest.mark.usefixtures("backend")
+
+
+def test_report_lists_every_kind_of_difference():
+    records = ReconciliationColumns(exponent=-2)
+    records.add(LinkKind.PAYMENT, 1, Decimal(unscaled=1_000, exponent=-2))  # matches
+    records.add(LinkKind.PAYMENT, 2, Fraction(25, 2))  # ledger says 12.50 + 0.01
+    records.add(LinkKind.PAYMENT, 3, 5)  # never booked
+    records.add_failed(LinkKind.PAYMENT, 4)  # booked anyway
+    records.add(LinkKind.SETTLEMENT, 1, 100)  # same id, other kind
+    records.extend(LinkKind.FEE_SETTLEMENT, [9, 9], [150, 50])  # summed to 2.00
+
+    ledger = ReconciliationColumns(exponent=-2)
+    ledger.add_transactions(
+        AppendLedgerEntriesRequest(
+            transactions=[
+                payout(10, 1, cents(1_000)),
+                payout(11, 2, cents(1_250)),
+                payout(12, 2, cents(1)),
+                payout(13, 4, cents(300)),
+                payout(14, 5, cents(700)),  # unknown to the records
+            ]
+        )
+    )
+    ledger.add(LinkKind.SETTLEMENT, 1, 100)
+    ledger.add(LinkKind.FEE_SETTLEMENT, 9, 2)
+
+    report = reconcile(records, ledger)
+
+    assert report.matched == 3
+    assert report.missing_in_ledger[LinkKind.PAYMENT] == [3]
+    assert report.missing_in_records[LinkKind.PAYMENT] == [5]
+    assert report.failed_in_ledger[LinkKind.PAYMENT] == [4]
+    assert report.amount_mismatches == [AmountMismatch(LinkKind.PAYMENT, 2, 1_250, 1_251)]
+    assert report.summary() == {
+        "matched": 3,
+        "missing_in_ledger": 1,
+        "missing_in_records": 1,
+        "failed_in_ledger": 1,
+        "amount_mismatches": 1,
+    }
+    assert not report.ok
+
+
+def test_account_type_selects_the_compared_amount():
+    ledger = ReconciliationColumns(exponent=-2)
+    ledger.add_transactions([payout(1, 1, cents(500))], account_type=BALANCE)
+    records = ReconciliationColumns(exponent=-2)
+    records.add(LinkKind.PAYMENT, 1, -5)  # BALANCE was credited
+
+    assert reconcile(records, ledger).ok
+
+
+def test_agreeing_sides_and_errors():
+    empty = reconcile(ReconciliationColumns(), ReconciliationColumns())
+    assert empty.ok and empty.matched == 0
+
+    columns = ReconciliationColumns(exponent=-2)
+    with pytest.raises(ValueError, match="decimal places"):
+        columns.add(LinkKind.PAYMENT, 1, Decimal(unscaled=1, exponent=-3))
+    with pytest.raises(ValueError, match="length"):
+        columns.extend(LinkKind.PAYMENT, [1, 2], [1])
+    assert len(columns) == 0
+    with pytest.raises(ValueError, match="exponent"):
+        reconcile(columns, ReconciliationColumns(exponent=-8))
+
+
+def test_large_random_sides_agree_with_a_naive_join():
+    rng = random.Random(7)
+    ids = rng.sample(range(1, 1 << 63), 20_000) + [(1 << 64) - 1]
+    records = ReconciliationColumns()
+    ledger = ReconciliationColumns()
+    expected_missing, expected_unknown, expected_mismatch = [], [], []
+    for link_id in ids:
+        amount = rng.randrange(1, 10**12)
+        roll = rng.random()
+        if roll < 0.01:
+            records.extend(LinkKind.PAYMENT, [link_id], [amount])
+            expected_missing.append(link_id)
+        elif roll < 0.02:
+            ledger.extend(LinkKind.PAYMENT, [link_id], [amount])
+            expected_unknown.append(link_id)
+        elif roll < 0.03:
+            records.extend(LinkKind.PAYMENT, [link_id], [amount])
+            ledger.extend(LinkKind.PAYMENT, [link_id, link_id], [amount, 1])
+            expected_mismatch.append((link_id, amount, amount + 1))
+        else:
+            records.extend(LinkKind.PAYMENT, [link_id], [amount])
+            ledger.extend(LinkKind.PAYMENT, [link_id], [amount])
+
+    report = reconcile(records, ledger)
+
+    assert report.missing_in_ledger[LinkKind.PAYMENT] == sorted(expected_missing)
+    assert report.missing_in_records[LinkKind.PAYMENT] == sorted(expected_unknown)
+    assert [(m.link_id, m.expected, m.actual) for m in report.amount_mismatches] == sorted(expected_mismatch)
+    assert report.matched == len(ids) - len(expected_missing) - len(expected_unknown) - len(expected_mismatch)
@@ -0,0 +1,127 @@
+"""Tests for exposure reservations against counterparty limits."""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import UpdateLimitRequest
+from t0_provider_sdk.limits import ExposureBook, LimitExceededError, LimitTracker
+
+Limit = UpdateLimitRequest.Limit
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _limits(headroom: int, version: int = 1, counterpart_id: int = 7, tracker: LimitTracker | None = None):
+    tracker = tracker or LimitTracker()
+    tracker.update(
+        [
+            Limit(
+                version=version,
+                counterpart_id=counterpart_id,
+                payout_limit=Decimal(unscaled=headroom),
+                credit_limit=Decimal(unscaled=headroom),
+            )
+        ]
+    )
+    return tracker
+
+
+def test_reservations_consume_headroom_until_released():
+    book = ExposureBook(_limits(100))
+    reservation = book.reserve(7, 1, Decimal(unscaled=6_000, exponent=-2))
+    assert reservation.amount == 60 and not reservation.committed
+    assert book.reserve(7, 1, 60) is reservation  # redelivered PayoutRequest
+    assert book.available(7) == 40
+
+    with pytest.raises(LimitExceededError) as excinfo:
+        book.reserve(7, 2, Fraction(81, 2))
+    assert excinfo.value.counterpart_id == 7 and excinfo.value.available == 40
+    assert book.reserve(8, 3, 0).amount == 0  # unknown counterparty has no headroom
+    with pytest.raises(LimitExceededError):
+        book.reserve(8, 4, 1)
+
+    assert book.release(1) is reservation
+    assert book.release(1) is None and book.get(1) is None
+    assert book.available(7) == 100
+    with pytest.raises(ValueError, match="negative"):
+        book.reserve(7, 5, -1)
+
+
+def test_committed_amounts_count_until_a_newer_limit_version():
+    tracker = _limits(100, version=1)
+    book = ExposureBook(tracker)
+    book.reserve(7, 1, 30)
+    book.reserve(7, 2, 20)
+    committed = book.commit(1)
+    assert committed.committed and committed.version == 1
+    assert book.commit(1) is None
+    assert book.available(7) == 50
+
+    _limits(100, version=1, tracker=tracker)  # stale redelivery changes nothing
+    assert book.available(7) == 50
+
+    _limits(70, version=2, tracker=tracker)  # credit_usage now includes payment 1
+    assert book.exposure(7) == 20  # payment 2 is still pending
+    assert book.available(7) == 50
+    assert book.get(1) is None and book.get(2).amount == 20
+
+
+def test_pending_reservations_expire():
+    clock = _Clock()
+    book = ExposureBook(_limits(100), ttl=10, clock=clock)
+    book.reserve(7, 1, 40)
+    clock.now = 5
+    book.reserve(7, 2, 40)
+    with pytest.raises(LimitExceededError):
+        book.reserve(7, 3, 40)
+
+    clock.now = 10
+    assert book.available(7) == 60  # payment 1 expired on access
+    assert book.commit(1) is None
+    clock.now = 15
+    assert book.expire() == 1
+    assert book.exposure(7) == 0
+
+    snapshot = book.registry.snapshot()["t0_exposure_reservations_total"]
+    assert snapshot[(("result", "reserved"),)] == 2
+    assert snapshot[(("result", "rejected"),)] == 1
+    assert snapshot[(("result", "expired"),)] == 2
+
+
+def test_concurrent_payouts_never_overdraw():
+    tracker = LimitTracker()
+    for counterpart_id in range(16):
+        _limits(1_000, counterpart_id=counterpart_id, tracker=tracker)
+    book = ExposureBook(tracker, shards=4)
+    accepted = [0] * 16
+    lock = threading.Lock()
+
+    def pay_out(payment_id: int) -> None:
+        counterpart_id = payment_id % 16
+        try:
+            book.reserve(counterpart_id, payment_id, 3)
+        except LimitExceededError:
+            return
+        with lock:
+            accepted[counterpart_id] += 1
+        if payment_id % 5 == 0:
+            book.release(payment_id)
+            with lock:
+                accepted[counterpart_id] -= 1
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(pay_out, range(1, 8_001)))
+
+    for counterpart_id in range(16):
+        assert book.exposure(counterpart_id) == accepted[counterpart_id] * 3 <= 1_000
+        assert book.available(counterpart_id) < 3  # every counterparty was filled up
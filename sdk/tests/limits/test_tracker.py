@@ -0,0 +1,89 @@
+"""Tests for the versioned counterparty limit tracker."""
+
+import threading
+from fractions import Fraction
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import UpdateLimitRequest
+from t0_provider_sdk.limits import LimitTracker
+
+Limit = UpdateLimitRequest.Limit
+
+
+def _limit(counterpart_id: int, version: int, credit: int, usage: int = 0, reserve: int = 0) -> Limit:
+    return Limit(
+        version=version,
+        counterpart_id=counterpart_id,
+        payout_limit=Decimal(unscaled=credit - usage - reserve),
+        credit_limit=Decimal(unscaled=credit),
+        credit_usage=Decimal(unscaled=usage),
+        reserve=Decimal(unscaled=reserve),
+    )
+
+
+def test_newer_versions_apply_and_older_are_ignored():
+    tracker = LimitTracker(clock=lambda: 100.0)
+    applied = tracker.update(UpdateLimitRequest(limits=[_limit(7, 5, 1_000, usage=200), _limit(8, 3, 50)]))
+    assert [limit.counterpart_id for limit in applied] == [7, 8]
+
+    assert tracker.update([_limit(7, 4, 9_999)]) == []  # delivered late
+    assert tracker.update([_limit(7, 5, 9_999)]) == []  # redelivered
+    limit = tracker.get(7)
+    assert limit.version == 5 and limit.credit_limit == 1_000 and limit.payout_limit == 800
+    assert limit.updated_at == 100.0
+
+    tracker.update([_limit(7, 6, 1_000, usage=900, reserve=200)])
+    assert tracker.headroom(7) == -100  # exceeded
+    assert tracker.headroom(9) == 0 and tracker.get(9) is None
+    assert len(tracker) == 2 and 8 in tracker
+
+    snapshot = tracker.registry.snapshot()["t0_limit_updates_total"]
+    assert snapshot[(("result", "applied"),)] == 3
+    assert snapshot[(("result", "stale"),)] == 2
+
+
+def test_newest_entry_within_one_request_wins():
+    tracker = LimitTracker()
+    tracker.update([_limit(7, 2, 300), _limit(7, 1, 100), _limit(7, 3, 500)])
+    assert tracker.get(7).version == 3 and tracker.headroom(7) == 500
+
+
+def test_can_pay_out_accepts_decimal_messages_and_fractions():
+    tracker = LimitTracker()
+    tracker.update([_limit(7, 1, 1_000, usage=250)])
+    assert tracker.can_pay_out(7, Decimal(unscaled=75_000, exponent=-2))
+    assert tracker.can_pay_out(7, Fraction(1501, 2)) is False
+    assert tracker.can_pay_out(7, 750)
+    assert tracker.can_pay_out(8, 0) and not tracker.can_pay_out(8, 1)
+
+
+def test_snapshot_is_immutable_and_unaffected_by_updates():
+    tracker = LimitTracker()
+    tracker.update([_limit(7, 1, 100)])
+    before = tracker.snapshot()
+    tracker.update([_limit(7, 2, 200), _limit(8, 1, 10)])
+
+    assert before[7].credit_limit == 100 and 8 not in before
+    assert tracker.snapshot()[7].credit_limit == 200
+    try:
+        before[9] = None  # type: ignore[index]
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("snapshot is writable")
+
+
+def test_concurrent_updates_keep_the_highest_version():
+    tracker = LimitTracker()
+
+    def apply(start: int) -> None:
+        for version in range(start, 2_000, 4):
+            tracker.update([_limit(7, version, version)])
+
+    threads = [threading.Thread(target=apply, args=(start,)) for start in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert tracker.get(7).version == 1_999 and tracker.headroom(7) == 1_999
@@ -0,0 +1,100 @@
+"""Shared fixtures for network client tests."""
+
+import gzip
+import json
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import FinalizePayoutRequest, FinalizePayoutResponse
+from t0_provider_sdk.crypto.hash import legacy_keccak256
+from t0_provider_sdk.crypto.keys import public_key_from_bytes
+from t0_provider_sdk.crypto.verifier import verify_signature
+
+# Payment ids for which the server answers with a Connect "failed_precondition" error.
+FAILING_PAYMENT_ID = 999
+
+
+class NetworkHandler(BaseHTTPRequestHandler):
+    """Answers every unary Connect call with an empty response after checking the signature.
+
+    HEAD requests (connection warm-up) are answered with 404 after a short delay
+    that stands in for network latency. The client address of every accepted TCP
+    connection is recorded.
+    """
+
+    protocol_version = "HTTP/1.1"
+    received: list[int] = []
+    connections: set[tuple[str, int]] = set()
+    lock = threading.Lock()
+
+    def setup(self) -> None:
+        super().setup()
+        with self.lock:
+            self.connections.add(self.client_address)
+
+    def do_HEAD(self) -> None:  # noqa: N802
+        time.sleep(0.05)
+        self.send_response(404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        timestamp = struct.pack("<Q", int(self.headers["X-Signature-Timestamp"]))
+        public_key = public_key_from_bytes(bytes.fromhex(self.headers["X-Public-Key"][2:]))
+        signature = bytes.fromhex(self.headers["X-Signature"][2:])
+        if not verify_signature(public_key, legacy_keccak256(body + timestamp), signature):
+            self.send_response(401)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        request = FinalizePayoutRequest()
+        request.ParseFromString(body)
+        with self.lock:
+            self.received.append(request.payment_id)
+
+        if request.payment_id == FAILING_PAYMENT_ID:
+            self._reply(400, "application/json", json.dumps({"code": "failed_precondition"}).encode())
+        else:
+            self._reply(200, "application/proto", FinalizePayoutResponse().SerializeToString())
+
+    def _reply(self, status: int, content_type: str, payload: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def network_server():
+    NetworkHandler.received = []
+    NetworkHandler.connections = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NetworkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def received_payment_ids(network_server):
+    """Payment ids received by network_server, in arrival order."""
+    return NetworkHandler.received
+
+
+@pytest.fixture
+def server_connections(network_server):
+    """Client addresses of the TCP connections accepted by network_server."""
+    return NetworkHandler.connections
@@ -0,0 +1,204 @@
+"""Tests for the GetQuote response cache."""
+
+import asyncio
+
+import pytest
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import PAYMENT_METHOD_TYPE_SEPA
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import (
+    GetQuoteRequest,
+    GetQuoteResponse,
+    PaymentAmount,
+)
+from t0_provider_sdk.network.cache import QuoteCache
+from t0_provider_sdk.quote.diff import to_timestamp
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeNetwork:
+    def __init__(self, expiration: float | None = 1_030.0) -> None:
+        self.expiration = expiration
+        self.calls: list[tuple[GetQuoteRequest, dict]] = []
+        self.gate: asyncio.Event | None = None
+        self.error: Exception | None = None
+        self.fail = False
+
+    async def get_quote(self, request: GetQuoteRequest, **kwargs) -> GetQuoteResponse:
+        self.calls.append((request, kwargs))
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.error is not None:
+            raise self.error
+        if self.fail:
+            return GetQuoteResponse(failure=GetQuoteResponse.Failure(reason=10))
+        success = GetQuoteResponse.Success(rate=Decimal(unscaled=len(self.calls), exponent=-2))
+        if self.expiration is not None:
+            success.expiration.CopyFrom(to_timestamp(self.expiration))
+        return GetQuoteResponse(success=success)
+
+    async def update_quote(self, request):
+        return "passed through"
+
+
+def _request(amount: int = 100, currency: str = "EUR") -> GetQuoteRequest:
+    return GetQuoteRequest(
+        amount=PaymentAmount(settlement_amount=Decimal(unscaled=amount)),
+        pay_out_currency=currency,
+        pay_out_method=PAYMENT_METHOD_TYPE_SEPA,
+        quote_type=1,
+    )
+
+
+def _requests(cache: QuoteCache) -> dict[str, float]:
+    family = cache.registry.snapshot()["t0_quote_cache_requests_total"]
+    return {dict(labels)["result"]: value for labels, value in family.items()}
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+async def test_success_is_cached_until_expiration_minus_margin(clock):
+    network = FakeNetwork(expiration=1_030.0)
+    cache = QuoteCache(network, expiry_margin=2.0, clock=clock)
+
+    first = await cache.get_quote(_request(), timeout_ms=500)
+    clock.now = 1_027.9
+    second = await cache.get_quote(_request())
+    assert first == second and len(network.calls) == 1
+    assert network.calls[0][1] == {"timeout_ms": 500}
+
+    clock.now = 1_028.0
+    third = await cache.get_quote(_request())
+    assert third.success.rate.unscaled == 2 and len(network.calls) == 2
+    assert _requests(cache) == {"hit": 1, "miss": 2, "collapsed": 0}
+
+
+async def test_key_covers_every_request_field(clock):
+    network = FakeNetwork()
+    cache = QuoteCache(network, clock=clock)
+    for request in (_request(), _request(amount=200), _request(currency="GBP"), _request()):
+        await cache.get_quote(request)
+    assert len(network.calls) == 3 and len(cache) == 3
+
+
+async def test_returned_responses_are_copies(clock):
+    cache = QuoteCache(FakeNetwork(), clock=clock)
+    response = await cache.get_quote(_request())
+    response.success.rate.unscaled = 999
+    assert (await cache.get_quote(_request())).success.rate.unscaled == 1
+
+
+async def test_failures_and_unexpiring_responses(clock):
+    network = FakeNetwork()
+    network.fail = True
+    cache = QuoteCache(network, clock=clock)
+    await cache.get_quote(_request())
+    await cache.get_quote(_request())
+    assert len(network.calls) == 2  # failures are not cached by default
+
+    cache = QuoteCache(network, failure_ttl=5.0, clock=clock)
+    await cache.get_quote(_request())
+    clock.now += 4.9
+    await cache.get_quote(_request())
+    assert len(network.calls) == 3
+
+    network.fail, network.expiration = False, None
+    cache = QuoteCache(network, clock=clock)
+    await cache.get_quote(_request())
+    await cache.get_quote(_request())
+    assert len(network.calls) == 5 and len(cache) == 0
+
+
+async def test_concurrent_misses_collapse_into_one_request(clock):
+    network = FakeNetwork()
+    network.gate = asyncio.Event()
+    cache = QuoteCache(network, clock=clock)
+
+    callers = [asyncio.create_task(cache.get_quote(_request())) for _ in range(10)]
+    await asyncio.sleep(0)
+    network.gate.set()
+    responses = await asyncio.gather(*callers)
+
+    assert len(network.calls) == 1
+    assert all(r == responses[0] for r in responses)
+    assert _requests(cache) == {"hit": 0, "miss": 1, "collapsed": 9}
+
+
+async def test_cancelled_caller_does_not_cancel_shared_request(clock):
+    network = FakeNetwork()
+    network.gate = asyncio.Event()
+    cache = QuoteCache(network, clock=clock)
+
+    leader = asyncio.create_task(cache.get_quote(_request()))
+    follower = asyncio.create_task(cache.get_quote(_request()))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await asyncio.sleep(0)
+    network.gate.set()
+
+    assert (await follower).success.rate.unscaled == 1
+    assert leader.cancelled()
+    assert len(cache) == 1
+
+
+async def test_errors_reach_every_waiter_and_are_not_cached(clock):
+    network = FakeNetwork()
+    network.gate = asyncio.Event()
+    network.error = ConnectError(Code.UNAVAILABLE, "down")
+    cache = QuoteCache(network, clock=clock)
+
+    callers = [asyncio.create_task(cache.get_quote(_request())) for _ in range(3)]
+    await asyncio.sleep(0)
+    network.gate.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(r, ConnectError) for r in results)
+
+    network.gate, network.error = None, None
+    assert (await cache.get_quote(_request())).HasField("success")
+    assert len(network.calls) == 2
+
+
+async def test_lru_eviction(clock):
+    network = FakeNetwork()
+    cache = QuoteCache(network, max_entries=2, clock=clock)
+    await cache.get_quote(_request(1))
+    await cache.get_quote(_request(2))
+    await cache.get_quote(_request(1))  # 1 becomes most recently used
+    await cache.get_quote(_request(3))  # evicts 2
+
+    await cache.get_quote(_request(1))
+    assert len(network.calls) == 3
+    await cache.get_quote(_request(2))
+    assert len(network.calls) == 4
+    assert cache.registry.snapshot()["t0_quote_cache_evictions_total"][()] == 2
+
+
+async def test_invalidate_and_passthrough(clock):
+    network = FakeNetwork()
+    cache = QuoteCache(network, clock=clock)
+    await cache.get_quote(_request(1))
+    await cache.get_quote(_request(2))
+    cache.invalidate(_request(1))
+    assert len(cache) == 1
+    cache.invalidate()
+    assert len(cache) == 0
+    assert await cache.update_quote(None) == "passed through"
+
+
+def test_validation():
+    with pytest.raises(ValueError):
+        QuoteCache(FakeNetwork(), max_entries=0)
+    with pytest.raises(ValueError):
+        QuoteCache(FakeNetwork(), failure_ttl=-1)
@@ -0,0 +1,31 @@
+"""Tests for the client factories against a local HTTP server."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClientSync
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import FinalizePayoutRequest
+from t0_provider_sdk.network.client import new_pooled_service_client_sync
+
+PRIVATE_KEY = "0x6b30303de7b26bfb1222b317a52113357f8bb06de00160b4261a2fef9c8b9bd8"
+
+
+class TestPooledServiceClientSync:
+    def test_shared_client_across_threads(self, network_server, received_payment_ids):
+        threads = 16
+        client = new_pooled_service_client_sync(
+            PRIVATE_KEY, NetworkServiceClientSync, threads=threads, base_url=network_server
+        )
+
+        def call(payment_id: int) -> None:
+            client.finalize_payout(FinalizePayoutRequest(payment_id=payment_id))
+
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(call, range(1, 321)))
+
+        assert sorted(received_payment_ids) == list(range(1, 321))
+
+    def test_rejects_invalid_thread_count(self):
+        with pytest.raises(ValueError):
+            new_pooled_service_client_sync(PRIVATE_KEY, NetworkServiceClientSync, threads=0)
@@ -0,0 +1,150 @@
+"""Tests for the outbound RPC metrics registry and client instrumentation."""
+
+import math
+import threading
+
+import pytest
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+
+from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClient, NetworkServiceClientSync
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import FinalizePayoutRequest
+from t0_provider_sdk.common.metrics import Histogram, MetricsRegistry
+from t0_provider_sdk.network import metrics as network_metrics
+from t0_provider_sdk.network.client import new_service_client, new_service_client_sync
+from t0_provider_sdk.network.metrics import ClientMetrics
+
+PRIVATE_KEY = "0x6b30303de7b26bfb1222b317a52113357f8bb06de00160b4261a2fef9c8b9bd8"
+FAILING_PAYMENT_ID = 999  # network_server answers failed_precondition for this id
+
+
+class TestHistogram:
+    def test_bucket_upper_bound_is_inclusive(self):
+        histogram = Histogram((1.0, 2.0))
+        for value in (0.5, 1.0, 1.5, 2.0, 3.0):
+            histogram.observe(value)
+        snap = histogram.snapshot()
+        assert snap.counts == (2, 4, 5)
+        assert snap.count == 5
+        assert snap.sum == pytest.approx(8.0)
+
+    def test_quantile_interpolates_within_bucket(self):
+        histogram = Histogram((1.0, 2.0, 4.0))
+        for _ in range(10):
+            histogram.observe(1.5)
+        assert histogram.snapshot().quantile(0.5) == pytest.approx(1.5)
+        assert math.isnan(Histogram().snapshot().quantile(0.5))
+
+    def test_invalid_buckets(self):
+        with pytest.raises(ValueError):
+            Histogram((2.0, 1.0))
+        with pytest.raises(ValueError):
+            Histogram(())
+
+    def test_concurrent_observations_are_not_lost(self):
+        histogram = Histogram((1.0,))
+
+        def worker():
+            for _ in range(10_000):
+                histogram.observe(0.5)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert histogram.snapshot().count == 80_000
+
+
+class TestMetricsRegistry:
+    def test_same_labels_return_same_metric(self):
+        registry = MetricsRegistry()
+        assert registry.counter("c", "help", a="1") is registry.counter("c", "help", a="1")
+        assert registry.counter("c", "help", a="1") is not registry.counter("c", "help", a="2")
+
+    def test_kind_conflict(self):
+        registry = MetricsRegistry()
+        registry.counter("m", "help")
+        with pytest.raises(ValueError):
+            registry.histogram("m", "help")
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry()
+        registry.counter("requests_total", "Requests.", method="UpdateQuote", code="ok").inc(3)
+        registry.histogram("latency_seconds", "Latency.", (0.1, 1.0), method='Say "hi"').observe(0.5)
+
+        assert registry.to_prometheus() == (
+            "# HELP latency_seconds Latency.\n"
+            "# TYPE latency_seconds histogram\n"
+            'latency_seconds_bucket{method="Say \\"hi\\"",le="0.1"} 0\n'
+            'latency_seconds_bucket{method="Say \\"hi\\"",le="1"} 1\n'
+            'latency_seconds_bucket{method="Say \\"hi\\"",le="+Inf"} 1\n'
+            'latency_seconds_sum{method="Say \\"hi\\""} 0.5\n'
+            'latency_seconds_count{method="Say \\"hi\\""} 1\n'
+            "# HELP requests_total Requests.\n"
+            "# TYPE requests_total counter\n"
+            'requests_total{code="ok",method="UpdateQuote"} 3\n'
+        )
+
+    def test_network_metrics_reexports_the_registry(self):
+        assert network_metrics.MetricsRegistry is MetricsRegistry
+        assert network_metrics.Histogram is Histogram
+
+    def test_empty_registry_exports_nothing(self):
+        assert MetricsRegistry().to_prometheus() == ""
+
+
+def _count(metrics: ClientMetrics, name: str, **labels: str) -> float:
+    value = metrics.registry.snapshot()[name][tuple(sorted(labels.items()))]
+    return value if isinstance(value, float | int) else value.count
+
+
+class TestClientInstrumentation:
+    def test_sync_client_records_all_metrics(self, network_server):
+        metrics = ClientMetrics()
+        client = new_service_client_sync(
+            PRIVATE_KEY, NetworkServiceClientSync, base_url=network_server, metrics=metrics
+        )
+
+        client.finalize_payout(FinalizePayoutRequest(payment_id=1))
+        client.finalize_payout(FinalizePayoutRequest(payment_id=2))
+        with pytest.raises(ConnectError) as exc_info:
+            client.finalize_payout(FinalizePayoutRequest(payment_id=FAILING_PAYMENT_ID))
+        assert exc_info.value.code == Code.FAILED_PRECONDITION
+
+        method = "FinalizePayout"
+        assert _count(metrics, "t0_client_requests_total", method=method, code="ok") == 2
+        assert _count(metrics, "t0_client_requests_total", method=method, code="failed_precondition") == 1
+        for name in (
+            "t0_client_signing_seconds",
+            "t0_client_ttfb_seconds",
+            "t0_client_request_duration_seconds",
+            "t0_client_request_size_bytes",
+            "t0_client_response_size_bytes",
+        ):
+            assert _count(metrics, name, method=method) == 3, name
+
+        text = metrics.to_prometheus()
+        assert 't0_client_requests_total{code="ok",method="FinalizePayout"} 2' in text
+        assert 't0_client_ttfb_seconds_count{method="FinalizePayout"} 3' in text
+
+    async def test_async_client_records_latency_and_ttfb(self, network_server):
+        metrics = ClientMetrics()
+        client = new_service_client(PRIVATE_KEY, NetworkServiceClient, base_url=network_server, metrics=metrics)
+
+        await client.finalize_payout(FinalizePayoutRequest(payment_id=1))
+
+        method = "FinalizePayout"
+        assert _count(metrics, "t0_client_requests_total", method=method, code="ok") == 1
+        assert _count(metrics, "t0_client_ttfb_seconds", method=method) == 1
+        assert _count(metrics, "t0_client_signing_seconds", method=method) == 1
+
+    def test_transport_errors_are_counted(self):
+        metrics = ClientMetrics()
+        # Nothing listens on port 9 of localhost; the connection is refused.
+        client = new_service_client_sync(
+            PRIVATE_KEY, NetworkServiceClientSync, base_url="http://127.0.0.1:9", metrics=metrics
+        )
+        with pytest.raises(ConnectError):
+            client.finalize_payout(FinalizePayoutRequest(payment_id=1))
+        assert _count(metrics, "t0_client_requests_total", method="FinalizePayout", code="unavailable") == 1
@@ -0,0 +1,207 @@
+"""Tests for the durable outbound request outbox."""
+
+import asyncio
+
+import pytest
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+
+from t0_provider_sdk.api.tzero.v1.common.payment_receipt_pb2 import PaymentReceipt
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import FinalizePayoutRequest, FinalizePayoutResponse
+from t0_provider_sdk.network.outbox import (
+    STATUS_DEAD,
+    STATUS_DONE,
+    STATUS_INFLIGHT,
+    STATUS_PENDING,
+    Outbox,
+    OutboxWorker,
+)
+
+
+def _finalize(payment_id: int) -> FinalizePayoutRequest:
+    return FinalizePayoutRequest(
+        payment_id=payment_id,
+        success=FinalizePayoutRequest.Success(
+            receipt=PaymentReceipt(sepa=PaymentReceipt.Sepa(banking_transaction_reference_id="ref")),
+        ),
+    )
+
+
+class FakeNetworkClient:
+    def __init__(self, failures: dict[int, list[Exception]] | None = None) -> None:
+        self.failures = failures or {}
+        self.delivered: list[FinalizePayoutRequest] = []
+        self.max_concurrent = 0
+        self._concurrent = 0
+
+    async def finalize_payout(self, request: FinalizePayoutRequest) -> FinalizePayoutResponse:
+        self._concurrent += 1
+        self.max_concurrent = max(self.max_concurrent, self._concurrent)
+        try:
+            await asyncio.sleep(0.01)
+            pending = self.failures.get(request.payment_id)
+            if pending:
+                raise pending.pop(0)
+            self.delivered.append(request)
+            return FinalizePayoutResponse()
+        finally:
+            self._concurrent -= 1
+
+
+async def _drain(outbox: Outbox, client: FakeNetworkClient, *, until, timeout: float = 5.0, **kwargs) -> None:
+    shutdown = asyncio.Event()
+    worker = OutboxWorker(outbox, client, base_backoff=0.01, max_backoff=0.02, poll_interval=0.01, **kwargs)
+    task = asyncio.create_task(worker.run(shutdown))
+    for _ in range(int(timeout / 0.01)):
+        if until():
+            break
+        await asyncio.sleep(0.01)
+    shutdown.set()
+    await task
+
+
+class TestOutbox:
+    def test_enqueue_dedupes_by_payment_id(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        assert outbox.enqueue_sync("finalize_payout", _finalize(1)) is True
+        assert outbox.enqueue_sync("finalize_payout", _finalize(1)) is False
+        assert outbox.enqueue_sync("finalize_payout", _finalize(2)) is True
+        assert outbox.counts() == {STATUS_PENDING: 2}
+
+    def test_unset_payment_id_is_not_a_dedupe_key(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        assert outbox.enqueue_sync("finalize_payout", _finalize(0)) is True
+        assert outbox.enqueue_sync("finalize_payout", _finalize(0)) is True
+        assert outbox.counts() == {STATUS_PENDING: 2}
+
+    def test_failing_listener_does_not_fail_the_enqueue(self, tmp_path, caplog):
+        outbox = Outbox(tmp_path / "outbox.db")
+        notified = []
+        outbox.subscribe(lambda: 1 / 0)
+        outbox.subscribe(lambda: notified.append(True))
+        assert outbox.enqueue_sync("finalize_payout", _finalize(1)) is True
+        assert notified == [True] and outbox.counts() == {STATUS_PENDING: 1}
+        assert "Outbox enqueue listener failed" in caplog.text
+
+    def test_entries_survive_reopen(self, tmp_path):
+        path = tmp_path / "outbox.db"
+        outbox = Outbox(path)
+        outbox.enqueue_sync("finalize_payout", _finalize(7))
+        outbox.close()
+
+        entries = Outbox(path).claim(10)
+        assert len(entries) == 1
+        assert entries[0].method == "finalize_payout"
+        assert entries[0].decode() == _finalize(7)
+
+    def test_claim_marks_entries_inflight(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        for payment_id in range(1, 4):
+            outbox.enqueue_sync("finalize_payout", _finalize(payment_id))
+        assert [e.decode().payment_id for e in outbox.claim(2)] == [1, 2]
+        assert outbox.counts() == {STATUS_INFLIGHT: 2, STATUS_PENDING: 1}
+        assert outbox.requeue_inflight() == 2
+        assert outbox.counts() == {STATUS_PENDING: 3}
+
+    def test_open_requeues_entries_left_inflight(self, tmp_path):
+        path = tmp_path / "outbox.db"
+        outbox = Outbox(path)
+        for payment_id in range(1, 4):
+            outbox.enqueue_sync("finalize_payout", _finalize(payment_id))
+        outbox.claim(2)
+        outbox.close()
+
+        assert Outbox(path).counts() == {STATUS_PENDING: 3}
+
+    def test_retry_delays_entry(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        outbox.enqueue_sync("finalize_payout", _finalize(1))
+        (entry,) = outbox.claim(1)
+        outbox.retry(entry.id, 60.0, "unavailable")
+        assert outbox.claim(1) == []
+
+    def test_explicit_dedupe_key(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        assert outbox.enqueue_sync("finalize_payout", _finalize(1), dedupe_key="a") is True
+        assert outbox.enqueue_sync("finalize_payout", _finalize(1), dedupe_key="b") is True
+
+    async def test_async_enqueue(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        assert await outbox.enqueue("finalize_payout", _finalize(1)) is True
+
+
+@pytest.mark.asyncio
+class TestOutboxWorker:
+    async def test_delivers_all_entries(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        for payment_id in range(1, 21):
+            outbox.enqueue_sync("finalize_payout", _finalize(payment_id))
+        client = FakeNetworkClient()
+
+        await _drain(outbox, client, until=lambda: len(client.delivered) == 20, concurrency=4)
+
+        assert sorted(r.payment_id for r in client.delivered) == list(range(1, 21))
+        assert outbox.counts() == {STATUS_DONE: 20}
+        assert 1 < client.max_concurrent <= 4
+
+    async def test_redelivered_payout_is_sent_once(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        client = FakeNetworkClient()
+        outbox.enqueue_sync("finalize_payout", _finalize(5))
+        await _drain(outbox, client, until=lambda: len(client.delivered) == 1)
+
+        assert outbox.enqueue_sync("finalize_payout", _finalize(5)) is False
+        await _drain(outbox, client, until=lambda: False, timeout=0.2)
+        assert len(client.delivered) == 1
+
+    async def test_retries_transient_errors(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        client = FakeNetworkClient(
+            failures={1: [ConnectError(Code.UNAVAILABLE, "down"), ConnectionError("reset")]},
+        )
+        outbox.enqueue_sync("finalize_payout", _finalize(1))
+
+        await _drain(outbox, client, until=lambda: len(client.delivered) == 1)
+
+        assert len(client.delivered) == 1
+        assert outbox.counts() == {STATUS_DONE: 1}
+
+    async def test_permanent_error_moves_entry_to_dead(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        client = FakeNetworkClient(failures={1: [ConnectError(Code.INVALID_ARGUMENT, "bad receipt")]})
+        outbox.enqueue_sync("finalize_payout", _finalize(1))
+
+        await _drain(outbox, client, until=lambda: outbox.counts().get(STATUS_DEAD) == 1)
+
+        ((entry, error),) = outbox.dead_entries()
+        assert entry.decode().payment_id == 1
+        assert error == "bad receipt"
+        assert client.delivered == []
+
+    async def test_gives_up_after_max_attempts(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        client = FakeNetworkClient(failures={1: [ConnectError(Code.UNAVAILABLE, "down")] * 5})
+        outbox.enqueue_sync("finalize_payout", _finalize(1))
+
+        await _drain(outbox, client, until=lambda: outbox.counts().get(STATUS_DEAD) == 1, max_attempts=3)
+
+        ((entry, _),) = outbox.dead_entries()
+        assert entry.attempts == 3
+
+    async def test_wakes_up_on_enqueue(self, tmp_path):
+        outbox = Outbox(tmp_path / "outbox.db")
+        client = FakeNetworkClient()
+        shutdown = asyncio.Event()
+        worker = OutboxWorker(outbox, client, poll_interval=60.0)
+        task = asyncio.create_task(worker.run(shutdown))
+        await asyncio.sleep(0.05)
+
+        await outbox.enqueue("finalize_payout", _finalize(3))
+        for _ in range(100):
+            if client.delivered:
+                break
+            await asyncio.sleep(0.01)
+        shutdown.set()
+        await task
+
+        assert [r.payment_id for r in client.delivered] == [3]
@@ -0,0 +1,160 @@
+"""Tests for outbound token-bucket rate limiting."""
+
+import threading
+import time
+
+import pytest
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+
+from t0_provider_sdk.crypto.signer import new_signer_from_hex
+from t0_provider_sdk.network.errors import RateLimitExceededError
+from t0_provider_sdk.network.ratelimit import RateLimit, RateLimiter, TokenBucket, rpc_method_from_url
+from t0_provider_sdk.network.signing import SigningClient, SigningSyncClient
+
+PRIVATE_KEY = "0x6b30303de7b26bfb1222b317a52113357f8bb06de00160b4261a2fef9c8b9bd8"
+UPDATE_QUOTE_URL = "https://api.t-0.network/tzero.v1.payment.NetworkService/UpdateQuote"
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTokenBucket:
+    def test_burst_is_available_immediately(self):
+        bucket = TokenBucket(RateLimit(rate=1, burst=3), clock=FakeClock())
+        assert [bucket.reserve(0.0) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert bucket.reserve(0.0) is None
+
+    def test_reservations_queue_in_order(self):
+        bucket = TokenBucket(RateLimit(rate=2, burst=1), clock=FakeClock())
+        assert bucket.reserve(10.0) == 0.0
+        assert bucket.reserve(10.0) == pytest.approx(0.5)
+        assert bucket.reserve(10.0) == pytest.approx(1.0)
+
+    def test_refills_over_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(RateLimit(rate=1, burst=1), clock=clock)
+        assert bucket.reserve(0.0) == 0.0
+        assert bucket.reserve(0.0) is None
+        clock.now += 1.0
+        assert bucket.reserve(0.0) == 0.0
+
+    def test_refill_is_capped_at_burst(self):
+        clock = FakeClock()
+        bucket = TokenBucket(RateLimit(rate=1, burst=2), clock=clock)
+        clock.now += 60.0
+        assert bucket.reserve(0.0) == 0.0
+        assert bucket.reserve(0.0) == 0.0
+        assert bucket.reserve(0.0) is None
+
+    def test_invalid_limits(self):
+        with pytest.raises(ValueError):
+            RateLimit(rate=0)
+        with pytest.raises(ValueError):
+            RateLimit(rate=1, burst=0)
+
+
+class TestRateLimiter:
+    def test_method_limit_is_independent_per_method(self):
+        limiter = RateLimiter(method_limits={"UpdateQuote": RateLimit(rate=1)}, max_wait=0.0, clock=FakeClock())
+        assert limiter.reserve("UpdateQuote") == 0.0
+        with pytest.raises(RateLimitExceededError):
+            limiter.reserve("UpdateQuote")
+        assert limiter.reserve("FinalizePayout") == 0.0
+
+    def test_global_limit_applies_to_all_methods(self):
+        limiter = RateLimiter(global_limit=RateLimit(rate=1, burst=2), max_wait=0.0, clock=FakeClock())
+        limiter.reserve("UpdateQuote")
+        limiter.reserve("FinalizePayout")
+        with pytest.raises(RateLimitExceededError):
+            limiter.reserve("GetQuote")
+
+    def test_rejected_request_refunds_method_token(self):
+        clock = FakeClock()
+        limiter = RateLimiter(
+            global_limit=RateLimit(rate=1),
+            method_limits={"FinalizePayout": RateLimit(rate=1, burst=2)},
+            max_wait=0.0,
+            clock=clock,
+        )
+        limiter.reserve("UpdateQuote")  # drains the global bucket
+        with pytest.raises(RateLimitExceededError):
+            limiter.reserve("FinalizePayout")
+        clock.now += 1.0
+        # Both FinalizePayout tokens are still available; the global bucket is the constraint.
+        assert limiter.reserve("FinalizePayout") == 0.0
+
+    def test_delay_is_bounded_by_max_wait(self):
+        limiter = RateLimiter(method_limits={"UpdateQuote": RateLimit(rate=1)}, max_wait=1.5, clock=FakeClock())
+        assert limiter.reserve("UpdateQuote") == 0.0
+        assert limiter.reserve("UpdateQuote") == pytest.approx(1.0)
+        with pytest.raises(RateLimitExceededError) as exc_info:
+            limiter.reserve("UpdateQuote")
+        assert exc_info.value.retry_after == pytest.approx(2.0)
+
+    def test_error_is_resource_exhausted_connect_error(self):
+        limiter = RateLimiter(method_limits={"UpdateQuote": RateLimit(rate=1)}, max_wait=0.0)
+        limiter.reserve("UpdateQuote")
+        with pytest.raises(ConnectError) as exc_info:
+            limiter.reserve("UpdateQuote")
+        assert exc_info.value.code == Code.RESOURCE_EXHAUSTED
+
+    def test_threaded_callers_share_the_budget(self):
+        limiter = RateLimiter(global_limit=RateLimit(rate=1, burst=5), max_wait=0.0)
+        admitted = []
+        lock = threading.Lock()
+
+        def worker():
+            try:
+                limiter.reserve("FinalizePayout")
+            except RateLimitExceededError:
+                return
+            with lock:
+                admitted.append(1)
+
+        threads = [threading.Thread(target=worker) for _ in range(32)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(admitted) == 5
+
+    async def test_acquire_waits_for_token(self):
+        limiter = RateLimiter(method_limits={"UpdateQuote": RateLimit(rate=20)})
+        start = time.monotonic()
+        await limiter.acquire("UpdateQuote")
+        await limiter.acquire("UpdateQuote")
+        assert time.monotonic() - start >= 0.04
+
+    def test_acquire_sync_waits_for_token(self):
+        limiter = RateLimiter(method_limits={"UpdateQuote": RateLimit(rate=20)})
+        start = time.monotonic()
+        limiter.acquire_sync("UpdateQuote")
+        limiter.acquire_sync("UpdateQuote")
+        assert time.monotonic() - start >= 0.04
+
+
+class TestSigningClientRateLimit:
+    def test_sync_client_rejects_before_sending(self):
+        limiter = RateLimiter(method_limits={"UpdateQuote": RateLimit(rate=0.001)}, max_wait=0.0)
+        limiter.reserve("UpdateQuote")
+        client = SigningSyncClient(new_signer_from_hex(PRIVATE_KEY), rate_limiter=limiter)
+        with pytest.raises(RateLimitExceededError):
+            client.post(UPDATE_QUOTE_URL, content=b"")
+
+    async def test_async_client_rejects_before_sending(self):
+        limiter = RateLimiter(method_limits={"UpdateQuote": RateLimit(rate=0.001)}, max_wait=0.0)
+        limiter.reserve("UpdateQuote")
+        client = SigningClient(new_signer_from_hex(PRIVATE_KEY), rate_limiter=limiter)
+        with pytest.raises(RateLimitExceededError):
+            await client.post(UPDATE_QUOTE_URL, content=b"")
+
+
+def test_rpc_method_from_url():
+    assert rpc_method_from_url(UPDATE_QUOTE_URL) == "UpdateQuote"
+    assert rpc_method_from_url(UPDATE_QUOTE_URL.replace("UpdateQuote", "GetQuote") + "?message=abc") == "GetQuote"
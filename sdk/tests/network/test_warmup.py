@@ -0,0 +1,94 @@
+"""Tests for connection pre-warming and keep-alive."""
+
+import asyncio
+import time
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClient, NetworkServiceClientSync
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import FinalizePayoutRequest
+from t0_provider_sdk.network.client import (
+    client_endpoint,
+    new_pooled_service_client_sync,
+    new_service_client,
+    new_service_client_sync,
+)
+from t0_provider_sdk.network.warmup import KeepAlive, KeepAliveSync, warm_up, warm_up_sync
+
+PRIVATE_KEY = "0x6b30303de7b26bfb1222b317a52113357f8bb06de00160b4261a2fef9c8b9bd8"
+
+
+class TestWarmUp:
+    async def test_opens_requested_connections(self, network_server, server_connections):
+        client = new_service_client(PRIVATE_KEY, NetworkServiceClient, base_url=network_server)
+        assert await warm_up(client, connections=3) == 3
+        assert len(server_connections) == 3
+
+    def test_sync_opens_requested_connections(self, network_server, server_connections):
+        client = new_pooled_service_client_sync(
+            PRIVATE_KEY, NetworkServiceClientSync, threads=4, base_url=network_server
+        )
+        assert warm_up_sync(client, connections=4) == 4
+        assert len(server_connections) == 4
+
+    def test_warm_connections_are_reused_by_rpcs(self, network_server, server_connections, received_payment_ids):
+        client = new_pooled_service_client_sync(
+            PRIVATE_KEY, NetworkServiceClientSync, threads=2, base_url=network_server
+        )
+        warm_up_sync(client, connections=2)
+        client.finalize_payout(FinalizePayoutRequest(payment_id=1))
+        assert received_payment_ids == [1]
+        # Reusing a warmed connection means a further warm-up opens no new ones.
+        warm_up_sync(client, connections=2)
+        assert len(server_connections) == 2
+
+    async def test_unreachable_endpoint_is_not_fatal(self):
+        client = new_service_client(PRIVATE_KEY, NetworkServiceClient, base_url="http://127.0.0.1:9")
+        assert await warm_up(client, connections=2, timeout=1.0) == 0
+
+    def test_rejects_foreign_clients(self):
+        with pytest.raises(TypeError):
+            warm_up_sync(NetworkServiceClientSync("http://127.0.0.1:9"))
+        client = new_service_client_sync(PRIVATE_KEY, NetworkServiceClientSync, base_url="http://127.0.0.1:9")
+        assert client_endpoint(client).base_url == "http://127.0.0.1:9"
+        with pytest.raises(TypeError):
+            asyncio.run(warm_up(client))  # a sync client's transport cannot be awaited
+        with pytest.raises(ValueError):
+            warm_up_sync(client, connections=0)
+
+
+class TestKeepAlive:
+    async def test_start_warms_and_repeats_until_stop(self, network_server, server_connections):
+        client = new_service_client(PRIVATE_KEY, NetworkServiceClient, base_url=network_server)
+        keep_alive = KeepAlive(client, connections=2, interval=0.05)
+        rounds = []
+        original = keep_alive.warm_up
+
+        async def counting_warm_up() -> int:
+            rounds.append(1)
+            return await original()
+
+        keep_alive.warm_up = counting_warm_up
+        await keep_alive.start()
+        assert len(server_connections) == 2
+        await asyncio.sleep(0.2)
+        await keep_alive.stop()
+        count = len(rounds)
+        assert count >= 3
+        await asyncio.sleep(0.1)
+        assert len(rounds) == count
+
+    def test_sync_start_and_stop(self, network_server, server_connections):
+        client = new_pooled_service_client_sync(
+            PRIVATE_KEY, NetworkServiceClientSync, threads=2, base_url=network_server
+        )
+        keep_alive = KeepAliveSync(client, connections=2, interval=0.05)
+        keep_alive.start()
+        assert len(server_connections) == 2
+        time.sleep(0.15)
+        keep_alive.stop()
+
+    def test_invalid_interval(self):
+        client = new_service_client(PRIVATE_KEY, NetworkServiceClient)
+        with pytest.raises(ValueError):
+            KeepAlive(client, interval=0)
@@ -0,0 +1,128 @@
+"""Tests for the payment state machine store and its backends."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import CreatePaymentResponse, FinalizePayoutRequest
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import PayoutRequest, PayoutResponse, UpdatePaymentRequest
+from t0_provider_sdk.common.groupcommit import GroupCommitWriter
+from t0_provider_sdk.payments import (
+    IllegalTransitionError,
+    MemoryPaymentBackend,
+    PaymentError,
+    PaymentNotFoundError,
+    PaymentRole,
+    PaymentState,
+    PaymentStore,
+    SQLitePaymentBackend,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite", "sqlite-group-commit"])
+def store(request, tmp_path):
+    path = tmp_path / "payments.db"
+    writer = GroupCommitWriter(path) if request.param == "sqlite-group-commit" else None
+    backend = MemoryPaymentBackend() if request.param == "memory" else SQLitePaymentBackend(path, writer=writer)
+    with PaymentStore(backend, shards=8) as store:
+        yield store
+    if writer is not None:
+        writer.close()
+
+
+def _accepted(payment_client_id: str, payment_id: int) -> CreatePaymentResponse:
+    return CreatePaymentResponse(
+        payment_client_id=payment_client_id, accepted=CreatePaymentResponse.Accepted(payment_id=payment_id)
+    )
+
+
+def test_pay_in_lifecycle_indexed_by_both_ids(store):
+    created = store.create("order-1")
+    assert created.state is PaymentState.PENDING and created.payment_id == 0
+    assert store.create("order-1") == created
+
+    assert store.apply_create_response(_accepted("order-1", 42)).payment_id == 42
+    store.update(UpdatePaymentRequest(payment_client_id="order-1", manual_aml_check={}))
+    store.update(UpdatePaymentRequest(payment_id=42, accepted={}))  # found by payment_id
+    store.update(UpdatePaymentRequest(payment_id=42, accepted={}))  # redelivered: no-op
+    confirmed = store.update(UpdatePaymentRequest(payment_id=42, payment_client_id="order-1", confirmed={}))
+
+    assert confirmed.state is PaymentState.CONFIRMED and confirmed.version == 3
+    assert store.get(42, role=PaymentRole.PAY_IN) == confirmed == store.get_by_client_id("order-1")
+    assert store.get(42) is None  # not a payout
+
+
+def test_illegal_transitions_are_rejected(store):
+    store.create("order-1")
+    store.apply_create_response(_accepted("order-1", 1))
+    store.update(UpdatePaymentRequest(payment_id=1, failed={}))
+
+    with pytest.raises(IllegalTransitionError) as excinfo:
+        store.update(UpdatePaymentRequest(payment_id=1, accepted={}))
+    assert excinfo.value.record.state is PaymentState.FAILED and excinfo.value.state is PaymentState.ACCEPTED
+
+    store.create("order-2")
+    with pytest.raises(IllegalTransitionError):
+        store.update(UpdatePaymentRequest(payment_client_id="order-2", confirmed={}))  # never accepted
+    assert store.get_by_client_id("order-2").state is PaymentState.PENDING
+
+    with pytest.raises(PaymentNotFoundError):
+        store.update(UpdatePaymentRequest(payment_id=99, accepted={}))
+    with pytest.raises(PaymentError, match="unsupported"):
+        store.update(UpdatePaymentRequest(payment_client_id="order-2"))
+    failed = CreatePaymentResponse(payment_client_id="order-2", failure={})
+    assert store.apply_create_response(failed).state is PaymentState.FAILED
+
+    assert store.registry.snapshot()["t0_payment_illegal_transitions_total"][()] == 2
+
+
+def test_payout_lifecycle(store):
+    payment_id = (1 << 64) - 1  # uint64 ids survive SQLite's signed integers
+    assert store.start_payout(PayoutRequest(payment_id=payment_id)).state is PaymentState.PENDING
+    store.start_payout(PayoutRequest(payment_id=payment_id))
+    store.apply_payout_response(payment_id, PayoutResponse(manual_aml_check={}))
+    store.transition(PaymentRole.PAY_OUT, payment_id, PaymentState.ACCEPTED)  # CompleteManualAmlCheck
+    done = store.finalize_payout(FinalizePayoutRequest(payment_id=payment_id, success={}))
+
+    assert done.state is PaymentState.CONFIRMED and store.get(payment_id) == done
+    with pytest.raises(IllegalTransitionError):
+        store.finalize_payout(FinalizePayoutRequest(payment_id=payment_id, failure={}))
+    with pytest.raises(PaymentNotFoundError):
+        store.finalize_payout(FinalizePayoutRequest(payment_id=7, success={}))
+    store.start_payout(PayoutRequest(payment_id=8))
+    with pytest.raises(PaymentError, match="unsupported"):
+        store.finalize_payout(FinalizePayoutRequest(payment_id=8))
+    assert store.get(8).state is PaymentState.PENDING
+
+
+def test_concurrent_updates_of_one_payment_are_serialized(store):
+    store.start_payout(PayoutRequest(payment_id=1))
+    store.apply_payout_response(1, PayoutResponse(accepted={}))
+
+    def finalize(success: bool) -> str:
+        request = (
+            FinalizePayoutRequest(payment_id=1, success={})
+            if success
+            else FinalizePayoutRequest(payment_id=1, failure={})
+        )
+        try:
+            return store.finalize_payout(request).state
+        except IllegalTransitionError:
+            return "rejected"
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(finalize, [i % 2 == 0 for i in range(32)]))
+
+    final = store.get(1).state
+    assert final in (PaymentState.CONFIRMED, PaymentState.FAILED)
+    assert set(results) == {final, "rejected"}  # every other outcome lost
+    assert store.get(1).version == 2
+
+
+def test_sqlite_records_survive_reopening(tmp_path):
+    with PaymentStore(SQLitePaymentBackend(tmp_path / "payments.db")) as store:
+        store.create("order-1")
+        store.apply_create_response(_accepted("order-1", 5))
+    with PaymentStore(SQLitePaymentBackend(tmp_path / "payments.db")) as store:
+        assert store.get(5, role=PaymentRole.PAY_IN).payment_client_id == "order-1"
+        assert store.update(UpdatePaymentRequest(payment_id=5, accepted={})).state is PaymentState.ACCEPTED
@@ -0,0 +1,61 @@
+"""Tests for ASGI app composition and lifespan hooks."""
+
+import pytest
+
+from t0_provider_sdk.provider.handler import new_asgi_app
+
+NETWORK_PUBLIC_KEY = "0x044fa1465c087aaf42e5ff707050b8f77d2ce92129c5f300686bdd3adfffe44567713bb7931632837c5268a832512e75599b6964f4484c9531c02e96d90384d9f0"
+
+
+async def _lifespan(app, *messages: str) -> list[dict]:
+    incoming = [{"type": m} for m in messages]
+    sent: list[dict] = []
+
+    async def receive() -> dict:
+        return incoming.pop(0)
+
+    async def send(message: dict) -> None:
+        sent.append(message)
+
+    await app({"type": "lifespan"}, receive, send)
+    return sent
+
+
+class TestLifespanHooks:
+    async def test_hooks_run_in_order(self):
+        calls = []
+
+        async def first():
+            calls.append("first")
+
+        async def second():
+            calls.append("second")
+
+        async def stop():
+            calls.append("stop")
+
+        app = new_asgi_app("", on_startup=[first, second], on_shutdown=[stop])
+        sent = await _lifespan(app, "lifespan.startup", "lifespan.shutdown")
+
+        assert calls == ["first", "second", "stop"]
+        assert [m["type"] for m in sent] == ["lifespan.startup.complete", "lifespan.shutdown.complete"]
+
+    async def test_failing_startup_hook_fails_startup(self):
+        async def broken():
+            raise RuntimeError("network unreachable")
+
+        app = new_asgi_app("", on_startup=[broken])
+        sent = await _lifespan(app, "lifespan.startup")
+
+        assert sent == [{"type": "lifespan.startup.failed", "message": "network unreachable"}]
+
+    @pytest.mark.parametrize("key", ["", NETWORK_PUBLIC_KEY])
+    async def test_hooks_run_behind_signature_middleware(self, key):
+        started = []
+
+        async def hook():
+            started.append(True)
+
+        app = new_asgi_app(key, on_startup=[hook])
+        await _lifespan(app, "lifespan.startup", "lifespan.shutdown")
+        assert started == [True]
@@ -0,0 +1,175 @@
+"""Tests for lazy decoding of AppendLedgerEntries requests."""
+
+import io
+import json
+
+import pytest
+from google.protobuf.message import DecodeError
+
+from t0_provider_sdk.api.tzero.v1.payment.provider_connect import (
+    ProviderService,
+    ProviderServiceASGIApplication,
+    ProviderServiceSync,
+    ProviderServiceWSGIApplication,
+)
+from t0_provider_sdk.api.tzero.v1.payment.provider_pb2 import (
+    AppendLedgerEntriesRequest,
+    AppendLedgerEntriesResponse,
+    UpdateLimitRequest,
+    UpdateLimitResponse,
+)
+from t0_provider_sdk.provider import (
+    LazyAppendLedgerEntriesRequest,
+    handler,
+    handler_sync,
+    new_asgi_app,
+    new_wsgi_app,
+    with_lazy_ledger_entries,
+)
+
+Transaction = AppendLedgerEntriesRequest.Transaction
+PATH = "/tzero.v1.payment.ProviderService/AppendLedgerEntries"
+NETWORK_PUBLIC_KEY = "0x044fa1465c087aaf42e5ff707050b8f77d2ce92129c5f300686bdd3adfffe44567713bb7931632837c5268a832512e75599b6964f4484c9531c02e96d90384d9f0"
+
+
+def _request(count: int) -> AppendLedgerEntriesRequest:
+    return AppendLedgerEntriesRequest(
+        transactions=[
+            Transaction(transaction_id=i, payout=Transaction.Payout(payment_id=i * 10)) for i in range(1, count + 1)
+        ]
+    )
+
+
+class _Service(ProviderService):
+    def __init__(self):
+        self.requests = []
+        self.seen = []
+
+    async def append_ledger_entries(self, request, ctx):
+        self.requests.append(request)
+        self.seen.extend(t.transaction_id for t in request.transactions)
+        return AppendLedgerEntriesResponse()
+
+    async def update_limit(self, request, ctx):
+        self.requests.append(request)
+        return UpdateLimitResponse()
+
+
+class _SyncService(ProviderServiceSync):
+    def __init__(self):
+        self.requests = []
+
+    def append_ledger_entries(self, request, ctx):
+        self.requests.append(request)
+        return AppendLedgerEntriesResponse()
+
+
+async def _post(app, path: str, body: bytes, content_type: str = "application/proto") -> tuple[int, bytes]:
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"content-type", content_type.encode())],
+    }
+    sent = []
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    return sent[0]["status"], b"".join(m.get("body", b"") for m in sent[1:])
+
+
+class TestLazyRequest:
+    def test_transactions_match_full_parse(self):
+        data = _request(50).SerializeToString()
+        lazy = LazyAppendLedgerEntriesRequest()
+        assert lazy.ParseFromString(data) == len(data) == lazy.ByteSize()
+        assert list(lazy.transactions) == list(_request(50).transactions)
+        assert [t.transaction_id for t in lazy.transactions][:3] == [1, 2, 3]  # iterable again
+        assert lazy.to_message() == _request(50)
+        assert list(LazyAppendLedgerEntriesRequest().transactions) == []
+
+    def test_unknown_fields_are_skipped(self):
+        # field 2 varint, field 3 length-delimited, field 4 fixed64, field 5 fixed32
+        unknown = b"\x10\x96\x01" + b"\x1a\x02ab" + b"\x21" + bytes(8) + b"\x2d" + bytes(4)
+        data = unknown + _request(2).SerializeToString() + unknown
+        assert [t.transaction_id for t in LazyAppendLedgerEntriesRequest(data).transactions] == [1, 2]
+
+    def test_truncated_body_fails_after_intact_transactions(self):
+        data = _request(3).SerializeToString()[:-2]
+        transactions = LazyAppendLedgerEntriesRequest(data).transactions
+        assert [next(transactions).transaction_id, next(transactions).transaction_id] == [1, 2]
+        with pytest.raises(DecodeError, match="truncated"):
+            next(transactions)
+
+
+class TestLazyHandler:
+    async def test_proto_requests_reach_the_handler_undecoded(self):
+        service = _Service()
+        app = new_asgi_app("", handler(ProviderServiceASGIApplication, service, with_lazy_ledger_entries()))
+
+        status, body = await _post(app, PATH, _request(3).SerializeToString())
+
+        assert status == 200
+        assert AppendLedgerEntriesResponse.FromString(body) == AppendLedgerEntriesResponse()
+        assert isinstance(service.requests[0], LazyAppendLedgerEntriesRequest)
+        assert service.seen == [1, 2, 3]
+
+    async def test_json_and_other_methods_are_parsed_as_usual(self):
+        service = _Service()
+        app = new_asgi_app("", handler(ProviderServiceASGIApplication, service, with_lazy_ledger_entries()))
+
+        body = json.dumps({"transactions": [{"transactionId": "7", "payout": {"paymentId": "1"}}]}).encode()
+        status, _ = await _post(app, PATH, body, "application/json")
+        assert status == 200
+        status, _ = await _post(app, "/tzero.v1.payment.ProviderService/UpdateLimit", b"")
+        assert status == 200
+
+        assert isinstance(service.requests[0], AppendLedgerEntriesRequest)
+        assert isinstance(service.requests[1], UpdateLimitRequest)
+        assert service.seen == [7]
+
+    async def test_without_option_requests_are_parsed(self):
+        service = _Service()
+        app = new_asgi_app("", handler(ProviderServiceASGIApplication, service))
+        await _post(app, PATH, _request(1).SerializeToString())
+        assert isinstance(service.requests[0], AppendLedgerEntriesRequest)
+
+    async def test_signature_errors_still_reject_lazy_requests(self):
+        service = _Service()
+        app = new_asgi_app(
+            NETWORK_PUBLIC_KEY, handler(ProviderServiceASGIApplication, service, with_lazy_ledger_entries())
+        )
+
+        status, _ = await _post(app, PATH, _request(1).SerializeToString())
+
+        assert status == 400  # missing signature headers
+        assert service.requests == []
+
+    def test_wsgi(self):
+        service = _SyncService()
+        app = new_wsgi_app("", handler_sync(ProviderServiceWSGIApplication, service, with_lazy_ledger_entries()))
+        body = _request(2).SerializeToString()
+        statuses = []
+        environ = {
+            "REQUEST_METHOD": "POST",
+            "PATH_INFO": PATH,
+            "CONTENT_TYPE": "application/proto",
+            "CONTENT_LENGTH": str(len(body)),
+            "wsgi.input": io.BytesIO(body),
+            "wsgi.url_scheme": "http",
+            "SERVER_NAME": "localhost",
+            "SERVER_PORT": "80",
+        }
+
+        b"".join(app(environ, lambda status, headers, exc_info=None: statuses.append(status)))
+
+        assert statuses[0].startswith("200")
+        assert [t.transaction_id for t in service.requests[0].transactions] == [1, 2]
+        assert isinstance(service.requests[0], LazyAppendLedgerEntriesRequest)
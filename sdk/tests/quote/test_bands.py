@@ -0,0 +1,160 @@
+"""Tests for building quote bands from rate curves."""
+
+import decimal
+import random
+from fractions import Fraction
+
+import pytest
+
+import t0_provider_sdk.quote.bands as bands_module
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import PAYMENT_METHOD_TYPE_SEPA
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteResponse
+from t0_provider_sdk.quote.bands import RateCurve, build_bands, build_quotes
+from t0_provider_sdk.quote.publisher import Direction, QuoteKey, QuotePublisher
+
+# Modules the shared `backend` fixture runs with and without NumPy
+NUMPY_MODULES = [bands_module]
+
+
+def _values(bands):
+    return [(b.max_amount.unscaled, b.max_amount.exponent, b.rate.unscaled, b.rate.exponent) for b in bands]
+
+
+def _random_curves(seed: int, count: int = 20, size: int = 20) -> dict:
+    rng = random.Random(seed)
+    return {
+        f"C{i}": RateCurve([1_000 * (j + 1) for j in range(size)], [rng.uniform(0.001, 20_000) for _ in range(size)])
+        for i in range(count)
+    }
+
+
+class TestBuildBands:
+    def test_float_rates_are_quantized(self, backend):
+        bands = build_bands([1_000, 10_000], [0.86123456789, 0.8612])
+        assert _values(bands) == [(1_000, 0, 86123457, -8), (10_000, 0, 86120000, -8)]
+        assert [b.client_quote_id for b in bands] == ["", ""]
+
+    def test_exact_inputs(self, backend):
+        rates = [decimal.Decimal("0.123456785"), "0.123456795", Fraction(1, 3), Decimal(unscaled=86, exponent=-2)]
+        bands = build_bands([1, 2, 3, 4], rates)
+        assert [b.rate.unscaled for b in bands] == [12345678, 12345680, 33333333, 86000000]
+        bands = build_bands([1, 2, 3, 4], rates, rounding=decimal.ROUND_UP)
+        assert [b.rate.unscaled for b in bands] == [12345679, 12345680, 33333334, 86000000]
+
+    def test_exponents_and_ids(self, backend):
+        bands = build_bands(
+            [999.99, 5_000.5], [1.5, 2], client_quote_ids=["a", "b"], rate_exponent=-2, amount_exponent=-2
+        )
+        assert _values(bands) == [(99999, -2, 150, -2), (500050, -2, 200, -2)]
+        assert [b.client_quote_id for b in bands] == ["a", "b"]
+        bands = build_bands([10_000, 20_000], [0.5, 0.6], amount_exponent=3)
+        assert [b.max_amount.unscaled for b in bands] == [10, 20]
+
+    @pytest.mark.parametrize(
+        ("rounding", "expected"),
+        [
+            (decimal.ROUND_HALF_EVEN, [2, 2, 4]),
+            (decimal.ROUND_HALF_UP, [3, 2, 4]),
+            (decimal.ROUND_HALF_DOWN, [2, 2, 3]),
+            (decimal.ROUND_UP, [3, 3, 4]),
+            (decimal.ROUND_DOWN, [2, 2, 3]),
+            (decimal.ROUND_CEILING, [3, 3, 4]),
+            (decimal.ROUND_FLOOR, [2, 2, 3]),
+        ],
+    )
+    def test_float_rounding_modes(self, backend, rounding, expected):
+        bands = build_bands([1, 2, 3], [2.5, 2.25, 3.5], rate_exponent=0, rounding=rounding)
+        assert [b.rate.unscaled for b in bands] == expected
+
+    def test_validation(self, backend):
+        with pytest.raises(ValueError):
+            build_bands([1_000, 1_000], [1.0, 1.0])  # not strictly ascending
+        with pytest.raises(ValueError):
+            build_bands([0, 1_000], [1.0, 1.0])
+        with pytest.raises(ValueError):
+            build_bands([1_000], [0.000000001])  # rounds to zero
+        with pytest.raises(ValueError):
+            build_bands([1_000], [float("nan")])
+        with pytest.raises(ValueError):
+            build_bands([1_000], [1e12])  # 1e20 at exponent -8 overflows int64
+        with pytest.raises(ValueError):
+            build_bands([10**12], [1.0], amount_exponent=-8)
+        with pytest.raises(ValueError):
+            build_bands([1_000, 2_000], [1.0])
+        with pytest.raises(ValueError):
+            build_bands([], [])
+        with pytest.raises(ValueError):
+            build_bands([1_000], [1.0], client_quote_ids=["a", "b"])
+        with pytest.raises(ValueError):
+            build_bands([1_000], [1.0], rate_exponent=-9)
+        with pytest.raises(ValueError):
+            build_bands([1_000], [1.0], rounding=decimal.ROUND_05UP)
+        with pytest.raises(TypeError):
+            build_bands([1_000], [True])
+
+
+class TestBuildQuotes:
+    def test_backends_agree(self, monkeypatch):
+        if bands_module.np is None:
+            pytest.skip("NumPy is not installed")
+        np = bands_module.np
+        curves = _random_curves(3)
+        array_curves = {k: RateCurve(np.asarray(c.max_amounts), np.asarray(c.rates)) for k, c in curves.items()}
+        for rounding in (decimal.ROUND_HALF_EVEN, decimal.ROUND_HALF_UP, decimal.ROUND_FLOOR):
+            vectorized = build_quotes(array_curves, rounding=rounding)
+            monkeypatch.setattr(bands_module, "np", None)
+            scalar = build_quotes(curves, rounding=rounding)
+            monkeypatch.setattr(bands_module, "np", np)
+            assert {k: _values(v) for k, v in vectorized.items()} == {k: _values(v) for k, v in scalar.items()}
+
+    def test_float_rates_match_decimal_quantize_of_their_exact_value(self, backend):
+        # Binary rounding agrees with decimal rounding except at exact ties, which random floats avoid
+        curves = _random_curves(4, count=5)
+        built = build_quotes(curves)
+        quantum = decimal.Decimal("1E-8")
+        for key, curve in curves.items():
+            expected = [int(decimal.Decimal(rate).quantize(quantum).scaleb(8)) for rate in curve.rates]
+            assert [b.rate.unscaled for b in built[key]] == expected
+
+    def test_mixed_curves_keep_order_and_ids(self, backend):
+        curves = {
+            "EUR": RateCurve([1_000, 10_000], [0.86, 0.85]),
+            "GBP": RateCurve([5_000], ["0.74"]),
+            "JPY": RateCurve.from_spreads(150.0, [1_000, 2_000], [-10, -5]),
+        }
+        built = build_quotes(curves, client_quote_ids={"GBP": ["gbp-1"]})
+        assert list(built) == ["EUR", "GBP", "JPY"]
+        assert _values(built["GBP"]) == [(5_000, 0, 74000000, -8)]
+        assert built["GBP"][0].client_quote_id == "gbp-1"
+        assert [b.rate.unscaled for b in built["JPY"]] == [14985000000, 14992500000]
+
+    def test_validation_names_the_curve(self, backend):
+        with pytest.raises(ValueError, match="GBP"):
+            build_quotes({"EUR": RateCurve([1], [1.0]), "GBP": RateCurve([2, 1], [1.0, 1.0])})
+
+
+def test_from_spreads_exact(backend):
+    curve = RateCurve.from_spreads(decimal.Decimal("0.86"), [1_000, 10_000], [-10, 2.5])
+    assert curve.rates == [Fraction("0.85914"), Fraction("0.860215")]
+    assert [b.rate.unscaled for b in build_bands(curve.max_amounts, curve.rates)] == [85914000, 86021500]
+
+
+class RecordingClient:
+    def __init__(self) -> None:
+        self.requests = []
+
+    async def update_quote(self, request):
+        self.requests.append(request)
+        return UpdateQuoteResponse()
+
+
+async def test_built_bands_publish(backend):
+    key = QuoteKey("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT)
+    publisher = QuotePublisher(RecordingClient(), min_interval=0.01, max_interval=None)
+    for quote_key, bands in build_quotes({key: RateCurve.from_spreads(0.86, [1_000, 10_000], [-5, 0])}).items():
+        publisher.update(*quote_key, bands)
+
+    quote = publisher.build_request().pay_out[0]
+    assert [b.rate.unscaled for b in quote.bands] == [85957000, 86000000]
+    assert all(b.client_quote_id for b in quote.bands)
@@ -0,0 +1,170 @@
+"""Tests for the published quote book and last-look checks."""
+
+import asyncio
+from fractions import Fraction
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import (
+    PAYMENT_METHOD_TYPE_SEPA,
+    PAYMENT_METHOD_TYPE_SWIFT,
+)
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest, UpdateQuoteResponse
+from t0_provider_sdk.quote.book import LastLook, QuoteBook
+from t0_provider_sdk.quote.diff import to_timestamp
+from t0_provider_sdk.quote.publisher import Direction, QuotePublisher
+
+Band = UpdateQuoteRequest.Quote.Band
+
+
+def _quote(
+    currency: str, bands: list[tuple[str, int, int]], expiration: float = 1_030, method=PAYMENT_METHOD_TYPE_SEPA
+):
+    return UpdateQuoteRequest.Quote(
+        currency=currency,
+        payment_method=method,
+        expiration=to_timestamp(expiration),
+        timestamp=to_timestamp(1_000),
+        bands=[
+            Band(
+                client_quote_id=client_quote_id,
+                max_amount=Decimal(unscaled=max_amount, exponent=0),
+                rate=Decimal(unscaled=rate, exponent=-4),
+            )
+            for client_quote_id, max_amount, rate in bands
+        ],
+    )
+
+
+EUR_BANDS = [("eur-1k", 1_000, 8600), ("eur-10k", 10_000, 8590), ("eur-100k", 100_000, 8580)]
+
+
+@pytest.fixture
+def now():
+    return [1_010.0]
+
+
+@pytest.fixture
+def book(now):
+    book = QuoteBook(history=2, clock=lambda: now[0])
+    book.record(
+        UpdateQuoteRequest(
+            pay_out=[_quote("EUR", EUR_BANDS), _quote("GBP", [("gbp-1", 5_000, 7400)])],
+            pay_in=[_quote("EUR", [("eur-in", 1_000, 8800)])],
+        )
+    )
+    return book
+
+
+class TestLookups:
+    def test_get_by_client_quote_id(self, book):
+        band = book.get("eur-10k")
+        assert band.rate == Fraction(859, 1000)
+        assert band.max_amount == 10_000
+        assert band.key.currency == "EUR" and band.key.direction is Direction.PAY_OUT
+        assert band.expiration == 1_030
+        assert book.get("missing") is None
+        assert len(book) == 5
+
+    def test_find_bisects_over_max_amount(self, book):
+        def find(amount):
+            band = book.find("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, amount)
+            return band.client_quote_id if band else None
+
+        assert find(1) == "eur-1k"
+        assert find(1_000) == "eur-1k"
+        assert find(Decimal(unscaled=100001, exponent=-2)) == "eur-10k"
+        assert find(100_000) == "eur-100k"
+        assert find(100_001) is None
+        assert book.find("EUR", PAYMENT_METHOD_TYPE_SWIFT, Direction.PAY_OUT, 1) is None
+
+    def test_unordered_bands_are_sorted(self, now):
+        book = QuoteBook(clock=lambda: now[0])
+        book.record(UpdateQuoteRequest(pay_out=[_quote("EUR", list(reversed(EUR_BANDS)))]))
+        ids = [b.client_quote_id for b in book.bands("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT)]
+        assert ids == ["eur-1k", "eur-10k", "eur-100k"]
+
+    def test_republish_moves_dropped_bands_to_bounded_history(self, book):
+        book.record(UpdateQuoteRequest(pay_out=[_quote("EUR", [("eur-new", 1_000, 8601)])]))
+
+        assert book.is_live("eur-new")
+        assert not book.is_live("eur-1k")
+        assert book.get("eur-1k") is None  # history keeps only the last 2 superseded bands
+        assert {b for b in ("eur-10k", "eur-100k", "gbp-1", "eur-in") if book.get(b)} == {"gbp-1", "eur-in"}
+
+    def test_republished_band_leaves_history(self, book):
+        book.record(UpdateQuoteRequest())
+        book.record(UpdateQuoteRequest(pay_in=[_quote("EUR", [("eur-in", 1_000, 8800)])]))
+        assert book.is_live("eur-in")
+        assert book.check("eur-in", rate=Fraction(88, 100), amount=10) is LastLook.ACCEPTED
+
+
+class TestLastLook:
+    def test_accepts_matching_payment(self, book):
+        verdict = book.check("eur-10k", rate=Decimal(unscaled=859, exponent=-3), amount=Decimal(unscaled=5_000))
+        assert verdict is LastLook.ACCEPTED
+
+    def test_rate_tolerance(self, book):
+        rate = Decimal(unscaled=8594, exponent=-4)  # ~4.7 bps above 0.8590
+        assert book.check("eur-10k", rate=rate, amount=5_000) is LastLook.RATE_MISMATCH
+        assert book.check("eur-10k", rate=rate, amount=5_000, tolerance_bps=5) is LastLook.ACCEPTED
+
+    def test_amount_above_band(self, book):
+        assert book.check("eur-1k", rate=Fraction(86, 100), amount=1_001) is LastLook.AMOUNT_EXCEEDED
+
+    def test_expired(self, book, now):
+        now[0] = 1_030.0
+        assert book.check("eur-1k", rate=Fraction(86, 100), amount=10) is LastLook.EXPIRED
+
+    def test_superseded_and_unknown(self, book):
+        book.record(UpdateQuoteRequest(pay_out=[_quote("GBP", [("gbp-1", 5_000, 7400)])]))
+        assert book.check("eur-in", rate=Fraction(88, 100), amount=10) is LastLook.SUPERSEDED
+        assert book.check("never", rate=Fraction(88, 100), amount=10) is LastLook.UNKNOWN_QUOTE
+
+    def test_check_rate_by_currency_and_amount(self, book):
+        def check(amount, rate):
+            return book.check_rate(
+                "EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, rate=rate, amount=amount, tolerance_bps=1
+            )
+
+        assert check(50_000, Fraction(858, 1000)) is LastLook.ACCEPTED
+        assert check(500, Fraction(858, 1000)) is LastLook.RATE_MISMATCH
+        assert check(200_000, Fraction(858, 1000)) is LastLook.AMOUNT_EXCEEDED
+        assert (
+            book.check_rate("CHF", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, rate=1, amount=1)
+            is LastLook.UNKNOWN_QUOTE
+        )
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            QuoteBook(history=-1)
+
+
+class RecordingClient:
+    def __init__(self) -> None:
+        self.requests: list[UpdateQuoteRequest] = []
+
+    async def update_quote(self, request: UpdateQuoteRequest) -> UpdateQuoteResponse:
+        self.requests.append(request)
+        return UpdateQuoteResponse()
+
+
+async def test_publisher_records_published_book():
+    book = QuoteBook()
+    publisher = QuotePublisher(RecordingClient(), min_interval=0.01, max_interval=None, book=book)
+    publisher.update(
+        "EUR",
+        PAYMENT_METHOD_TYPE_SEPA,
+        Direction.PAY_OUT,
+        [Band(client_quote_id="q1", max_amount=Decimal(unscaled=1000), rate=Decimal(unscaled=86, exponent=-2))],
+    )
+    assert book.get("q1") is None
+
+    shutdown = asyncio.Event()
+    task = asyncio.create_task(publisher.run(shutdown))
+    await asyncio.sleep(0.05)
+    shutdown.set()
+    await task
+
+    assert book.check("q1", rate=Fraction(86, 100), amount=1000) is LastLook.ACCEPTED
@@ -0,0 +1,168 @@
+"""Tests for quote change detection and incremental encoding."""
+
+import asyncio
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import PAYMENT_METHOD_TYPE_SEPA
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest, UpdateQuoteResponse
+from t0_provider_sdk.common.decimal import relative_change_bps
+from t0_provider_sdk.quote.diff import QuoteDiffer
+from t0_provider_sdk.quote.publisher import Direction, QuoteEntry, QuoteKey, QuotePublisher
+
+Band = UpdateQuoteRequest.Quote.Band
+
+EUR_OUT = QuoteKey("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT)
+EUR_IN = QuoteKey("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_IN)
+GBP_OUT = QuoteKey("GBP", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT)
+
+
+def _entry(rate: int, client_quote_id: str, max_amount: int = 1000, ttl: float = 30, updated_at: float = 0):
+    band = Band(
+        client_quote_id=client_quote_id,
+        max_amount=Decimal(unscaled=max_amount, exponent=0),
+        rate=Decimal(unscaled=rate, exponent=-4),
+    )
+    return QuoteEntry([band], ttl, updated_at)
+
+
+def test_relative_change_bps_is_exact():
+    assert relative_change_bps(Decimal(unscaled=10000, exponent=-4), Decimal(unscaled=10001, exponent=-4)) == 1.0
+    assert relative_change_bps(Decimal(unscaled=1, exponent=0), Decimal(unscaled=10000, exponent=-4)) == 0.0
+    assert relative_change_bps(Decimal(unscaled=0, exponent=0), Decimal(unscaled=1, exponent=0)) == float("inf")
+
+
+class TestQuoteDiffer:
+    def test_first_plan_builds_full_book(self):
+        differ = QuoteDiffer()
+        plan = differ.plan({EUR_OUT: _entry(8600, "a"), EUR_IN: _entry(8800, "b")}, now=100)
+
+        assert plan.changed and plan.rebuilt == 2 and plan.reused == 0
+        request = plan.request()
+        assert request.pay_out[0].bands[0].client_quote_id == "a"
+        assert request.pay_in[0].bands[0].client_quote_id == "b"
+        assert request.pay_out[0].expiration.seconds == 130
+
+    def test_payload_matches_regular_serialization(self):
+        differ = QuoteDiffer()
+        plan = differ.plan({EUR_OUT: _entry(8600, "a"), EUR_IN: _entry(8800, "b"), GBP_OUT: _entry(7400, "c")}, 100)
+        request = plan.request()
+        assert UpdateQuoteRequest.FromString(request.SerializeToString()) == request
+        assert [q.currency for q in request.pay_out] == ["EUR", "GBP"]
+
+    def test_sub_threshold_move_reuses_published_quote(self):
+        differ = QuoteDiffer(thresholds_bps={"EUR": 5})
+        differ.commit(differ.plan({EUR_OUT: _entry(10000, "a")}, now=100))
+        published = differ.published[EUR_OUT]
+
+        plan = differ.plan({EUR_OUT: _entry(10004, "b")}, now=101)
+
+        assert not plan.changed and plan.reused == 1
+        assert plan.quotes[EUR_OUT].encoded is published.encoded
+        assert plan.request().pay_out[0].bands[0].client_quote_id == "a"
+
+    def test_threshold_is_measured_against_published_rate(self):
+        differ = QuoteDiffer(thresholds_bps={"EUR": 5})
+        differ.commit(differ.plan({EUR_OUT: _entry(10000, "a")}, now=100))
+        differ.commit(differ.plan({EUR_OUT: _entry(10004, "b")}, now=101))
+
+        plan = differ.plan({EUR_OUT: _entry(10005, "c")}, now=102)
+
+        assert plan.changed and plan.rebuilt == 1
+        assert plan.request().pay_out[0].bands[0].client_quote_id == "c"
+
+    def test_default_threshold_and_per_currency_override(self):
+        differ = QuoteDiffer(thresholds_bps={"EUR": 50}, default_threshold_bps=1)
+        differ.commit(differ.plan({EUR_OUT: _entry(10000, "a"), GBP_OUT: _entry(10000, "b")}, now=100))
+
+        plan = differ.plan({EUR_OUT: _entry(10010, "c"), GBP_OUT: _entry(10010, "d")}, now=101)
+
+        assert plan.rebuilt == 1
+        request = plan.request()
+        assert [q.bands[0].client_quote_id for q in request.pay_out] == ["a", "d"]
+
+    def test_max_amount_change_is_always_meaningful(self):
+        differ = QuoteDiffer(default_threshold_bps=1_000)
+        differ.commit(differ.plan({EUR_OUT: _entry(10000, "a")}, now=100))
+        assert differ.plan({EUR_OUT: _entry(10000, "b", max_amount=2000)}, now=101).changed
+
+    def test_equal_value_with_different_scale_is_unchanged(self):
+        differ = QuoteDiffer()
+        differ.commit(differ.plan({EUR_OUT: _entry(10000, "a")}, now=100))
+        entry = _entry(10000, "b")
+        entry.bands[0].rate.CopyFrom(Decimal(unscaled=1, exponent=0))
+        assert not differ.plan({EUR_OUT: entry}, now=101).changed
+
+    def test_added_or_removed_quote_changes_book(self):
+        differ = QuoteDiffer()
+        first = _entry(8600, "a")
+        differ.commit(differ.plan({EUR_OUT: first}, now=100))
+
+        added = differ.plan({EUR_OUT: first, EUR_IN: _entry(8800, "b")}, now=101)
+        assert added.changed and added.rebuilt == 1 and added.reused == 1
+
+        removed = differ.plan({}, now=101)
+        assert removed.changed and removed.request() == UpdateQuoteRequest()
+
+    def test_approaching_expiration_rebuilds(self):
+        differ = QuoteDiffer(refresh_before=5)
+        entry = _entry(8600, "a", ttl=30)
+        differ.commit(differ.plan({EUR_OUT: entry}, now=100))
+        assert differ.next_refresh() == 125
+
+        assert not differ.plan({EUR_OUT: entry}, now=124).changed
+        plan = differ.plan({EUR_OUT: entry}, now=125)
+        assert plan.changed
+        assert plan.request().pay_out[0].expiration.seconds == 155
+        assert plan.request().pay_out[0].bands[0].client_quote_id == "a"
+
+    def test_uncommitted_plan_is_not_published_state(self):
+        differ = QuoteDiffer()
+        differ.plan({EUR_OUT: _entry(8600, "a")}, now=100)
+        assert differ.published == {}
+        assert differ.plan({EUR_OUT: _entry(8600, "a")}, now=100).changed
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            QuoteDiffer(default_threshold_bps=-1)
+        with pytest.raises(ValueError):
+            QuoteDiffer(thresholds_bps={"EUR": -1})
+        with pytest.raises(ValueError):
+            QuoteDiffer(refresh_before=-1)
+
+
+class RecordingClient:
+    def __init__(self) -> None:
+        self.requests: list[UpdateQuoteRequest] = []
+
+    async def update_quote(self, request: UpdateQuoteRequest) -> UpdateQuoteResponse:
+        self.requests.append(request)
+        return UpdateQuoteResponse()
+
+
+async def test_publisher_suppresses_sub_threshold_updates():
+    client = RecordingClient()
+    publisher = QuotePublisher(
+        client, min_interval=0.02, max_interval=None, differ=QuoteDiffer(default_threshold_bps=10)
+    )
+    shutdown = asyncio.Event()
+    task = asyncio.create_task(publisher.run(shutdown))
+
+    def update(rate: int) -> None:
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, _entry(rate, "").bands)
+
+    update(10000)
+    await asyncio.sleep(0.05)
+    for rate in (10001, 10002, 10003):
+        update(rate)
+        await asyncio.sleep(0.03)
+    update(10010)
+    await asyncio.sleep(0.05)
+    shutdown.set()
+    await task
+
+    assert [r.pay_out[0].bands[0].rate.unscaled for r in client.requests] == [10000, 10010]
+    snapshot = publisher.registry.snapshot()
+    assert snapshot["t0_quote_suppressed_publishes_total"][()] == 3
+    assert snapshot["t0_quote_encodings_total"][(("action", "rebuilt"),)] == 2
@@ -0,0 +1,367 @@
+"""Tests for the rate feed ingestion pipeline."""
+
+import asyncio
+import http.server
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import (
+    PAYMENT_METHOD_TYPE_SEPA,
+    PAYMENT_METHOD_TYPE_SWIFT,
+)
+from t0_provider_sdk.quote.feed import (
+    FeedPipeline,
+    FileTailSource,
+    HttpPollingSource,
+    LocalFeed,
+    RateUpdate,
+    RateValidator,
+    SocketSource,
+    parse_json_rates,
+)
+from t0_provider_sdk.quote.publisher import Direction, QuoteKey
+
+EUR_OUT = QuoteKey("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT)
+
+
+class FakeSink:
+    def __init__(self) -> None:
+        self.quotes: dict[QuoteKey, tuple[list, float]] = {}
+        self.updates = 0
+
+    def update(self, currency, payment_method, direction, bands, *, ttl=30.0) -> None:
+        self.quotes[QuoteKey(currency, payment_method, direction)] = (list(bands), ttl)
+        self.updates += 1
+
+    def remove(self, currency, payment_method, direction) -> bool:
+        return self.quotes.pop(QuoteKey(currency, payment_method, direction), None) is not None
+
+    def rate(self, key: QuoteKey = EUR_OUT) -> Decimal | None:
+        entry = self.quotes.get(key)
+        return None if entry is None else entry[0][0].rate
+
+
+def _quote(rate: str = "0.86", **fields) -> dict:
+    return {
+        "currency": "EUR",
+        "payment_method": "SEPA",
+        "direction": "pay_out",
+        "bands": [{"max_amount": "1000", "rate": rate}],
+        **fields,
+    }
+
+
+async def _until(condition, timeout: float = 2.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not condition():
+        assert loop.time() < deadline, "condition not met in time"
+        await asyncio.sleep(0.005)
+
+
+def _metric(pipeline: FeedPipeline, name: str, **labels: str) -> float:
+    return pipeline.registry.snapshot()[name].get(tuple(sorted(labels.items())), 0)
+
+
+class TestNormalizeAndValidate:
+    def test_parse_json_rates_formats(self):
+        [update] = parse_json_rates("lp", json.dumps(_quote(ttl=10, timestamp=5.5)).encode())
+        assert update.key == EUR_OUT and update.ttl == 10 and update.timestamp == 5.5
+        assert update.bands[0].rate == Decimal(unscaled=86, exponent=-2)
+
+        record = (
+            b'{"quotes": [{"currency": "GBP", "payment_method": 20, "direction": "pay_in",'
+            b' "bands": [{"max_amount": 500, "rate": 1.2345678}]}]}'
+        )
+        [update] = parse_json_rates("lp", record)
+        assert update.key == QuoteKey("GBP", PAYMENT_METHOD_TYPE_SWIFT, Direction.PAY_IN)
+        assert update.bands[0].rate == Decimal(unscaled=12345678, exponent=-7)  # JSON floats parsed exactly
+        assert len(parse_json_rates("lp", [_quote(), _quote()])) == 2
+
+    @pytest.mark.parametrize(
+        "record",
+        [b"not json", b'{"currency": "EUR"}', _quote(payment_method="CARRIER_PIGEON"), _quote(rate="abc")],
+    )
+    def test_parse_json_rates_rejects_malformed(self, record):
+        with pytest.raises(ValueError):
+            parse_json_rates("lp", record)
+
+    @pytest.mark.parametrize(
+        ("quote", "reason"),
+        [
+            (_quote(currency="eur"), "currency"),
+            (_quote(payment_method=0), "payment method"),
+            (_quote(rate="0"), "positive"),
+            (_quote(ttl=0), "ttl"),
+            ({**_quote(), "bands": []}, "at least one band"),
+            ({**_quote(), "bands": [{"max_amount": 10, "rate": 1}, {"max_amount": 10, "rate": 1}]}, "ascending"),
+            (_quote(timestamp=1_100.0), "future"),
+            (_quote(timestamp=900.0), "old"),
+        ],
+    )
+    def test_validator_rejections(self, quote, reason):
+        validator = RateValidator(max_age=60, clock=lambda: 1_000.0)
+        [update] = parse_json_rates("lp", quote)
+        with pytest.raises(ValueError, match=reason):
+            validator.validate(update)
+
+    def test_validator_max_move_guard(self):
+        validator = RateValidator(max_move_bps=100)
+        validator.validate(parse_json_rates("lp", _quote("0.86"))[0])
+        validator.validate(parse_json_rates("lp", _quote("0.865"))[0])  # 58 bps
+        jump = parse_json_rates("lp", _quote("0.95"))[0]
+        with pytest.raises(ValueError, match="moved"):
+            validator.validate(jump)
+        validator.reset(EUR_OUT)
+        validator.validate(jump)
+
+
+class TestPipeline:
+    async def test_local_feed_reaches_sink(self):
+        feed, sink = LocalFeed("lp"), FakeSink()
+        pipeline = FeedPipeline([feed], sink)
+        await pipeline.start()
+        feed.push_quote("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [(1000, "0.86")], ttl=15)
+        feed.push(json.dumps(_quote("0.87")))
+        await _until(lambda: sink.updates == 2)
+        await pipeline.stop()
+
+        assert sink.rate() == Decimal(unscaled=87, exponent=-2)
+        assert sink.quotes[EUR_OUT][1] == 30.0
+        assert pipeline.status()["lp"].updates == 2
+        assert _metric(pipeline, "t0_feed_records_total", source="lp") == 2
+        assert _metric(pipeline, "t0_feed_updates_total", source="lp", result="accepted") == 2
+
+    async def test_bad_records_are_dropped_and_counted(self, caplog):
+        feed, sink = LocalFeed("lp"), FakeSink()
+        pipeline = FeedPipeline([feed], sink)
+        await pipeline.start()
+        feed.push(b"garbage")
+        feed.push(_quote("-1"))
+        feed.push(_quote("0.86"))
+        await _until(lambda: sink.updates == 1)
+        await pipeline.stop()
+
+        status = pipeline.status()["lp"]
+        assert (status.errors, status.rejected, status.updates) == (1, 1, 1)
+        assert _metric(pipeline, "t0_feed_errors_total", source="lp", stage="normalize") == 1
+        assert _metric(pipeline, "t0_feed_updates_total", source="lp", result="rejected") == 1
+        assert "rejected EUR/10/pay_out quote" in caplog.text
+
+    async def test_sink_failure_is_counted_and_the_pipeline_continues(self, caplog):
+        class FlakySink(FakeSink):
+            def update(self, currency, payment_method, direction, bands, *, ttl=30.0) -> None:
+                if bands[0].rate == Decimal(unscaled=13, exponent=-1):
+                    raise RuntimeError("sink is down")
+                super().update(currency, payment_method, direction, bands, ttl=ttl)
+
+        feed, sink = LocalFeed("lp"), FlakySink()
+        pipeline = FeedPipeline([feed], sink)
+        await pipeline.start()
+        feed.push(_quote("1.3"))
+        feed.push(_quote("0.86"))
+        await _until(lambda: sink.updates == 1)
+        await pipeline.stop()
+
+        status = pipeline.status()["lp"]
+        assert (status.errors, status.rejected, status.updates) == (1, 0, 1)
+        assert _metric(pipeline, "t0_feed_errors_total", source="lp", stage="apply") == 1
+        assert _metric(pipeline, "t0_feed_updates_total", source="lp", result="accepted") == 1
+        assert "dropping EUR/10/pay_out quote that could not be applied" in caplog.text
+
+    async def test_failed_source_is_restarted_and_finished_source_is_not(self, caplog):
+        caplog.set_level(logging.INFO)
+        feed, sink = LocalFeed("lp"), FakeSink()
+        pipeline = FeedPipeline([feed], sink, base_backoff=0.01)
+        await pipeline.start()
+        feed.fail(ConnectionError("lp down"))
+        feed.push(_quote())
+        await _until(lambda: sink.updates == 1)
+        feed.close()
+        await asyncio.sleep(0.02)
+        feed.push(_quote("0.87"))  # no longer read
+        await asyncio.sleep(0.05)
+        await pipeline.stop()
+
+        assert sink.updates == 1
+        assert pipeline.status()["lp"].errors == 1
+        assert _metric(pipeline, "t0_feed_errors_total", source="lp", stage="source") == 1
+        assert "lp: feed source failed (1 consecutive)" in caplog.text
+        assert "lp: feed source finished" in caplog.text
+
+    async def test_stale_source_quotes_are_withdrawn_until_it_recovers(self):
+        fast, slow, sink = LocalFeed("fast"), LocalFeed("slow"), FakeSink()
+        gbp = QuoteKey("GBP", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT)
+        pipeline = FeedPipeline([fast, slow], sink, stale_after=0.1)
+        await pipeline.start()
+        slow.push(_quote(currency="GBP"))
+        for _ in range(20):
+            fast.push(_quote())
+            await asyncio.sleep(0.01)
+        await _until(lambda: pipeline.status()["slow"].stale)
+        assert EUR_OUT in sink.quotes and gbp not in sink.quotes
+        assert not pipeline.status()["fast"].stale
+
+        slow.push(_quote(currency="GBP"))
+        await _until(lambda: gbp in sink.quotes)
+        assert not pipeline.status()["slow"].stale
+        await pipeline.stop()
+        assert _metric(pipeline, "t0_feed_stale_total", source="slow") == 1
+
+    async def test_quote_taken_over_by_another_source_is_not_withdrawn(self):
+        a, b, sink = LocalFeed("a"), LocalFeed("b"), FakeSink()
+        pipeline = FeedPipeline([a, b], sink, stale_after=0.08)
+        await pipeline.start()
+        a.push(_quote("0.86"))
+        await _until(lambda: sink.updates == 1)
+        for _ in range(15):
+            b.push(_quote("0.87"))
+            await asyncio.sleep(0.01)
+        await _until(lambda: pipeline.status()["a"].stale)
+        await pipeline.stop()
+        assert sink.rate() == Decimal(unscaled=87, exponent=-2)
+
+    async def test_backpressure_bounds_buffering(self):
+        produced = []
+
+        class Burst:
+            name = "burst"
+
+            async def stream(self):
+                for _ in range(50):
+                    produced.append(True)
+                    yield _quote()
+
+        release = asyncio.Event()
+        sink = FakeSink()
+        pipeline = FeedPipeline([Burst()], sink, queue_size=2, stale_after=None)
+        validate_stage = pipeline._validate_stage
+
+        async def held_back(updates):
+            await release.wait()
+            await validate_stage(updates)
+
+        pipeline._validate_stage = held_back
+        await pipeline.start()
+        await asyncio.sleep(0.05)
+        # updates queue (2) + one put waiting in normalize + raw queue (2) + one put waiting in the source
+        assert len(produced) == 6
+        assert _metric(pipeline, "t0_feed_backpressure_total", stage="normalize") >= 1
+        assert _metric(pipeline, "t0_feed_backpressure_total", stage="validate") >= 1
+        release.set()
+        await _until(lambda: sink.updates == 50)
+        await pipeline.stop()
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            FeedPipeline([LocalFeed("a"), LocalFeed("a")], FakeSink())
+        with pytest.raises(ValueError):
+            FeedPipeline([], FakeSink(), queue_size=0)
+        with pytest.raises(ValueError):
+            FeedPipeline([], FakeSink(), stale_after=0)
+
+
+class TestSources:
+    async def _collect(self, source, count: int, timeout: float = 2.0) -> list:
+        records = []
+
+        async def consume():
+            async for record in source.stream():
+                records.append(record)
+                if len(records) == count:
+                    return
+
+        await asyncio.wait_for(consume(), timeout)
+        return records
+
+    async def test_file_tail_follows_appends_truncation_and_rotation(self, tmp_path):
+        path = tmp_path / "rates.jsonl"
+        path.write_bytes(b"old\n")
+        source = FileTailSource("file", path, poll_interval=0.005)
+        records = []
+
+        async def consume():
+            async for record in source.stream():
+                records.append(record)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.03)
+        with open(path, "ab") as f:
+            f.write(b"one\n\ntw")
+            f.flush()
+            await asyncio.sleep(0.03)
+            f.write(b"o\n")
+        await _until(lambda: records == [b"one", b"two"])
+
+        path.write_bytes(b"three\n")  # truncated and rewritten
+        await _until(lambda: records[-1:] == [b"three"])
+
+        with open(path, "ab") as f:
+            f.write(b"four\n")
+        os.rename(path, tmp_path / "rates.jsonl.1")
+        path.write_bytes(b"five\n")  # rotated
+        await _until(lambda: records[-2:] == [b"four", b"five"])
+        task.cancel()
+        assert records == [b"one", b"two", b"three", b"four", b"five"]
+
+    async def test_file_tail_from_start_and_missing_file(self, tmp_path):
+        path = tmp_path / "rates.jsonl"
+        source = FileTailSource("file", path, poll_interval=0.005, from_start=True)
+        consume = asyncio.create_task(self._collect(source, 2))
+        await asyncio.sleep(0.02)
+        path.write_bytes(b"a\nb\n")
+        assert await consume == [b"a", b"b"]
+
+    async def test_unix_socket_source(self, tmp_path):
+        path = str(tmp_path / "feed.sock")
+
+        async def serve(reader, writer):
+            writer.write(b'{"a": 1}\r\n\n{"b": 2}\n')
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_unix_server(serve, path)
+        source = SocketSource("sock", path=path)
+        records = []
+        with pytest.raises(ConnectionError, match="closed by peer"):
+            async for record in source.stream():
+                records.append(record)
+        server.close()
+        assert records == [b'{"a": 1}', b'{"b": 2}']
+
+    async def test_http_polling_source(self):
+        bodies = iter([b"first", b"second"])
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = next(bodies, None)
+                self.send_response(200 if body else 503)
+                self.end_headers()
+                self.wfile.write(body or b"")
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            source = HttpPollingSource("http", f"http://127.0.0.1:{server.server_port}/rates", interval=0.01)
+            records = []
+            with pytest.raises(ConnectionError, match="HTTP 503"):
+                async for record in source.stream():
+                    records.append(record)
+            assert records == [b"first", b"second"]
+        finally:
+            server.shutdown()
+
+    def test_source_validation(self):
+        with pytest.raises(ValueError):
+            SocketSource("s")
+        with pytest.raises(ValueError):
+            HttpPollingSource("h", "http://x", interval=0)
+        assert isinstance(RateUpdate("s", "EUR", 1, Direction.PAY_OUT, ()).key, QuoteKey)
@@ -0,0 +1,159 @@
+"""Tests for the concurrent GetQuote fan-out and the rate matrix."""
+
+import asyncio
+import logging
+
+import pytest
+from connectrpc.code import Code
+from connectrpc.errors import ConnectError
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import (
+    PAYMENT_METHOD_TYPE_SEPA,
+    PAYMENT_METHOD_TYPE_SWIFT,
+)
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import GetQuoteRequest, GetQuoteResponse
+from t0_provider_sdk.quote.diff import to_timestamp
+from t0_provider_sdk.quote.matrix import QuoteStatus, RateMatrix, fetch_rate_matrix
+
+SEPA, SWIFT = PAYMENT_METHOD_TYPE_SEPA, PAYMENT_METHOD_TYPE_SWIFT
+
+
+class FakeNetwork:
+    """Answers GetQuote from a rule per (currency, method), tracking concurrency."""
+
+    def __init__(self, delay: float = 0.001) -> None:
+        self.delay = delay
+        self.requests: list[GetQuoteRequest] = []
+        self.inflight = 0
+        self.max_inflight = 0
+
+    async def get_quote(self, request: GetQuoteRequest) -> GetQuoteResponse:
+        self.requests.append(request)
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(self.delay)
+            amount = request.amount.settlement_amount.unscaled
+            if request.pay_out_currency == "GBP" and request.pay_out_method == SWIFT:
+                return GetQuoteResponse(failure=GetQuoteResponse.Failure(reason=10))
+            if request.pay_out_currency == "JPY" and amount == 1_000:
+                raise ConnectError(Code.UNAVAILABLE, "upstream down")
+            if request.pay_out_currency == "JPY" and amount == 100:
+                await asyncio.sleep(10)
+            return GetQuoteResponse(
+                success=GetQuoteResponse.Success(
+                    rate=Decimal(unscaled=8600 - amount // 100, exponent=-4),
+                    expiration=to_timestamp(1_030.5),
+                    quote_id={"quote_id": amount, "provider_id": 7},
+                    pay_out_amount=Decimal(unscaled=amount * 86, exponent=-2),
+                    settlement_amount=Decimal(unscaled=amount),
+                )
+            )
+        finally:
+            self.inflight -= 1
+
+
+async def test_fan_out_fills_matrix():
+    network = FakeNetwork()
+    matrix = await fetch_rate_matrix(network, currencies=["EUR"], methods=[SEPA, SWIFT], amounts=[100, "1000"])
+
+    assert matrix.shape == (1, 2, 2) and len(matrix) == 4
+    assert matrix.complete and not matrix.failures
+    assert matrix.rate("EUR", SWIFT, 1) == Decimal(unscaled=8590, exponent=-4)
+    assert list(matrix.rate_unscaled) == [8599, 8590, 8599, 8590]
+    assert set(matrix.rate_exponent) == {-4}
+    assert list(matrix.status) == [QuoteStatus.OK] * 4
+
+    success = matrix.success("EUR", SEPA, 0)
+    assert success.quote_id.quote_id == 100 and success.quote_id.provider_id == 7
+    assert success.pay_out_amount == Decimal(unscaled=8600, exponent=-2)
+    assert success.expiration == to_timestamp(1_030.5)
+
+    sent = {(r.pay_out_currency, r.pay_out_method, r.amount.settlement_amount.unscaled) for r in network.requests}
+    assert sent == {("EUR", m, a) for m in (SEPA, SWIFT) for a in (100, 1_000)}
+    assert all(r.quote_type == 1 for r in network.requests)
+
+
+async def test_bounded_parallelism():
+    network = FakeNetwork(delay=0.01)
+    matrix = await fetch_rate_matrix(
+        network, currencies=["EUR", "USD", "CHF"], methods=[SEPA], amounts=range(10, 110, 10), concurrency=4
+    )
+    assert len(network.requests) == 30 and matrix.complete
+    assert network.max_inflight == 4
+
+
+async def test_partial_failures_are_reported(caplog):
+    network = FakeNetwork()
+    with caplog.at_level(logging.WARNING):
+        matrix = await fetch_rate_matrix(
+            network, currencies=["GBP", "JPY"], methods=[SEPA, SWIFT], amounts=[100, 1_000], timeout=0.1
+        )
+
+    assert not matrix.complete
+    assert matrix.cell_status("GBP", SEPA, 0) is QuoteStatus.OK
+    assert matrix.rate("GBP", SWIFT, 0) is None and matrix.success("GBP", SWIFT, 0) is None
+    failures = [(f.currency, f.method, f.tier, f.status, f.code, f.message) for f in matrix.failures]
+    assert failures == [
+        ("GBP", SWIFT, 0, QuoteStatus.NOT_FOUND, None, "REASON_QUOTE_NOT_FOUND"),
+        ("GBP", SWIFT, 1, QuoteStatus.NOT_FOUND, None, "REASON_QUOTE_NOT_FOUND"),
+        ("JPY", SEPA, 0, QuoteStatus.TIMEOUT, None, "no response within 0.1s"),
+        ("JPY", SEPA, 1, QuoteStatus.ERROR, Code.UNAVAILABLE, "upstream down"),
+        ("JPY", SWIFT, 0, QuoteStatus.TIMEOUT, None, "no response within 0.1s"),
+        ("JPY", SWIFT, 1, QuoteStatus.ERROR, Code.UNAVAILABLE, "upstream down"),
+    ]
+    assert len(matrix.errors) == 4
+    assert matrix.rate_unscaled[matrix.index("JPY", SEPA, 1)] == 0
+    assert "6 of 8 quotes missing (2 not found, 4 errors or timeouts)" in caplog.text
+
+
+async def test_empty_response_and_unexpected_errors():
+    class Broken:
+        calls = 0
+
+        async def get_quote(self, request):
+            self.calls += 1
+            if self.calls == 1:
+                return GetQuoteResponse()
+            raise RuntimeError("boom")
+
+    matrix = await fetch_rate_matrix(Broken(), currencies=["EUR"], methods=[SEPA], amounts=[1, 2], concurrency=1)
+    assert [(f.status, f.message) for f in matrix.failures] == [
+        (QuoteStatus.ERROR, "response has neither success nor failure"),
+        (QuoteStatus.ERROR, "boom"),
+    ]
+
+
+async def test_unconvertible_success_is_recorded_as_an_error():
+    class Overflowing:
+        async def get_quote(self, request):
+            amount = request.amount.settlement_amount.unscaled
+            success = GetQuoteResponse.Success(
+                rate=Decimal(unscaled=86, exponent=-2 if amount == 1 else -200),  # exponent column is int8
+                settlement_amount=Decimal(unscaled=amount),
+            )
+            return GetQuoteResponse(success=success)
+
+    matrix = await fetch_rate_matrix(Overflowing(), currencies=["EUR"], methods=[SEPA], amounts=[1, 2])
+    assert matrix.rate("EUR", SEPA, 0) == Decimal(unscaled=86, exponent=-2)
+    assert matrix.cell_status("EUR", SEPA, 1) is QuoteStatus.ERROR
+    assert [f.tier for f in matrix.errors] == [1]
+    assert matrix.rate_unscaled[matrix.index("EUR", SEPA, 1)] == 0
+
+
+def test_matrix_indexing_and_validation():
+    matrix = RateMatrix.empty(["EUR", "GBP"], [SEPA, SWIFT], [Decimal(unscaled=1)] * 3)
+    assert matrix.index("GBP", SWIFT, 2) == 11
+    assert matrix.cell_status("EUR", SEPA, 0) is QuoteStatus.ERROR
+    with pytest.raises(ValueError):
+        matrix.index("CHF", SEPA, 0)
+    with pytest.raises(IndexError):
+        matrix.index("EUR", SEPA, 3)
+
+
+async def test_argument_validation():
+    with pytest.raises(ValueError):
+        await fetch_rate_matrix(FakeNetwork(), currencies=["EUR"], methods=[SEPA], amounts=[1], concurrency=0)
+    with pytest.raises(ValueError):
+        await fetch_rate_matrix(FakeNetwork(), currencies=["EUR"], methods=[SEPA], amounts=[1], timeout=0)
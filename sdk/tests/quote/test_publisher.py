@@ -0,0 +1,178 @@
+"""Tests for the coalescing quote publisher."""
+
+import asyncio
+import threading
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import (
+    PAYMENT_METHOD_TYPE_SEPA,
+    PAYMENT_METHOD_TYPE_SWIFT,
+)
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest, UpdateQuoteResponse
+from t0_provider_sdk.quote.publisher import Direction, QuoteKey, QuotePublisher
+
+Band = UpdateQuoteRequest.Quote.Band
+
+
+def _band(rate: int, max_amount: int = 1000, client_quote_id: str = "") -> Band:
+    return Band(
+        client_quote_id=client_quote_id,
+        max_amount=Decimal(unscaled=max_amount, exponent=0),
+        rate=Decimal(unscaled=rate, exponent=-2),
+    )
+
+
+class FakeNetworkClient:
+    def __init__(self, delay: float = 0.0, failures: int = 0) -> None:
+        self.delay = delay
+        self.failures = failures
+        self.requests: list[UpdateQuoteRequest] = []
+
+    async def update_quote(self, request: UpdateQuoteRequest) -> UpdateQuoteResponse:
+        await asyncio.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("network down")
+        self.requests.append(request)
+        return UpdateQuoteResponse()
+
+
+async def _run_for(publisher: QuotePublisher, seconds: float) -> None:
+    shutdown = asyncio.Event()
+    task = asyncio.create_task(publisher.run(shutdown))
+    await asyncio.sleep(seconds)
+    shutdown.set()
+    await task
+
+
+class TestBuildRequest:
+    def test_full_book_in_one_request(self):
+        publisher = QuotePublisher(FakeNetworkClient(), clock=lambda: 1_000.0)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)], ttl=30)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_IN, [_band(88)])
+        publisher.update("GBP", PAYMENT_METHOD_TYPE_SWIFT, Direction.PAY_OUT, [_band(74), _band(73, 5000)])
+
+        request = publisher.build_request()
+
+        assert [(q.currency, len(q.bands)) for q in request.pay_out] == [("EUR", 1), ("GBP", 2)]
+        assert [q.currency for q in request.pay_in] == ["EUR"]
+        assert request.pay_out[0].expiration.seconds == 1_030
+        assert request.pay_out[0].timestamp.seconds == 1_000
+        assert all(b.client_quote_id for q in request.pay_out for b in q.bands)
+
+    def test_update_replaces_previous_bands(self):
+        publisher = QuotePublisher(FakeNetworkClient())
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86, client_quote_id="a")])
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(87, client_quote_id="b")])
+        (quote,) = publisher.build_request().pay_out
+        assert [b.client_quote_id for b in quote.bands] == ["b"]
+
+    def test_caller_mutation_does_not_leak(self):
+        publisher = QuotePublisher(FakeNetworkClient())
+        band = _band(86, client_quote_id="a")
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [band])
+        band.rate.unscaled = 1
+        assert publisher.build_request().pay_out[0].bands[0].rate.unscaled == 86
+
+    def test_remove(self):
+        publisher = QuotePublisher(FakeNetworkClient())
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)])
+        assert publisher.remove("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT) is True
+        assert publisher.remove("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT) is False
+        assert publisher.build_request() == UpdateQuoteRequest()
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            QuotePublisher(FakeNetworkClient(), min_interval=2, max_interval=1)
+        with pytest.raises(ValueError):
+            QuotePublisher(FakeNetworkClient()).update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [])
+
+    def test_staleness(self):
+        now = [100.0]
+        publisher = QuotePublisher(FakeNetworkClient(), clock=lambda: now[0])
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)])
+        now[0] = 103.0
+        assert publisher.staleness() == {QuoteKey("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT): 3.0}
+
+
+class TestPublishing:
+    async def test_concurrent_updates_are_coalesced(self):
+        client = FakeNetworkClient()
+        publisher = QuotePublisher(client, min_interval=0.1, max_interval=10)
+
+        def feed(currency: str) -> None:
+            for rate in range(50, 100):
+                publisher.update(currency, PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(rate)])
+
+        threads = [threading.Thread(target=feed, args=(c,)) for c in ("EUR", "GBP", "CHF", "PLN")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        await _run_for(publisher, 0.25)
+
+        assert len(client.requests) == 1
+        assert sorted(q.currency for q in client.requests[0].pay_out) == ["CHF", "EUR", "GBP", "PLN"]
+        assert all(q.bands[0].rate.unscaled == 99 for q in client.requests[0].pay_out)
+
+    async def test_heartbeat_republishes_unchanged_book(self):
+        client = FakeNetworkClient()
+        publisher = QuotePublisher(client, min_interval=0.02, max_interval=0.1)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)])
+        await _run_for(publisher, 0.35)
+        assert 3 <= len(client.requests) <= 5
+
+    async def test_empty_book_is_not_republished(self):
+        client = FakeNetworkClient()
+        publisher = QuotePublisher(client, min_interval=0.02, max_interval=0.04)
+        await _run_for(publisher, 0.15)
+        assert client.requests == []
+
+    async def test_removing_last_quote_publishes_empty_book(self):
+        client = FakeNetworkClient()
+        publisher = QuotePublisher(client, min_interval=0.02, max_interval=10)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)])
+        shutdown = asyncio.Event()
+        task = asyncio.create_task(publisher.run(shutdown))
+        await asyncio.sleep(0.05)
+        publisher.remove("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT)
+        await asyncio.sleep(0.05)
+        shutdown.set()
+        await task
+        assert client.requests[-1] == UpdateQuoteRequest()
+
+    async def test_skips_ticks_while_publish_in_flight(self):
+        client = FakeNetworkClient(delay=0.15)
+        publisher = QuotePublisher(client, min_interval=0.02, max_interval=0.02)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)])
+        await _run_for(publisher, 0.2)
+
+        assert len(client.requests) <= 2
+        skipped = publisher.registry.snapshot()["t0_quote_skipped_ticks_total"][()]
+        assert skipped >= 4
+
+    async def test_failed_publish_is_retried_and_counted(self):
+        client = FakeNetworkClient(failures=1)
+        publisher = QuotePublisher(client, min_interval=0.02, max_interval=10)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)])
+        await _run_for(publisher, 0.1)
+
+        assert len(client.requests) == 1
+        results = publisher.registry.snapshot()["t0_quote_publishes_total"]
+        assert results[(("result", "error"),)] == 1
+        assert results[(("result", "ok"),)] == 1
+        assert publisher.registry.snapshot()["t0_quote_publish_seconds"][()].count == 1
+
+    async def test_start_and_stop_as_lifespan_hooks(self):
+        client = FakeNetworkClient()
+        publisher = QuotePublisher(client, min_interval=0.02, max_interval=10)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, [_band(86)])
+        await publisher.start()
+        with pytest.raises(RuntimeError):
+            await publisher.start()
+        await asyncio.sleep(0.05)
+        await publisher.stop()
+        await publisher.stop()  # idempotent
+        assert len(client.requests) == 1
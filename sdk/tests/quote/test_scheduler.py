@@ -0,0 +1,144 @@
+"""Tests for the timer wheel and expiry-driven publishing."""
+
+import asyncio
+import math
+import random
+
+import pytest
+
+from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
+from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import PAYMENT_METHOD_TYPE_SEPA
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest, UpdateQuoteResponse
+from t0_provider_sdk.quote.diff import QuoteDiffer
+from t0_provider_sdk.quote.publisher import Direction, QuotePublisher
+from t0_provider_sdk.quote.scheduler import TimerWheel
+
+
+class TestTimerWheel:
+    def test_fires_due_timers_only(self):
+        wheel = TimerWheel(slots=8, resolution=1.0)
+        wheel.schedule("a", 2.5)
+        wheel.schedule("b", 5.0)
+        assert wheel.advance(2.0) == []
+        assert wheel.advance(2.5) == ["a"]
+        assert wheel.advance(4.9) == []
+        assert wheel.advance(5.0) == ["b"]
+        assert len(wheel) == 0
+
+    def test_reschedule_and_cancel(self):
+        wheel = TimerWheel(slots=8, resolution=1.0)
+        wheel.schedule("a", 2.0)
+        wheel.schedule("a", 6.0)
+        assert len(wheel) == 1
+        assert wheel.advance(3.0) == []
+        assert wheel.cancel("a") is True
+        assert wheel.cancel("a") is False
+        assert wheel.advance(10.0) == []
+
+    def test_deadlines_beyond_one_revolution(self):
+        wheel = TimerWheel(slots=4, resolution=1.0)
+        wheel.schedule("far", 9.5)  # same slot as 1.5, two revolutions later
+        wheel.schedule("near", 1.5)
+        assert wheel.next_deadline() == 1.5
+        assert wheel.advance(2.0) == ["near"]
+        assert wheel.next_deadline() == 9.5
+        assert wheel.advance(6.0) == []
+        assert wheel.advance(9.5) == ["far"]
+
+    def test_overdue_timer_fires_on_next_advance(self):
+        wheel = TimerWheel(slots=8, resolution=1.0, start=10.0)
+        wheel.schedule("late", 3.0)
+        assert wheel.next_deadline() == 3.0
+        assert wheel.advance(10.0) == ["late"]
+
+    def test_next_deadline_empty(self):
+        assert TimerWheel().next_deadline() == math.inf
+
+    def test_matches_brute_force_for_many_keys(self):
+        rng = random.Random(7)
+        wheel = TimerWheel(slots=64, resolution=0.1)
+        deadlines = {key: rng.uniform(0, 20) for key in range(5_000)}
+        for key, deadline in deadlines.items():
+            wheel.schedule(key, deadline)
+
+        now = 0.0
+        while deadlines:
+            assert wheel.next_deadline() == min(deadlines.values())
+            now += rng.uniform(0, 0.5)
+            expected = {key for key, deadline in deadlines.items() if deadline <= now}
+            assert set(wheel.advance(now)) == expected
+            for key in expected:
+                del deadlines[key]
+
+    def test_validation(self):
+        with pytest.raises(ValueError):
+            TimerWheel(slots=0)
+        with pytest.raises(ValueError):
+            TimerWheel(resolution=0)
+
+
+def _bands(rate: int) -> list[UpdateQuoteRequest.Quote.Band]:
+    band = UpdateQuoteRequest.Quote.Band(
+        max_amount=Decimal(unscaled=1000, exponent=0), rate=Decimal(unscaled=rate, exponent=-2)
+    )
+    return [band]
+
+
+class RecordingClient:
+    def __init__(self) -> None:
+        self.requests: list[UpdateQuoteRequest] = []
+
+    async def update_quote(self, request: UpdateQuoteRequest) -> UpdateQuoteResponse:
+        self.requests.append(request)
+        return UpdateQuoteResponse()
+
+
+class TestExpiryDrivenPublishing:
+    async def test_republishes_just_before_expiry(self):
+        client = RecordingClient()
+        differ = QuoteDiffer(refresh_before=0.1, wheel=TimerWheel(resolution=0.01))
+        publisher = QuotePublisher(client, min_interval=0.01, max_interval=None, differ=differ)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, _bands(86), ttl=0.25)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_IN, _bands(88), ttl=10)
+
+        shutdown = asyncio.Event()
+        task = asyncio.create_task(publisher.run(shutdown))
+        await asyncio.sleep(0.5)
+        shutdown.set()
+        await task
+
+        # Published at ~0, then refreshed every ~0.15 s (ttl - refresh_before) for the short-lived quote
+        assert 3 <= len(client.requests) <= 5
+        expirations = [r.pay_out[0].expiration.ToNanoseconds() for r in client.requests]
+        assert expirations == sorted(set(expirations))
+        pay_in = {r.pay_in[0].expiration.ToNanoseconds() for r in client.requests}
+        assert len(pay_in) == 1  # the long-lived quote is reused, not refreshed
+
+    async def test_idle_book_is_not_polled(self):
+        client = RecordingClient()
+        publisher = QuotePublisher(client, min_interval=0.01, max_interval=None)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, _bands(86))
+
+        shutdown = asyncio.Event()
+        task = asyncio.create_task(publisher.run(shutdown))
+        await asyncio.sleep(0.2)
+        shutdown.set()
+        await task
+
+        assert len(client.requests) == 1
+        assert publisher.registry.snapshot()["t0_quote_suppressed_publishes_total"][()] == 0
+
+    async def test_update_wakes_sleeping_publisher(self):
+        client = RecordingClient()
+        publisher = QuotePublisher(client, min_interval=0.01, max_interval=None)
+        publisher.update("EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, _bands(86))
+
+        shutdown = asyncio.Event()
+        task = asyncio.create_task(publisher.run(shutdown))
+        await asyncio.sleep(0.1)
+        await asyncio.to_thread(publisher.update, "EUR", PAYMENT_METHOD_TYPE_SEPA, Direction.PAY_OUT, _bands(87))
+        await asyncio.sleep(0.05)
+        shutdown.set()
+        await task
+
+        assert [r.pay_out[0].bands[0].rate.unscaled for r in client.requests] == [86, 87]
@@ -6,7 +6,9 @@ Implements all ProviderService RPC methods. Each method returns an empty
 response with TODO comments indicating what to implement.
 
 Please refer to docs, proto definition comments, or source code comments
-to understand the purpose of each function.
+to understand the purpose of each function. The SDK's helpers for keeping
+payment, limit, ledger and quote state are described in the SDK's
+docs/ARCHITECTURE.md.
 """
 
 from __future__ import annotations
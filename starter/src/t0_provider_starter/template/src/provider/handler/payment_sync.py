@@ -4,7 +4,9 @@ Parallel to payment.py but implements ProviderServiceSync (no async/await).
 Use this with handler_sync() and new_wsgi_app() for synchronous WSGI servers.
 
 Please refer to docs, proto definition comments, or source code comments
-to understand the purpose of each function.
+to understand the purpose of each function. The SDK's helpers for keeping
+payment, limit, ledger and quote state are described in the SDK's
+docs/ARCHITECTURE.md.
 """
 
 from __future__ import annotations
@@ -16,31 +16,38 @@ swap the following imports and use the sync variants:
     # With sync imports:
     #   from t0_provider_sdk.api.tzero.v1.payment.provider_connect import ProviderServiceWSGIApplication
     #   from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClientSync
-    #   from t0_provider_sdk.network.client import new_service_client_sync
+    #   from t0_provider_sdk.network.client import new_pooled_service_client_sync
     #   from t0_provider_sdk.provider.handler import handler_sync, new_wsgi_app
 
     # Use the sync handler implementation:
     #   from provider.handler.payment_sync import ProviderServiceSyncImplementation
 
-    # Build the WSGI app:
-    #   network_client = new_service_client_sync(private_key, NetworkServiceClientSync, base_url=...)
+    # Build the WSGI app (one client per worker process, shared by all its threads):
+    #   network_client = new_pooled_service_client_sync(
+    #       private_key, NetworkServiceClientSync, threads=16, base_url=...
+    #   )
     #   service = ProviderServiceSyncImplementation(network_client)
     #   app = new_wsgi_app(network_public_key, handler_sync(ProviderServiceWSGIApplication, service))
 
+    # Pre-open connections to the T-0 Network in each worker (no ASGI lifespan under WSGI):
+    #   from t0_provider_sdk.network.warmup import KeepAliveSync
+    #   KeepAliveSync(network_client).start()
+
     # Run with gunicorn (from command line):
-    #   gunicorn provider.main:wsgi_app --bind 0.0.0.0:8080
+    #   gunicorn provider.main:wsgi_app --bind 0.0.0.0:8080 --threads 16
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
-import signal
+from typing import TYPE_CHECKING
 
 import uvicorn
 from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClient
 from t0_provider_sdk.api.tzero.v1.payment.provider_connect import ProviderServiceASGIApplication
 from t0_provider_sdk.network.client import new_service_client
+from t0_provider_sdk.network.warmup import KeepAlive
 from t0_provider_sdk.provider.handler import handler, new_asgi_app
 
 from provider.config import Config, load_config
@@ -48,6 +55,12 @@ from provider.get_quote import get_quote
 from provider.handler.payment import ProviderServiceImplementation
 from provider.publish_quotes import publish_quotes
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from t0_provider_sdk.common.periodic import PeriodicTask
+    from t0_provider_sdk.quote.publisher import QuotePublisher
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
@@ -64,15 +77,29 @@ def init_network_client(config: Config) -> NetworkServiceClient:
     )
 
 
-def create_provider_app(config: Config, network_client: NetworkServiceClient):
+def create_provider_app(
+    config: Config,
+    network_client: NetworkServiceClient,
+    background: Sequence[QuotePublisher | PeriodicTask] = (),
+):
     """Create the provider ASGI application.
 
     Go equivalent: startProviderServer()
+
+    Connections to the T-0 Network are pre-opened on server startup and kept
+    alive while the server runs, so the first outbound call after a deploy or an
+    idle period does not pay for DNS, TCP and TLS setup.
+
+    Background tasks (quote publishing) are started after that and stopped,
+    in reverse order, when the server shuts down.
     """
     service = ProviderServiceImplementation(network_client)
+    keep_alive = KeepAlive(network_client)
     return new_asgi_app(
         config.network_public_key,
         handler(ProviderServiceASGIApplication, service),
+        on_startup=[keep_alive.start, *(task.start for task in background)],
+        on_shutdown=[*(task.stop for task in reversed(background)), keep_alive.stop],
     )
 
 
@@ -81,22 +108,14 @@ async def main() -> None:
 
     network_client = init_network_client(config)
 
-    app = create_provider_app(config, network_client)
+    # TODO: Step 1.3 Replace the sample quotes in publish_quotes.py with your own quote publishing logic
+    app = create_provider_app(config, network_client, background=publish_quotes(network_client))
 
     # Step 1.1 is done. You successfully initialised starter template
     logger.info("Step 1.1: Provider server initialized on :%d", config.port)
 
     # TODO: Step 1.2 Share the generated public key from .env with t-0 team
 
-    # TODO: Step 1.3 Replace publish_quotes with your own quote publishing logic
-    shutdown_event = asyncio.Event()
-
-    loop = asyncio.get_event_loop()
-    for sig in (signal.SIGINT, signal.SIGTERM):
-        loop.add_signal_handler(sig, shutdown_event.set)
-
-    publish_task = asyncio.create_task(publish_quotes(network_client, shutdown_event))
-
     # TODO: Step 1.4 Verify that quotes for target currency are successfully received
     quote_task = asyncio.create_task(get_quote(network_client))
 
@@ -110,9 +129,7 @@ async def main() -> None:
 
     await server.serve()
 
-    # Clean up background tasks
-    shutdown_event.set()
-    publish_task.cancel()
+    # Clean up background tasks (quote publishing is stopped by the server's lifespan)
     quote_task.cancel()
 
 
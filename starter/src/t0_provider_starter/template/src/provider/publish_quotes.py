@@ -2,114 +2,110 @@
 
 Go equivalent: internal/publish_quotes.go → PublishQuotes()
 
-Publishes sample PayOut (off-ramp) and PayIn (on-ramp) quotes every 5 seconds.
+Publishes sample PayOut (off-ramp) and PayIn (on-ramp) quotes through a QuotePublisher.
 TODO: Step 1.3 Replace this with fetching quotes from your systems and publishing them.
 We recommend publishing at least once per 5 seconds, but not more than once per second.
+QuotePublisher does both: it publishes at most once per second when a rate moves, and
+re-sends the unchanged book at least once per 5 seconds.
+Quotes are refreshed from your systems by a PeriodicTask on a fixed-rate schedule that
+keeps running through errors; both run for as long as the provider server does.
 """
 
 from __future__ import annotations
 
-import asyncio
-import logging
-import uuid
+from functools import partial
+from typing import TYPE_CHECKING
 
-from google.protobuf.timestamp_pb2 import Timestamp
 from t0_provider_sdk.api.tzero.v1.common.common_pb2 import Decimal
 from t0_provider_sdk.api.tzero.v1.common.payment_method_pb2 import PAYMENT_METHOD_TYPE_SEPA
-from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClient
-from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import QUOTE_TYPE_REALTIME, UpdateQuoteRequest
+from t0_provider_sdk.api.tzero.v1.payment.network_pb2 import UpdateQuoteRequest
+from t0_provider_sdk.common.periodic import PeriodicTask
+from t0_provider_sdk.quote.publisher import Direction, QuotePublisher
 
-logger = logging.getLogger(__name__)
+if TYPE_CHECKING:
+    from t0_provider_sdk.api.tzero.v1.payment.network_connect import NetworkServiceClient
 
-PUBLISH_INTERVAL_SECONDS = 5
+# Seconds between quote refreshes from your systems
+QUOTE_REFRESH_INTERVAL = 5.0
 
 
-def _now_timestamp() -> Timestamp:
-    """Create a protobuf Timestamp for the current time."""
-    ts = Timestamp()
-    ts.GetCurrentTime()
-    return ts
+def update_sample_quotes(publisher: QuotePublisher) -> None:
+    """Feed the sample EUR/SEPA quotes into the publisher.
 
+    Call publisher.update() from your rate feeds instead, as often as rates change.
+    Every (currency, payment method, direction) is kept until replaced or removed,
+    and the publisher always sends the full book: every UpdateQuote request
+    discards all previously published quotes.
+    """
+    currency = "EUR"
+    payment_method = PAYMENT_METHOD_TYPE_SEPA
+
+    # The quote at which you want to take USDT and pay out local currency (off-ramp)
+    publisher.update(
+        currency,
+        payment_method,
+        Direction.PAY_OUT,
+        [
+            # One or more bands are allowed; a client_quote_id is generated if not set
+            UpdateQuoteRequest.Quote.Band(
+                max_amount=Decimal(
+                    unscaled=1000,  # maximum amount in USD
+                    exponent=0,
+                ),
+                # Note: rate is always USD/XXX, so for BRL quote should be USD/BRL
+                rate=Decimal(
+                    unscaled=86,  # rate 0.86
+                    exponent=-2,
+                ),
+            ),
+        ],
+        ttl=30,  # seconds the quote stays valid after each publish
+    )
+
+    # The quote at which you want to take local currency and settle with USDT (on-ramp)
+    publisher.update(
+        currency,
+        payment_method,
+        Direction.PAY_IN,
+        [
+            UpdateQuoteRequest.Quote.Band(
+                max_amount=Decimal(
+                    unscaled=1000,
+                    exponent=0,
+                ),
+                rate=Decimal(
+                    unscaled=88,  # rate 0.88
+                    exponent=-2,
+                ),
+            ),
+        ],
+        ttl=30,
+    )
 
-def _expiration_timestamp(seconds_from_now: int = 30) -> Timestamp:
-    """Create a protobuf Timestamp offset from now."""
-    ts = _now_timestamp()
-    ts.seconds += seconds_from_now
-    return ts
 
+async def refresh_quotes(publisher: QuotePublisher) -> None:
+    """Fetch current quotes from your systems and feed them into the publisher.
 
-async def publish_quotes(network_client: NetworkServiceClient, shutdown_event: asyncio.Event) -> None:
-    """Publish sample quotes on a regular interval.
+    Called every QUOTE_REFRESH_INTERVAL seconds; an exception is logged and the
+    next refresh still runs. Only changed rates are published.
 
-    NOTE: Every UpdateQuote request discards all previous quotes.
-    If you want to publish multiple quotes, combine them into a single request.
-    Otherwise, only the quotes from the last request will be available.
+    To stream rates from liquidity-provider APIs, files or sockets instead, feed the
+    publisher from a t0_provider_sdk.quote.feed.FeedPipeline started with the server.
     """
-    while not shutdown_event.is_set():
-        try:
-            currency = "EUR"
-            payment_method = PAYMENT_METHOD_TYPE_SEPA
-            expiration = _expiration_timestamp(30)
-            timestamp = _now_timestamp()
-
-            await network_client.update_quote(
-                UpdateQuoteRequest(
-                    pay_out=[
-                        # The quote at which you want to take USDT and pay out local currency (off-ramp)
-                        UpdateQuoteRequest.Quote(
-                            currency=currency,
-                            quote_type=QUOTE_TYPE_REALTIME,  # REALTIME is the only supported type
-                            payment_method=payment_method,
-                            expiration=expiration,
-                            timestamp=timestamp,
-                            bands=[
-                                # One or more bands are allowed
-                                UpdateQuoteRequest.Quote.Band(
-                                    client_quote_id=str(uuid.uuid4()),
-                                    max_amount=Decimal(
-                                        unscaled=1000,  # maximum amount in USD
-                                        exponent=0,
-                                    ),
-                                    # Note: rate is always USD/XXX, so for BRL quote should be USD/BRL
-                                    rate=Decimal(
-                                        unscaled=86,  # rate 0.86
-                                        exponent=-2,
-                                    ),
-                                ),
-                            ],
-                        ),
-                    ],
-                    pay_in=[
-                        # The quote at which you want to take local currency and settle with USDT (on-ramp)
-                        UpdateQuoteRequest.Quote(
-                            currency=currency,
-                            quote_type=QUOTE_TYPE_REALTIME,
-                            payment_method=payment_method,
-                            expiration=expiration,
-                            timestamp=timestamp,
-                            bands=[
-                                UpdateQuoteRequest.Quote.Band(
-                                    client_quote_id=str(uuid.uuid4()),
-                                    max_amount=Decimal(
-                                        unscaled=1000,
-                                        exponent=0,
-                                    ),
-                                    rate=Decimal(
-                                        unscaled=88,  # rate 0.88
-                                        exponent=-2,
-                                    ),
-                                ),
-                            ],
-                        ),
-                    ],
-                ),
-            )
-        except Exception:
-            logger.exception("Error updating quote")
-            return
-
-        try:
-            await asyncio.wait_for(shutdown_event.wait(), timeout=PUBLISH_INTERVAL_SECONDS)
-            return  # shutdown requested
-        except asyncio.TimeoutError:
-            pass  # interval elapsed, publish again
+    update_sample_quotes(publisher)
+
+
+def publish_quotes(network_client: NetworkServiceClient) -> list[QuotePublisher | PeriodicTask]:
+    """Create the quote publisher and the periodic task that refreshes its quotes.
+
+    Returns background tasks with start()/stop(), to be run with the server's lifespan.
+    """
+    # Publishes when a rate moves, and re-sends the unchanged book every 5 seconds (max_interval)
+    publisher = QuotePublisher(network_client)
+    refresh = PeriodicTask(
+        partial(refresh_quotes, publisher),
+        interval=QUOTE_REFRESH_INTERVAL,
+        jitter=QUOTE_REFRESH_INTERVAL / 10,
+        name="quote refresh",
+    )
+    return [publisher, refresh]